@@ -0,0 +1,40 @@
+"""Add transaction and goal indexes
+
+Revision ID: 5c1e9b7d2f4a
+Revises: a259e07664c1
+Create Date: 2026-10-17 11:03:27.418265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e9b7d2f4a'
+down_revision: Union[str, None] = 'a259e07664c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_transaction_user_id_date_id', 'transaction', ['user_id', 'date', 'id'], unique=False)
+    op.create_index(
+        'ix_transaction_user_id_type_id_category_id_date',
+        'transaction',
+        ['user_id', 'type_id', 'category_id', 'date'],
+        unique=False,
+        postgresql_include=['value'],
+    )
+    op.create_index('ix_goal_user_id_start_date', 'goal', ['user_id', 'start_date'], unique=False)
+    op.create_index('ix_goal_user_id_end_date', 'goal', ['user_id', 'end_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_goal_user_id_end_date', table_name='goal')
+    op.drop_index('ix_goal_user_id_start_date', table_name='goal')
+    op.drop_index('ix_transaction_user_id_type_id_category_id_date', table_name='transaction')
+    op.drop_index('ix_transaction_user_id_date_id', table_name='transaction')
@@ -0,0 +1,63 @@
+"""Add category reference constraints
+
+Revision ID: a7c4e2d9f186
+Revises: f3b8d1c5a729
+Create Date: 2026-10-17 19:12:40.518206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e2d9f186'
+down_revision: Union[str, None] = 'f3b8d1c5a729'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # rows referencing a category of another type are reported and the upgrade stopped, rather than changed here, so
+    # they can be fixed by hand before the constraints are added
+    for table in ('transaction', 'goal'):
+        op.execute(
+            f'DO $$ DECLARE ids TEXT; BEGIN '
+            f'SELECT string_agg({table}.id::text, \', \' ORDER BY {table}.id) INTO ids FROM {table} '
+            f'JOIN category ON category.id = {table}.category_id WHERE category.type_id <> {table}.type_id; '
+            f'IF ids IS NOT NULL THEN '
+            f"RAISE EXCEPTION '{table} rows with ids % reference a category of another type', ids; "
+            f'END IF; END $$'
+        )
+
+    op.create_unique_constraint('uq_category_id_type_id', 'category', ['id', 'type_id'])
+    # deferred to the commit, so that deleting a category can first set category_id to null through the simple key
+    op.create_foreign_key(
+        'fk_transaction_category_id_type_id',
+        'transaction',
+        'category',
+        ['category_id', 'type_id'],
+        ['id', 'type_id'],
+        deferrable=True,
+        initially='DEFERRED',
+    )
+    op.create_foreign_key(
+        'fk_goal_category_id_type_id',
+        'goal',
+        'category',
+        ['category_id', 'type_id'],
+        ['id', 'type_id'],
+        deferrable=True,
+        initially='DEFERRED',
+    )
+    op.create_check_constraint('ck_goal_end_date_after_start_date', 'goal', sa.text('end_date > start_date'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('ck_goal_end_date_after_start_date', 'goal', type_='check')
+    op.drop_constraint('fk_goal_category_id_type_id', 'goal', type_='foreignkey')
+    op.drop_constraint('fk_transaction_category_id_type_id', 'transaction', type_='foreignkey')
+    op.drop_constraint('uq_category_id_type_id', 'category', type_='unique')
@@ -0,0 +1,72 @@
+"""Store amounts as minor units
+
+Revision ID: b5e9d3a1c864
+Revises: a7c4e2d9f186
+Create Date: 2026-10-17 20:03:27.194518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e9d3a1c864'
+down_revision: Union[str, None] = 'a7c4e2d9f186'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# amounts become integer counts of cents, the minor units of CURRENCY_EXPONENT 2; pinned here rather than read from
+# the app, so that the stored values are never rescaled by running this migration with another exponent
+scale = 100
+
+amount_columns = (
+    ('transaction', 'value'),
+    ('goal', 'target_value'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # values with more decimal places than the currency has are rounded to the nearest minor unit
+    for table, column in amount_columns:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.Numeric(),
+            type_=sa.BigInteger(),
+            existing_nullable=False,
+            postgresql_using=f'round({column} * {scale})::bigint',
+        )
+    # rollup totals are rebuilt from the rounded values rather than rounded once per month, so that they stay equal
+    # to the sums of the transactions they stand for
+    op.execute('DELETE FROM transaction_monthly_rollup')
+    op.alter_column(
+        'transaction_monthly_rollup',
+        'total',
+        existing_type=sa.Numeric(),
+        type_=sa.BigInteger(),
+        existing_nullable=False,
+        postgresql_using='total::bigint',
+    )
+    op.execute(
+        'INSERT INTO transaction_monthly_rollup (user_id, type_id, category_id, month, total, count) '
+        "SELECT user_id, type_id, category_id, CAST(date_trunc('month', date) AS DATE), sum(value), count(*) "
+        'FROM transaction '
+        "GROUP BY user_id, type_id, category_id, CAST(date_trunc('month', date) AS DATE)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # whole minor units divide back exactly, the rollup totals included
+    for table, column in (*amount_columns, ('transaction_monthly_rollup', 'total')):
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.BigInteger(),
+            type_=sa.Numeric(),
+            existing_nullable=False,
+            postgresql_using=f'{column}::numeric / {scale}',
+        )
@@ -0,0 +1,61 @@
+"""Add keyword search indexes
+
+Revision ID: b83f2d6e0a17
+Revises: 5c1e9b7d2f4a
+Create Date: 2026-10-17 13:26:54.092318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b83f2d6e0a17'
+down_revision: Union[str, None] = '5c1e9b7d2f4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_transaction_comment_trgm',
+        'transaction',
+        ['comment'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'comment': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_transaction_comment_tsvector',
+        'transaction',
+        [sa.text("to_tsvector('simple', coalesce(comment, ''))")],
+        unique=False,
+        postgresql_using='gin',
+    )
+    op.create_index(
+        'ix_goal_name_trgm',
+        'goal',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_goal_name_tsvector',
+        'goal',
+        [sa.text("to_tsvector('simple', coalesce(name, ''))")],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_goal_name_tsvector', table_name='goal')
+    op.drop_index('ix_goal_name_trgm', table_name='goal')
+    op.drop_index('ix_transaction_comment_tsvector', table_name='transaction')
+    op.drop_index('ix_transaction_comment_trgm', table_name='transaction')
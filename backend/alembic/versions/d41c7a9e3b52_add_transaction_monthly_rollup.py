@@ -0,0 +1,54 @@
+"""Add transaction monthly rollup
+
+Revision ID: d41c7a9e3b52
+Revises: b83f2d6e0a17
+Create Date: 2026-10-17 15:47:08.631904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41c7a9e3b52'
+down_revision: Union[str, None] = 'b83f2d6e0a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('transaction_monthly_rollup',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('type_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('total', sa.Numeric(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['category.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['type_id'], ['type.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'uq_transaction_monthly_rollup_key',
+        'transaction_monthly_rollup',
+        ['user_id', 'type_id', sa.text('coalesce(category_id, 0)'), 'month'],
+        unique=True,
+    )
+    # backfill from the existing transactions, later writes keep the rollup up to date
+    op.execute(
+        'INSERT INTO transaction_monthly_rollup (user_id, type_id, category_id, month, total, count) '
+        "SELECT user_id, type_id, category_id, CAST(date_trunc('month', date) AS DATE), sum(value), count(*) "
+        'FROM transaction '
+        "GROUP BY user_id, type_id, category_id, CAST(date_trunc('month', date) AS DATE)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_transaction_monthly_rollup_key', table_name='transaction_monthly_rollup')
+    op.drop_table('transaction_monthly_rollup')
@@ -0,0 +1,152 @@
+"""Partition transaction by date
+
+Revision ID: e6a2f4c8b913
+Revises: d41c7a9e3b52
+Create Date: 2026-10-17 17:12:39.504817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a2f4c8b913'
+down_revision: Union[str, None] = 'd41c7a9e3b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# months of partitions created ahead of the current one, the app tops them up on startup
+MONTHS_AHEAD = 3
+
+# creates the missing monthly partitions between two months, inclusive, and returns how many were created;
+# each partition is built detached so rows that fell into the default partition can be moved into it before attaching
+CREATE_PARTITIONS_FUNCTION = """
+CREATE OR REPLACE FUNCTION create_transaction_partitions(from_month date, to_month date) RETURNS integer AS $$
+DECLARE
+    month_start date;
+    month_end date;
+    partition_name text;
+    created integer := 0;
+BEGIN
+    -- concurrent callers, e.g. several app workers starting at once, create partitions one at a time
+    PERFORM pg_advisory_xact_lock(hashtext('create_transaction_partitions'));
+    FOR month_start IN
+        SELECT CAST(m AS date)
+        FROM generate_series(date_trunc('month', from_month), date_trunc('month', to_month), interval '1 month') AS m
+    LOOP
+        partition_name := 'transaction_' || to_char(month_start, 'YYYY_MM');
+        CONTINUE WHEN to_regclass(partition_name) IS NOT NULL;
+        month_end := CAST(month_start + interval '1 month' AS date);
+
+        EXECUTE format('CREATE TABLE %I (LIKE transaction INCLUDING DEFAULTS)', partition_name);
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM transaction_default WHERE date >= %L AND date < %L RETURNING *) '
+            || 'INSERT INTO %I SELECT * FROM moved',
+            month_start, month_end, partition_name
+        );
+        EXECUTE format(
+            'ALTER TABLE transaction ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+            partition_name, month_start, month_end
+        );
+        created := created + 1;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+COLUMNS = 'id, user_id, type_id, category_id, date, value, comment'
+
+
+def create_indexes() -> None:
+    op.create_index('ix_transaction_user_id_date_id', 'transaction', ['user_id', 'date', 'id'], unique=False)
+    op.create_index(
+        'ix_transaction_user_id_type_id_category_id_date',
+        'transaction',
+        ['user_id', 'type_id', 'category_id', 'date'],
+        unique=False,
+        postgresql_include=['value'],
+    )
+    op.create_index(
+        'ix_transaction_comment_trgm',
+        'transaction',
+        ['comment'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'comment': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_transaction_comment_tsvector',
+        'transaction',
+        [sa.text("to_tsvector('simple', coalesce(comment, ''))")],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def drop_indexes() -> None:
+    op.drop_index('ix_transaction_comment_tsvector', table_name='transaction')
+    op.drop_index('ix_transaction_comment_trgm', table_name='transaction')
+    op.drop_index('ix_transaction_user_id_type_id_category_id_date', table_name='transaction')
+    op.drop_index('ix_transaction_user_id_date_id', table_name='transaction')
+
+
+def create_transaction_table(primary_key: list[str], **kwargs) -> None:
+    # the id sequence is kept across the swap, so existing ids and the next id stay the same
+    op.create_table('transaction',
+    sa.Column(
+        'id', sa.Integer(), server_default=sa.text("nextval('transaction_id_seq')"), autoincrement=False, nullable=False
+    ),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('type_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=True),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('value', sa.Numeric(), nullable=False),
+    sa.Column('comment', sa.String(), nullable=True),
+    sa.ForeignKeyConstraint(['category_id'], ['category.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['type_id'], ['type.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint(*primary_key),
+    **kwargs
+    )
+
+
+def swap_transaction_table(old_name: str, primary_key: list[str], **kwargs) -> None:
+    drop_indexes()
+    op.rename_table('transaction', old_name)
+    op.execute(f'ALTER TABLE {old_name} RENAME CONSTRAINT transaction_pkey TO {old_name}_pkey')
+    op.execute('ALTER SEQUENCE transaction_id_seq OWNED BY NONE')
+    create_transaction_table(primary_key, **kwargs)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # a partitioned table needs the partition key in its primary key, ids still come from one sequence
+    swap_transaction_table('transaction_unpartitioned', ['id', 'date'], postgresql_partition_by='RANGE (date)')
+    op.execute('CREATE TABLE transaction_default PARTITION OF transaction DEFAULT')
+    op.execute(CREATE_PARTITIONS_FUNCTION)
+    # partitions from the first existing transaction on, so the copy goes straight into them
+    op.execute(
+        'SELECT create_transaction_partitions('
+        'coalesce((SELECT min(date) FROM transaction_unpartitioned), CAST(now() AS date)), '
+        f"CAST(now() + interval '{MONTHS_AHEAD} months' AS date))"
+    )
+    op.execute(f'INSERT INTO transaction ({COLUMNS}) SELECT {COLUMNS} FROM transaction_unpartitioned')
+    op.drop_table('transaction_unpartitioned')
+    op.execute('ALTER SEQUENCE transaction_id_seq OWNED BY transaction.id')
+    create_indexes()
+    op.execute('ANALYZE transaction')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    swap_transaction_table('transaction_partitioned', ['id'])
+    op.execute(f'INSERT INTO transaction ({COLUMNS}) SELECT {COLUMNS} FROM transaction_partitioned')
+    op.drop_table('transaction_partitioned')
+    op.execute('DROP FUNCTION create_transaction_partitions(date, date)')
+    op.execute('ALTER SEQUENCE transaction_id_seq OWNED BY transaction.id')
+    create_indexes()
+    op.execute('ANALYZE transaction')
@@ -0,0 +1,35 @@
+"""Add transaction external id
+
+Revision ID: f3b8d1c5a729
+Revises: e6a2f4c8b913
+Create Date: 2026-10-17 18:05:51.273640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d1c5a729'
+down_revision: Union[str, None] = 'e6a2f4c8b913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('transaction', sa.Column('external_id', sa.String(), nullable=True))
+    op.create_index(
+        'uq_transaction_user_id_external_id_date',
+        'transaction',
+        ['user_id', 'external_id', 'date'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_transaction_user_id_external_id_date', table_name='transaction')
+    op.drop_column('transaction', 'external_id')
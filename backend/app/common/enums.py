@@ -11,6 +11,22 @@ class Tag(Enum):
     security = "security"
 
 
+class AggregateGroupBy(Enum):
+    type_id = "type_id"
+    category_id = "category_id"
+    month = "month"
+    week = "week"
+    day = "day"
+
+
+class AggregateMetric(Enum):
+    sum = "sum"
+    count = "count"
+    avg = "avg"
+    min = "min"
+    max = "max"
+
+
 class EntityType(Enum):
     role = "role"
     user = "user"
@@ -20,6 +36,20 @@ class EntityType(Enum):
     transaction = "transaction"
 
 
+class FilterOperator(Enum):
+    in_ = "in"
+    gte = "gte"
+    lte = "lte"
+    ilike = "ilike"
+    match = "match"
+
+
+class SearchMode(Enum):
+    substring = "substring"
+    fulltext = "fulltext"
+    ranked = "ranked"
+
+
 class LogLevel(Enum):
     DEBUG = "DEBUG"
     INFO = "INFO"
@@ -28,6 +58,21 @@ class LogLevel(Enum):
     CRITICAL = "CRITICAL"
 
 
+class ExecutorType(Enum):
+    thread = "thread"
+    process = "process"
+
+
+class ExportFormat(Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+class ImportFormat(Enum):
+    csv = "csv"
+    ofx = "ofx"
+
+
 class RoleName(Enum):
     admin = "admin"
     user = "user"
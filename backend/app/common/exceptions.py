@@ -20,7 +20,25 @@ class ActionForbiddenException(Exception):
         super().__init__(f"action forbidden{f': {detail}' if detail else ''}")
 
 
+class InvalidCursorException(Exception):
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+        super().__init__(f"invalid cursor {cursor}")
+
+
 class EntityNotAssociatedException(Exception):
     def __init__(self, detail: str = ""):
         self.detail = detail
         super().__init__(f"entity not associated{f': {detail}' if detail else ''}")
+
+
+class BulkValidationException(Exception):
+    def __init__(self, errors: list[dict]):
+        self.errors = errors
+        super().__init__(f"{len(errors)} items are invalid")
+
+
+class ImportRecordTooLargeException(Exception):
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        super().__init__(f"imported record is longer than {max_size} characters")
@@ -0,0 +1,53 @@
+from app.core.config import get_settings
+from app.db_models import Role, Type
+from app.schemas import AuthContext
+from app.utils.cache_utils import ReferenceCache, TTLCache
+
+
+settings = get_settings()
+
+# authorization contexts keyed by token subject (email), shared by all requests of the process
+principal_cache: TTLCache[str, AuthContext] = TTLCache(
+    max_size=settings.principal_cache_max_size, ttl_seconds=settings.principal_cache_ttl_seconds
+)
+
+# lowest token version still trusted per user id, recorded when a user row changes;
+# entries only need to outlive the access tokens issued before the change.
+# it is per process and bounded: a change made through another process, or evicted, is missed and older claims are
+# trusted until their token expires, at most ACCESS_TOKEN_EXPIRE_MINUTES; admin contexts are checked against the
+# database instead, as they widen queries to every user
+token_version_cache: TTLCache[int, int] = TTLCache(
+    max_size=settings.token_version_cache_max_size, ttl_seconds=settings.access_token_expire_minutes * 60
+)
+
+# snapshots of the seeded reference tables keyed by id, loaded at startup and reloaded when the rows change
+role_cache: ReferenceCache[int, Role] = ReferenceCache()
+type_cache: ReferenceCache[int, Type] = ReferenceCache()
+
+
+def evict_principal(user_id: int, min_token_version: int | None = None) -> None:
+    """
+    Remove cached principals of a user, to be called whenever the user row changes.
+
+    Args:
+        user_id (int): Id of the user whose principals should be removed.
+        min_token_version (int | None): If provided, claims of tokens with a lower version are treated as stale.
+    """
+    principal_cache.pop_where(lambda _, auth_context: auth_context.id == user_id)
+    if min_token_version is not None:
+        token_version_cache.set(user_id, min_token_version)
+
+
+def is_token_version_stale(user_id: int, token_version: int) -> bool:
+    """
+    Check if claims of a token were issued before the last known change of the user.
+
+    Args:
+        user_id (int): Id of the user the token was issued for.
+        token_version (int): Version of the user at the time the token was issued.
+
+    Returns:
+        bool: True if the claims are stale, False otherwise.
+    """
+    min_token_version = token_version_cache.get(user_id)
+    return min_token_version is not None and token_version < min_token_version
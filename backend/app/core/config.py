@@ -4,7 +4,7 @@ from typing_extensions import Self
 from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
-from app.common.enums import LogLevel
+from app.common.enums import ExecutorType, LogLevel
 
 
 class Settings(BaseSettings):
@@ -23,6 +23,7 @@ class Settings(BaseSettings):
     postgres_password: str = "changethis"
     postgres_db: str = "piggybankdb"
     db_host: str = "changethis"
+    transaction_partition_months_ahead: int = 3
 
     @property
     def async_database_url(self) -> str:
@@ -53,6 +54,24 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 15
     refresh_token_expire_hours: int = 24
     comment_disallowed_chars_regex: str = r"[<>&\"'\\|~]"
+    password_hashing_executor: ExecutorType = ExecutorType.thread
+    password_hashing_max_workers: int = 4
+
+    # pagination settings
+    default_page_size: int = 100
+    max_page_size: int = 1000
+    export_chunk_size: int = 1000
+
+    # bulk settings
+    max_bulk_size: int = 1000
+    import_batch_size: int = 5000
+    max_import_errors: int = 100
+    max_import_record_size: int = 65536
+
+    # cache settings
+    principal_cache_max_size: int = 1024
+    principal_cache_ttl_seconds: int = 60
+    token_version_cache_max_size: int = 10000
 
     @property
     def secure_cookies(self) -> bool:
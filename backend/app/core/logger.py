@@ -1,32 +1,83 @@
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 from app.core.config import get_settings
 
 
+# modules log through loggers named after them, which propagate to this one
+APP_LOGGER_NAME = "app"
+
+_listener: QueueListener | None = None
+
+
 def get_logger(name: str = __name__) -> logging.Logger:
-    settings = get_settings()
-    logger = logging.getLogger(name)
-    log_lvl_map = logging.getLevelNamesMapping()
-    log_level = log_lvl_map[settings.log_level.value]
+    """
+    Get the logger of a module of the app.
+
+    Handlers are not attached here, records propagate to the app logger set up by configure_logging.
+
+    Args:
+        name (str): Name of the module, under the app package.
+
+    Returns:
+        logging.Logger: The logger.
+    """
+    return logging.getLogger(name)
 
-    logger.setLevel(log_level)
 
+def configure_logging() -> QueueListener:
+    """
+    Set up the app logger once, to write records to the console and the log file from a background thread.
+
+    Logging calls only put records on a queue, so request handlers never wait for the console or the disk. Messages
+    are merged with their %-style arguments when put on the queue, and only if the level is enabled.
+
+    Returns:
+        QueueListener: The running listener, the same one on later calls.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    settings = get_settings()
+    log_level = logging.getLevelNamesMapping()[settings.log_level.value]
     formatter = logging.Formatter(settings.log_format)
 
     console_handler = logging.StreamHandler()
-    console_handler.setLevel(log_level)
     console_handler.setFormatter(formatter)
 
     Path(settings.log_dir).mkdir(parents=True, exist_ok=True)
     file_handler = logging.FileHandler(f"{settings.log_dir}/{settings.log_filename}")
-    file_handler.setLevel(log_level)
     file_handler.setFormatter(formatter)
 
-    for handler in logger.handlers:
-        logger.removeHandler(handler)
+    log_queue = queue.SimpleQueue()
+    app_logger = logging.getLogger(APP_LOGGER_NAME)
+    app_logger.setLevel(log_level)
+    for handler in list(app_logger.handlers):
+        app_logger.removeHandler(handler)
+    app_logger.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, console_handler, file_handler)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """
+    Stop the listener set up by configure_logging, after it has written the records still on the queue.
+    """
+    global _listener
+    if _listener is None:
+        return
 
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    app_logger = logging.getLogger(APP_LOGGER_NAME)
+    for handler in list(app_logger.handlers):
+        app_logger.removeHandler(handler)
+    app_logger.setLevel(logging.NOTSET)
 
-    return logger
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
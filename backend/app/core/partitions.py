@@ -0,0 +1,37 @@
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.logger import get_logger
+from app.utils.date_utils import get_month_start, get_next_month_start
+
+
+async def create_transaction_partitions(session: AsyncSession, today: date | None = None) -> None:
+    """
+    Create the monthly transaction partitions from the current month to the configured number of months ahead.
+
+    Only PostgreSQL partitions the transaction table, other databases are left untouched. Existing partitions are
+    skipped, so this runs on every startup; transactions past the last partition go to the default partition and are
+    moved into their own partition once it is created.
+
+    Args:
+        session (AsyncSession): Database session.
+        today (date | None): Day to count from, today if None.
+    """
+    settings = get_settings()
+    logger = get_logger(__name__)
+
+    if session.get_bind().dialect.name != "postgresql":
+        return
+
+    from_month = get_month_start(today or date.today())
+    to_month = from_month
+    for _ in range(settings.transaction_partition_months_ahead):
+        to_month = get_next_month_start(to_month)
+
+    result = await session.execute(select(func.create_transaction_partitions(from_month, to_month)))
+    created = result.scalar_one()
+    await session.commit()
+    logger.info("created %s transaction partitions up to %s", created, to_month.isoformat())
@@ -6,7 +6,7 @@ from app.common.exceptions import EntityNotFoundException
 from app.core.config import get_settings
 from app.core.logger import get_logger
 from app.db_models import User, Role, Type
-from app.utils.password_utils import get_password_hash
+from app.utils.password_utils import get_password_hash_async
 
 
 async def seed_initial_data(session: AsyncSession) -> None:
@@ -21,9 +21,9 @@ async def seed_initial_data(session: AsyncSession) -> None:
             new_role = Role(name=role_enum)
             session.add(new_role)
             await session.flush()
-            logger.info(f"created {role_enum.value} role")
+            logger.info("created %s role", role_enum.value)
         else:
-            logger.info(f"{role_enum.value} role already exists")
+            logger.info("%s role already exists", role_enum.value)
 
     logger.debug("creating initial admin user")
     result = await session.execute(select(User).where(User.email == settings.initial_admin_email))
@@ -32,19 +32,19 @@ async def seed_initial_data(session: AsyncSession) -> None:
         result = await session.execute(select(Role.id).where(Role.name == RoleName.admin.value))
         admin_role_id = result.scalar_one_or_none()
         if not admin_role_id:
-            logger.error(f"failed seeding initial data")
+            logger.error("failed seeding initial data")
             raise EntityNotFoundException(entity_id=RoleName.admin.value, entity_type=EntityType.role)
         new_user = User(
             role_id=admin_role_id,
             email=settings.initial_admin_email,
-            password_hash=get_password_hash(settings.initial_admin_password),
+            password_hash=await get_password_hash_async(settings.initial_admin_password),
             is_protected=True,
         )
         session.add(new_user)
         await session.flush()
-        logger.info(f"created initial admin user with email {settings.initial_admin_email}")
+        logger.info("created initial admin user with email %s", settings.initial_admin_email)
     else:
-        logger.info(f"user with email {settings.initial_admin_email} already exists")
+        logger.info("user with email %s already exists", settings.initial_admin_email)
 
     logger.debug("creating initial transaction types")
     for type_enum in TypeName:
@@ -54,8 +54,8 @@ async def seed_initial_data(session: AsyncSession) -> None:
             new_type = Type(name=type_enum)
             session.add(new_type)
             await session.flush()
-            logger.info(f"created {type_enum.value} type")
+            logger.info("created %s type", type_enum.value)
         else:
-            logger.info(f"{type_enum.value} type already exists")
+            logger.info("%s type already exists", type_enum.value)
 
     await session.commit()
@@ -2,5 +2,6 @@ from app.db_models.category import Category
 from app.db_models.goal import Goal
 from app.db_models.role import Role
 from app.db_models.transaction import Transaction
+from app.db_models.transaction_monthly_rollup import TransactionMonthlyRollup
 from app.db_models.type import Type
 from app.db_models.user import User
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.db_models.base import Base
@@ -6,6 +6,10 @@ from app.db_models.base import Base
 
 class Category(Base):
     __tablename__ = "category"
+    __table_args__ = (
+        # referenced by transactions and goals, so the database checks that their category is of their type
+        UniqueConstraint("id", "type_id", name="uq_category_id_type_id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
@@ -14,5 +18,7 @@ class Category(Base):
 
     user = relationship("User", back_populates="categories")
     type = relationship("Type", back_populates="categories")
-    transactions = relationship("Transaction", back_populates="category", passive_deletes=True)
-    goals = relationship("Goal", back_populates="category", passive_deletes=True)
+    transactions = relationship(
+        "Transaction", back_populates="category", passive_deletes=True, foreign_keys="Transaction.category_id"
+    )
+    goals = relationship("Goal", back_populates="category", passive_deletes=True, foreign_keys="Goal.category_id")
@@ -1,11 +1,34 @@
-from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey
+from sqlalchemy import CheckConstraint, Column, Integer, String, Date, ForeignKey, ForeignKeyConstraint, Index, text
 from sqlalchemy.orm import relationship
 
 from app.db_models.base import Base
+from app.utils.sql_utils import MinorUnits
 
 
 class Goal(Base):
     __tablename__ = "goal"
+    __table_args__ = (
+        # the category of a goal must be of its type, deferred like the one of transactions
+        ForeignKeyConstraint(
+            ["category_id", "type_id"],
+            ["category.id", "category.type_id"],
+            name="fk_goal_category_id_type_id",
+            deferrable=True,
+            initially="DEFERRED",
+        ),
+        # also validated by the schemas, kept by the database for writes that bypass them
+        CheckConstraint("end_date > start_date", name="ck_goal_end_date_after_start_date"),
+        # lists of a user's goals filtered by start or end date
+        Index("ix_goal_user_id_start_date", "user_id", "start_date"),
+        Index("ix_goal_user_id_end_date", "user_id", "end_date"),
+        # keyword search on names, trigrams serve ILIKE substring search and the tsvector full-text search
+        Index("ix_goal_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}).ddl_if(
+            dialect="postgresql"
+        ),
+        Index(
+            "ix_goal_name_tsvector", text("to_tsvector('simple', coalesce(name, ''))"), postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
@@ -14,8 +37,8 @@ class Goal(Base):
     name = Column(String, nullable=False)
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
-    target_value = Column(Numeric, nullable=False)
+    target_value = Column(MinorUnits(), nullable=False)
 
     user = relationship("User", back_populates="goals")
     type = relationship("Type", back_populates="goals")
-    category = relationship("Category", back_populates="goals")
+    category = relationship("Category", back_populates="goals", foreign_keys=[category_id])
@@ -1,20 +1,61 @@
-from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, ForeignKeyConstraint, Index, text
 from sqlalchemy.orm import relationship
 
 from app.db_models.base import Base
+from app.utils.sql_utils import MinorUnits
 
 
 class Transaction(Base):
+    # on PostgreSQL the table is range partitioned by month on date, set up by migration rather than declared here:
+    # its primary key there is (id, date), while ids stay unique through the sequence and identify rows for the ORM
     __tablename__ = "transaction"
+    __table_args__ = (
+        # the category of a transaction must be of its type, a single check by the database on write; deferred to the
+        # commit, so that deleting a category can first set category_id to null through the simple foreign key
+        ForeignKeyConstraint(
+            ["category_id", "type_id"],
+            ["category.id", "category.type_id"],
+            name="fk_transaction_category_id_type_id",
+            deferrable=True,
+            initially="DEFERRED",
+        ),
+        # lists of a user's transactions, in the (date, id) keyset order
+        Index("ix_transaction_user_id_date_id", "user_id", "date", "id"),
+        # totals, aggregates and goal progress, covering value so sums can be answered from the index alone
+        Index(
+            "ix_transaction_user_id_type_id_category_id_date",
+            "user_id",
+            "type_id",
+            "category_id",
+            "date",
+            postgresql_include=["value"],
+        ),
+        # idempotent bank syncs, upserts are keyed by the id the bank gave the transaction; the date is part of the
+        # key as unique indexes of the partitioned table must include its partition key
+        Index("uq_transaction_user_id_external_id_date", "user_id", "external_id", "date", unique=True),
+        # keyword search on comments, trigrams serve ILIKE substring search and the tsvector full-text search
+        Index(
+            "ix_transaction_comment_trgm",
+            "comment",
+            postgresql_using="gin",
+            postgresql_ops={"comment": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_transaction_comment_tsvector",
+            text("to_tsvector('simple', coalesce(comment, ''))"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
     type_id = Column(Integer, ForeignKey("type.id", ondelete="CASCADE"), nullable=False)
     category_id = Column(Integer, ForeignKey("category.id", ondelete="SET NULL"), nullable=True)
     date = Column(Date, nullable=False)
-    value = Column(Numeric, nullable=False)
+    value = Column(MinorUnits(), nullable=False)
     comment = Column(String, nullable=True)
+    external_id = Column(String, nullable=True)
 
     user = relationship("User", back_populates="transactions")
     type = relationship("Type", back_populates="transactions")
-    category = relationship("Category", back_populates="transactions")
+    category = relationship("Category", back_populates="transactions", foreign_keys=[category_id])
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, Index, func, literal_column
+
+from app.db_models.base import Base
+from app.utils.sql_utils import MinorUnits
+
+
+class TransactionMonthlyRollup(Base):
+    __tablename__ = "transaction_monthly_rollup"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    type_id = Column(Integer, ForeignKey("type.id", ondelete="CASCADE"), nullable=False)
+    # rows of deleted categories are moved to the uncategorized row by the category service before the delete
+    category_id = Column(Integer, ForeignKey("category.id", ondelete="CASCADE"), nullable=True)
+    month = Column(Date, nullable=False)
+    total = Column(MinorUnits(), nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+
+# one row per key, NULL categories are coalesced as NULLs are distinct in unique indexes; the 0 is rendered inline
+# so that upserts can infer the index from the expression
+ROLLUP_KEY = (
+    TransactionMonthlyRollup.user_id,
+    TransactionMonthlyRollup.type_id,
+    func.coalesce(TransactionMonthlyRollup.category_id, literal_column("0")),
+    TransactionMonthlyRollup.month,
+)
+Index("uq_transaction_monthly_rollup_key", *ROLLUP_KEY, unique=True)
@@ -12,6 +12,8 @@ class User(Base):
     email = Column(String, unique=True, nullable=False)
     password_hash = Column(String, nullable=False)
     is_protected = Column(Boolean, default=False)
+    # bumped on every update, so access tokens issued before it carry stale claims
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     role = relationship("Role", back_populates="users")
     categories = relationship("Category", back_populates="user", cascade="all, delete")
@@ -4,18 +4,30 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import get_settings
+from app.core.logger import configure_logging, shutdown_logging
 from app.core.session import get_session_context
+from app.core.partitions import create_transaction_partitions
 from app.core.seeder import seed_initial_data
 from app.routes import role, security, type, user, category, transaction, goal
+from app.services import RoleService, TypeService
+from app.utils.password_utils import shutdown_password_executor
 
 settings = get_settings()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # first, so that startup is logged too
+    configure_logging()
     async with get_session_context() as session:
         await seed_initial_data(session=session)
+        await create_transaction_partitions(session=session)
+        # roles and types are fixed seed data, later lookups are served from memory
+        await RoleService(session=session).load_reference_cache()
+        await TypeService(session=session).load_reference_cache()
     yield
+    shutdown_password_executor()
+    shutdown_logging()
 
 
 app = FastAPI(
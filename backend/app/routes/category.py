@@ -3,13 +3,13 @@ from typing import Annotated
 from fastapi import APIRouter, HTTPException, Depends, Query
 
 from app.common.enums import Tag
-from app.common.exceptions import EntityNotFoundException, ActionForbiddenException
+from app.common.exceptions import EntityNotFoundException, ActionForbiddenException, InvalidCursorException
 from app.common.responses import common_responses_dict
 from app.core.logger import get_logger
-from app.db_models import User
-from app.schemas import CategoryCreate, CategoryUpdate, CategoryOut, CategoryFilters, ErrorResponse
+from app.schemas import CategoryCreate, CategoryUpdate, CategoryOut, CategoryFilters, ErrorResponse, AuthContext, Page
 from app.services import CategoryService, get_category_service
 from app.services.security import get_current_user
+from app.utils.serialization_utils import SerializedJSONResponse
 
 
 logger = get_logger(__name__)
@@ -39,12 +39,12 @@ router = APIRouter(prefix="/categories", tags=[Tag.category])
 async def get_category(
     category_id: int,
     service: CategoryService = Depends(get_category_service),
-    current_user: User = Depends(get_current_user),
-) -> CategoryOut:
-    logger.info(f"fetching category with id {category_id}")
+    current_user: AuthContext = Depends(get_current_user),
+) -> SerializedJSONResponse:
+    logger.info("fetching category with id %s", category_id)
     try:
-        category = await service.get_by_id(entity_id=category_id, gotten_by=current_user)
-        return category
+        category = await service.get_by_id(entity_id=category_id, gotten_by=current_user, as_rows=True)
+        return SerializedJSONResponse(category, annotation=CategoryOut)
     except ActionForbiddenException as e:
         raise HTTPException(status_code=403, detail=str(e))
     except EntityNotFoundException as e:
@@ -53,20 +53,32 @@ async def get_category(
 
 @router.get(
     "",
-    response_model=list[CategoryOut],
+    response_model=Page[CategoryOut],
     status_code=200,
-    description="get all categories with optional filters",
-    responses=common_responses_dict,
+    description="get a page of categories with optional filters, pass next_cursor as cursor to get the next page",
+    responses={
+        **common_responses_dict,
+        422: {
+            "description": "invalid cursor",
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": {"detail": "invalid cursor abc"}}},
+        },
+    },
 )
 async def get_categories(
     filters: Annotated[CategoryFilters, Query()],
     service: CategoryService = Depends(get_category_service),
-    current_user: User = Depends(get_current_user),
-) -> list[CategoryOut]:
-    logger.info(f"fetching all categories with filters {filters}")
-    categories = await service.get_all_with_filters(filters=filters, gotten_by=current_user)
-    logger.info(f"returned {len(categories)} categories")
-    return categories
+    current_user: AuthContext = Depends(get_current_user),
+) -> SerializedJSONResponse:
+    logger.info("fetching all categories with filters %s", filters)
+    try:
+        categories, next_cursor = await service.get_page_with_filters(
+            filters=filters, gotten_by=current_user, as_rows=True
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    logger.info("returned %s categories", len(categories))
+    return SerializedJSONResponse({"items": categories, "next_cursor": next_cursor}, annotation=Page[CategoryOut])
 
 
 @router.post(
@@ -86,7 +98,7 @@ async def get_categories(
 async def create_category(
     new_category: CategoryCreate,
     service: CategoryService = Depends(get_category_service),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthContext = Depends(get_current_user),
 ) -> CategoryOut:
     logger.info("creating a new category")
     try:
@@ -119,9 +131,9 @@ async def update_category(
     category_id: int,
     updated_category: CategoryUpdate,
     service: CategoryService = Depends(get_category_service),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthContext = Depends(get_current_user),
 ) -> CategoryOut:
-    logger.info(f"updating category with id {category_id}")
+    logger.info("updating category with id %s", category_id)
     try:
         category = await service.update(entity_id=category_id, update_schema=updated_category, updated_by=current_user)
         return category
@@ -153,9 +165,9 @@ async def update_category(
 async def delete_category(
     category_id: int,
     service: CategoryService = Depends(get_category_service),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthContext = Depends(get_current_user),
 ) -> CategoryOut:
-    logger.info(f"deleting category with id {category_id}")
+    logger.info("deleting category with id %s", category_id)
     try:
         category = await service.delete(entity_id=category_id, deleted_by=current_user)
         return category
@@ -3,13 +3,27 @@ from typing import Annotated
 from fastapi import APIRouter, HTTPException, Depends, Query
 
 from app.common.enums import Tag
-from app.common.exceptions import EntityNotFoundException, ActionForbiddenException, EntityNotAssociatedException
+from app.common.exceptions import (
+    EntityNotFoundException,
+    ActionForbiddenException,
+    EntityNotAssociatedException,
+    InvalidCursorException,
+)
 from app.common.responses import common_responses_dict
 from app.core.logger import get_logger
-from app.db_models import User
-from app.schemas import GoalCreate, GoalUpdate, GoalOut, GoalFilters, ErrorResponse
+from app.schemas import (
+    GoalCreate,
+    GoalUpdate,
+    GoalOut,
+    GoalProgressOut,
+    GoalFilters,
+    ErrorResponse,
+    AuthContext,
+    Page,
+)
 from app.services import GoalService, get_goal_service
 from app.services.security import get_current_user
+from app.utils.serialization_utils import SerializedJSONResponse
 
 
 logger = get_logger(__name__)
@@ -17,6 +31,34 @@ logger = get_logger(__name__)
 router = APIRouter(prefix="/goals", tags=[Tag.goal])
 
 
+@router.get(
+    "/progress",
+    response_model=Page[GoalProgressOut],
+    status_code=200,
+    description="get a page of goals with their current value, percentage and remaining value, with optional filters",
+    responses={
+        **common_responses_dict,
+        422: {
+            "description": "invalid cursor",
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": {"detail": "invalid cursor abc"}}},
+        },
+    },
+)
+async def get_goals_progress(
+    filters: Annotated[GoalFilters, Query()],
+    service: GoalService = Depends(get_goal_service),
+    current_user: AuthContext = Depends(get_current_user),
+) -> SerializedJSONResponse:
+    logger.info("fetching progress of all goals with filters %s", filters)
+    try:
+        goals, next_cursor = await service.get_progress_page_with_filters(filters=filters, gotten_by=current_user)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    logger.info("returned progress of %s goals", len(goals))
+    return SerializedJSONResponse({"items": goals, "next_cursor": next_cursor}, annotation=Page[GoalProgressOut])
+
+
 @router.get(
     "/{goal_id}",
     response_model=GoalOut,
@@ -39,12 +81,12 @@ router = APIRouter(prefix="/goals", tags=[Tag.goal])
 async def get_goal(
     goal_id: int,
     service: GoalService = Depends(get_goal_service),
-    current_user: User = Depends(get_current_user),
-) -> GoalOut:
-    logger.info(f"fetching goal with id {goal_id}")
+    current_user: AuthContext = Depends(get_current_user),
+) -> SerializedJSONResponse:
+    logger.info("fetching goal with id %s", goal_id)
     try:
-        goal = await service.get_by_id(entity_id=goal_id, gotten_by=current_user)
-        return goal
+        goal = await service.get_by_id(entity_id=goal_id, gotten_by=current_user, as_rows=True)
+        return SerializedJSONResponse(goal, annotation=GoalOut)
     except ActionForbiddenException as e:
         raise HTTPException(status_code=403, detail=str(e))
     except EntityNotFoundException as e:
@@ -53,20 +95,30 @@ async def get_goal(
 
 @router.get(
     "",
-    response_model=list[GoalOut],
+    response_model=Page[GoalOut],
     status_code=200,
-    description="get all goals with optional filters",
-    responses=common_responses_dict,
+    description="get a page of goals with optional filters, pass next_cursor as cursor to get the next page",
+    responses={
+        **common_responses_dict,
+        422: {
+            "description": "invalid cursor",
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": {"detail": "invalid cursor abc"}}},
+        },
+    },
 )
 async def get_goals(
     filters: Annotated[GoalFilters, Query()],
     service: GoalService = Depends(get_goal_service),
-    current_user: User = Depends(get_current_user),
-) -> list[GoalOut]:
-    logger.info(f"fetching all goals with filters {filters}")
-    goals = await service.get_all_with_filters(filters=filters, gotten_by=current_user)
-    logger.info(f"returned {len(goals)} goals")
-    return goals
+    current_user: AuthContext = Depends(get_current_user),
+) -> SerializedJSONResponse:
+    logger.info("fetching all goals with filters %s", filters)
+    try:
+        goals, next_cursor = await service.get_page_with_filters(filters=filters, gotten_by=current_user, as_rows=True)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    logger.info("returned %s goals", len(goals))
+    return SerializedJSONResponse({"items": goals, "next_cursor": next_cursor}, annotation=Page[GoalOut])
 
 
 @router.post(
@@ -100,7 +152,7 @@ async def get_goals(
 async def create_goal(
     new_goal: GoalCreate,
     service: GoalService = Depends(get_goal_service),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthContext = Depends(get_current_user),
 ) -> GoalOut:
     logger.info("creating a new goal")
     try:
@@ -146,9 +198,9 @@ async def update_goal(
     goal_id: int,
     updated_goal: GoalUpdate,
     service: GoalService = Depends(get_goal_service),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthContext = Depends(get_current_user),
 ) -> GoalOut:
-    logger.info(f"updating goal with id {goal_id}")
+    logger.info("updating goal with id %s", goal_id)
     try:
         goal = await service.update(entity_id=goal_id, update_schema=updated_goal, updated_by=current_user)
         return goal
@@ -182,9 +234,9 @@ async def update_goal(
 async def delete_goal(
     goal_id: int,
     service: GoalService = Depends(get_goal_service),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthContext = Depends(get_current_user),
 ) -> GoalOut:
-    logger.info(f"deleting goal with id {goal_id}")
+    logger.info("deleting goal with id %s", goal_id)
     try:
         goal = await service.delete(entity_id=goal_id, deleted_by=current_user)
         return goal
@@ -31,7 +31,7 @@ router = APIRouter(prefix="/roles", tags=[Tag.role], dependencies=[Depends(get_c
     },
 )
 async def get_role(role_id: int, service: RoleService = Depends(get_role_service)) -> RoleOut:
-    logger.info(f"fetching role with id {role_id}")
+    logger.info("fetching role with id %s", role_id)
     try:
         role = await service.get_by_id(entity_id=role_id)
         return role
@@ -49,7 +49,7 @@ async def get_role(role_id: int, service: RoleService = Depends(get_role_service
 async def get_roles(
     filters: Annotated[RoleFilters, Query()], service: RoleService = Depends(get_role_service)
 ) -> list[RoleOut]:
-    logger.info(f"fetching all roles with filters {filters}")
+    logger.info("fetching all roles with filters %s", filters)
     roles = await service.get_all_with_filters(filters=filters)
-    logger.info(f"returned {len(roles)} roles")
+    logger.info("returned %s roles", len(roles))
     return roles
@@ -9,7 +9,13 @@ from app.common.responses import common_responses_dict
 from app.core.config import get_settings
 from app.schemas import Token
 from app.services import UserService, get_user_service
-from app.services.security import authenticate_user, create_access_token, create_refresh_token, verify_refresh_token
+from app.services.security import (
+    authenticate_user,
+    create_access_token,
+    create_refresh_token,
+    get_access_token_data,
+    verify_refresh_token,
+)
 
 settings = get_settings()
 router = APIRouter(prefix="/token", tags=[Tag.security])
@@ -28,7 +34,9 @@ async def login(
         )
 
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(data={"sub": user_db.email}, expires_delta=access_token_expires)
+    access_token = create_access_token(
+        data=await get_access_token_data(user=user_db, user_service=user_service), expires_delta=access_token_expires
+    )
 
     refresh_token_expires = timedelta(hours=settings.refresh_token_expire_hours)
     refresh_token = create_refresh_token(data={"sub": user_db.email}, expires_delta=refresh_token_expires)
@@ -56,14 +64,25 @@ async def login(
 
 
 @router.post("/refresh", responses=common_responses_dict)
-async def refresh_token(refresh_token: str = Cookie(None), response: Response = None):
+async def refresh_token(
+    refresh_token: str = Cookie(None),
+    user_service: UserService = Depends(get_user_service),
+    response: Response = None,
+):
     payload = verify_refresh_token(refresh_token)
     email: str = payload.get("sub")
     if email is None:
         raise HTTPException(status_code=401, detail="invalid refresh token", headers={"WWW-Authenticate": "Bearer"})
 
+    # reload the user, so the new access token carries up to date claims
+    user_db = await user_service.get_by_email(email=email)
+    if user_db is None:
+        raise HTTPException(status_code=401, detail="invalid refresh token", headers={"WWW-Authenticate": "Bearer"})
+
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
-    access_token = create_access_token(data={"sub": email}, expires_delta=access_token_expires)
+    access_token = create_access_token(
+        data=await get_access_token_data(user=user_db, user_service=user_service), expires_delta=access_token_expires
+    )
 
     response.set_cookie(
         key="access_token",
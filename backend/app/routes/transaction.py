@@ -1,23 +1,46 @@
 from typing import Annotated
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 
-from app.common.enums import Tag
-from app.common.exceptions import EntityNotFoundException, ActionForbiddenException, EntityNotAssociatedException
+from app.common.enums import Tag, ExportFormat, ImportFormat
+from app.common.exceptions import (
+    EntityNotFoundException,
+    ActionForbiddenException,
+    EntityNotAssociatedException,
+    InvalidCursorException,
+    BulkValidationException,
+    ImportRecordTooLargeException,
+)
 from app.common.responses import common_responses_dict
+from app.core.config import get_settings
 from app.core.logger import get_logger
-from app.db_models import User
 from app.schemas import (
     TransactionCreate,
     TransactionUpdate,
     TransactionOut,
+    TransactionBulkCreate,
+    TransactionBulkUpsert,
+    TransactionBulkOut,
+    TransactionImportOut,
     TransactionTotalOut,
     TransactionFilters,
+    TransactionBulkFilters,
+    TransactionBulkPatch,
+    TransactionAffectedOut,
+    TransactionAggregateFilters,
+    TransactionAggregateOut,
     ErrorResponse,
+    AuthContext,
+    Page,
 )
 from app.services import TransactionService, get_transaction_service
 from app.services.security import get_current_user
+from app.utils.export_utils import EXPORT_MEDIA_TYPES, serialize_chunks
+from app.utils.serialization_utils import SerializedJSONResponse
+
 
+settings = get_settings()
 
 logger = get_logger(__name__)
 
@@ -34,14 +57,64 @@ router = APIRouter(prefix="/transactions", tags=[Tag.transaction])
 async def get_transactions_total(
     filters: Annotated[TransactionFilters, Query()],
     service: TransactionService = Depends(get_transaction_service),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthContext = Depends(get_current_user),
 ) -> TransactionTotalOut:
-    logger.info(f"fetching total value of transactions with filters {filters}")
+    logger.info("fetching total value of transactions with filters %s", filters)
     total = await service.get_total_with_filters(filters=filters, gotten_by=current_user)
-    logger.info(f"total value of transactions is {total}")
+    logger.info("total value of transactions is %s", total)
     return TransactionTotalOut(total=total)
 
 
+@router.get(
+    "/aggregate",
+    response_model=list[TransactionAggregateOut],
+    response_model_exclude_unset=True,
+    status_code=200,
+    description="get sum, count, avg, min or max of transaction values with optional filters, grouped by "
+    "type_id, category_id and one of month, week, day",
+    responses=common_responses_dict,
+)
+async def get_transactions_aggregate(
+    filters: Annotated[TransactionAggregateFilters, Query()],
+    service: TransactionService = Depends(get_transaction_service),
+    current_user: AuthContext = Depends(get_current_user),
+) -> list[TransactionAggregateOut]:
+    logger.info("fetching aggregate of transactions with filters %s", filters)
+    groups = await service.get_aggregate_with_filters(filters=filters, gotten_by=current_user)
+    logger.info("returned %s transaction groups", len(groups))
+    return groups
+
+
+@router.get(
+    "/export/{export_format}",
+    response_class=StreamingResponse,
+    status_code=200,
+    description="stream all transactions with optional filters as NDJSON or CSV, pagination params are ignored",
+    responses={
+        **common_responses_dict,
+        200: {
+            "description": "transactions in requested format",
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+        },
+    },
+)
+async def export_transactions(
+    export_format: ExportFormat,
+    filters: Annotated[TransactionFilters, Query()],
+    service: TransactionService = Depends(get_transaction_service),
+    current_user: AuthContext = Depends(get_current_user),
+) -> StreamingResponse:
+    logger.info("exporting transactions as %s with filters %s", export_format.value, filters)
+    chunks = service.stream_all_with_filters(
+        filters=filters, gotten_by=current_user, chunk_size=settings.export_chunk_size, as_rows=True
+    )
+    return StreamingResponse(
+        serialize_chunks(chunks, schema=TransactionOut, export_format=export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{export_format.value}"'},
+    )
+
+
 @router.get(
     "/{transaction_id}",
     response_model=TransactionOut,
@@ -64,12 +137,12 @@ async def get_transactions_total(
 async def get_transaction(
     transaction_id: int,
     service: TransactionService = Depends(get_transaction_service),
-    current_user: User = Depends(get_current_user),
-) -> TransactionOut:
-    logger.info(f"fetching transaction with id {transaction_id}")
+    current_user: AuthContext = Depends(get_current_user),
+) -> SerializedJSONResponse:
+    logger.info("fetching transaction with id %s", transaction_id)
     try:
-        transaction = await service.get_by_id(entity_id=transaction_id, gotten_by=current_user)
-        return transaction
+        transaction = await service.get_by_id(entity_id=transaction_id, gotten_by=current_user, as_rows=True)
+        return SerializedJSONResponse(transaction, annotation=TransactionOut)
     except ActionForbiddenException as e:
         raise HTTPException(status_code=403, detail=str(e))
     except EntityNotFoundException as e:
@@ -78,20 +151,33 @@ async def get_transaction(
 
 @router.get(
     "",
-    response_model=list[TransactionOut],
+    response_model=Page[TransactionOut],
     status_code=200,
-    description="get all transactions with optional filters",
-    responses=common_responses_dict,
+    description="get a page of transactions with optional filters, pass next_cursor as cursor to get the next page",
+    responses={
+        **common_responses_dict,
+        422: {
+            "description": "invalid cursor",
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": {"detail": "invalid cursor abc"}}},
+        },
+    },
 )
 async def get_transactions(
     filters: Annotated[TransactionFilters, Query()],
     service: TransactionService = Depends(get_transaction_service),
-    current_user: User = Depends(get_current_user),
-) -> list[TransactionOut]:
-    logger.info(f"fetching all transactions with filters {filters}")
-    transactions = await service.get_all_with_filters(filters=filters, gotten_by=current_user)
-    logger.info(f"returned {len(transactions)} transactions")
-    return transactions
+    current_user: AuthContext = Depends(get_current_user),
+) -> SerializedJSONResponse:
+    logger.info("fetching all transactions with filters %s", filters)
+    try:
+        transactions, next_cursor = await service.get_page_with_filters(
+            filters=filters, gotten_by=current_user, as_rows=True
+        )
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    logger.info("returned %s transactions", len(transactions))
+    # pages can hold thousands of transactions, serialized from rows in one pass instead of through the response model
+    return SerializedJSONResponse({"items": transactions, "next_cursor": next_cursor}, annotation=Page[TransactionOut])
 
 
 @router.post(
@@ -125,7 +211,7 @@ async def get_transactions(
 async def create_transaction(
     new_transaction: TransactionCreate,
     service: TransactionService = Depends(get_transaction_service),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthContext = Depends(get_current_user),
 ) -> TransactionOut:
     logger.info("creating a new transaction")
     try:
@@ -141,6 +227,185 @@ async def create_transaction(
         raise HTTPException(status_code=409, detail=str(e))
 
 
+@router.post(
+    "/bulk",
+    response_model=TransactionBulkOut,
+    status_code=201,
+    description="create many transactions at once, all or nothing unless atomic is false, in which case valid items "
+    "are created and invalid ones reported by their index",
+    responses={
+        **common_responses_dict,
+        422: {
+            "description": "invalid items in an atomic batch",
+            "content": {
+                "application/json": {"example": {"detail": [{"index": 3, "detail": "type with id 100 not found"}]}}
+            },
+        },
+        413: {"description": "record longer than the maximum import record size"},
+    },
+)
+async def create_transactions_bulk(
+    new_transactions: TransactionBulkCreate,
+    service: TransactionService = Depends(get_transaction_service),
+    current_user: AuthContext = Depends(get_current_user),
+) -> TransactionBulkOut:
+    logger.info("creating %s transactions", len(new_transactions.items))
+    try:
+        transactions, errors = await service.create_bulk(
+            create_schemas=new_transactions.items, created_by=current_user, atomic=new_transactions.atomic
+        )
+    except BulkValidationException as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    logger.info("created %s transactions, %s invalid", len(transactions), len(errors))
+    return {"items": transactions, "errors": errors}
+
+
+@router.put(
+    "/bulk",
+    response_model=TransactionBulkOut,
+    status_code=200,
+    description="create or update many transactions at once by their external ids, a transaction with the same "
+    "external id and date is updated, all or nothing unless atomic is false, in which case valid items are upserted "
+    "and invalid ones reported by their index",
+    responses={
+        **common_responses_dict,
+        422: {
+            "description": "invalid items in an atomic batch",
+            "content": {
+                "application/json": {"example": {"detail": [{"index": 3, "detail": "type with id 100 not found"}]}}
+            },
+        },
+        413: {"description": "record longer than the maximum import record size"},
+    },
+)
+async def upsert_transactions_bulk(
+    upserted_transactions: TransactionBulkUpsert,
+    service: TransactionService = Depends(get_transaction_service),
+    current_user: AuthContext = Depends(get_current_user),
+) -> TransactionBulkOut:
+    logger.info("upserting %s transactions", len(upserted_transactions.items))
+    try:
+        transactions, errors = await service.upsert_bulk(
+            upsert_schemas=upserted_transactions.items, created_by=current_user, atomic=upserted_transactions.atomic
+        )
+    except BulkValidationException as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    logger.info("upserted %s transactions, %s invalid", len(transactions), len(errors))
+    return {"items": transactions, "errors": errors}
+
+
+@router.post(
+    "/import/{import_format}",
+    response_model=TransactionImportOut,
+    status_code=201,
+    description="import transactions from a CSV or OFX bank statement sent as the request body, read as it arrives, "
+    "all or nothing unless atomic is false, in which case valid records are created and invalid ones reported",
+    responses={
+        **common_responses_dict,
+        422: {
+            "description": "invalid records in an atomic import",
+            "content": {
+                "application/json": {"example": {"detail": [{"index": 3, "detail": "type with id 100 not found"}]}}
+            },
+        },
+        413: {"description": "record longer than the maximum import record size"},
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/csv": {"schema": {"type": "string"}},
+                "application/x-ofx": {"schema": {"type": "string"}},
+            },
+        }
+    },
+)
+async def import_transactions(
+    import_format: ImportFormat,
+    request: Request,
+    atomic: bool = True,
+    service: TransactionService = Depends(get_transaction_service),
+    current_user: AuthContext = Depends(get_current_user),
+) -> TransactionImportOut:
+    logger.info("importing transactions from %s", import_format.value)
+    try:
+        created, invalid, errors = await service.import_records(
+            chunks=request.stream(), import_format=import_format, created_by=current_user, atomic=atomic
+        )
+    except BulkValidationException as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    except ImportRecordTooLargeException as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    logger.info("imported %s transactions, %s invalid", created, invalid)
+    return {"created": created, "invalid": invalid, "errors": errors}
+
+
+@router.patch(
+    "",
+    response_model=TransactionAffectedOut,
+    status_code=200,
+    description="change the given fields of all transactions matching filters, or every one with all set",
+    responses={
+        **common_responses_dict,
+        403: {
+            "description": "action forbidden",
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": {"detail": "users can only view their own categories"}}},
+        },
+        404: {
+            "description": "type or category not found",
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": {"detail": "category with id 100 not found"}}},
+        },
+        409: {
+            "description": "entity not associated",
+            "model": ErrorResponse,
+            "content": {
+                "application/json": {
+                    "example": {"detail": "entity not associated: category with id 10 is not of type with id 2"}
+                }
+            },
+        },
+    },
+)
+async def update_transactions(
+    bulk_patch: TransactionBulkPatch,
+    service: TransactionService = Depends(get_transaction_service),
+    current_user: AuthContext = Depends(get_current_user),
+) -> TransactionAffectedOut:
+    logger.info("updating transactions with filters %s", bulk_patch.filters)
+    try:
+        count = await service.update_with_filters(
+            filters=bulk_patch.filters, patch_schema=bulk_patch.changes, updated_by=current_user
+        )
+    except ActionForbiddenException as e:
+        raise HTTPException(status_code=403, detail=str(e))
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except EntityNotAssociatedException as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    logger.info("updated %s transactions", count)
+    return TransactionAffectedOut(count=count)
+
+
+@router.delete(
+    "",
+    response_model=TransactionAffectedOut,
+    status_code=200,
+    description="delete all transactions matching filters, or every one with all set, pagination params are ignored",
+    responses=common_responses_dict,
+)
+async def delete_transactions(
+    filters: TransactionBulkFilters,
+    service: TransactionService = Depends(get_transaction_service),
+    current_user: AuthContext = Depends(get_current_user),
+) -> TransactionAffectedOut:
+    logger.info("deleting transactions with filters %s", filters)
+    count = await service.delete_with_filters(filters=filters, deleted_by=current_user)
+    logger.info("deleted %s transactions", count)
+    return TransactionAffectedOut(count=count)
+
+
 @router.put(
     "/{transaction_id}",
     response_model=TransactionOut,
@@ -173,9 +438,9 @@ async def update_transaction(
     transaction_id: int,
     updated_transaction: TransactionUpdate,
     service: TransactionService = Depends(get_transaction_service),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthContext = Depends(get_current_user),
 ) -> TransactionOut:
-    logger.info(f"updating transaction with id {transaction_id}")
+    logger.info("updating transaction with id %s", transaction_id)
     try:
         transaction = await service.update(
             entity_id=transaction_id, update_schema=updated_transaction, updated_by=current_user
@@ -211,9 +476,9 @@ async def update_transaction(
 async def delete_transaction(
     transaction_id: int,
     service: TransactionService = Depends(get_transaction_service),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthContext = Depends(get_current_user),
 ) -> TransactionOut:
-    logger.info(f"deleting transaction with id {transaction_id}")
+    logger.info("deleting transaction with id %s", transaction_id)
     try:
         transaction = await service.delete(entity_id=transaction_id, deleted_by=current_user)
         return transaction
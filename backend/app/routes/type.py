@@ -31,7 +31,7 @@ router = APIRouter(prefix="/types", tags=[Tag.type], dependencies=[Depends(get_c
     },
 )
 async def get_type(type_id: int, service: TypeService = Depends(get_type_service)) -> TypeOut:
-    logger.info(f"fetching type with id {type_id}")
+    logger.info("fetching type with id %s", type_id)
     try:
         type = await service.get_by_id(entity_id=type_id)
         return type
@@ -49,7 +49,7 @@ async def get_type(type_id: int, service: TypeService = Depends(get_type_service
 async def get_types(
     filters: Annotated[TypeFilters, Query()], service: TypeService = Depends(get_type_service)
 ) -> list[TypeOut]:
-    logger.info(f"fetching all types with filters {filters}")
+    logger.info("fetching all types with filters %s", filters)
     types = await service.get_all_with_filters(filters=filters)
-    logger.info(f"returned {len(types)} types")
+    logger.info("returned %s types", len(types))
     return types
@@ -3,14 +3,19 @@ from typing import Annotated
 from fastapi import APIRouter, HTTPException, Depends, Query
 
 from app.common.enums import Tag, RoleName
-from app.common.exceptions import EntityNotFoundException, UserEmailAlreadyExistsException, ActionForbiddenException
+from app.common.exceptions import (
+    EntityNotFoundException,
+    UserEmailAlreadyExistsException,
+    ActionForbiddenException,
+    InvalidCursorException,
+)
 from app.common.responses import common_responses_dict
 from app.core.logger import get_logger
-from app.db_models import User
-from app.schemas import UserCreate, UserUpdate, UserOut, UserFilters, ErrorResponse
+from app.schemas import UserCreate, UserUpdate, UserOut, UserFilters, ErrorResponse, AuthContext, Page
 from app.services import UserService, get_user_service
 from app.services.security import get_current_user, get_current_admin
-from app.utils.password_utils import get_password_hash
+from app.utils.password_utils import get_password_hash_async
+from app.utils.serialization_utils import SerializedJSONResponse
 
 
 logger = get_logger(__name__)
@@ -25,7 +30,7 @@ router = APIRouter(prefix="/users", tags=[Tag.user])
     description="get information about the current user",
     responses=common_responses_dict,
 )
-async def get_user_me(current_user: User = Depends(get_current_user)):
+async def get_user_me(current_user: AuthContext = Depends(get_current_user)):
     return current_user
 
 
@@ -44,21 +49,23 @@ async def get_user_me(current_user: User = Depends(get_current_user)):
     },
 )
 async def get_user(
-    user_id: int, service: UserService = Depends(get_user_service), current_admin: User = Depends(get_current_admin)
-) -> UserOut:
-    logger.info(f"fetching user with id {user_id}")
+    user_id: int,
+    service: UserService = Depends(get_user_service),
+    current_admin: AuthContext = Depends(get_current_admin),
+) -> SerializedJSONResponse:
+    logger.info("fetching user with id %s", user_id)
     try:
-        user = await service.get_by_id(entity_id=user_id)
-        return user
+        user = await service.get_by_id(entity_id=user_id, as_rows=True)
+        return SerializedJSONResponse(user, annotation=UserOut)
     except EntityNotFoundException as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.get(
     "",
-    response_model=list[UserOut],
+    response_model=Page[UserOut],
     status_code=200,
-    description="get all users with optional filters",
+    description="get a page of users with optional filters, pass next_cursor as cursor to get the next page",
     responses={
         **common_responses_dict,
         403: {
@@ -66,17 +73,25 @@ async def get_user(
             "model": ErrorResponse,
             "content": {"application/json": {"example": {"detail": "users is not an admin"}}},
         },
+        422: {
+            "description": "invalid cursor",
+            "model": ErrorResponse,
+            "content": {"application/json": {"example": {"detail": "invalid cursor abc"}}},
+        },
     },
 )
 async def get_users(
     filters: Annotated[UserFilters, Query()],
     service: UserService = Depends(get_user_service),
-    current_admin: User = Depends(get_current_admin),
-) -> list[UserOut]:
-    logger.info(f"fetching all users with filters {filters}")
-    users = await service.get_all_with_filters(filters=filters)
-    logger.info(f"returned {len(users)} users")
-    return users
+    current_admin: AuthContext = Depends(get_current_admin),
+) -> SerializedJSONResponse:
+    logger.info("fetching all users with filters %s", filters)
+    try:
+        users, next_cursor = await service.get_page_with_filters(filters=filters, as_rows=True)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    logger.info("returned %s users", len(users))
+    return SerializedJSONResponse({"items": users, "next_cursor": next_cursor}, annotation=Page[UserOut])
 
 
 @router.post(
@@ -100,7 +115,7 @@ async def create_user(new_user: UserCreate, service: UserService = Depends(get_u
         user_role = await service.role_service.get_by_name(role_name=RoleName.user)
         # create new user with base user role
         user = await service.create(
-            create_schema=new_user, password_hash=get_password_hash(new_user.password), role_id=user_role.id
+            create_schema=new_user, password_hash=await get_password_hash_async(new_user.password), role_id=user_role.id
         )
         return user
     except UserEmailAlreadyExistsException as e:
@@ -135,14 +150,14 @@ async def update_user(
     user_id: int,
     updated_user: UserUpdate,
     service: UserService = Depends(get_user_service),
-    current_user: User = Depends(get_current_user),
+    current_user: AuthContext = Depends(get_current_user),
 ) -> UserOut:
-    logger.info(f"updating a user with id {user_id}")
+    logger.info("updating a user with id %s", user_id)
     try:
         user = await service.update(
             entity_id=user_id,
             update_schema=updated_user,
-            password_hash=get_password_hash(updated_user.new_password),
+            password_hash=await get_password_hash_async(updated_user.new_password),
             updated_by=current_user,
         )
         return user
@@ -174,9 +189,11 @@ async def update_user(
     },
 )
 async def delete_user(
-    user_id: int, service: UserService = Depends(get_user_service), current_user: User = Depends(get_current_user)
+    user_id: int,
+    service: UserService = Depends(get_user_service),
+    current_user: AuthContext = Depends(get_current_user),
 ) -> UserOut:
-    logger.info(f"deleting a user with id {user_id}")
+    logger.info("deleting a user with id %s", user_id)
     try:
         user = await service.delete(entity_id=user_id, deleted_by=current_user)
         return user
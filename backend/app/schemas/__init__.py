@@ -1,14 +1,27 @@
 from app.schemas.category import CategoryCreate, CategoryUpdate, CategoryOut, CategoryFilters
 from app.schemas.error_response import ErrorResponse
-from app.schemas.goal import GoalCreate, GoalUpdate, GoalOut, GoalFilters
+from app.schemas.goal import GoalCreate, GoalUpdate, GoalOut, GoalProgressOut, GoalFilters
+from app.schemas.pagination import PaginationParams, Page
 from app.schemas.role import RoleCreate, RoleUpdate, RoleOut, RoleFilters
-from app.schemas.security import Token, TokenData
+from app.schemas.security import Token, TokenData, AuthContext
 from app.schemas.transaction import (
     TransactionCreate,
     TransactionUpdate,
+    TransactionPatch,
+    TransactionUpsert,
     TransactionOut,
+    TransactionBulkCreate,
+    TransactionBulkUpsert,
+    TransactionBulkError,
+    TransactionBulkOut,
+    TransactionImportOut,
     TransactionTotalOut,
     TransactionFilters,
+    TransactionBulkFilters,
+    TransactionBulkPatch,
+    TransactionAffectedOut,
+    TransactionAggregateFilters,
+    TransactionAggregateOut,
 )
 from app.schemas.type import TypeCreate, TypeUpdate, TypeOut, TypeFilters
 from app.schemas.user import UserCreate, UserUpdate, UserInDB, UserOut, UserFilters
@@ -2,6 +2,8 @@ from typing import ClassVar
 
 from pydantic import BaseModel, Field, field_validator
 
+from app.schemas.pagination import PaginationParams
+
 
 class CategoryBase(BaseModel):
     name: str = Field(min_length=1, max_length=255)
@@ -30,7 +32,7 @@ class CategoryOut(CategoryBase):
     user_id: int
 
 
-class CategoryFilters(BaseModel):
+class CategoryFilters(PaginationParams):
     user_id: list[int] | None = None
     type_id: list[int] | None = None
     name: list[str] | None = None
@@ -3,6 +3,10 @@ from typing import ClassVar
 
 from pydantic import BaseModel, model_validator, Field, field_validator
 
+from app.common.enums import SearchMode
+from app.schemas.money import Money, MoneySum
+from app.schemas.pagination import PaginationParams
+
 
 class GoalBase(BaseModel):
     type_id: int
@@ -10,7 +14,7 @@ class GoalBase(BaseModel):
     name: str = Field(min_length=1, max_length=255)
     start_date: date
     end_date: date
-    target_value: float
+    target_value: Money
 
     @field_validator("name", mode="before")
     def validate_name(cls, v: str) -> str:
@@ -39,7 +43,14 @@ class GoalOut(GoalBase):
     user_id: int
 
 
-class GoalFilters(BaseModel):
+class GoalProgressOut(GoalOut):
+    # sum of the owner's transactions of the goal type and category within the goal dates
+    current_value: MoneySum
+    percentage: float | None = None
+    remaining: MoneySum
+
+
+class GoalFilters(PaginationParams):
     user_id: list[int] | None = None
     type_id: list[int] | None = None
     category_id: list[int] | None = None
@@ -48,8 +59,10 @@ class GoalFilters(BaseModel):
     start_date_lt: date | None = None
     end_date_gt: date | None = None
     end_date_lt: date | None = None
-    target_value_gt: float | None = None
-    target_value_lt: float | None = None
+    target_value_gt: Money | None = None
+    target_value_lt: Money | None = None
+    # ranked search returns a single page of the best keyword matches, which cannot be continued with a cursor
+    search_mode: SearchMode = SearchMode.substring
 
     list_filters: ClassVar[list[str]] = ["user_id", "type_id", "category_id"]
     gt_filters: ClassVar[list[str]] = ["start_date_gt", "end_date_gt", "target_value_gt"]
@@ -0,0 +1,22 @@
+from decimal import Decimal
+from typing import Annotated
+
+from pydantic import Field, PlainSerializer
+
+from app.utils.sql_utils import CURRENCY_EXPONENT
+
+
+_minor_unit = Decimal(1).scaleb(-CURRENCY_EXPONENT)
+
+# JSON numbers rather than the strings pydantic gives Decimals, floats print amounts of up to 15 digits exactly
+_as_json_number = PlainSerializer(float, return_type=float, when_used="json")
+
+# an amount of money, exact to the minor unit of the currency and within what BIGINT minor units and JSON numbers hold
+Money = Annotated[Decimal, Field(max_digits=15, decimal_places=CURRENCY_EXPONENT), _as_json_number]
+
+# sums of amounts, not bounded like a single amount, so JSON strings that keep every digit rather than numbers;
+# written with the decimal places of the currency, such as "0.00" for a sum of nothing
+_as_json_string = PlainSerializer(
+    lambda value: str(Decimal(value).quantize(_minor_unit)), return_type=str, when_used="json"
+)
+MoneySum = Annotated[Decimal, _as_json_string]
@@ -0,0 +1,20 @@
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, Field
+
+from app.core.config import get_settings
+
+
+settings = get_settings()
+
+ItemT = TypeVar("ItemT")
+
+
+class PaginationParams(BaseModel):
+    limit: int = Field(default=settings.default_page_size, ge=1, le=settings.max_page_size)
+    cursor: str | None = None
+
+
+class Page(BaseModel, Generic[ItemT]):
+    items: list[ItemT]
+    next_cursor: str | None = None
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 
+from app.common.enums import RoleName
+
 
 class Token(BaseModel):
     access_token: str
@@ -9,3 +11,16 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     username: str | None = None
+    user_id: int | None = None
+    role_id: int | None = None
+    role: RoleName | None = None
+    version: int | None = None
+
+
+class AuthContext(BaseModel):
+    id: int
+    email: str
+    role_id: int
+    is_admin: bool
+
+    model_config = {"frozen": True}
@@ -1,20 +1,26 @@
 import re
 from datetime import date
+from enum import Enum
 from typing import ClassVar
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
+from app.common.enums import AggregateGroupBy, AggregateMetric, SearchMode
 from app.core.config import get_settings
+from app.schemas.money import Money, MoneySum
+from app.schemas.pagination import PaginationParams
 
 
 settings = get_settings()
 
+PERIOD_GROUP_BYS = (AggregateGroupBy.month, AggregateGroupBy.week, AggregateGroupBy.day)
+
 
 class TransactionBase(BaseModel):
     type_id: int
     category_id: int | None = None
     date: date
-    value: float
+    value: Money
     comment: str | None = None
 
     @field_validator("comment", mode="before")
@@ -45,28 +51,164 @@ class TransactionUpdate(TransactionBase):
     model_config = {"extra": "forbid"}
 
 
+class TransactionPatch(BaseModel):
+    # only the fields that are set are changed, a null category_id removes the category
+    type_id: int | None = None
+    category_id: int | None = None
+    comment: str | None = None
+
+    model_config = {"extra": "forbid"}
+
+    @field_validator("comment", mode="before")
+    def validate_comment(cls, v: str | None) -> str | None:
+        return TransactionBase.validate_comment(v)
+
+    @model_validator(mode="after")
+    def check_changes(cls, model):
+        if not model.model_fields_set:
+            raise ValueError("at least one field must be changed")
+        if "type_id" in model.model_fields_set:
+            if model.type_id is None:
+                raise ValueError("type_id cannot be null")
+            # categories of the changed transactions must match the new type
+            if "category_id" not in model.model_fields_set:
+                raise ValueError("type_id can only be changed together with category_id")
+        return model
+
+
+class TransactionUpsert(TransactionCreate):
+    # the id the bank gave the transaction, a transaction with the same one and date is updated instead of created
+    external_id: str = Field(min_length=1, max_length=255)
+
+
 class TransactionOut(TransactionBase):
     id: int
     user_id: int
+    external_id: str | None = None
+
+
+class TransactionBulkCreate(BaseModel):
+    items: list[TransactionCreate] = Field(min_length=1, max_length=settings.max_bulk_size)
+    # all items are created or none, otherwise valid items are created and invalid ones reported
+    atomic: bool = True
+
+    model_config = {"extra": "forbid"}
+
+
+class TransactionBulkUpsert(BaseModel):
+    items: list[TransactionUpsert] = Field(min_length=1, max_length=settings.max_bulk_size)
+    # all items are upserted or none, otherwise valid items are upserted and invalid ones reported
+    atomic: bool = True
+
+    model_config = {"extra": "forbid"}
+
+
+class TransactionBulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class TransactionBulkOut(BaseModel):
+    items: list[TransactionOut]
+    errors: list[TransactionBulkError] = []
+
+
+class TransactionImportOut(BaseModel):
+    created: int
+    invalid: int
+    # only the first invalid records are reported, indexes count records of the file from 0, not lines
+    errors: list[TransactionBulkError] = []
 
 
 class TransactionTotalOut(BaseModel):
-    total: float
+    total: MoneySum
 
 
-class TransactionFilters(BaseModel):
+class TransactionFilters(PaginationParams):
     user_id: list[int] | None = None
     type_id: list[int] | None = None
     category_id: list[int] | None = None
     date_gt: date | None = None
     date_lt: date | None = None
-    value_gt: float | None = None
-    value_lt: float | None = None
+    value_gt: Money | None = None
+    value_lt: Money | None = None
     comment: list[str] | None = None
+    external_id: list[str] | None = None
+    # ranked search returns a single page of the best keyword matches, which cannot be continued with a cursor
+    search_mode: SearchMode = SearchMode.substring
 
-    list_filters: ClassVar[list[str]] = ["user_id", "type_id", "category_id"]
+    list_filters: ClassVar[list[str]] = ["user_id", "type_id", "category_id", "external_id"]
     gt_filters: ClassVar[list[str]] = ["date_gt", "value_gt"]
     lt_filters: ClassVar[list[str]] = ["date_lt", "value_lt"]
     kw_filters: ClassVar[list[str]] = ["comment"]
 
     model_config = {"extra": "forbid"}
+
+
+class TransactionBulkFilters(TransactionFilters):
+    # without any filter every transaction the caller can see is matched, which has to be asked for explicitly
+    all: bool = False
+
+    @model_validator(mode="after")
+    def check_filtered(cls, model):
+        unfiltering = {*PaginationParams.model_fields, "search_mode", "all"}
+        filtered = any(
+            getattr(model, name) not in (None, [])
+            for name in TransactionFilters.model_fields
+            if name not in unfiltering
+        )
+        if not filtered and not model.all:
+            raise ValueError("at least one filter is required, or all set to true to match every transaction")
+        return model
+
+
+class TransactionBulkPatch(BaseModel):
+    # pagination params of the filters are ignored, all matching transactions are changed
+    filters: TransactionBulkFilters
+    changes: TransactionPatch
+
+    model_config = {"extra": "forbid"}
+
+
+class TransactionAffectedOut(BaseModel):
+    count: int
+
+
+class TransactionAggregateFilters(TransactionFilters):
+    group_by: list[AggregateGroupBy] = []
+    metrics: list[AggregateMetric] = [AggregateMetric.sum]
+
+    @field_validator("group_by", "metrics", mode="before")
+    def split_comma_separated(cls, v: str | list[str]) -> list[str]:
+        # accept both repeated query params and comma separated values
+        values = v.split(",") if isinstance(v, str) else v
+        return [
+            value.strip()
+            for item in values
+            for value in (item.value if isinstance(item, Enum) else str(item)).split(",")
+            if value.strip()
+        ]
+
+    @model_validator(mode="after")
+    def check_group_by(cls, model):
+        periods = [group for group in model.group_by if group in PERIOD_GROUP_BYS]
+        if len(periods) > 1:
+            raise ValueError("group_by can contain at most one of month, week, day")
+        if len(set(model.group_by)) != len(model.group_by):
+            raise ValueError("group_by contains duplicates")
+        if not model.metrics:
+            raise ValueError("at least one metric is required")
+        return model
+
+
+class TransactionAggregateOut(BaseModel):
+    # only the requested group columns and metrics are returned
+    type_id: int | None = None
+    category_id: int | None = None
+    period: date | None = None
+    sum: MoneySum | None = None
+    count: int | None = None
+    # averages are not whole minor units
+    avg: float | None = None
+    min: Money | None = None
+    max: Money | None = None
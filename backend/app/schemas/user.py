@@ -2,6 +2,8 @@ from typing import ClassVar
 
 from pydantic import BaseModel, Field, EmailStr, field_validator
 
+from app.schemas.pagination import PaginationParams
+
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -36,7 +38,7 @@ class UserOut(UserBase):
     id: int
 
 
-class UserFilters(BaseModel):
+class UserFilters(PaginationParams):
     role_id: list[int] | None = None
     email: list[EmailStr] | None = None
 
@@ -1,13 +1,20 @@
-from typing import Generic, TypeVar, Any
+import operator
+from functools import reduce
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generic, Iterable, Mapping, Sequence, TypeVar
 
 from pydantic import BaseModel
-from sqlalchemy import select, or_
+from sqlalchemy import ColumnElement, Delete, Row, Select, Update, delete, exists, literal, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.common.enums import EntityType
-from app.common.exceptions import EntityNotFoundException
+from app.common.enums import EntityType, FilterOperator, SearchMode
+from app.common.exceptions import ActionForbiddenException, EntityNotFoundException
 from app.core.logger import get_logger
-from app.utils.sanitization_utils import escape_like
+from app.schemas import AuthContext
+from app.utils.cache_utils import ReferenceCache
+from app.utils.filter_utils import FILTER_CONDITIONS, KEYWORD_OPERATORS, get_active_filters
+from app.utils.pagination_utils import decode_cursor, encode_cursor
+from app.utils.sql_utils import text_rank
 
 
 DatabaseModelT = TypeVar("DatabaseModelT")
@@ -20,81 +27,337 @@ logger = get_logger(__name__)
 
 
 class BaseService(Generic[DatabaseModelT, CreateSchemaT, UpdateSchemaT, FilterSchemaT]):
+    # columns lists are ordered by, the last one must be unique so that pagination cursors are stable
+    sort_columns: tuple[str, ...] = ("id",)
+    # whether _sync_derived_data needs previous column values, which update_returning then reads before its UPDATE
+    has_derived_data: bool = False
+    # output schema of the entity, its fields are the columns selected by reads as rows
+    out_schema_class: type[BaseModel] | None = None
+
     def __init__(self, session: AsyncSession, db_model_class: type[DatabaseModelT], entity_type: EntityType) -> None:
         self.session = session
         self.db_model_class = db_model_class
         self.entity_type = entity_type
 
-    async def get_by_id(self, entity_id: int, **kwargs) -> DatabaseModelT:
+    async def get_by_id(
+        self, entity_id: int, owner_id: int | None = None, forbidden_detail: str = "", as_rows: bool = False, **kwargs
+    ) -> DatabaseModelT | Row:
         """
         Get entity by its id.
 
         Args:
             entity_id (int): The id of the entity to retrieve.
+            owner_id (int | None): If provided, only the entity owned by the user with this id is returned.
+            forbidden_detail (str): Detail of the exception raised when the entity belongs to another user.
+            as_rows (bool): If True, the output columns are returned as a row instead of the entity, for read-only
+                output.
             kwargs: Additional arguments for getting the entity.
 
         Returns:
-            DatabaseModelT: The database model instance.
+            DatabaseModelT | Row: The database model instance.
 
         Raises:
             EntityNotFoundException: If the entity with the given id does not exist.
+            ActionForbiddenException: If owner_id is provided and the entity belongs to another user.
         """
-        logger.info(f"executing query to fetch {self.entity_type.value} with id {entity_id}")
+        logger.info("executing query to fetch %s with id %s", self.entity_type.value, entity_id)
 
-        query = await self.session.execute(select(self.db_model_class).where(self.db_model_class.id == entity_id))
-        entity = query.scalar_one_or_none()
+        # ownership is checked by the database, so the common case is a single statement
+        statement = self._where_id(select(*self._get_selected(as_rows)), entity_id=entity_id, owner_id=owner_id)
+
+        query = await self.session.execute(statement)
+        entity = query.one_or_none() if as_rows else query.scalar_one_or_none()
 
         if not entity:
-            logger.error(f"{self.entity_type.value} with id {entity_id} not found")
-            raise EntityNotFoundException(entity_id=entity_id, entity_type=self.entity_type)
+            await self._raise_missing(entity_id=entity_id, owner_id=owner_id, forbidden_detail=forbidden_detail)
 
         return entity
 
-    async def get_all_with_filters(self, filters: FilterSchemaT = None, **kwargs) -> list[DatabaseModelT]:
+    async def get_by_ids(self, entity_ids: Iterable[int]) -> dict[int, DatabaseModelT]:
+        """
+        Get entities by their ids in a single query.
+
+        Args:
+            entity_ids (Iterable[int]): The ids of the entities to retrieve, duplicates are allowed.
+
+        Returns:
+            dict[int, DatabaseModelT]: Entities keyed by id, ids of entities that do not exist are left out.
+        """
+        entity_ids = set(entity_ids)
+        if not entity_ids:
+            return {}
+
+        logger.info("executing query to fetch %s %s by ids", len(entity_ids), self.entity_type.value)
+
+        query = await self.session.execute(select(self.db_model_class).where(self.db_model_class.id.in_(entity_ids)))
+        return {entity.id: entity for entity in query.scalars().all()}
+
+    async def exists(self, entity_id: int) -> bool:
+        """
+        Check if entity with given id exists, without loading it.
+
+        Args:
+            entity_id (int): The id of the entity to check.
+
+        Returns:
+            bool: True if the entity exists, False otherwise.
+        """
+        query = await self.session.execute(select(exists().where(self.db_model_class.id == entity_id)))
+        return bool(query.scalar())
+
+    def _where_id(
+        self, statement: Select | Update | Delete, entity_id: int, owner_id: int | None = None
+    ) -> Select | Update | Delete:
+        """
+        Restrict a statement to the entity with the given id, and to entities of the owner if provided.
+
+        Args:
+            statement (Select | Update | Delete): The statement to restrict.
+            entity_id (int): The id of the entity.
+            owner_id (int | None): If provided, the id of the user the entity must belong to.
+
+        Returns:
+            Select | Update | Delete: The restricted statement.
+        """
+        statement = statement.where(self.db_model_class.id == entity_id)
+        if owner_id is not None:
+            statement = statement.where(self.db_model_class.user_id == owner_id)
+        return statement
+
+    async def _raise_missing(self, entity_id: int, owner_id: int | None = None, forbidden_detail: str = "") -> None:
+        """
+        Raise the error for a statement scoped by _where_id that matched no entity.
+
+        Args:
+            entity_id (int): The id of the entity.
+            owner_id (int | None): The id of the user the statement was scoped to, if any.
+            forbidden_detail (str): Detail of the exception raised when the entity belongs to another user.
+
+        Raises:
+            EntityNotFoundException: If the entity with the given id does not exist.
+            ActionForbiddenException: If owner_id is provided and the entity belongs to another user.
+        """
+        # only a miss needs a second look, to tell entities of other users apart from missing ones
+        if owner_id is not None and await self.exists(entity_id=entity_id):
+            logger.error(
+                "%s with id %s does not belong to user with id %s", self.entity_type.value, entity_id, owner_id
+            )
+            raise ActionForbiddenException(detail=forbidden_detail)
+
+        logger.error("%s with id %s not found", self.entity_type.value, entity_id)
+        raise EntityNotFoundException(entity_id=entity_id, entity_type=self.entity_type)
+
+    def _get_selected(self, as_rows: bool = False) -> Sequence[Any]:
+        """
+        Get what reads select, the entity or only the columns of its output schema.
+
+        Rows are not turned into entities tracked by the session, which costs more than the query for large lists.
+
+        Args:
+            as_rows (bool): Whether columns are selected instead of the entity.
+
+        Returns:
+            Sequence[Any]: The entity class, or the output columns in the order of the output schema.
+        """
+        if not as_rows:
+            return (self.db_model_class,)
+
+        columns = self.db_model_class.__table__.columns
+        if self.out_schema_class is None:
+            return tuple(columns)
+        return tuple(columns[name] for name in self.out_schema_class.model_fields)
+
+    @staticmethod
+    def _get_owner_scope(acting_user: AuthContext) -> int | None:
+        """
+        Get the owner id entities should be scoped to for the acting user.
+
+        Args:
+            acting_user (AuthContext): The user performing the action.
+
+        Returns:
+            int | None: Id of the acting user, None for admins who can access entities of all users.
         """
-        Get all entities of specified type, matching optional filters.
+        return None if acting_user.is_admin else acting_user.id
+
+    def _apply_filters(self, statement: Select, filters: FilterSchemaT = None) -> Select:
+        """
+        Add conditions of the filters declared by a filter schema to a statement, using its compiled filter plan.
 
         Args:
+            statement (Select): The statement to filter.
             filters (FilterSchemaT): The optional filters to apply.
 
         Returns:
-            list[DatabaseModelT]: A list of all entities matching provided filters.
+            Select: The filtered statement.
         """
-        logger.info(f"executing query to fetch all {self.entity_type.value} with filters {filters}")
+        if not filters:
+            return statement
 
-        statement = select(self.db_model_class)
+        keyword_operator = KEYWORD_OPERATORS[getattr(filters, "search_mode", SearchMode.substring)]
+        for entry, value in get_active_filters(self.db_model_class, filters):
+            filter_operator = keyword_operator if entry.operator == FilterOperator.ilike else entry.operator
+            statement = statement.where(FILTER_CONDITIONS[filter_operator](entry.column, value))
 
-        if filters:
-            for filter_name, filter_values in filters:
-                clean_filter_name = filter_name.replace("_gt", "").replace("_lt", "")
-                column = getattr(self.db_model_class, clean_filter_name, None)
+        return statement
 
-                if not column:
-                    logger.warning(f"ignoring invalid filter: {filter_name}")
-                    continue
+    def _get_search_rank(self, filters: FilterSchemaT = None) -> ColumnElement[float] | None:
+        """
+        Get the full-text rank of entities matching the keyword filters, if ranked search is requested.
 
-                # list filters (IN-style filter)
-                if filter_name in filters.list_filters and filter_values:
-                    statement = statement.where(column.in_(filter_values))
+        Args:
+            filters (FilterSchemaT): The optional filters to apply.
+
+        Returns:
+            ColumnElement[float] | None: Sum of the ranks of all keywords, None if results are not ranked.
+        """
+        if not filters or getattr(filters, "search_mode", None) != SearchMode.ranked:
+            return None
+
+        ranks = [
+            text_rank(entry.column, keyword)
+            for entry, keywords in get_active_filters(self.db_model_class, filters)
+            if entry.operator == FilterOperator.ilike
+            for keyword in keywords
+        ]
+        return reduce(operator.add, ranks) if ranks else None
+
+    def _apply_keyset(self, statement: Select, limit: int | None = None, cursor: str | None = None) -> Select:
+        """
+        Order a statement by sort columns and restrict it to one page.
+
+        Args:
+            statement (Select): The statement to paginate.
+            limit (int | None): If provided, the maximum number of rows to return.
+            cursor (str | None): If provided, only rows sorted after the cursor are returned.
+
+        Returns:
+            Select: The paginated statement.
+
+        Raises:
+            InvalidCursorException: If the cursor is malformed.
+        """
+        sort_columns = [getattr(self.db_model_class, column_name) for column_name in self.sort_columns]
+        if cursor:
+            # keyset pagination, seeks past the last returned sort key instead of skipping rows with an offset
+            cursor_values = decode_cursor(cursor, python_types=[column.type.python_type for column in sort_columns])
+            statement = statement.where(
+                tuple_(*sort_columns)
+                > tuple_(*(literal(value, column.type) for column, value in zip(sort_columns, cursor_values)))
+            )
+        statement = statement.order_by(*sort_columns)
+        if limit is not None:
+            statement = statement.limit(limit)
+
+        return statement
+
+    async def get_all_with_filters(
+        self,
+        filters: FilterSchemaT = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        as_rows: bool = False,
+        **kwargs,
+    ) -> list[DatabaseModelT] | list[Row]:
+        """
+        Get all entities of specified type, matching optional filters, ordered by sort columns.
 
-                # greater-than filters
-                elif filter_name in filters.gt_filters and filter_values is not None:
-                    statement = statement.where(column >= filter_values)
+        Args:
+            filters (FilterSchemaT): The optional filters to apply.
+            limit (int | None): If provided, the maximum number of entities to return.
+            cursor (str | None): If provided, only entities sorted after the cursor are returned.
+            as_rows (bool): If True, the output columns are returned as rows instead of entities, for read-only
+                output.
+
+        Returns:
+            list[DatabaseModelT] | list[Row]: A list of all entities matching provided filters.
+
+        Raises:
+            InvalidCursorException: If the cursor is malformed.
+        """
+        logger.info("executing query to fetch all %s with filters %s", self.entity_type.value, filters)
 
-                # less-than filters
-                elif filter_name in filters.lt_filters and filter_values is not None:
-                    statement = statement.where(column <= filter_values)
+        statement = self._apply_filters(select(*self._get_selected(as_rows)), filters=filters)
 
-                # keyword filters (ILIKE with ORs)
-                elif filter_name in filters.kw_filters and filter_values:
-                    statement = statement.where(
-                        or_(*(column.ilike(f"%{escape_like(kw)}%", escape="\\") for kw in filter_values))
-                    )
+        search_rank = self._get_search_rank(filters)
+        if search_rank is not None:
+            # best matches first, the cursor is ignored as ranks cannot be sought past like sort columns
+            sort_columns = [getattr(self.db_model_class, column_name) for column_name in self.sort_columns]
+            statement = statement.order_by(search_rank.desc(), *sort_columns).limit(limit)
+        else:
+            statement = self._apply_keyset(statement, limit=limit, cursor=cursor)
 
         query = await self.session.execute(statement)
-        entities = query.scalars().all()
+        entities = query.all() if as_rows else query.scalars().all()
         return entities
 
+    async def get_page_with_filters(
+        self, filters: FilterSchemaT, get_all: Callable[..., Awaitable[Sequence[Any]]] | None = None, **kwargs
+    ) -> tuple[list[Any], str | None]:
+        """
+        Get one page of entities matching filters, as selected by the pagination params of the filter schema.
+
+        Args:
+            filters (FilterSchemaT): The filters to apply, including limit and cursor.
+            get_all (Callable | None): Method returning entities or mappings for filters, limit and cursor,
+                defaults to get_all_with_filters.
+            kwargs: Additional arguments for getting the entities.
+
+        Returns:
+            tuple[list[Any], str | None]: Entities of the page, and the cursor of the next page if any.
+
+        Raises:
+            InvalidCursorException: If the cursor is malformed.
+        """
+        get_all = get_all or self.get_all_with_filters
+
+        # one extra row tells if there is a next page without a separate count query
+        entities = await get_all(filters=filters, limit=filters.limit + 1, cursor=filters.cursor, **kwargs)
+        if len(entities) <= filters.limit:
+            return entities, None
+        if self._get_search_rank(filters) is not None:
+            # ranked results are a single page
+            return entities[: filters.limit], None
+
+        entities = entities[: filters.limit]
+        last = entities[-1]
+        next_cursor = encode_cursor(
+            [last[name] if isinstance(last, Mapping) else getattr(last, name) for name in self.sort_columns]
+        )
+        return entities, next_cursor
+
+    async def stream_all_with_filters(
+        self, filters: FilterSchemaT = None, chunk_size: int = 1000, as_rows: bool = False, **kwargs
+    ) -> AsyncGenerator[Sequence[DatabaseModelT] | Sequence[Row], None]:
+        """
+        Stream all entities matching optional filters in chunks, ordered by sort columns, using a server-side cursor.
+
+        Only one chunk is held in memory at a time, pagination params of the filter schema are ignored.
+
+        Args:
+            filters (FilterSchemaT): The optional filters to apply.
+            chunk_size (int): The number of entities fetched from the cursor at once.
+            as_rows (bool): If True, the output columns are streamed as rows instead of entities, for read-only
+                output.
+
+        Yields:
+            Sequence[DatabaseModelT] | Sequence[Row]: The next chunk of entities.
+        """
+        logger.info("executing query to stream all %s with filters %s", self.entity_type.value, filters)
+
+        statement = self._apply_filters(select(*self._get_selected(as_rows)), filters=filters)
+        statement = statement.order_by(*(getattr(self.db_model_class, name) for name in self.sort_columns))
+        statement = statement.execution_options(yield_per=chunk_size)
+
+        try:
+            result = await (self.session.stream(statement) if as_rows else self.session.stream_scalars(statement))
+            async for chunk in result.partitions():
+                yield chunk
+        finally:
+            # streamed bodies are sent after request dependencies exit, so the connection the session
+            # reopened for the cursor is released here
+            await self.session.close()
+
     async def _validate_create(self, create_schema: CreateSchemaT, **kwargs) -> None:
         """
         Validate create schema.
@@ -127,6 +390,48 @@ class BaseService(Generic[DatabaseModelT, CreateSchemaT, UpdateSchemaT, FilterSc
         valid_fields.update({key: value for key, value in kwargs.items() if key in database_model_fields})
         return valid_fields
 
+    def _get_column_values(self, entity_db: DatabaseModelT) -> dict[str, Any]:
+        """
+        Snapshot the column values of an entity.
+
+        Args:
+            entity_db (DatabaseModelT): The entity to snapshot.
+
+        Returns:
+            dict[str, Any]: Values of the entity keyed by column name.
+        """
+        return {column.key: getattr(entity_db, column.key) for column in self.db_model_class.__table__.columns}
+
+    async def _sync_derived_data(
+        self, previous: dict[str, Any] | None = None, current: DatabaseModelT | None = None
+    ) -> None:
+        """
+        Update data derived from entities, such as rollups, in the same database transaction as the write.
+
+        Args:
+            previous (dict[str, Any] | None): Column values before the write, None for creation.
+            current (DatabaseModelT | None): The entity after the write, None for deletion.
+
+        Returns:
+            None
+        """
+        # no derived data by default, to be overwritten in child classes
+        pass
+
+    async def _explain_integrity_error(self, schema: CreateSchemaT | UpdateSchemaT, **kwargs) -> None:
+        """
+        Raise the exception a write rejected by a database constraint stands for, once the session is rolled back.
+
+        Args:
+            schema (CreateSchemaT | UpdateSchemaT): The schema of the rejected write.
+            kwargs: Additional arguments of the write, entity_id for updates.
+
+        Returns:
+            None
+        """
+        # nothing to explain by default, to be overwritten in child classes, the IntegrityError is then raised as is
+        pass
+
     async def create(self, create_schema: CreateSchemaT, **kwargs) -> DatabaseModelT:
         """
         Create new entity in the database.
@@ -137,15 +442,26 @@ class BaseService(Generic[DatabaseModelT, CreateSchemaT, UpdateSchemaT, FilterSc
 
         Returns:
             DatabaseModelT: The created entity.
+
+        Raises:
+            IntegrityError: If a database constraint rejected the entity and _explain_integrity_error did not raise.
         """
-        logger.info(f"executing query to create a new {self.entity_type.value}")
+        logger.info("executing query to create a new %s", self.entity_type.value)
 
         await self._validate_create(create_schema=create_schema, **kwargs)
 
         valid_fields = self._get_create_or_update_valid_fields(schema=create_schema, **kwargs)
         entity_db = self.db_model_class(**valid_fields)
         self.session.add(entity_db)
-        await self.session.commit()
+        try:
+            await self._sync_derived_data(current=entity_db)
+            await self.session.commit()
+        except IntegrityError:
+            # invariants checked by constraints are only looked into when the database rejects the write
+            logger.error("%s rejected by a database constraint", self.entity_type.value)
+            await self.session.rollback()
+            await self._explain_integrity_error(schema=create_schema, **kwargs)
+            raise
         return entity_db
 
     async def _validate_update(self, entity_id: int, update_schema: UpdateSchemaT, **kwargs) -> DatabaseModelT:
@@ -182,19 +498,120 @@ class BaseService(Generic[DatabaseModelT, CreateSchemaT, UpdateSchemaT, FilterSc
         Raises:
             EntityNotFoundException: If the entity with the given id does not exist.
         """
-        logger.info(f"executing query to update {self.entity_type.value} with id {entity_id}")
+        logger.info("executing query to update %s with id %s", self.entity_type.value, entity_id)
 
         entity_db = await self._validate_update(entity_id=entity_id, update_schema=update_schema, **kwargs)
 
+        previous = self._get_column_values(entity_db)
         valid_fields = self._get_create_or_update_valid_fields(schema=update_schema, **kwargs)
         for key, value in valid_fields.items():
             setattr(entity_db, key, value)
 
         self.session.add(entity_db)
+        await self._sync_derived_data(previous=previous, current=entity_db)
         await self.session.commit()
         await self.session.refresh(entity_db)
         return entity_db
 
+    async def update_returning(
+        self,
+        entity_id: int,
+        update_schema: UpdateSchemaT,
+        owner_id: int | None = None,
+        forbidden_detail: str = "",
+        **kwargs,
+    ) -> DatabaseModelT:
+        """
+        Update an existing entity with a single UPDATE ... RETURNING statement, without loading it first.
+
+        References are left to database constraints, violations are explained by _explain_integrity_error.
+
+        Args:
+            entity_id (int): The id of the entity to update.
+            update_schema (UpdateSchemaT): The schema for updating the entity.
+            owner_id (int | None): If provided, only the entity owned by the user with this id is updated.
+            forbidden_detail (str): Detail of the exception raised when the entity belongs to another user.
+            kwargs: Additional arguments for update.
+
+        Returns:
+            DatabaseModelT: The updated entity.
+
+        Raises:
+            EntityNotFoundException: If the entity with the given id does not exist.
+            ActionForbiddenException: If owner_id is provided and the entity belongs to another user.
+            IntegrityError: If a database constraint rejected the update and _explain_integrity_error did not raise.
+        """
+        logger.info("executing query to update %s with id %s returning it", self.entity_type.value, entity_id)
+
+        previous = None
+        if self.has_derived_data:
+            # RETURNING only sees the new values, the previous ones are read and the row locked beforehand
+            query = await self.session.execute(
+                self._where_id(
+                    select(self.db_model_class.__table__), entity_id=entity_id, owner_id=owner_id
+                ).with_for_update()
+            )
+            previous = query.mappings().one_or_none()
+            if previous is None:
+                await self._raise_missing(entity_id=entity_id, owner_id=owner_id, forbidden_detail=forbidden_detail)
+            previous = dict(previous)
+
+        valid_fields = self._get_create_or_update_valid_fields(schema=update_schema, **kwargs)
+        statement = self._where_id(update(self.db_model_class), entity_id=entity_id, owner_id=owner_id)
+        try:
+            query = await self.session.execute(
+                statement.values(valid_fields).returning(self.db_model_class),
+                execution_options={"synchronize_session": False, "populate_existing": True},
+            )
+            entity_db = query.scalar_one_or_none()
+
+            if not entity_db:
+                await self._raise_missing(entity_id=entity_id, owner_id=owner_id, forbidden_detail=forbidden_detail)
+
+            await self._sync_derived_data(previous=previous, current=entity_db)
+            await self.session.commit()
+        except IntegrityError:
+            logger.error("%s with id %s rejected by a database constraint", self.entity_type.value, entity_id)
+            await self.session.rollback()
+            await self._explain_integrity_error(schema=update_schema, entity_id=entity_id, **kwargs)
+            raise
+        return entity_db
+
+    async def delete_returning(
+        self, entity_id: int, owner_id: int | None = None, forbidden_detail: str = "", **kwargs
+    ) -> DatabaseModelT:
+        """
+        Delete an existing entity with a single DELETE ... RETURNING statement, without loading it first.
+
+        Derived data is synced after the delete, so it must not be touched by cascades of the deleted row.
+
+        Args:
+            entity_id (int): The id of the entity to delete.
+            owner_id (int | None): If provided, only the entity owned by the user with this id is deleted.
+            forbidden_detail (str): Detail of the exception raised when the entity belongs to another user.
+            kwargs: Additional arguments for delete.
+
+        Returns:
+            DatabaseModelT: The deleted entity, transient as it is no longer in the database.
+
+        Raises:
+            EntityNotFoundException: If the entity with the given id does not exist.
+            ActionForbiddenException: If owner_id is provided and the entity belongs to another user.
+        """
+        logger.info("executing query to delete %s with id %s returning it", self.entity_type.value, entity_id)
+
+        statement = self._where_id(delete(self.db_model_class), entity_id=entity_id, owner_id=owner_id)
+        query = await self.session.execute(statement.returning(*self.db_model_class.__table__.columns))
+        previous = query.mappings().one_or_none()
+
+        if previous is None:
+            await self._raise_missing(entity_id=entity_id, owner_id=owner_id, forbidden_detail=forbidden_detail)
+
+        previous = dict(previous)
+        await self._sync_derived_data(previous=previous)
+        await self.session.commit()
+        return self.db_model_class(**previous)
+
     async def _validate_delete(self, entity_id: int, **kwargs) -> DatabaseModelT:
         """
         Validate deletion of an entity.
@@ -227,10 +644,138 @@ class BaseService(Generic[DatabaseModelT, CreateSchemaT, UpdateSchemaT, FilterSc
         Raises:
             EntityNotFoundException: If the entity with the given id does not exist.
         """
-        logger.info(f"executing query to delete {self.entity_type.value} with id {entity_id}")
+        logger.info("executing query to delete %s with id %s", self.entity_type.value, entity_id)
 
         entity_db = await self._validate_delete(entity_id=entity_id, **kwargs)
 
+        # derived data is synced first, as the delete is flushed with the next statement and may cascade to it
+        await self._sync_derived_data(previous=self._get_column_values(entity_db))
         await self.session.delete(entity_db)
         await self.session.commit()
         return entity_db
+
+
+class ReferenceDataService(BaseService[DatabaseModelT, CreateSchemaT, UpdateSchemaT, FilterSchemaT]):
+    # reads are served from a process-wide snapshot once it is loaded, writes always go to the database
+    def __init__(
+        self,
+        session: AsyncSession,
+        db_model_class: type[DatabaseModelT],
+        entity_type: EntityType,
+        reference_cache: ReferenceCache[int, DatabaseModelT],
+    ) -> None:
+        super().__init__(session=session, db_model_class=db_model_class, entity_type=entity_type)
+        self.reference_cache = reference_cache
+
+    async def load_reference_cache(self) -> None:
+        """
+        Load all entities into the reference cache, replacing the previous snapshot.
+
+        Cached entities are detached copies, so they can be shared between sessions.
+        """
+        logger.info("loading %s reference cache", self.entity_type.value)
+
+        query = await self.session.execute(select(self.db_model_class))
+        columns = self.db_model_class.__table__.columns
+        self.reference_cache.load(
+            {
+                entity.id: self.db_model_class(**{column.key: getattr(entity, column.key) for column in columns})
+                for entity in query.scalars().all()
+            }
+        )
+
+    async def get_by_id(self, entity_id: int, from_cache: bool = True, **kwargs) -> DatabaseModelT:
+        """
+        Get entity by its id, from the reference cache if it is loaded.
+
+        Args:
+            entity_id (int): The id of the entity to retrieve.
+            from_cache (bool): Whether the reference cache may be used, entities to be modified must not come from it.
+            kwargs: Additional arguments for getting the entity.
+
+        Returns:
+            DatabaseModelT: The database model instance.
+
+        Raises:
+            EntityNotFoundException: If the entity with the given id does not exist.
+        """
+        if not (from_cache and self.reference_cache.is_loaded):
+            return await super().get_by_id(entity_id=entity_id, **kwargs)
+
+        entity = self.reference_cache.get(entity_id)
+
+        if not entity:
+            logger.error("%s with id %s not found", self.entity_type.value, entity_id)
+            raise EntityNotFoundException(entity_id=entity_id, entity_type=self.entity_type)
+
+        return entity
+
+    async def get_by_ids(self, entity_ids: Iterable[int], from_cache: bool = True) -> dict[int, DatabaseModelT]:
+        """
+        Get entities by their ids, from the reference cache if it is loaded.
+
+        Args:
+            entity_ids (Iterable[int]): The ids of the entities to retrieve, duplicates are allowed.
+            from_cache (bool): Whether the reference cache may be used, entities to be modified must not come from it.
+
+        Returns:
+            dict[int, DatabaseModelT]: Entities keyed by id, ids of entities that do not exist are left out.
+        """
+        if not (from_cache and self.reference_cache.is_loaded):
+            return await super().get_by_ids(entity_ids=entity_ids)
+
+        entities = {entity_id: self.reference_cache.get(entity_id) for entity_id in set(entity_ids)}
+        return {entity_id: entity for entity_id, entity in entities.items() if entity is not None}
+
+    async def get_all_with_filters(self, filters: FilterSchemaT = None, **kwargs) -> list[DatabaseModelT]:
+        """
+        Get all entities of specified type, matching optional filters, from the reference cache if it is loaded.
+
+        Args:
+            filters (FilterSchemaT): The optional filters to apply.
+
+        Returns:
+            list[DatabaseModelT]: A list of all entities matching provided filters.
+        """
+        active_filters = get_active_filters(self.db_model_class, filters) if filters else []
+
+        # reference tables only have list filters, anything else is left to the database
+        if not self.reference_cache.is_loaded or any(
+            entry.operator != FilterOperator.in_ for entry, _ in active_filters
+        ):
+            return await super().get_all_with_filters(filters=filters, **kwargs)
+
+        entities = self.reference_cache.values()
+
+        for entry, values in active_filters:
+            entities = [entity for entity in entities if getattr(entity, entry.column.key) in values]
+
+        return entities
+
+    async def create(self, create_schema: CreateSchemaT, **kwargs) -> DatabaseModelT:
+        entity_db = await super().create(create_schema=create_schema, **kwargs)
+        await self._reload_reference_cache()
+        return entity_db
+
+    async def _validate_update(self, entity_id: int, update_schema: UpdateSchemaT, **kwargs) -> DatabaseModelT:
+        entity_db = await self.get_by_id(entity_id=entity_id, from_cache=False)
+        return entity_db
+
+    async def update(self, entity_id: int, update_schema: UpdateSchemaT, **kwargs) -> DatabaseModelT:
+        entity_db = await super().update(entity_id=entity_id, update_schema=update_schema, **kwargs)
+        await self._reload_reference_cache()
+        return entity_db
+
+    async def _validate_delete(self, entity_id: int, **kwargs) -> DatabaseModelT:
+        entity_db = await self.get_by_id(entity_id=entity_id, from_cache=False)
+        return entity_db
+
+    async def delete(self, entity_id: int, **kwargs) -> DatabaseModelT:
+        entity_db = await super().delete(entity_id=entity_id, **kwargs)
+        await self._reload_reference_cache()
+        return entity_db
+
+    async def _reload_reference_cache(self) -> None:
+        # a snapshot that was never loaded stays unloaded, it is populated at startup
+        if self.reference_cache.is_loaded:
+            await self.load_reference_cache()
@@ -1,33 +1,44 @@
+from typing import Any
+
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.enums import EntityType
-from app.common.exceptions import ActionForbiddenException
 from app.core.session import get_session
 from app.core.logger import get_logger
-from app.db_models import Category, User
-from app.schemas import CategoryCreate, CategoryUpdate, CategoryFilters
+from app.db_models import Category
+from app.schemas import CategoryCreate, CategoryUpdate, CategoryOut, CategoryFilters, AuthContext
 from app.services.base import BaseService
+from app.services.transaction_rollup import TransactionRollupService
 from app.services.type import get_type_service, TypeService
-from app.services.user import get_user_service, UserService
 
 
 logger = get_logger(__name__)
 
 
 class CategoryService(BaseService[Category, CategoryCreate, CategoryUpdate, CategoryFilters]):
-    def __init__(self, session: AsyncSession, user_service: UserService, type_service: TypeService) -> None:
-        self.user_service = user_service
+    out_schema_class = CategoryOut
+
+    def __init__(self, session: AsyncSession, type_service: TypeService) -> None:
         self.type_service = type_service
+        self.rollup_service = TransactionRollupService(session=session)
         super().__init__(session=session, db_model_class=Category, entity_type=EntityType.category)
 
-    async def get_by_id(self, entity_id: int, gotten_by: User) -> Category:
+    async def get_by_id(
+        self,
+        entity_id: int,
+        gotten_by: AuthContext,
+        forbidden_detail: str = "users can only view their own categories",
+        **kwargs,
+    ) -> Category:
         """
         Get category by its id.
 
         Args:
             entity_id (int): The id of the category to retrieve.
-            gotten_by (User): The user doing the getting.
+            gotten_by (AuthContext): The user doing the getting.
+            forbidden_detail (str): Detail of the exception raised when the category belongs to another user.
+            kwargs: Additional arguments for getting the category.
 
         Returns:
             Category: The gotten category.
@@ -36,16 +47,15 @@ class CategoryService(BaseService[Category, CategoryCreate, CategoryUpdate, Cate
             EntityNotFoundException: If the entity with the given id does not exist.
             ActionForbiddenException: If the user doing the getting is not allowed to perform the get.
         """
-        # get the category if exists
-        category_db = await super().get_by_id(entity_id=entity_id)
-
-        # verify if they can get
-        if not (gotten_by.id == category_db.user_id or await self.user_service.is_admin(user_id=gotten_by.id)):
-            raise ActionForbiddenException(detail="users can only view their own categories")
-
+        # get the category if exists and they can get it, in one statement unless it is not found
+        category_db = await super().get_by_id(
+            entity_id=entity_id, owner_id=self._get_owner_scope(gotten_by), forbidden_detail=forbidden_detail, **kwargs
+        )
         return category_db
 
-    async def get_all_with_filters(self, filters: CategoryFilters = None, gotten_by: User = None) -> list[Category]:
+    async def get_all_with_filters(
+        self, filters: CategoryFilters = None, gotten_by: AuthContext = None, **kwargs
+    ) -> list[Category]:
         """
         Get all categories, matching optional filters.
 
@@ -55,10 +65,10 @@ class CategoryService(BaseService[Category, CategoryCreate, CategoryUpdate, Cate
         Returns:
             list[Category]: A list of all categories matching provided filters.
         """
-        if not await self.user_service.is_admin(user_id=gotten_by.id):
+        if not gotten_by.is_admin:
             # if user is not an admin, always add filters to filter for only their own categories
             filters.user_id = [gotten_by.id]
-        return await super().get_all_with_filters(filters=filters)
+        return await super().get_all_with_filters(filters=filters, **kwargs)
 
     async def _validate_create(self, create_schema: CategoryCreate, **kwargs) -> None:
         """
@@ -77,14 +87,16 @@ class CategoryService(BaseService[Category, CategoryCreate, CategoryUpdate, Cate
         # verify type exists
         await self.type_service.get_by_id(entity_id=create_schema.type_id)
 
-    async def _validate_update(self, entity_id: int, update_schema: CategoryUpdate, updated_by: User) -> Category:
+    async def _validate_update(
+        self, entity_id: int, update_schema: CategoryUpdate, updated_by: AuthContext
+    ) -> Category:
         """
         Validate CategoryUpdate schema.
 
         Args:
             entity_id (int): The id of the category to validate.
             schema (CategoryUpdate): The schema to validate.
-            updated_by (User): The user doing the update.
+            updated_by (AuthContext): The user doing the update.
 
         Returns:
             Category: The validated category.
@@ -93,22 +105,20 @@ class CategoryService(BaseService[Category, CategoryCreate, CategoryUpdate, Cate
             EntityNotFoundException: If the category or type with the given id do not exist.
             ActionForbiddenException: If the user doing the update is not allowed to perform the update.
         """
-        # verify category exists
-        category_db = await self.get_by_id(entity_id=entity_id, gotten_by=updated_by)
-
-        # verify if they can update
-        if not (updated_by.id == category_db.user_id or await self.user_service.is_admin(user_id=updated_by.id)):
-            raise ActionForbiddenException(detail="users can only update their own categories")
+        # verify category exists and they can update it
+        category_db = await self.get_by_id(
+            entity_id=entity_id, gotten_by=updated_by, forbidden_detail="users can only update their own categories"
+        )
 
         return category_db
 
-    async def _validate_delete(self, entity_id: int, deleted_by: User) -> Category:
+    async def _validate_delete(self, entity_id: int, deleted_by: AuthContext) -> Category:
         """
         Validate deletion of a category.
 
         Args:
             entity_id (int): The id of the category to validate.
-            deleted_by (User): The user doing the delete.
+            deleted_by (AuthContext): The user doing the delete.
 
         Returns:
             Category: The validated user.
@@ -117,19 +127,21 @@ class CategoryService(BaseService[Category, CategoryCreate, CategoryUpdate, Cate
             EntityNotFoundException: If the category with the given id does not exist.
             ActionForbiddenException: If user doing the delete is not allowed to perform the delete.
         """
-        # verify category exists
-        category_db = await self.get_by_id(entity_id=entity_id, gotten_by=deleted_by)
-
-        # verify they can delete
-        if not (deleted_by.id == category_db.user_id or await self.user_service.is_admin(user_id=deleted_by.id)):
-            raise ActionForbiddenException(detail="users can only delete their own categories")
+        # verify category exists and they can delete it
+        category_db = await self.get_by_id(
+            entity_id=entity_id, gotten_by=deleted_by, forbidden_detail="users can only delete their own categories"
+        )
 
         return category_db
 
+    async def _sync_derived_data(self, previous: dict[str, Any] | None = None, current: Category | None = None) -> None:
+        # transactions of a deleted category become uncategorized, so do their rollups
+        if previous is not None and current is None:
+            await self.rollup_service.uncategorize(category_id=previous["id"])
+
 
 def get_category_service(
     session: AsyncSession = Depends(get_session),
-    user_service: UserService = Depends(get_user_service),
     type_service: TypeService = Depends(get_type_service),
 ) -> CategoryService:
-    return CategoryService(session=session, user_service=user_service, type_service=type_service)
+    return CategoryService(session=session, type_service=type_service)
@@ -1,107 +1,196 @@
+from decimal import Decimal
+from typing import Any
+
 from fastapi import Depends
+from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.enums import EntityType
-from app.common.exceptions import ActionForbiddenException, EntityNotAssociatedException
+from app.common.exceptions import EntityNotAssociatedException
 from app.core.session import get_session
 from app.core.logger import get_logger
-from app.db_models import Goal, User
-from app.schemas import GoalCreate, GoalUpdate, GoalFilters
+from app.db_models import Goal, Transaction
+from app.schemas import GoalCreate, GoalUpdate, GoalOut, GoalFilters, AuthContext
 from app.services.base import BaseService
 from app.services.category import get_category_service, CategoryService
 from app.services.type import get_type_service, TypeService
-from app.services.user import get_user_service, UserService
 
 
 logger = get_logger(__name__)
 
 
 class GoalService(BaseService[Goal, GoalCreate, GoalUpdate, GoalFilters]):
+    out_schema_class = GoalOut
+
     def __init__(
         self,
         session: AsyncSession,
         category_service: CategoryService,
         type_service: TypeService,
-        user_service: UserService,
     ) -> None:
         self.category_service = category_service
         self.type_service = type_service
-        self.user_service = user_service
         super().__init__(session=session, db_model_class=Goal, entity_type=EntityType.goal)
 
-    async def get_by_id(self, entity_id: int, gotten_by: User) -> Goal:
-        # get the goal if exists
-        goal_db = await super().get_by_id(entity_id=entity_id)
-
-        # verify if they can get
-        if not (gotten_by.id == goal_db.user_id or await self.user_service.is_admin(user_id=gotten_by.id)):
-            raise ActionForbiddenException(detail="users can only view their own goals")
-
+    async def get_by_id(
+        self,
+        entity_id: int,
+        gotten_by: AuthContext,
+        forbidden_detail: str = "users can only view their own goals",
+        **kwargs,
+    ) -> Goal:
+        # get the goal if exists and they can get it, in one statement unless it is not found
+        goal_db = await super().get_by_id(
+            entity_id=entity_id, owner_id=self._get_owner_scope(gotten_by), forbidden_detail=forbidden_detail, **kwargs
+        )
         return goal_db
 
-    async def get_all_with_filters(self, filters: GoalFilters = None, gotten_by: User = None) -> list[Goal]:
-        if not await self.user_service.is_admin(user_id=gotten_by.id):
+    async def get_all_with_filters(
+        self, filters: GoalFilters = None, gotten_by: AuthContext = None, **kwargs
+    ) -> list[Goal]:
+        if not gotten_by.is_admin:
             # if user is not an admin, always add filters to filter for only their own goals
             filters.user_id = [gotten_by.id]
-        return await super().get_all_with_filters(filters=filters)
+        return await super().get_all_with_filters(filters=filters, **kwargs)
 
-    async def _validate_create(self, create_schema: GoalCreate, created_by: User, **kwargs) -> None:
-        # verify type exists
-        type_db = await self.type_service.get_by_id(entity_id=create_schema.type_id)
+    async def get_progress_with_filters(
+        self,
+        filters: GoalFilters = None,
+        gotten_by: AuthContext = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        **kwargs,
+    ) -> list[dict[str, Any]]:
+        """
+        Get goals matching optional filters with their progress, computed for all goals in a single query.
+
+        The current value of a goal is the sum of its owner's transactions of the goal type, and category if set,
+        dated within the goal start and end dates.
+
+        Args:
+            filters (GoalFilters): The optional filters to apply.
+            gotten_by (AuthContext): The user doing the getting.
+            limit (int | None): If provided, the maximum number of goals to return.
+            cursor (str | None): If provided, only goals sorted after the cursor are returned.
+
+        Returns:
+            list[dict[str, Any]]: One row per goal, with the goal columns, current value, percentage and remaining.
+
+        Raises:
+            InvalidCursorException: If the cursor is malformed.
+        """
+        logger.info("executing query to fetch progress of all goals with filters %s", filters)
+
+        if not gotten_by.is_admin:
+            # if user is not an admin, always add filters to filter for only their own goals
+            filters.user_id = [gotten_by.id]
 
-        # if provided, verify category exists and belongs to the type
-        if create_schema.category_id:
-            category_db = await self.category_service.get_by_id(
-                entity_id=create_schema.category_id, gotten_by=created_by
+        # goals are grouped by their primary key, so their columns can be selected next to the aggregate
+        statement = (
+            select(*Goal.__table__.columns, func.coalesce(func.sum(Transaction.value), 0).label("current_value"))
+            .outerjoin(
+                Transaction,
+                and_(
+                    Transaction.user_id == Goal.user_id,
+                    Transaction.type_id == Goal.type_id,
+                    or_(Goal.category_id.is_(None), Transaction.category_id == Goal.category_id),
+                    Transaction.date >= Goal.start_date,
+                    Transaction.date <= Goal.end_date,
+                ),
             )
-            if category_db.type_id != type_db.id:
-                raise EntityNotAssociatedException(
-                    detail=f"category with id {category_db.id} is not of type with id {type_db.id}"
-                )
-
-    async def _validate_update(self, entity_id: int, update_schema: GoalUpdate, updated_by: User, **kwargs) -> Goal:
-        # verify goal exists
-        goal_db = await self.get_by_id(entity_id=entity_id, gotten_by=updated_by)
-
-        # verify if they can update
-        if not (updated_by.id == goal_db.user_id or await self.user_service.is_admin(user_id=updated_by.id)):
-            raise ActionForbiddenException(detail="users can only update their own goals")
+            .group_by(Goal.id)
+        )
+        statement = self._apply_filters(statement, filters=filters)
+        statement = self._apply_keyset(statement, limit=limit, cursor=cursor)
+
+        query = await self.session.execute(statement)
+        goals = []
+        for row in query.mappings().all():
+            goal = dict(row)
+            goal["percentage"] = (
+                float(goal["current_value"] / goal["target_value"] * 100) if goal["target_value"] else None
+            )
+            goal["remaining"] = max(goal["target_value"] - goal["current_value"], Decimal(0))
+            goals.append(goal)
+        return goals
+
+    async def get_progress_page_with_filters(
+        self, filters: GoalFilters, gotten_by: AuthContext
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Get one page of goals matching filters with their progress.
+
+        Args:
+            filters (GoalFilters): The filters to apply, including limit and cursor.
+            gotten_by (AuthContext): The user doing the getting.
+
+        Returns:
+            tuple[list[dict[str, Any]], str | None]: Goals of the page with progress, and the next page cursor if any.
+
+        Raises:
+            InvalidCursorException: If the cursor is malformed.
+        """
+        return await self.get_page_with_filters(
+            filters=filters, get_all=self.get_progress_with_filters, gotten_by=gotten_by
+        )
+
+    async def _validate_category_owner(self, category_id: int | None, acting_user: AuthContext) -> None:
+        # the database checks that the category exists and is of the type, whose category it is is checked here, as
+        # only admins may reference categories of other users
+        if category_id and not acting_user.is_admin:
+            await self.category_service.get_by_id(entity_id=category_id, gotten_by=acting_user)
+
+    async def _validate_create(self, create_schema: GoalCreate, created_by: AuthContext, **kwargs) -> None:
+        await self._validate_category_owner(category_id=create_schema.category_id, acting_user=created_by)
+
+    async def update(self, entity_id: int, update_schema: GoalUpdate, updated_by: AuthContext, **kwargs) -> Goal:
+        await self._validate_category_owner(category_id=update_schema.category_id, acting_user=updated_by)
+        # the goal is not loaded first, ownership is checked by the UPDATE itself
+        return await self.update_returning(
+            entity_id=entity_id,
+            update_schema=update_schema,
+            owner_id=self._get_owner_scope(updated_by),
+            forbidden_detail="users can only update their own goals",
+            updated_by=updated_by,
+            **kwargs,
+        )
+
+    async def _explain_integrity_error(
+        self,
+        schema: GoalCreate | GoalUpdate,
+        created_by: AuthContext | None = None,
+        updated_by: AuthContext | None = None,
+        **kwargs,
+    ) -> None:
+        # the type and category are only looked up once the database rejected them, to tell which check failed
+        acting_user = created_by or updated_by
 
         # verify type exists
-        type_db = await self.type_service.get_by_id(entity_id=update_schema.type_id)
+        type_db = await self.type_service.get_by_id(entity_id=schema.type_id)
 
         # if provided, verify category exists and belongs to the type
-        if update_schema.category_id:
-            category_db = await self.category_service.get_by_id(
-                entity_id=update_schema.category_id, gotten_by=updated_by
-            )
+        if schema.category_id:
+            category_db = await self.category_service.get_by_id(entity_id=schema.category_id, gotten_by=acting_user)
             if category_db.type_id != type_db.id:
                 raise EntityNotAssociatedException(
                     detail=f"category with id {category_db.id} is not of type with id {type_db.id}"
                 )
 
-        return goal_db
-
-    async def _validate_delete(self, entity_id: int, deleted_by: User) -> Goal:
-        # verify goal exists
-        goal_db = await self.get_by_id(entity_id=entity_id, gotten_by=deleted_by)
-
-        # verify they can delete
-        if not (deleted_by.id == goal_db.user_id or await self.user_service.is_admin(user_id=deleted_by.id)):
-            raise ActionForbiddenException(detail="users can only delete their own goals")
-
-        return goal_db
+    async def delete(self, entity_id: int, deleted_by: AuthContext, **kwargs) -> Goal:
+        return await self.delete_returning(
+            entity_id=entity_id,
+            owner_id=self._get_owner_scope(deleted_by),
+            forbidden_detail="users can only delete their own goals",
+        )
 
 
 def get_goal_service(
     session: AsyncSession = Depends(get_session),
     category_service: CategoryService = Depends(get_category_service),
     type_service: TypeService = Depends(get_type_service),
-    user_service: UserService = Depends(get_user_service),
 ) -> GoalService:
     return GoalService(
         session=session,
         category_service=category_service,
         type_service=type_service,
-        user_service=user_service,
     )
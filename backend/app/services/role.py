@@ -4,24 +4,27 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.enums import EntityType, RoleName
 from app.common.exceptions import EntityNotFoundException
+from app.core.cache import role_cache
 from app.core.logger import get_logger
 from app.core.session import get_session
 from app.db_models import Role
-from app.schemas import RoleCreate, RoleUpdate, RoleFilters
-from app.services.base import BaseService
+from app.schemas import RoleCreate, RoleUpdate, RoleOut, RoleFilters
+from app.services.base import ReferenceDataService
 
 
 logger = get_logger(__name__)
 
 
-class RoleService(BaseService[Role, RoleCreate, RoleUpdate, RoleFilters]):
+class RoleService(ReferenceDataService[Role, RoleCreate, RoleUpdate, RoleFilters]):
+    out_schema_class = RoleOut
+
     # has available all the methods from BaseService, but only gets are exposed in routes
     def __init__(self, session: AsyncSession) -> None:
-        super().__init__(session=session, db_model_class=Role, entity_type=EntityType.role)
+        super().__init__(session=session, db_model_class=Role, entity_type=EntityType.role, reference_cache=role_cache)
 
     async def get_by_name(self, role_name: RoleName) -> Role:
         """
-        Get role by name.
+        Get role by name, from the reference cache if it is loaded.
 
         Args:
             role_name (RoleName): The name of the role to retrieve.
@@ -32,13 +35,16 @@ class RoleService(BaseService[Role, RoleCreate, RoleUpdate, RoleFilters]):
         Raises:
             EntityNotFoundException: If the role with given name was not found.
         """
-        logger.info(f"executing query to fetch role with name {role_name.value}")
+        if self.reference_cache.is_loaded:
+            role = self.reference_cache.find(lambda cached: cached.name == role_name)
+        else:
+            logger.info("executing query to fetch role with name %s", role_name.value)
 
-        query = await self.session.execute(select(Role).where(Role.name == role_name))
-        role = query.scalar_one_or_none()
+            query = await self.session.execute(select(Role).where(Role.name == role_name))
+            role = query.scalar_one_or_none()
 
         if not role:
-            logger.error(f"role with name {role_name.value} not found")
+            logger.error("role with name %s not found", role_name.value)
             raise EntityNotFoundException(entity_id=role_name, entity_type=EntityType.role)
 
         return role
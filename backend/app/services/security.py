@@ -5,13 +5,15 @@ import jwt
 from fastapi import Depends, HTTPException, Cookie, Request
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
+from pydantic import ValidationError
 
 from app.common.enums import RoleName
+from app.core.cache import principal_cache, evict_principal, is_token_version_stale
 from app.core.config import get_settings
 from app.db_models import User
-from app.schemas import TokenData
+from app.schemas import TokenData, AuthContext
 from app.services.user import UserService, get_user_service
-from app.utils.password_utils import verify_password
+from app.utils.password_utils import verify_password_async
 
 
 settings = get_settings()
@@ -23,11 +25,23 @@ async def authenticate_user(email: str, password: str, user_service: UserService
     user_db = await user_service.get_by_email(email=email)
     if not user_db:
         return False
-    if not verify_password(plain_password=password, hashed_password=user_db.password_hash):
+    if not await verify_password_async(plain_password=password, hashed_password=user_db.password_hash):
         return False
     return user_db
 
 
+async def get_access_token_data(user: User, user_service: UserService) -> dict:
+    # signed claims that let later requests build the principal without querying the database
+    role_db = await user_service.role_service.get_by_id(entity_id=user.role_id)
+    return {
+        "sub": user.email,
+        "uid": user.id,
+        "rid": role_db.id,
+        "role": role_db.name.value,
+        "ver": user.token_version,
+    }
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     if expires_delta:
@@ -79,10 +93,7 @@ async def get_token_from_header_or_cookie(request: Request, access_token: str =
     )
 
 
-async def get_current_user(
-    token: Annotated[str, Depends(get_token_from_header_or_cookie)],
-    user_service: Annotated[UserService, Depends(get_user_service)],
-) -> User:
+async def get_token_data(token: Annotated[str, Depends(get_token_from_header_or_cookie)]) -> TokenData:
     credentials_exception = HTTPException(
         status_code=401, detail="could not validate credentials", headers={"WWW-Authenticate": "Bearer"}
     )
@@ -91,20 +102,74 @@ async def get_current_user(
         username = payload.get("sub")
         if username is None:
             raise credentials_exception
-        token_data = TokenData(username=username)
-    except InvalidTokenError:
+        return TokenData(
+            username=username,
+            user_id=payload.get("uid"),
+            role_id=payload.get("rid"),
+            role=payload.get("role"),
+            version=payload.get("ver"),
+        )
+    except (InvalidTokenError, ValidationError):
         raise credentials_exception
-    user_db = await user_service.get_by_email(email=token_data.username)
+
+
+def has_fresh_claims(token_data: TokenData) -> bool:
+    if None in (token_data.user_id, token_data.role_id, token_data.role, token_data.version):
+        return False
+    return not is_token_version_stale(user_id=token_data.user_id, token_version=token_data.version)
+
+
+async def get_auth_context_from_db(user_db: User | None, user_service: UserService) -> AuthContext:
+    # the principal of the user row as it is now, cached for tokens without usable claims
     if user_db is None:
-        raise credentials_exception
-    return user_db
+        raise HTTPException(
+            status_code=401, detail="could not validate credentials", headers={"WWW-Authenticate": "Bearer"}
+        )
+    role_db = await user_service.role_service.get_by_id(entity_id=user_db.role_id)
+    auth_context = AuthContext(
+        id=user_db.id,
+        email=user_db.email,
+        role_id=user_db.role_id,
+        is_admin=role_db.name.value == RoleName.admin.value,
+    )
+    principal_cache.set(user_db.email, auth_context)
+    return auth_context
 
 
-async def get_current_admin(
-    current_user: Annotated[User, Depends(get_current_user)],
+async def get_current_user(
+    token_data: Annotated[TokenData, Depends(get_token_data)],
     user_service: Annotated[UserService, Depends(get_user_service)],
-) -> User:
-    current_user_role = await user_service.role_service.get_by_id(entity_id=current_user.role_id)
-    if not current_user_role.name.value == RoleName.admin.value:
+) -> AuthContext:
+    # resolved once per request, services get the context instead of checking the role themselves
+    if has_fresh_claims(token_data):
+        auth_context = AuthContext(
+            id=token_data.user_id,
+            email=token_data.username,
+            role_id=token_data.role_id,
+            is_admin=token_data.role == RoleName.admin,
+        )
+    else:
+        # claims missing (older tokens) or stale (user changed since issuing), fall back to the database
+        auth_context = principal_cache.get(token_data.username)
+        if auth_context is None:
+            user_db = await user_service.get_by_email(email=token_data.username)
+            return await get_auth_context_from_db(user_db=user_db, user_service=user_service)
+
+    if not auth_context.is_admin:
+        return auth_context
+
+    # admin contexts widen queries to the data of every user; the token version and principal caches only know of
+    # changes made through this process, and forget them when full, so they are checked against the user row instead
+    user_db = await user_service.get_by_email(email=token_data.username)
+    if user_db is not None and user_db.token_version == token_data.version:
+        return auth_context
+    if user_db is not None:
+        # the user changed since the token was issued, possibly through another process
+        evict_principal(user_id=user_db.id, min_token_version=user_db.token_version)
+    return await get_auth_context_from_db(user_db=user_db, user_service=user_service)
+
+
+async def get_current_admin(current_user: Annotated[AuthContext, Depends(get_current_user)]) -> AuthContext:
+    if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="user is not an admin")
     return current_user
@@ -1,145 +1,714 @@
+from decimal import Decimal
+from typing import Any, AsyncGenerator, AsyncIterator, Sequence
+
 from fastapi import Depends
-from sqlalchemy import func, select, or_
+from pydantic import ValidationError
+from sqlalchemy import (
+    Column,
+    Date,
+    Integer,
+    MetaData,
+    Select,
+    String,
+    Table,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    type_coerce,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.common.enums import EntityType
-from app.common.exceptions import ActionForbiddenException, EntityNotAssociatedException
+from app.common.enums import AggregateMetric, EntityType, FilterOperator, ImportFormat, TypeName
+from app.common.exceptions import (
+    ActionForbiddenException,
+    BulkValidationException,
+    EntityNotAssociatedException,
+    EntityNotFoundException,
+    ImportRecordTooLargeException,
+)
+from app.core.config import get_settings
 from app.core.session import get_session
 from app.core.logger import get_logger
-from app.db_models import Transaction, User
-from app.schemas import TransactionCreate, TransactionUpdate, TransactionFilters
+from app.db_models import Category, Transaction, TransactionMonthlyRollup, Type
+from app.schemas import (
+    TransactionCreate,
+    TransactionUpdate,
+    TransactionUpsert,
+    TransactionPatch,
+    TransactionFilters,
+    TransactionAggregateFilters,
+    TransactionOut,
+    AuthContext,
+)
+from app.schemas.transaction import PERIOD_GROUP_BYS
 from app.services.base import BaseService
 from app.services.category import get_category_service, CategoryService
+from app.services.transaction_rollup import TransactionRollupService
 from app.services.type import get_type_service, TypeService
-from app.services.user import get_user_service, UserService
+from app.utils.date_utils import get_whole_months
+from app.utils.filter_utils import get_active_filters
+from app.utils.import_utils import decode_chunks, iter_batches, iter_csv_records, iter_ofx_records
+from app.utils.sql_utils import MinorUnits, date_trunc, get_upsert_insert, in_values
+
 
+settings = get_settings()
 
 logger = get_logger(__name__)
 
+AGGREGATE_FUNCTIONS = {
+    AggregateMetric.sum: func.sum,
+    AggregateMetric.count: func.count,
+    AggregateMetric.avg: func.avg,
+    AggregateMetric.min: func.min,
+    AggregateMetric.max: func.max,
+}
+
+# key of upserts by external id, matching the unique index of the transaction table
+UPSERT_KEY = ("user_id", "external_id", "date")
+
+# imported rows are loaded into this per-connection table first, then merged into transactions in one statement
+import_staging_table = Table(
+    "transaction_import",
+    MetaData(),
+    Column("user_id", Integer, nullable=False),
+    Column("type_id", Integer, nullable=False),
+    Column("category_id", Integer, nullable=True),
+    Column("date", Date, nullable=False),
+    Column("value", MinorUnits(), nullable=False),
+    Column("comment", String, nullable=True),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+# columns of a transaction the monthly rollup is computed from
+ROLLUP_COLUMNS = ("user_id", "type_id", "category_id", "date", "value")
+
+# filters the monthly rollup can answer, any other filter needs the values of individual transactions
+ROLLUP_FILTERS = frozenset(("user_id", "type_id", "category_id", "date_gt", "date_lt"))
+
 
 class TransactionService(BaseService[Transaction, TransactionCreate, TransactionUpdate, TransactionFilters]):
+    sort_columns = ("date", "id")
+    has_derived_data = True
+    out_schema_class = TransactionOut
+
     def __init__(
         self,
         session: AsyncSession,
         category_service: CategoryService,
         type_service: TypeService,
-        user_service: UserService,
     ) -> None:
         self.category_service = category_service
         self.type_service = type_service
-        self.user_service = user_service
+        self.rollup_service = TransactionRollupService(session=session)
         super().__init__(session=session, db_model_class=Transaction, entity_type=EntityType.transaction)
 
-    async def get_by_id(self, entity_id: int, gotten_by: User) -> Transaction:
-        # get the transaction if exists
-        transaction_db = await super().get_by_id(entity_id=entity_id)
-
-        # verify if they can get
-        if not (gotten_by.id == transaction_db.user_id or await self.user_service.is_admin(user_id=gotten_by.id)):
-            raise ActionForbiddenException(detail="users can only view their own transactions")
-
+    async def get_by_id(
+        self,
+        entity_id: int,
+        gotten_by: AuthContext,
+        forbidden_detail: str = "users can only view their own transactions",
+        **kwargs,
+    ) -> Transaction:
+        # get the transaction if exists and they can get it, in one statement unless it is not found
+        transaction_db = await super().get_by_id(
+            entity_id=entity_id, owner_id=self._get_owner_scope(gotten_by), forbidden_detail=forbidden_detail, **kwargs
+        )
         return transaction_db
 
     async def get_all_with_filters(
-        self, filters: TransactionFilters = None, gotten_by: User = None
+        self, filters: TransactionFilters = None, gotten_by: AuthContext = None, **kwargs
     ) -> list[Transaction]:
-        if not await self.user_service.is_admin(user_id=gotten_by.id):
+        if not gotten_by.is_admin:
             # if user is not an admin, always add filters to filter for only their own transactions
             filters.user_id = [gotten_by.id]
-        return await super().get_all_with_filters(filters=filters)
+        return await super().get_all_with_filters(filters=filters, **kwargs)
 
-    async def get_total_with_filters(self, filters=None, gotten_by: User = None) -> float:
-        if not await self.user_service.is_admin(user_id=gotten_by.id):
+    async def stream_all_with_filters(
+        self, filters: TransactionFilters = None, gotten_by: AuthContext = None, **kwargs
+    ) -> AsyncGenerator[Sequence[Transaction], None]:
+        if not gotten_by.is_admin:
             # if user is not an admin, always add filters to filter for only their own transactions
             filters.user_id = [gotten_by.id]
-        statement = select(func.sum(self.db_model_class.value))
-        if filters:
-            for filter_name, filter_values in filters:
-                clean_filter_name = filter_name.replace("_gt", "").replace("_lt", "")
-                column = getattr(self.db_model_class, clean_filter_name, None)
-
-                if not column:
-                    logger.warning(f"ignoring invalid filter: {filter_name}")
-                    continue
-
-                # list filters (IN-style filter)
-                if filter_name in filters.list_filters and filter_values:
-                    statement = statement.where(column.in_(filter_values))
-
-                # greater-than filters
-                elif filter_name in filters.gt_filters and filter_values is not None:
-                    statement = statement.where(column >= filter_values)
-
-                # less-than filters
-                elif filter_name in filters.lt_filters and filter_values is not None:
-                    statement = statement.where(column <= filter_values)
-
-                # keyword filters (ILIKE with ORs)
-                elif filter_name in filters.kw_filters and filter_values:
-                    statement = statement.where(or_(*(column.ilike(f"%{kw}%") for kw in filter_values)))
+        async for chunk in super().stream_all_with_filters(filters=filters, **kwargs):
+            yield chunk
+
+    async def get_total_with_filters(self, filters=None, gotten_by: AuthContext = None) -> Decimal:
+        if not gotten_by.is_admin:
+            # if user is not an admin, always add filters to filter for only their own transactions
+            filters.user_id = [gotten_by.id]
+        statement = self._get_total_statement(filters=filters or TransactionFilters())
         query = await self.session.execute(statement)
         result = query.scalar()
-        return result or 0.0
+        return result or Decimal(0)
 
-    async def _validate_create(self, create_schema: TransactionCreate, created_by: User, **kwargs) -> None:
-        # verify type exists
-        type_db = await self.type_service.get_by_id(entity_id=create_schema.type_id)
+    def _get_total_statement(self, filters: TransactionFilters) -> Select:
+        """
+        Build the statement summing values of transactions matching filters.
 
-        # if provided, verify category exists and belongs to the type
-        if create_schema.category_id:
-            category_db = await self.category_service.get_by_id(
-                entity_id=create_schema.category_id, gotten_by=created_by
+        Whole months of the date range are summed from the monthly rollup, only the days of partial months at the
+        edges of the range are summed from transactions. Filters the rollup cannot answer fall back to transactions.
+
+        Args:
+            filters (TransactionFilters): The filters to apply.
+
+        Returns:
+            Select: The statement selecting the total.
+        """
+        raw_total = select(func.sum(self.db_model_class.value))
+        active_filters = get_active_filters(self.db_model_class, filters)
+        whole_months = get_whole_months(filters.date_gt, filters.date_lt)
+        if whole_months is None or any(entry.filter_name not in ROLLUP_FILTERS for entry, _ in active_filters):
+            return self._apply_filters(raw_total, filters=filters)
+
+        first_month, end_month = whole_months
+        rollup_total = select(func.sum(TransactionMonthlyRollup.total))
+        for entry, values in active_filters:
+            if entry.operator == FilterOperator.in_:
+                rollup_total = rollup_total.where(getattr(TransactionMonthlyRollup, entry.column.key).in_(values))
+        edge_conditions = []
+        if first_month is not None:
+            rollup_total = rollup_total.where(TransactionMonthlyRollup.month >= first_month)
+            if filters.date_gt < first_month:
+                edge_conditions.append(self.db_model_class.date < first_month)
+        if end_month is not None:
+            rollup_total = rollup_total.where(TransactionMonthlyRollup.month < end_month)
+            if filters.date_lt >= end_month:
+                edge_conditions.append(self.db_model_class.date >= end_month)
+
+        total = func.coalesce(rollup_total.scalar_subquery(), 0)
+        if edge_conditions:
+            edge_total = self._apply_filters(raw_total, filters=filters).where(or_(*edge_conditions))
+            total = total + func.coalesce(edge_total.scalar_subquery(), 0)
+        # the sum of integer minor units is scaled back to an amount, which arithmetic on the column type drops
+        return select(type_coerce(total, self.db_model_class.value.type))
+
+    async def get_aggregate_with_filters(
+        self, filters: TransactionAggregateFilters, gotten_by: AuthContext = None
+    ) -> list[dict[str, Any]]:
+        """
+        Aggregate values of transactions matching filters, grouped by the requested columns, in a single query.
+
+        Args:
+            filters (TransactionAggregateFilters): The filters to apply, with the group by columns and metrics.
+            gotten_by (AuthContext): The user doing the getting.
+
+        Returns:
+            list[dict[str, Any]]: One row per group, with the group by columns and the requested metrics.
+        """
+        if not gotten_by.is_admin:
+            # if user is not an admin, always add filters to filter for only their own transactions
+            filters.user_id = [gotten_by.id]
+
+        group_columns = [
+            (
+                date_trunc(group.value, self.db_model_class.date).label("period")
+                if group in PERIOD_GROUP_BYS
+                else getattr(self.db_model_class, group.value).label(group.value)
             )
-            if category_db.type_id != type_db.id:
-                raise EntityNotAssociatedException(
-                    detail=f"category with id {category_db.id} is not of type with id {type_db.id}"
-                )
+            for group in filters.group_by
+        ]
+        # aggregates run on the integer minor units, all but counts are scaled back to amounts
+        metric_columns = [
+            (
+                AGGREGATE_FUNCTIONS[metric](self.db_model_class.value)
+                if metric == AggregateMetric.count
+                else type_coerce(AGGREGATE_FUNCTIONS[metric](self.db_model_class.value), self.db_model_class.value.type)
+            ).label(metric.value)
+            for metric in filters.metrics
+        ]
+
+        statement = self._apply_filters(select(*group_columns, *metric_columns), filters=filters)
+        if group_columns:
+            statement = statement.group_by(*group_columns).order_by(*group_columns)
+
+        query = await self.session.execute(statement)
+        return [dict(row) for row in query.mappings().all()]
+
+    async def _sync_derived_data(
+        self, previous: dict[str, Any] | None = None, current: Transaction | None = None
+    ) -> None:
+        # move the value of the transaction out of its previous month and into its current one, in one upsert
+        await self.rollup_service.add_changes(
+            previous=[previous] if previous is not None else [],
+            current=[self._get_column_values(current)] if current is not None else [],
+        )
+
+    async def _validate_category_owner(self, category_id: int | None, acting_user: AuthContext) -> None:
+        # the database checks that the category exists and is of the type, whose category it is is checked here, as
+        # only admins may reference categories of other users
+        if category_id and not acting_user.is_admin:
+            await self.category_service.get_by_id(entity_id=category_id, gotten_by=acting_user)
 
-    async def _validate_update(
-        self, entity_id: int, update_schema: TransactionUpdate, updated_by: User, **kwargs
+    async def _validate_create(self, create_schema: TransactionCreate, created_by: AuthContext, **kwargs) -> None:
+        await self._validate_category_owner(category_id=create_schema.category_id, acting_user=created_by)
+
+    async def update(
+        self, entity_id: int, update_schema: TransactionUpdate, updated_by: AuthContext, **kwargs
     ) -> Transaction:
-        # verify transaction exists
-        transaction_db = await self.get_by_id(entity_id=entity_id, gotten_by=updated_by)
+        await self._validate_category_owner(category_id=update_schema.category_id, acting_user=updated_by)
+        # the transaction is not loaded first, ownership is checked by the UPDATE itself
+        return await self.update_returning(
+            entity_id=entity_id,
+            update_schema=update_schema,
+            owner_id=self._get_owner_scope(updated_by),
+            forbidden_detail="users can only update their own transactions",
+            updated_by=updated_by,
+            **kwargs,
+        )
+
+    async def delete(self, entity_id: int, deleted_by: AuthContext, **kwargs) -> Transaction:
+        return await self.delete_returning(
+            entity_id=entity_id,
+            owner_id=self._get_owner_scope(deleted_by),
+            forbidden_detail="users can only delete their own transactions",
+        )
 
-        # verify if they can update
-        if not (updated_by.id == transaction_db.user_id or await self.user_service.is_admin(user_id=updated_by.id)):
-            raise ActionForbiddenException(detail="users can only update their own transactions")
+    async def update_with_filters(
+        self, filters: TransactionFilters, patch_schema: TransactionPatch, updated_by: AuthContext
+    ) -> int:
+        """
+        Change the set fields of all transactions matching filters with a single UPDATE, committed once.
 
-        # verify type exists
-        type_db = await self.type_service.get_by_id(entity_id=update_schema.type_id)
+        Args:
+            filters (TransactionFilters): The filters selecting the transactions, pagination params are ignored.
+            patch_schema (TransactionPatch): The fields to change.
+            updated_by (AuthContext): The user doing the update, only their own transactions unless admin.
 
-        # if provided, verify category exists and belongs to the type
-        if update_schema.category_id:
-            category_db = await self.category_service.get_by_id(
-                entity_id=update_schema.category_id, gotten_by=updated_by
+        Returns:
+            int: The number of updated transactions.
+
+        Raises:
+            EntityNotFoundException: If the type or category does not exist.
+            ActionForbiddenException: If the category belongs to another user.
+            EntityNotAssociatedException: If the category is not of the type of the changed transactions.
+        """
+        logger.info("executing query to update transactions with filters %s", filters)
+
+        if not updated_by.is_admin:
+            # if user is not an admin, always add filters to filter for only their own transactions
+            filters.user_id = [updated_by.id]
+        values = patch_schema.model_dump(include=patch_schema.model_fields_set)
+        await self._validate_patch(filters=filters, values=values, updated_by=updated_by)
+
+        statement = update(self.db_model_class).values(**values)
+        # only type and category changes move values between rollup rows
+        moves_rollups = "type_id" in values or "category_id" in values
+        if moves_rollups:
+            # the matched rows are locked before their previous values are read, and only they are updated, so that
+            # rows written concurrently cannot be moved in the rollup from values it was never told about
+            query = await self.session.execute(
+                self._apply_filters(select(*self.db_model_class.__table__.columns), filters=filters).with_for_update()
             )
-            if category_db.type_id != type_db.id:
-                raise EntityNotAssociatedException(
-                    detail=f"category with id {category_db.id} is not of type with id {type_db.id}"
+            previous = [dict(row) for row in query.mappings().all()]
+            dialect_name = self.session.get_bind().dialect.name
+            statement = statement.where(
+                in_values(self.db_model_class.id, [row["id"] for row in previous], dialect_name=dialect_name)
+            )
+        else:
+            statement = self._apply_filters(statement, filters=filters)
+
+        query = await self.session.execute(
+            statement.returning(*self.db_model_class.__table__.columns),
+            execution_options={"synchronize_session": False},
+        )
+        transactions = query.mappings().all()
+        if moves_rollups:
+            await self.rollup_service.add_changes(previous=previous, current=transactions)
+        await self.session.commit()
+        return len(transactions)
+
+    async def delete_with_filters(self, filters: TransactionFilters, deleted_by: AuthContext) -> int:
+        """
+        Delete all transactions matching filters with a single DELETE, committed once.
+
+        Args:
+            filters (TransactionFilters): The filters selecting the transactions, pagination params are ignored.
+            deleted_by (AuthContext): The user doing the delete, only their own transactions unless admin.
+
+        Returns:
+            int: The number of deleted transactions.
+        """
+        logger.info("executing query to delete transactions with filters %s", filters)
+
+        if not deleted_by.is_admin:
+            # if user is not an admin, always add filters to filter for only their own transactions
+            filters.user_id = [deleted_by.id]
+
+        # the rollup is reduced by the rows the DELETE returns, the rows it actually removed
+        query = await self.session.execute(
+            self._apply_filters(delete(self.db_model_class), filters=filters).returning(
+                *(getattr(self.db_model_class, key) for key in ROLLUP_COLUMNS)
+            ),
+            execution_options={"synchronize_session": False},
+        )
+        transactions = query.mappings().all()
+        await self.rollup_service.add_many(transactions, sign=-1)
+        await self.session.commit()
+        return len(transactions)
+
+    async def _validate_patch(
+        self, filters: TransactionFilters, values: dict[str, Any], updated_by: AuthContext
+    ) -> None:
+        # the type is only changed together with the category, which is checked against it
+        if "type_id" in values:
+            await self.type_service.get_by_id(entity_id=values["type_id"])
+
+        if values.get("category_id"):
+            category_db = await self.category_service.get_by_id(entity_id=values["category_id"], gotten_by=updated_by)
+            if "type_id" in values:
+                if category_db.type_id != values["type_id"]:
+                    raise EntityNotAssociatedException(
+                        detail=f"category with id {category_db.id} is not of type with id {values['type_id']}"
+                    )
+            else:
+                # one check for all matched transactions, instead of loading them
+                other_type = self._apply_filters(
+                    select(self.db_model_class.id).where(self.db_model_class.type_id != category_db.type_id), filters
                 )
+                query = await self.session.execute(select(other_type.exists()))
+                if query.scalar():
+                    raise EntityNotAssociatedException(
+                        detail=f"category with id {category_db.id} is not of the type of all matched transactions"
+                    )
 
-        return transaction_db
+    async def create_bulk(
+        self, create_schemas: list[TransactionCreate], created_by: AuthContext, atomic: bool = True
+    ) -> tuple[list[Transaction], list[dict[str, Any]]]:
+        """
+        Create many transactions of the creating user in a single multi-row insert, committed once.
 
-    async def _validate_delete(self, entity_id: int, deleted_by: User) -> Transaction:
-        # verify transaction exists
-        transaction_db = await self.get_by_id(entity_id=entity_id, gotten_by=deleted_by)
+        Args:
+            create_schemas (list[TransactionCreate]): The schemas for creating the transactions.
+            created_by (AuthContext): The user doing the creating, who owns the transactions.
+            atomic (bool): Whether any invalid item fails the whole batch, otherwise only valid items are created.
 
-        # verify they can delete
-        if not (deleted_by.id == transaction_db.user_id or await self.user_service.is_admin(user_id=deleted_by.id)):
-            raise ActionForbiddenException(detail="users can only delete their own transactions")
+        Returns:
+            tuple[list[Transaction], list[dict[str, Any]]]: The created transactions in the order of the schemas, and
+                the index and detail of every invalid item.
 
-        return transaction_db
+        Raises:
+            BulkValidationException: If atomic and any item is invalid, nothing is created then.
+        """
+        logger.info("executing query to create %s transactions", len(create_schemas))
+
+        errors = await self._validate_create_bulk(create_schemas=create_schemas, created_by=created_by)
+        if errors and atomic:
+            logger.error("%s of %s transactions are invalid", len(errors), len(create_schemas))
+            raise BulkValidationException(errors=errors)
+
+        invalid_indexes = {error["index"] for error in errors}
+        rows = [
+            self._get_create_or_update_valid_fields(schema=create_schema, user_id=created_by.id)
+            for index, create_schema in enumerate(create_schemas)
+            if index not in invalid_indexes
+        ]
+        if not rows:
+            return [], errors
+
+        query = await self.session.execute(
+            insert(self.db_model_class).returning(self.db_model_class, sort_by_parameter_order=True), rows
+        )
+        transactions = list(query.scalars().all())
+        await self.rollup_service.add_many(rows)
+        await self.session.commit()
+        return transactions, errors
+
+    async def upsert_bulk(
+        self, upsert_schemas: list[TransactionUpsert], created_by: AuthContext, atomic: bool = True
+    ) -> tuple[list[Transaction], list[dict[str, Any]]]:
+        """
+        Create or update many transactions of the creating user by their external ids, with a single upsert statement,
+        committed once.
+
+        Items are validated like in create_bulk. A stored transaction with the same external id but another date is
+        replaced, as the date is part of the upsert key.
+
+        Args:
+            upsert_schemas (list[TransactionUpsert]): The schemas for upserting the transactions.
+            created_by (AuthContext): The user doing the upserting, who owns the transactions.
+            atomic (bool): Whether any invalid item fails the whole batch, otherwise only valid items are upserted.
+
+        Returns:
+            tuple[list[Transaction], list[dict[str, Any]]]: The created or updated transactions in the order of the
+                schemas, and the index and detail of every invalid item.
+
+        Raises:
+            BulkValidationException: If atomic and any item is invalid, nothing is upserted then.
+        """
+        logger.info("executing query to upsert %s transactions", len(upsert_schemas))
+
+        errors = await self._validate_create_bulk(create_schemas=upsert_schemas, created_by=created_by)
+        # one statement cannot upsert the same row twice
+        seen_external_ids = set()
+        for index, upsert_schema in enumerate(upsert_schemas):
+            if upsert_schema.external_id in seen_external_ids:
+                errors.append({"index": index, "detail": f"external id {upsert_schema.external_id} is repeated"})
+            seen_external_ids.add(upsert_schema.external_id)
+        errors.sort(key=lambda error: error["index"])
+        if errors and atomic:
+            logger.error("%s of %s transactions are invalid", len(errors), len(upsert_schemas))
+            raise BulkValidationException(errors=errors)
+
+        invalid_indexes = {error["index"] for error in errors}
+        rows = [
+            self._get_create_or_update_valid_fields(schema=upsert_schema, user_id=created_by.id)
+            for index, upsert_schema in enumerate(upsert_schemas)
+            if index not in invalid_indexes
+        ]
+        if not rows:
+            return [], errors
+
+        # stored versions are locked and moved out of the rollup, the upsert adds them back with their new values
+        query = await self.session.execute(
+            select(*self.db_model_class.__table__.columns)
+            .where(
+                self.db_model_class.user_id == created_by.id,
+                self.db_model_class.external_id.in_([row["external_id"] for row in rows]),
+            )
+            .with_for_update()
+        )
+        previous = [dict(row) for row in query.mappings().all()]
+        await self.rollup_service.add_many(previous, sign=-1)
+        dates = {row["external_id"]: row["date"] for row in rows}
+        moved_ids = [row["id"] for row in previous if row["date"] != dates[row["external_id"]]]
+        if moved_ids:
+            await self.session.execute(delete(self.db_model_class).where(self.db_model_class.id.in_(moved_ids)))
+
+        # the rows are rendered into one multi-row VALUES, executing them as parameter sets with sorted RETURNING
+        # rows would send one upsert per row
+        insert = get_upsert_insert(self.session.get_bind().dialect.name)
+        statement = insert(self.db_model_class).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(UPSERT_KEY),
+            set_={key: statement.excluded[key] for key in rows[0] if key not in UPSERT_KEY},
+        )
+        query = await self.session.execute(
+            statement.returning(self.db_model_class), execution_options={"populate_existing": True}
+        )
+        # RETURNING rows of a multi-row VALUES come in no particular order, they are put back in the order of the items
+        upserted = {
+            tuple(getattr(transaction, key) for key in UPSERT_KEY): transaction for transaction in query.scalars()
+        }
+        transactions = [upserted[tuple(row[key] for key in UPSERT_KEY)] for row in rows]
+        await self.rollup_service.add_many(rows)
+        await self.session.commit()
+        return transactions, errors
+
+    async def import_records(
+        self,
+        chunks: AsyncIterator[bytes],
+        import_format: ImportFormat,
+        created_by: AuthContext,
+        atomic: bool = True,
+    ) -> tuple[int, int, list[dict[str, Any]]]:
+        """
+        Import the transactions of a CSV or OFX file as they are read, committed once.
+
+        Records are validated in batches like in create_bulk and loaded into a staging table, with COPY on
+        PostgreSQL, so only one batch is held in memory. The staged rows are then merged into transactions and the
+        monthly rollup with one statement each.
+
+        Args:
+            chunks (AsyncIterator[bytes]): Chunks of the file, such as the request stream.
+            import_format (ImportFormat): The format of the file.
+            created_by (AuthContext): The user doing the importing, who owns the transactions.
+            atomic (bool): Whether any invalid record fails the whole import, otherwise only valid records are created.
+
+        Returns:
+            tuple[int, int, list[dict[str, Any]]]: The number of created transactions, the number of invalid records,
+                and the index and detail of the first invalid records, up to max_import_errors.
+
+        Raises:
+            BulkValidationException: If atomic and any record is invalid, nothing is created then.
+            ImportRecordTooLargeException: If a record is longer than max_import_record_size, nothing is created then.
+        """
+        logger.info("executing import of %s transactions", import_format.value)
+
+        texts = decode_chunks(chunks)
+        if import_format == ImportFormat.ofx:
+            type_ids = {type_name: (await self.type_service.get_by_name(type_name)).id for type_name in TypeName}
+            records = iter_ofx_records(texts, type_ids=type_ids, max_size=settings.max_import_record_size)
+        else:
+            records = iter_csv_records(texts, max_size=settings.max_import_record_size)
+
+        connection = await self.session.connection()
+        await connection.run_sync(import_staging_table.create, checkfirst=True)
+        # left over on databases without transactional DDL if a previous import on this connection failed
+        await self.session.execute(delete(import_staging_table))
+
+        created, invalid, errors = 0, 0, []
+        offset = 0
+        try:
+            async for batch in iter_batches(records, batch_size=settings.import_batch_size):
+                rows, batch_errors = await self._validate_import_batch(batch, offset=offset, created_by=created_by)
+                offset += len(batch)
+                invalid += len(batch_errors)
+                errors.extend(batch_errors[: settings.max_import_errors - len(errors)])
+                # once an atomic import has failed, the rest of the file is only validated
+                if rows and not (atomic and invalid):
+                    await self._stage_import_rows(rows)
+                    created += len(rows)
+        except ImportRecordTooLargeException:
+            logger.error("imported record after the first %s records is too large", offset)
+            await self.session.rollback()
+            raise
+
+        if atomic and invalid:
+            logger.error("%s of %s imported transactions are invalid", invalid, offset)
+            await self.session.rollback()
+            raise BulkValidationException(errors=errors)
+
+        await self.session.execute(
+            insert(self.db_model_class).from_select(
+                [column.name for column in import_staging_table.columns], select(import_staging_table)
+            )
+        )
+        await self.rollup_service.add_from(import_staging_table)
+        await connection.run_sync(import_staging_table.drop)
+        await self.session.commit()
+        return created, invalid, errors
+
+    async def _validate_import_batch(
+        self, records: list[dict[str, Any]], offset: int, created_by: AuthContext
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """
+        Validate a batch of imported records with the TransactionCreate rules and referenced types and categories.
+
+        Args:
+            records (list[dict[str, Any]]): The records to validate.
+            offset (int): The index of the first record in the file.
+            created_by (AuthContext): The user doing the importing.
+
+        Returns:
+            tuple[list[dict[str, Any]], list[dict[str, Any]]]: Column values of the valid records, and the index in the
+                file and detail of every invalid record.
+        """
+        create_schemas, errors = [], []
+        for index, record in enumerate(records, start=offset):
+            try:
+                create_schemas.append((index, TransactionCreate.model_validate(record)))
+            except ValidationError as e:
+                detail = "; ".join(
+                    f"{'.'.join(str(location) for location in error['loc'])}: {error['msg']}" for error in e.errors()
+                )
+                errors.append({"index": index, "detail": detail})
+
+        reference_errors = await self._validate_create_bulk(
+            create_schemas=[create_schema for _, create_schema in create_schemas], created_by=created_by
+        )
+        errors.extend({**error, "index": create_schemas[error["index"]][0]} for error in reference_errors)
+        invalid_indexes = {error["index"] for error in errors}
+
+        rows = [
+            self._get_create_or_update_valid_fields(schema=create_schema, user_id=created_by.id)
+            for index, create_schema in create_schemas
+            if index not in invalid_indexes
+        ]
+        return rows, sorted(errors, key=lambda error: error["index"])
+
+    async def _stage_import_rows(self, rows: list[dict[str, Any]]) -> None:
+        columns = [column.name for column in import_staging_table.columns]
+        if self.session.get_bind().dialect.name != "postgresql":
+            await self.session.execute(
+                insert(import_staging_table), [{key: row[key] for key in columns} for row in rows]
+            )
+            return
+
+        # binary COPY through the asyncpg connection of the session, in the same database transaction; COPY skips
+        # the bind processing of column types, so amounts are converted to minor units here
+        bind_value = import_staging_table.c.value.type.bind_processor(self.session.get_bind().dialect)
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            import_staging_table.name,
+            records=[tuple(bind_value(row[key]) if key == "value" else row[key] for key in columns) for row in rows],
+            columns=columns,
+        )
+
+    async def _validate_create_bulk(
+        self, create_schemas: list[TransactionCreate], created_by: AuthContext
+    ) -> list[dict[str, Any]]:
+        """
+        Validate the references of many TransactionCreate schemas, as _validate_create and the constraints do for one.
+
+        Args:
+            create_schemas (list[TransactionCreate]): The schemas to validate.
+            created_by (AuthContext): The user doing the creating.
+
+        Returns:
+            list[dict[str, Any]]: The index and detail of every invalid schema.
+        """
+        # referenced types and categories are fetched once for the whole batch, not once per item
+        types = await self.type_service.get_by_ids(entity_ids=(schema.type_id for schema in create_schemas))
+        categories = await self.category_service.get_by_ids(
+            entity_ids=(schema.category_id for schema in create_schemas if schema.category_id)
+        )
+        owner_id = self._get_owner_scope(created_by)
+
+        errors = []
+        for index, create_schema in enumerate(create_schemas):
+            try:
+                self._validate_references(
+                    create_schema=create_schema, types=types, categories=categories, owner_id=owner_id
+                )
+            except (EntityNotFoundException, ActionForbiddenException, EntityNotAssociatedException) as e:
+                errors.append({"index": index, "detail": str(e)})
+        return errors
+
+    @staticmethod
+    def _validate_references(
+        create_schema: TransactionCreate,
+        types: dict[int, Type],
+        categories: dict[int, Category],
+        owner_id: int | None,
+    ) -> None:
+        # the checks of the database constraints with their own errors, against prefetched types and categories
+        type_db = types.get(create_schema.type_id)
+        if type_db is None:
+            raise EntityNotFoundException(entity_id=create_schema.type_id, entity_type=EntityType.type)
+
+        if create_schema.category_id:
+            category_db = categories.get(create_schema.category_id)
+            if category_db is None:
+                raise EntityNotFoundException(entity_id=create_schema.category_id, entity_type=EntityType.category)
+            if owner_id is not None and category_db.user_id != owner_id:
+                raise ActionForbiddenException(detail="users can only view their own categories")
+            if category_db.type_id != type_db.id:
+                raise EntityNotAssociatedException(
+                    detail=f"category with id {category_db.id} is not of type with id {type_db.id}"
+                )
+
+    async def _explain_integrity_error(
+        self,
+        schema: TransactionCreate | TransactionUpdate,
+        created_by: AuthContext | None = None,
+        updated_by: AuthContext | None = None,
+        **kwargs,
+    ) -> None:
+        # the type and category are only looked up once the database rejected them, to tell which check failed
+        types = await self.type_service.get_by_ids(entity_ids=[schema.type_id])
+        categories = await self.category_service.get_by_ids(
+            entity_ids=[schema.category_id] if schema.category_id else []
+        )
+        self._validate_references(
+            create_schema=schema,
+            types=types,
+            categories=categories,
+            owner_id=self._get_owner_scope(created_by or updated_by),
+        )
 
 
 def get_transaction_service(
     session: AsyncSession = Depends(get_session),
     category_service: CategoryService = Depends(get_category_service),
     type_service: TypeService = Depends(get_type_service),
-    user_service: UserService = Depends(get_user_service),
 ) -> TransactionService:
     return TransactionService(
         session=session,
         category_service=category_service,
         type_service=type_service,
-        user_service=user_service,
     )
@@ -0,0 +1,130 @@
+from typing import Any, Iterable, Mapping
+
+from sqlalchemy import FromClause, Integer, Select, delete, func, literal, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import get_logger
+from app.db_models import TransactionMonthlyRollup
+from app.db_models.transaction_monthly_rollup import ROLLUP_KEY
+from app.utils.date_utils import get_month_start
+from app.utils.sql_utils import date_trunc, get_upsert_insert
+
+
+logger = get_logger(__name__)
+
+
+class TransactionRollupService:
+    # maintains monthly sums and counts of transactions, writes are only flushed with the caller's transaction
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def add_many(self, transactions: Iterable[Mapping[str, Any]], sign: int = 1) -> None:
+        """
+        Add the values of many transactions to the rollup rows of their months, in a single statement.
+
+        Args:
+            transactions (Iterable[Mapping[str, Any]]): Column values of the transactions.
+            sign (int): 1 to add the transactions, -1 to subtract them.
+        """
+        rollups: dict[tuple, dict[str, Any]] = {}
+        self._group(rollups, transactions, sign=sign)
+        if rollups:
+            await self._upsert(list(rollups.values()))
+
+    async def add_changes(self, previous: Iterable[Mapping[str, Any]], current: Iterable[Mapping[str, Any]]) -> None:
+        """
+        Move the values of transactions from the rollup rows of their previous values to those of their current ones,
+        in a single statement.
+
+        Args:
+            previous (Iterable[Mapping[str, Any]]): Column values of the transactions before the write.
+            current (Iterable[Mapping[str, Any]]): Column values of the transactions after the write.
+        """
+        rollups: dict[tuple, dict[str, Any]] = {}
+        self._group(rollups, previous, sign=-1)
+        self._group(rollups, current, sign=1)
+        # rows a write left unchanged, such as an update of the comment only, need no upsert
+        rollups = {key: rollup for key, rollup in rollups.items() if rollup["total"] or rollup["count"]}
+        if rollups:
+            await self._upsert(list(rollups.values()))
+
+    @staticmethod
+    def _group(rollups: dict[tuple, dict[str, Any]], transactions: Iterable[Mapping[str, Any]], sign: int) -> None:
+        # grouped first, as one statement cannot upsert the same rollup row twice
+        for transaction in transactions:
+            month = get_month_start(transaction["date"])
+            key = (transaction["user_id"], transaction["type_id"], transaction["category_id"], month)
+            rollup = rollups.setdefault(
+                key,
+                {
+                    "user_id": transaction["user_id"],
+                    "type_id": transaction["type_id"],
+                    "category_id": transaction["category_id"],
+                    "month": month,
+                    "total": 0,
+                    "count": 0,
+                },
+            )
+            rollup["total"] += sign * transaction["value"]
+            rollup["count"] += sign
+
+    async def add_from(self, transactions: FromClause, sign: int = 1) -> None:
+        """
+        Add the values of all transactions of a table or subquery to the rollup rows of their months, summed by the
+        database in a single statement.
+
+        Args:
+            transactions (FromClause): Selectable with the user_id, type_id, category_id, date and value columns.
+            sign (int): 1 to add the transactions, -1 to subtract them.
+        """
+        month = date_trunc("month", transactions.c.date)
+        key_columns = (transactions.c.user_id, transactions.c.type_id, transactions.c.category_id, month)
+        # the sign is an integer literal, as a bare number would be bound as an amount and scaled to minor units
+        sign = literal(sign, Integer)
+        await self._upsert(
+            select(*key_columns, sign * func.sum(transactions.c.value), sign * func.count()).group_by(*key_columns),
+        )
+
+    async def _upsert(self, rollups: list[dict[str, Any]] | Select) -> None:
+        insert = get_upsert_insert(self.session.get_bind().dialect.name)
+        if isinstance(rollups, Select):
+            statement = insert(TransactionMonthlyRollup).from_select(
+                ["user_id", "type_id", "category_id", "month", "total", "count"], rollups
+            )
+        else:
+            statement = insert(TransactionMonthlyRollup).values(rollups)
+        # a single statement, so that concurrent writes to the same month cannot lose updates
+        statement = statement.on_conflict_do_update(
+            index_elements=list(ROLLUP_KEY),
+            set_={
+                "total": TransactionMonthlyRollup.total + statement.excluded.total,
+                "count": TransactionMonthlyRollup.count + statement.excluded.count,
+            },
+        )
+        await self.session.execute(statement)
+
+    async def uncategorize(self, category_id: int) -> None:
+        """
+        Move the rollup rows of a category to the uncategorized rows, as its transactions are when it is deleted.
+
+        The rows of the category are locked first, so writes to them wait until they are moved, then added to the
+        uncategorized rows by the database in a single statement and deleted.
+
+        Args:
+            category_id (int): Id of the category being deleted.
+        """
+        logger.info("moving rollups of category with id %s to uncategorized", category_id)
+
+        in_category = TransactionMonthlyRollup.category_id == category_id
+        await self.session.execute(select(TransactionMonthlyRollup.id).where(in_category).with_for_update())
+        await self._upsert(
+            select(
+                TransactionMonthlyRollup.user_id,
+                TransactionMonthlyRollup.type_id,
+                null(),
+                TransactionMonthlyRollup.month,
+                TransactionMonthlyRollup.total,
+                TransactionMonthlyRollup.count,
+            ).where(in_category)
+        )
+        await self.session.execute(delete(TransactionMonthlyRollup).where(in_category))
@@ -4,24 +4,27 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.common.enums import EntityType, TypeName
 from app.common.exceptions import EntityNotFoundException
+from app.core.cache import type_cache
 from app.core.logger import get_logger
 from app.core.session import get_session
 from app.db_models import Type
-from app.schemas import TypeCreate, TypeUpdate, TypeFilters
-from app.services.base import BaseService
+from app.schemas import TypeCreate, TypeUpdate, TypeOut, TypeFilters
+from app.services.base import ReferenceDataService
 
 
 logger = get_logger(__name__)
 
 
-class TypeService(BaseService[Type, TypeCreate, TypeUpdate, TypeFilters]):
+class TypeService(ReferenceDataService[Type, TypeCreate, TypeUpdate, TypeFilters]):
+    out_schema_class = TypeOut
+
     # has available all the methods from BaseService, but only gets are exposed in routes
     def __init__(self, session: AsyncSession) -> None:
-        super().__init__(session=session, db_model_class=Type, entity_type=EntityType.type)
+        super().__init__(session=session, db_model_class=Type, entity_type=EntityType.type, reference_cache=type_cache)
 
     async def get_by_name(self, type_name: TypeName) -> Type:
         """
-        Get type by name.
+        Get type by name, from the reference cache if it is loaded.
 
         Args:
             type_name (TypeName): The name of the type to retrieve.
@@ -32,13 +35,16 @@ class TypeService(BaseService[Type, TypeCreate, TypeUpdate, TypeFilters]):
         Raises:
             EntityNotFoundException: If the type with given name was not found.
         """
-        logger.info(f"executing query to fetch type with name {type_name.value}")
+        if self.reference_cache.is_loaded:
+            type = self.reference_cache.find(lambda cached: cached.name == type_name)
+        else:
+            logger.info("executing query to fetch type with name %s", type_name.value)
 
-        query = await self.session.execute(select(Type).where(Type.name == type_name))
-        type = query.scalar_one_or_none()
+            query = await self.session.execute(select(Type).where(Type.name == type_name))
+            type = query.scalar_one_or_none()
 
         if not type:
-            logger.error(f"type with name {type_name.value} not found")
+            logger.error("type with name %s not found", type_name.value)
             raise EntityNotFoundException(entity_id=type_name, entity_type=EntityType.type)
 
         return type
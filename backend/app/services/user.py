@@ -2,21 +2,24 @@ from fastapi import Depends
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.common.enums import EntityType, RoleName
+from app.common.enums import EntityType
 from app.common.exceptions import UserEmailAlreadyExistsException, ActionForbiddenException
+from app.core.cache import evict_principal
 from app.core.session import get_session
 from app.core.logger import get_logger
 from app.db_models import User
-from app.schemas import UserCreate, UserUpdate, UserFilters
+from app.schemas import UserCreate, UserUpdate, UserOut, UserFilters, AuthContext
 from app.services.base import BaseService
 from app.services.role import get_role_service, RoleService
-from app.utils.password_utils import verify_password
+from app.utils.password_utils import verify_password_async
 
 
 logger = get_logger(__name__)
 
 
 class UserService(BaseService[User, UserCreate, UserUpdate, UserFilters]):
+    out_schema_class = UserOut
+
     def __init__(self, session: AsyncSession, role_service: RoleService) -> None:
         self.role_service = role_service
         super().__init__(session=session, db_model_class=User, entity_type=EntityType.user)
@@ -32,38 +35,19 @@ class UserService(BaseService[User, UserCreate, UserUpdate, UserFilters]):
             User | None: The User db model instance if found, None otherwise.
 
         """
-        logger.info(f"executing query to fetch user with email {email}")
+        logger.info("executing query to fetch user with email %s", email)
 
         query = await self.session.execute(select(User).where(User.email == email))
         entity = query.scalar_one_or_none()
         return entity
 
-    async def is_admin(self, user_id: int) -> bool:
-        """
-        Check if user has the admin role.
-
-        Args:
-            user_id (int): Id of the user to check.
-
-        Returns:
-            bool: True if user is an admin, False otherwise.
-
-        Raises:
-            EntityNotFoundException: If the user with provided id is not found.
-        """
-        user_db = await self.get_by_id(entity_id=user_id)
-        admin_role = await self.role_service.get_by_name(role_name=RoleName.admin)
-        if user_db.role_id == admin_role.id:
-            return True
-        return False
-
-    async def _validate_create(self, create_schema: UserCreate, **kwargs) -> None:
+    async def _explain_integrity_error(self, schema: UserCreate | UserUpdate, **kwargs) -> None:
         """
-        Validate UserCreate schema.
+        Raise the exception a user write rejected by a database constraint stands for.
 
         Args:
-            schema (UserCreate): The schema to validate.
-            kwargs: Additional arguments for creation.
+            schema (UserCreate | UserUpdate): The schema of the rejected write.
+            kwargs: Additional arguments of the write.
 
         Returns:
             None
@@ -71,18 +55,20 @@ class UserService(BaseService[User, UserCreate, UserUpdate, UserFilters]):
         Raises:
             UserEmailAlreadyExists: If user with provided email already exists.
         """
-        # verify user with same email exists
-        if await self.get_by_email(email=create_schema.email):
-            raise UserEmailAlreadyExistsException(email=create_schema.email)
+        # the unique email constraint is checked by the insert, the email is only looked up once it is rejected
+        if await self.get_by_email(email=schema.email):
+            raise UserEmailAlreadyExistsException(email=schema.email)
 
-    async def _validate_update(self, entity_id: int, update_schema: UserUpdate, updated_by: User, **kwargs) -> User:
+    async def _validate_update(
+        self, entity_id: int, update_schema: UserUpdate, updated_by: AuthContext, **kwargs
+    ) -> User:
         """
         Validate UserUpdate schema.
 
         Args:
             entity_id (int): The id of the user to validate.
             schema (UserUpdate): The schema to validate.
-            updated_by (User): The user doing the update.
+            updated_by (AuthContext): The user doing the update.
             kwargs: Additional arguments for update.
 
         Returns:
@@ -97,7 +83,7 @@ class UserService(BaseService[User, UserCreate, UserUpdate, UserFilters]):
         user_db = await self.get_by_id(entity_id=entity_id)
 
         # verify if they can update at all
-        if not (updated_by.id == user_db.id or await self.is_admin(user_id=updated_by.id)):
+        if not (updated_by.id == user_db.id or updated_by.is_admin):
             raise ActionForbiddenException(detail="only admins can update other users")
 
         # verify role exists
@@ -106,7 +92,7 @@ class UserService(BaseService[User, UserCreate, UserUpdate, UserFilters]):
         # verify if they can update roles
         if user_db.is_protected and user_db.role_id != update_schema.role_id:
             raise ActionForbiddenException(detail="cannot update role of protected user")
-        if not await self.is_admin(user_id=updated_by.id) and user_db.role_id != update_schema.role_id:
+        if not updated_by.is_admin and user_db.role_id != update_schema.role_id:
             raise ActionForbiddenException(detail="only admins can update role of users")
 
         # verify user with same email exists, and is not the same as the user being updated
@@ -115,18 +101,20 @@ class UserService(BaseService[User, UserCreate, UserUpdate, UserFilters]):
             raise UserEmailAlreadyExistsException(email=update_schema.email)
 
         # verify old password matches
-        if not verify_password(plain_password=update_schema.old_password, hashed_password=user_db.password_hash):
+        if not await verify_password_async(
+            plain_password=update_schema.old_password, hashed_password=user_db.password_hash
+        ):
             raise ActionForbiddenException(detail="old password does not match")
 
         return user_db
 
-    async def _validate_delete(self, entity_id: int, deleted_by: User, **kwargs) -> User:
+    async def _validate_delete(self, entity_id: int, deleted_by: AuthContext, **kwargs) -> User:
         """
         Validate deletion of a user.
 
         Args:
             entity_id (int): The id of the user to validate.
-            deleted_by (User): The user doing the delete.
+            deleted_by (AuthContext): The user doing the delete.
             kwargs: Additional arguments for deletion.
 
         Returns:
@@ -140,7 +128,7 @@ class UserService(BaseService[User, UserCreate, UserUpdate, UserFilters]):
         user_db = await self.get_by_id(entity_id=entity_id)
 
         # verify they can delete
-        if not (deleted_by.id == user_db.id or await self.is_admin(user_id=deleted_by.id)):
+        if not (deleted_by.id == user_db.id or deleted_by.is_admin):
             raise ActionForbiddenException(detail="only admins can delete other users")
 
         # disallow deleting initial admin
@@ -149,6 +137,20 @@ class UserService(BaseService[User, UserCreate, UserUpdate, UserFilters]):
 
         return user_db
 
+    async def update(self, entity_id: int, update_schema: UserUpdate, **kwargs) -> User:
+        # bump the version in sql, so that tokens issued before the update are no longer trusted
+        user_db = await super().update(
+            entity_id=entity_id, update_schema=update_schema, token_version=User.token_version + 1, **kwargs
+        )
+        # evicted by id, since the email the principal is cached under may have just changed
+        evict_principal(user_id=user_db.id, min_token_version=user_db.token_version)
+        return user_db
+
+    async def delete(self, entity_id: int, **kwargs) -> User:
+        user_db = await super().delete(entity_id=entity_id, **kwargs)
+        evict_principal(user_id=user_db.id, min_token_version=(user_db.token_version or 0) + 1)
+        return user_db
+
 
 def get_user_service(
     session: AsyncSession = Depends(get_session), role_service: RoleService = Depends(get_role_service)
@@ -0,0 +1,154 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+
+KeyT = TypeVar("KeyT", bound=Hashable)
+ValueT = TypeVar("ValueT")
+
+
+class TTLCache(Generic[KeyT, ValueT]):
+    """
+    Bounded in-memory cache whose entries expire after a fixed time to live.
+
+    When full, the least recently used entry is evicted. Not thread-safe, meant to be used from the event loop.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[KeyT, tuple[float, ValueT]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: KeyT) -> ValueT | None:
+        """
+        Get a value from the cache.
+
+        Args:
+            key (KeyT): The key of the value to retrieve.
+
+        Returns:
+            ValueT | None: The cached value, None if missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: KeyT, value: ValueT) -> None:
+        """
+        Put a value into the cache, evicting the least recently used entries if over max size.
+
+        Args:
+            key (KeyT): The key to store the value under.
+            value (ValueT): The value to store.
+        """
+        if self.max_size <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: KeyT) -> None:
+        """
+        Remove a value from the cache, if present.
+
+        Args:
+            key (KeyT): The key of the value to remove.
+        """
+        self._entries.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[KeyT, ValueT], bool]) -> None:
+        """
+        Remove all values matching the predicate from the cache.
+
+        Args:
+            predicate (Callable[[KeyT, ValueT], bool]): Returns True for key-value pairs that should be removed.
+        """
+        for key in [key for key, (_, value) in self._entries.items() if predicate(key, value)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """
+        Remove all values from the cache.
+        """
+        self._entries.clear()
+
+
+class ReferenceCache(Generic[KeyT, ValueT]):
+    """
+    In-memory snapshot of a small table holding fixed reference data.
+
+    The snapshot is replaced as a whole on every load and never expires. Until the first load the cache is empty and
+    callers are expected to fall back to the database.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[KeyT, ValueT] | None = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._entries is not None
+
+    def load(self, entries: dict[KeyT, ValueT]) -> None:
+        """
+        Replace the cached snapshot.
+
+        Args:
+            entries (dict[KeyT, ValueT]): The new snapshot.
+        """
+        self._entries = dict(entries)
+
+    def get(self, key: KeyT) -> ValueT | None:
+        """
+        Get a value from the cache.
+
+        Args:
+            key (KeyT): The key of the value to retrieve.
+
+        Returns:
+            ValueT | None: The cached value, None if missing or not loaded.
+        """
+        if self._entries is None:
+            return None
+        return self._entries.get(key)
+
+    def find(self, predicate: Callable[[ValueT], bool]) -> ValueT | None:
+        """
+        Get the first value matching the predicate.
+
+        Args:
+            predicate (Callable[[ValueT], bool]): Returns True for the value to retrieve.
+
+        Returns:
+            ValueT | None: The matching value, None if there is no match or not loaded.
+        """
+        return next((value for value in self.values() if predicate(value)), None)
+
+    def values(self) -> list[ValueT]:
+        """
+        Get all cached values.
+
+        Returns:
+            list[ValueT]: The cached values, empty if not loaded.
+        """
+        if self._entries is None:
+            return []
+        return list(self._entries.values())
+
+    def clear(self) -> None:
+        """
+        Drop the snapshot, so the cache is no longer loaded.
+        """
+        self._entries = None
@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+
+
+def get_month_start(day: date) -> date:
+    """
+    Get the first day of the month of a date.
+
+    Args:
+        day (date): Any day of the month.
+
+    Returns:
+        date: The first day of the month.
+    """
+    return day.replace(day=1)
+
+
+def get_next_month_start(day: date) -> date:
+    """
+    Get the first day of the month following the month of a date.
+
+    Args:
+        day (date): Any day of the month.
+
+    Returns:
+        date: The first day of the next month.
+    """
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def get_whole_months(start: date | None, end: date | None) -> tuple[date | None, date | None] | None:
+    """
+    Get the whole months within an inclusive date range, open on sides without a bound.
+
+    Args:
+        start (date | None): First day of the range, None if unbounded.
+        end (date | None): Last day of the range, None if unbounded.
+
+    Returns:
+        tuple[date | None, date | None] | None: First day of the first whole month and first day after the last whole
+            month, None on unbounded sides, or None if the range covers no whole month.
+    """
+    first_month = None if start is None else (start if start.day == 1 else get_next_month_start(start))
+    end_month = None if end is None else get_month_start(end + timedelta(days=1))
+
+    if first_month is not None and end_month is not None and first_month >= end_month:
+        return None
+    return first_month, end_month
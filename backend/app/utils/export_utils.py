@@ -0,0 +1,47 @@
+import csv
+import io
+from typing import AsyncIterator, Sequence, Any
+
+from pydantic import BaseModel
+
+from app.common.enums import ExportFormat
+from app.utils.serialization_utils import get_record_adapter
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+async def serialize_chunks(
+    chunks: AsyncIterator[Sequence[Any]], schema: type[BaseModel], export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """
+    Serialize chunks of entities into NDJSON or CSV text, one output chunk per input chunk.
+
+    Args:
+        chunks (AsyncIterator[Sequence[Any]]): Chunks of rows or entities to serialize.
+        schema (type[BaseModel]): The output schema, its fields are read from the rows without validation.
+        export_format (ExportFormat): The format to serialize to.
+
+    Yields:
+        str: The serialized chunk, CSV output starts with a header row.
+    """
+    if export_format == ExportFormat.csv:
+        fieldnames = list(schema.model_fields)
+        adapter = get_record_adapter(list[schema])
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+        writer.writeheader()
+        yield buffer.getvalue()
+
+        async for chunk in chunks:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+            writer.writerows(adapter.dump_python(chunk, mode="json"))
+            yield buffer.getvalue()
+    else:
+        adapter = get_record_adapter(schema)
+        async for chunk in chunks:
+            yield "".join(adapter.dump_json(entity).decode() + "\n" for entity in chunk)
@@ -0,0 +1,90 @@
+from functools import lru_cache
+from typing import Any, Callable, NamedTuple
+
+from pydantic import BaseModel
+from sqlalchemy import ColumnElement, or_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.common.enums import FilterOperator, SearchMode
+from app.core.logger import get_logger
+from app.utils.sanitization_utils import escape_like
+from app.utils.sql_utils import text_match
+
+
+logger = get_logger(__name__)
+
+
+class FilterPlanEntry(NamedTuple):
+    filter_name: str
+    column: InstrumentedAttribute
+    operator: FilterOperator
+
+
+# condition builders per operator, list and keyword values are never empty when called
+FILTER_CONDITIONS: dict[FilterOperator, Callable[[InstrumentedAttribute, Any], ColumnElement[bool]]] = {
+    FilterOperator.in_: lambda column, values: column.in_(values),
+    FilterOperator.gte: lambda column, value: column >= value,
+    FilterOperator.lte: lambda column, value: column <= value,
+    FilterOperator.ilike: lambda column, keywords: or_(
+        *(column.ilike(f"%{escape_like(keyword)}%", escape="\\") for keyword in keywords)
+    ),
+    FilterOperator.match: lambda column, keywords: or_(*(text_match(column, keyword) for keyword in keywords)),
+}
+
+# operators keyword filters are applied with, substring search is served by trigram indexes on PostgreSQL
+KEYWORD_OPERATORS: dict[SearchMode, FilterOperator] = {
+    SearchMode.substring: FilterOperator.ilike,
+    SearchMode.fulltext: FilterOperator.match,
+    SearchMode.ranked: FilterOperator.match,
+}
+
+
+@lru_cache
+def compile_filter_plan(db_model_class: type, filters_class: type[BaseModel]) -> tuple[FilterPlanEntry, ...]:
+    """
+    Resolve the filters declared by a filter schema into model columns and operators, once per schema and model.
+
+    Args:
+        db_model_class (type): The database model the filters are applied to.
+        filters_class (type[BaseModel]): The filter schema declaring list, gt, lt and keyword filters.
+
+    Returns:
+        tuple[FilterPlanEntry, ...]: One entry per filter matching a column of the model.
+    """
+    declared_filters = (
+        (FilterOperator.in_, filters_class.list_filters, ""),
+        (FilterOperator.gte, filters_class.gt_filters, "_gt"),
+        (FilterOperator.lte, filters_class.lt_filters, "_lt"),
+        (FilterOperator.ilike, filters_class.kw_filters, ""),
+    )
+
+    plan = []
+    for operator, filter_names, suffix in declared_filters:
+        for filter_name in filter_names:
+            column = getattr(db_model_class, filter_name.removesuffix(suffix), None)
+            if column is None:
+                logger.warning("ignoring invalid filter: %s", filter_name)
+                continue
+            plan.append(FilterPlanEntry(filter_name=filter_name, column=column, operator=operator))
+
+    return tuple(plan)
+
+
+def get_active_filters(db_model_class: type, filters: BaseModel) -> list[tuple[FilterPlanEntry, Any]]:
+    """
+    Get the plan entries of a filter schema instance that were given a value, with their values.
+
+    Args:
+        db_model_class (type): The database model the filters are applied to.
+        filters (BaseModel): The filter schema instance.
+
+    Returns:
+        list[tuple[FilterPlanEntry, Any]]: Entries and values of the filters to apply, empty lists are skipped.
+    """
+    active_filters = []
+    for entry in compile_filter_plan(db_model_class, type(filters)):
+        value = getattr(filters, entry.filter_name)
+        if value is None or (isinstance(value, list) and not value):
+            continue
+        active_filters.append((entry, value))
+    return active_filters
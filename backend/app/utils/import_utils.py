@@ -0,0 +1,188 @@
+import codecs
+import csv
+import html
+import re
+from typing import AsyncIterator, Mapping, TypeVar
+
+from app.common.enums import TypeName
+from app.common.exceptions import ImportRecordTooLargeException
+
+
+ItemT = TypeVar("ItemT")
+
+# columns read from imported CSV files, the same as in exported ones, other columns such as id are ignored
+CSV_COLUMNS = ("type_id", "category_id", "date", "value", "comment")
+
+# an OFX tag and the text up to the next tag, leaf elements are not closed in SGML OFX
+OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<]*)")
+
+
+async def decode_chunks(chunks: AsyncIterator[bytes], encoding: str = "utf-8-sig") -> AsyncIterator[str]:
+    """
+    Decode chunks of bytes into text, characters split between chunks are decoded with the next chunk.
+
+    Args:
+        chunks (AsyncIterator[bytes]): Chunks of encoded text, such as a request stream.
+        encoding (str): The encoding of the text, UTF-8 with an optional byte order mark by default.
+
+    Yields:
+        str: The decoded text, undecodable bytes are replaced.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+async def iter_lines(texts: AsyncIterator[str], max_size: int) -> AsyncIterator[str]:
+    """
+    Split chunks of text into lines, lines split between chunks are joined.
+
+    Args:
+        texts (AsyncIterator[str]): Chunks of text.
+        max_size (int): The maximum number of characters of a line.
+
+    Yields:
+        str: The next line, with its line ending.
+
+    Raises:
+        ImportRecordTooLargeException: If a line is longer than max_size.
+    """
+    pending = ""
+    async for text in texts:
+        lines = (pending + text).splitlines(keepends=True)
+        # the last line is incomplete unless the chunk ends with a line break
+        pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines:
+            if len(line) > max_size:
+                raise ImportRecordTooLargeException(max_size=max_size)
+            yield line
+        if len(pending) > max_size:
+            raise ImportRecordTooLargeException(max_size=max_size)
+    if pending:
+        yield pending
+
+
+async def iter_csv_records(texts: AsyncIterator[str], max_size: int) -> AsyncIterator[dict[str, str | None]]:
+    """
+    Parse CSV text with a header row into records, one record at a time.
+
+    Args:
+        texts (AsyncIterator[str]): Chunks of CSV text.
+        max_size (int): The maximum number of characters of a record, quoted line breaks included.
+
+    Yields:
+        dict[str, str | None]: The CSV_COLUMNS of the next record, None for empty or missing values.
+
+    Raises:
+        ImportRecordTooLargeException: If a record is longer than max_size, such as after an unmatched quote.
+    """
+    header = None
+    pending, pending_size, quoted = [], 0, False
+    async for line in iter_lines(texts, max_size=max_size):
+        pending.append(line)
+        pending_size += len(line)
+        if pending_size > max_size:
+            raise ImportRecordTooLargeException(max_size=max_size)
+        # the quotes of each line are only counted once, an odd number in total means a quoted value continues
+        quoted ^= line.count('"') % 2 == 1
+        if quoted:
+            continue
+
+        values = next(csv.reader(["".join(pending)]), [])
+        pending, pending_size = [], 0
+        if not values:
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+
+        record = dict(zip(header, values))
+        yield {column: record.get(column) or None for column in CSV_COLUMNS}
+
+
+async def iter_ofx_records(
+    texts: AsyncIterator[str], type_ids: Mapping[TypeName, int], max_size: int
+) -> AsyncIterator[dict[str, str | int | None]]:
+    """
+    Parse the statement transactions of OFX text, SGML or XML, into records, one record at a time.
+
+    Debits are expenses and credits are incomes, the value of a record is the absolute amount.
+
+    Args:
+        texts (AsyncIterator[str]): Chunks of OFX text.
+        type_ids (Mapping[TypeName, int]): Ids of the income and expense types.
+        max_size (int): The maximum number of characters of text without a tag.
+
+    Yields:
+        dict[str, str | int | None]: The type_id, date, value and comment of the next transaction.
+
+    Raises:
+        ImportRecordTooLargeException: If more than max_size characters are not followed by a tag.
+    """
+    pending = ""
+    transaction = None
+
+    def parse_tags(text: str):
+        nonlocal transaction
+        for closing, tag, content in OFX_TAG.findall(text):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if closing and transaction is not None:
+                    yield _get_ofx_record(transaction, type_ids=type_ids)
+                transaction = None if closing else {}
+            elif transaction is not None and not closing:
+                transaction[tag] = html.unescape(content.strip())
+
+    async for text in texts:
+        pending += text
+        # the text of the last tag may continue in the next chunk
+        cut = pending.rfind("<")
+        if cut > 0:
+            for record in parse_tags(pending[:cut]):
+                yield record
+            pending = pending[cut:]
+        if len(pending) > max_size:
+            raise ImportRecordTooLargeException(max_size=max_size)
+
+    for record in parse_tags(pending):
+        yield record
+
+
+def _get_ofx_record(transaction: dict[str, str], type_ids: Mapping[TypeName, int]) -> dict[str, str | int | None]:
+    # values are left as text, they are validated like any other imported record
+    amount = transaction.get("TRNAMT", "")
+    posted = transaction.get("DTPOSTED", "")
+    return {
+        "type_id": type_ids[TypeName.expense if amount.startswith("-") else TypeName.income],
+        "category_id": None,
+        # dates are YYYYMMDD, optionally followed by a time and time zone
+        "date": f"{posted[:4]}-{posted[4:6]}-{posted[6:8]}" if len(posted) >= 8 else posted or None,
+        "value": amount.lstrip("+-") or None,
+        "comment": transaction.get("MEMO") or transaction.get("NAME") or None,
+    }
+
+
+async def iter_batches(items: AsyncIterator[ItemT], batch_size: int) -> AsyncIterator[list[ItemT]]:
+    """
+    Group items into batches.
+
+    Args:
+        items (AsyncIterator[ItemT]): The items to group.
+        batch_size (int): The number of items in a batch, the last batch may be smaller.
+
+    Yields:
+        list[ItemT]: The next batch.
+    """
+    batch = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,47 @@
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Any, Sequence
+
+from app.common.exceptions import InvalidCursorException
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the sort key of the last returned entity into an opaque cursor.
+
+    Args:
+        values (Sequence[Any]): Values of the sort columns, dates are stored in ISO format.
+
+    Returns:
+        str: The url-safe cursor.
+    """
+    payload = [value.isoformat() if isinstance(value, date) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str, python_types: Sequence[type]) -> list[Any]:
+    """
+    Decode a cursor created by encode_cursor back into sort key values.
+
+    Args:
+        cursor (str): The cursor to decode.
+        python_types (Sequence[type]): Python types of the sort columns, in order.
+
+    Returns:
+        list[Any]: Values of the sort columns.
+
+    Raises:
+        InvalidCursorException: If the cursor is malformed or does not match the sort columns.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(payload, list) or len(payload) != len(python_types):
+            raise ValueError("cursor does not match sort columns")
+        return [
+            python_type.fromisoformat(value) if issubclass(python_type, date) else python_type(value)
+            for python_type, value in zip(python_types, payload)
+        ]
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError) as e:
+        raise InvalidCursorException(cursor=cursor) from e
@@ -1,8 +1,18 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
 from passlib.context import CryptContext
 
+from app.common.enums import ExecutorType
+from app.core.config import get_settings
+
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is deliberately slow, so hashing runs in a bounded pool instead of on the event loop;
+# calls beyond max workers wait in the pool queue without blocking other requests
+_password_executor: Executor | None = None
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -10,3 +20,42 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+def get_password_executor() -> Executor:
+    """
+    Get the executor running password hashing, creating it on first use.
+
+    Returns:
+        Executor: Thread or process pool, as configured in settings.
+    """
+    global _password_executor
+    if _password_executor is None:
+        settings = get_settings()
+        if settings.password_hashing_executor == ExecutorType.process:
+            _password_executor = ProcessPoolExecutor(max_workers=settings.password_hashing_max_workers)
+        else:
+            _password_executor = ThreadPoolExecutor(
+                max_workers=settings.password_hashing_max_workers, thread_name_prefix="password-hashing"
+            )
+    return _password_executor
+
+
+def shutdown_password_executor() -> None:
+    """
+    Shut down the password hashing executor, waiting for running calls to finish.
+    """
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=True)
+        _password_executor = None
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_password_executor(), verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_password_executor(), get_password_hash, password)
@@ -0,0 +1,92 @@
+from functools import lru_cache
+from typing import Annotated, Any, Callable, Mapping, TypedDict, get_args, get_origin
+
+from fastapi import Response
+from pydantic import BaseModel, SerializerFunctionWrapHandler, TypeAdapter, WrapSerializer
+from sqlalchemy import Row
+
+
+def _get_record_reader(field_names: tuple[str, ...]) -> Callable[[Any, SerializerFunctionWrapHandler], Any]:
+    def read_record(value: Any, handler: SerializerFunctionWrapHandler) -> Any:
+        # rows are read by column name and entities by attribute, dictionaries as they are
+        if isinstance(value, Row):
+            value = value._asdict()
+        elif not isinstance(value, dict):
+            value = {name: getattr(value, name) for name in field_names}
+        return handler(value)
+
+    return read_record
+
+
+@lru_cache
+def get_record_type(annotation: Any) -> Any:
+    """
+    Get the type serializing like an annotation, with schemas replaced by typed dictionaries of their fields.
+
+    Typed dictionaries are serialized without being validated first, from dictionaries, rows or entities with the
+    fields of the schema. Other keys are left out, and field types keep their serializers, such as amounts as JSON
+    numbers.
+
+    Args:
+        annotation (Any): The type to serialize, such as a schema or a list or page of schemas.
+
+    Returns:
+        Any: The record type.
+    """
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        fields = {}
+        for name, field in annotation.model_fields.items():
+            field_type = get_record_type(field.annotation)
+            # metadata such as constraints and serializers is not part of the annotation of a field
+            fields[name] = Annotated[(field_type, *field.metadata)] if field.metadata else field_type
+        return Annotated[TypedDict(annotation.__name__, fields), WrapSerializer(_get_record_reader(tuple(fields)))]
+    if get_origin(annotation) is list:
+        return list[get_record_type(get_args(annotation)[0])]
+    return annotation
+
+
+@lru_cache
+def get_record_adapter(annotation: Any) -> TypeAdapter:
+    """
+    Get the adapter of the record type of an annotation, its serializer is compiled once and reused by every response.
+
+    Args:
+        annotation (Any): The type to serialize.
+
+    Returns:
+        TypeAdapter: The compiled adapter.
+    """
+    return TypeAdapter(get_record_type(annotation))
+
+
+def to_json_bytes(content: Any, annotation: Any) -> bytes:
+    """
+    Serialize content shaped like a type straight to JSON bytes, without validating it.
+
+    Meant for values read from the database, which were validated when they were written.
+
+    Args:
+        content (Any): The content to serialize, with dictionaries, rows or entities in place of schemas.
+        annotation (Any): The type of the content.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    return get_record_adapter(annotation).dump_json(content)
+
+
+class SerializedJSONResponse(Response):
+    """
+    JSON response serialized by a compiled type adapter.
+
+    Returned from routes in place of the content, so neither the content nor the response model of the route are
+    validated, and the standard JSON encoder is skipped. The route still declares its response model for the
+    documentation.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self, content: Any, annotation: Any, status_code: int = 200, headers: Mapping[str, str] | None = None
+    ) -> None:
+        super().__init__(content=to_json_bytes(content, annotation), status_code=status_code, headers=headers)
@@ -0,0 +1,187 @@
+from decimal import Decimal
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import BigInteger, Boolean, ColumnElement, Date, Float, any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import Insert as PostgresqlInsert, insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import Insert as SqliteInsert, insert as sqlite_insert
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.sql.visitors import InternalTraversal
+from sqlalchemy.types import TypeDecorator
+
+
+class date_trunc(FunctionElement):
+    """
+    Truncate a date to the first day of its day, week (starting on monday) or month, as a date.
+
+    Compiles to date_trunc on PostgreSQL and to date modifiers on SQLite, which has no date_trunc.
+    """
+
+    type = Date()
+    inherit_cache = True
+    name = "date_trunc"
+    # precision is rendered into the SQL, so it has to be part of the statement cache key
+    _traverse_internals = FunctionElement._traverse_internals + [("precision", InternalTraversal.dp_string)]
+
+    def __init__(self, precision: str, column) -> None:
+        if precision not in ("day", "week", "month"):
+            raise ValueError(f"unsupported date_trunc precision: {precision}")
+        self.precision = precision
+        super().__init__(column)
+
+
+@compiles(date_trunc)
+def _compile_date_trunc(element: date_trunc, compiler, **kwargs) -> str:
+    column = compiler.process(element.clauses, **kwargs)
+    return f"CAST(date_trunc('{element.precision}', {column}) AS DATE)"
+
+
+@compiles(date_trunc, "sqlite")
+def _compile_date_trunc_sqlite(element: date_trunc, compiler, **kwargs) -> str:
+    column = compiler.process(element.clauses, **kwargs)
+    if element.precision == "month":
+        return f"date({column}, 'start of month')"
+    if element.precision == "week":
+        # %w is 0 for sunday, shift so that weeks start on monday like in PostgreSQL
+        return f"date({column}, '-' || ((CAST(strftime('%w', {column}) AS INTEGER) + 6) % 7) || ' days')"
+    return f"date({column})"
+
+
+# text search configuration of the full-text indexes, without stemming as comments and names can be in any language
+TEXT_SEARCH_CONFIG = "simple"
+
+# decimal places of the currency, amounts are stored as counts of its minor units, so changing it needs a migration
+# rescaling the stored values rather than a setting
+CURRENCY_EXPONENT = 2
+
+
+class text_match(FunctionElement):
+    """
+    Check if a text column matches a plain text query using full-text search.
+
+    Compiles to a tsvector match on PostgreSQL, in the same form as the expression indexes of the searched columns,
+    and to a case-insensitive substring check on SQLite, which has no full-text search built in.
+    """
+
+    type = Boolean()
+    inherit_cache = True
+    name = "text_match"
+
+    def __init__(self, column, query: str) -> None:
+        super().__init__(column, query)
+
+
+class text_rank(FunctionElement):
+    """
+    Rank how well a text column matches a plain text query, higher is better.
+
+    Compiles to ts_rank on PostgreSQL and to 1 for matches and 0 otherwise on SQLite.
+    """
+
+    type = Float()
+    inherit_cache = True
+    name = "text_rank"
+
+    def __init__(self, column, query: str) -> None:
+        super().__init__(column, query)
+
+
+def _compile_text_search_arguments(element: FunctionElement, compiler, **kwargs) -> tuple[str, str]:
+    column, query = (compiler.process(clause, **kwargs) for clause in element.clauses)
+    # the configuration is inlined, so that the expression matches the one of the index
+    tsvector = f"to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce({column}, ''))"
+    tsquery = f"plainto_tsquery('{TEXT_SEARCH_CONFIG}', {query})"
+    return tsvector, tsquery
+
+
+@compiles(text_match)
+def _compile_text_match(element: text_match, compiler, **kwargs) -> str:
+    tsvector, tsquery = _compile_text_search_arguments(element, compiler, **kwargs)
+    return f"{tsvector} @@ {tsquery}"
+
+
+@compiles(text_match, "sqlite")
+def _compile_text_match_sqlite(element: text_match, compiler, **kwargs) -> str:
+    column, query = (compiler.process(clause, **kwargs) for clause in element.clauses)
+    return f"(instr(lower(coalesce({column}, '')), lower({query})) > 0)"
+
+
+@compiles(text_rank)
+def _compile_text_rank(element: text_rank, compiler, **kwargs) -> str:
+    tsvector, tsquery = _compile_text_search_arguments(element, compiler, **kwargs)
+    return f"ts_rank({tsvector}, {tsquery})"
+
+
+@compiles(text_rank, "sqlite")
+def _compile_text_rank_sqlite(element: text_rank, compiler, **kwargs) -> str:
+    column, query = (compiler.process(clause, **kwargs) for clause in element.clauses)
+    return f"CAST(instr(lower(coalesce({column}, '')), lower({query})) > 0 AS REAL)"
+
+
+class MinorUnits(TypeDecorator):
+    """
+    Exact decimal amount of money, stored as a BIGINT count of minor units such as cents.
+
+    Integer columns are summed and compared faster than NUMERIC ones, while amounts are Decimals in Python.
+    Aggregates of the column keep its type, so their results are converted back too.
+    """
+
+    impl = BigInteger
+    cache_ok = True
+
+    def __init__(self, exponent: int = CURRENCY_EXPONENT) -> None:
+        super().__init__()
+        # number of decimal places of the currency, 2 for cents
+        self.exponent = exponent
+
+    @property
+    def python_type(self) -> type:
+        return Decimal
+
+    def process_bind_param(self, value: Any, dialect) -> int | None:
+        if value is None:
+            return None
+        minor_units = Decimal(str(value) if isinstance(value, float) else value).scaleb(self.exponent)
+        if minor_units != minor_units.to_integral_value():
+            raise ValueError(f"amount {value} has more than {self.exponent} decimal places")
+        return int(minor_units)
+
+    def process_result_value(self, value: Any, dialect) -> Decimal | None:
+        if value is None:
+            return None
+        # sums are NUMERIC on PostgreSQL and averages are floats on SQLite, both are scaled back as well
+        return Decimal(str(value) if isinstance(value, float) else value).scaleb(-self.exponent)
+
+
+def get_upsert_insert(dialect_name: str) -> Callable[..., PostgresqlInsert | SqliteInsert]:
+    """
+    Get the insert construct of a dialect, which supports ON CONFLICT upserts.
+
+    Args:
+        dialect_name (str): Name of the dialect of the session bind.
+
+    Returns:
+        Callable[..., PostgresqlInsert | SqliteInsert]: The SQLite insert for SQLite, the PostgreSQL one otherwise.
+    """
+    return sqlite_insert if dialect_name == "sqlite" else postgresql_insert
+
+
+def in_values(column: ColumnElement, values: Sequence[Any], dialect_name: str) -> ColumnElement[bool]:
+    """
+    Condition that a column is one of many values.
+
+    PostgreSQL gets the values as a single array parameter, as an IN list binds one parameter per value and asyncpg
+    takes at most 32767 of them.
+
+    Args:
+        column (ColumnElement): The column to compare.
+        values (Sequence[Any]): The values the column may have.
+        dialect_name (str): Name of the dialect of the session bind.
+
+    Returns:
+        ColumnElement[bool]: column = ANY(array) on PostgreSQL, column IN (values) otherwise.
+    """
+    if dialect_name == "sqlite":
+        return column.in_(values)
+    return column == any_(literal(list(values), ARRAY(column.type)))
@@ -0,0 +1,105 @@
+"""
+Benchmark keyword search on transaction comments, sequential ILIKE against the trigram and full-text indexes.
+
+Needs a PostgreSQL database with the pg_trgm extension available, configured like the app through the environment.
+Everything runs in a temporary table inside a transaction that is rolled back, so the database is left untouched.
+
+Run from the backend directory:
+
+    python -m benchmarks.keyword_search --rows 1000000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.common.enums import FilterOperator
+from app.core.config import get_settings
+from app.utils.filter_utils import FILTER_CONDITIONS
+
+
+settings = get_settings()
+
+# temporary copy of the comment column, indexed like the transaction table
+benchmark_table = Table(
+    "benchmark_transaction",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("comment", String),
+    prefixes=["TEMPORARY"],
+)
+
+WORDS = ["rent", "groceries", "salary", "coffee", "fuel", "insurance", "gift", "dinner", "books", "holiday"]
+
+
+async def populate(conn: AsyncConnection, rows: int) -> None:
+    await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    await conn.run_sync(benchmark_table.create)
+    # two words from the list around a random-looking token, so trigrams of the keywords are not in every row
+    await conn.execute(
+        text(
+            "INSERT INTO benchmark_transaction (id, comment) "
+            "SELECT i, w.words[1 + i % cardinality(w.words)] || ' ' || md5(i::text) || ' ' "
+            "|| w.words[1 + (i / 7) % cardinality(w.words)] "
+            "FROM generate_series(1, CAST(:rows AS integer)) AS i, (SELECT CAST(:words AS text[]) AS words) AS w"
+        ),
+        {"rows": rows, "words": WORDS},
+    )
+    await conn.execute(
+        text("CREATE INDEX ix_benchmark_comment_trgm ON benchmark_transaction USING gin (comment gin_trgm_ops)")
+    )
+    await conn.execute(
+        text(
+            "CREATE INDEX ix_benchmark_comment_tsvector ON benchmark_transaction "
+            "USING gin (to_tsvector('simple', coalesce(comment, '')))"
+        )
+    )
+    await conn.execute(text("ANALYZE benchmark_transaction"))
+
+
+async def measure(conn: AsyncConnection, operator: FilterOperator, keyword: str, use_index: bool, repeat: int) -> float:
+    statement = select(func.count()).where(FILTER_CONDITIONS[operator](benchmark_table.c.comment, [keyword]))
+    # the current path without the indexes, as before the keyword search migration
+    await conn.execute(text(f"SET LOCAL enable_bitmapscan = {'on' if use_index else 'off'}"))
+    await conn.execute(text(f"SET LOCAL enable_indexscan = {'on' if use_index else 'off'}"))
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await conn.execute(statement)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def main(rows: int, repeat: int, keyword: str) -> None:
+    engine = create_async_engine(settings.async_database_url)
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            print(f"populating {rows} rows")
+            await populate(conn, rows)
+
+            for label, operator, use_index in (
+                ("ILIKE, sequential scan", FilterOperator.ilike, False),
+                ("ILIKE, trigram index", FilterOperator.ilike, True),
+                ("full-text, tsvector index", FilterOperator.match, True),
+            ):
+                median = await measure(conn, operator, keyword, use_index, repeat)
+                print(f"{label:<28} {median:10.2f} ms (median of {repeat})")
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--keyword", default="insurance")
+    args = parser.parse_args()
+
+    asyncio.run(main(rows=args.rows, repeat=args.repeat, keyword=args.keyword))
@@ -0,0 +1,106 @@
+"""
+Benchmark serializing a page of transactions, ORM entities through the response model against rows through the
+compiled type adapter.
+
+Runs on the test database, an in-memory SQLite by default, as the work measured happens in Python: building entities
+or rows from the result, validating them and encoding JSON. The query itself is the same for both paths.
+
+Run from the backend directory:
+
+    python -m benchmarks.list_serialization --rows 10000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import get_settings
+from app.db_models import Transaction
+from app.db_models.base import Base
+from app.schemas import Page, TransactionOut
+from app.utils.serialization_utils import SerializedJSONResponse
+
+
+settings = get_settings()
+
+# what FastAPI builds from response_model=Page[TransactionOut] of the list route
+response_field = create_model_field(name="Response_get_transactions", type_=Page[TransactionOut], mode="serialization")
+
+
+async def populate(session: AsyncSession, rows: int) -> None:
+    await session.execute(
+        insert(Transaction),
+        [
+            {
+                "user_id": 1,
+                "type_id": 1 + i % 2,
+                "category_id": None,
+                "date": date(2025, 1, 1) + timedelta(days=i % 365),
+                "value": Decimal(i % 100000) / 100,
+                "comment": f"transaction {i}",
+            }
+            for i in range(rows)
+        ],
+    )
+
+
+async def serialize_entities(session: AsyncSession) -> bytes:
+    # the path before, entities returned as the page and handled by the response model of the route
+    transactions = (await session.execute(select(Transaction))).scalars().all()
+    content = await serialize_response(
+        field=response_field, response_content={"items": transactions, "next_cursor": None}
+    )
+    # entities are tracked by the session until it is closed, like they are for the rest of a request
+    session.expunge_all()
+    return JSONResponse(content).body
+
+
+async def serialize_rows(session: AsyncSession) -> bytes:
+    rows = (await session.execute(select(*Transaction.__table__.columns))).all()
+    return SerializedJSONResponse({"items": rows, "next_cursor": None}, annotation=Page[TransactionOut]).body
+
+
+async def measure(session: AsyncSession, serialize, repeat: int) -> tuple[float, int]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = await serialize(session)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(body)
+
+
+async def main(rows: int, repeat: int) -> None:
+    engine = create_async_engine(settings.test_database_url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine) as session:
+        print(f"populating {rows} rows")
+        await populate(session, rows)
+
+        for label, serialize in (
+            ("ORM entities, response model", serialize_entities),
+            ("rows, compiled type adapter", serialize_rows),
+        ):
+            median, size = await measure(session, serialize, repeat)
+            print(f"{label:<30} {median:10.2f} ms (median of {repeat}, {size} bytes)")
+        await session.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(main(rows=args.rows, repeat=args.repeat))
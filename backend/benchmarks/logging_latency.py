@@ -0,0 +1,109 @@
+"""
+Benchmark request latency with INFO logging enabled, synchronous handlers on every module logger against the queue
+pipeline set up by configure_logging.
+
+Requests go to a route that logs like the list routes do, through the app in process. Console output is sent to the
+null device, the log file is written to a temporary directory. No database is needed.
+
+Run from the backend directory:
+
+    python -m benchmarks.logging_latency --requests 2000 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.common.enums import LogLevel
+from app.core.config import get_settings
+from app.core.logger import configure_logging, get_logger, shutdown_logging
+from app.schemas import TransactionFilters
+
+
+settings = get_settings()
+
+logger = get_logger("app.benchmarks.logging_latency")
+
+app = FastAPI()
+
+
+@app.get("/transactions")
+async def get_transactions() -> list:
+    # the calls a list request makes, in the route and in the services
+    filters = TransactionFilters(type_id=[1, 2], comment=["rent"])
+    logger.info("fetching all transactions with filters %s", filters)
+    logger.info("executing query to fetch all %s with filters %s", "transaction", filters)
+    logger.debug("query returned %s rows", 0)
+    logger.info("returned %s transactions", 0)
+    return []
+
+
+def attach_sync_handlers() -> None:
+    # the setup before the queue pipeline, a console and a file handler on every module logger
+    formatter = logging.Formatter(settings.log_format)
+    for handler in (logging.StreamHandler(), logging.FileHandler(f"{settings.log_dir}/{settings.log_filename}")):
+        handler.setFormatter(formatter)
+        logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+def detach_sync_handlers() -> None:
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.setLevel(logging.NOTSET)
+
+
+async def measure(requests: int, concurrency: int) -> list[float]:
+    timings = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+
+        async def request() -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                await client.get("/transactions")
+                timings.append((time.perf_counter() - start) * 1000)
+
+        await asyncio.gather(*(request() for _ in range(requests)))
+    return timings
+
+
+async def main(requests: int, concurrency: int) -> None:
+    settings.log_level = LogLevel.INFO
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, "w") as devnull:
+        settings.log_dir = log_dir
+        with contextlib.redirect_stderr(devnull):
+            for label, setup, teardown in (
+                ("synchronous handlers", attach_sync_handlers, detach_sync_handlers),
+                ("queue handler, listener", configure_logging, shutdown_logging),
+            ):
+                setup()
+                # warm up the app and the handlers
+                await measure(requests=concurrency, concurrency=concurrency)
+                timings = await measure(requests=requests, concurrency=concurrency)
+                teardown()
+
+                p99 = statistics.quantiles(timings, n=100)[98]
+                print(
+                    f"{label:<26} median {statistics.median(timings):7.3f} ms, p99 {p99:7.3f} ms "
+                    f"({requests} requests, {concurrency} concurrent)"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(main(requests=args.requests, concurrency=args.concurrency))
@@ -0,0 +1,93 @@
+"""
+Benchmark SUM over amounts stored as NUMERIC against amounts stored as BIGINT minor units.
+
+Needs a PostgreSQL database, configured like the app through the environment. Everything runs in a temporary table
+inside a transaction that is rolled back, so the database is left untouched.
+
+Run from the backend directory:
+
+    python -m benchmarks.money_sum --rows 1000000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import BigInteger, Column, Integer, MetaData, Numeric, Table, func, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from app.core.config import get_settings
+from app.utils.sql_utils import CURRENCY_EXPONENT
+
+
+settings = get_settings()
+
+# the same amounts twice, as the transaction table stored them before and after the minor units migration
+benchmark_table = Table(
+    "benchmark_transaction",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("category_id", Integer),
+    Column("value_numeric", Numeric),
+    Column("value_minor", BigInteger),
+    prefixes=["TEMPORARY"],
+)
+
+
+async def populate(conn: AsyncConnection, rows: int) -> None:
+    await conn.run_sync(benchmark_table.create)
+    # amounts up to 10 000.00 spread over a hundred categories
+    await conn.execute(
+        text(
+            "INSERT INTO benchmark_transaction (id, category_id, value_numeric, value_minor) "
+            "SELECT i, i % 100, m / power(10, :exponent)::numeric, m "
+            "FROM generate_series(1, CAST(:rows AS integer)) AS i, "
+            "LATERAL (SELECT (i * 7919) % 1000000 + 1 AS m) AS amounts"
+        ),
+        {"rows": rows, "exponent": CURRENCY_EXPONENT},
+    )
+    await conn.execute(text("ANALYZE benchmark_transaction"))
+
+
+async def measure(conn: AsyncConnection, column: Column, grouped: bool, repeat: int) -> float:
+    statement = select(func.sum(column))
+    if grouped:
+        statement = select(benchmark_table.c.category_id, func.sum(column)).group_by(benchmark_table.c.category_id)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        (await conn.execute(statement)).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def main(rows: int, repeat: int) -> None:
+    engine = create_async_engine(settings.async_database_url)
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            print(f"populating {rows} rows")
+            await populate(conn, rows)
+
+            for label, column, grouped in (
+                ("SUM, NUMERIC", benchmark_table.c.value_numeric, False),
+                ("SUM, BIGINT minor units", benchmark_table.c.value_minor, False),
+                ("SUM by category, NUMERIC", benchmark_table.c.value_numeric, True),
+                ("SUM by category, BIGINT", benchmark_table.c.value_minor, True),
+            ):
+                median = await measure(conn, column, grouped, repeat)
+                print(f"{label:<28} {median:10.2f} ms (median of {repeat}, {rows / median / 1000:8.2f} M rows/s)")
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(main(rows=args.rows, repeat=args.repeat))
@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock
 import pytest
 from dotenv import load_dotenv
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.pool import StaticPool
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
@@ -14,11 +15,13 @@ load_dotenv(Path(__file__).resolve().parents[1] / ".env")
 import app.db_models
 from app.main import app as fastapi_app
 from app.common.enums import RoleName, TypeName
+from app.core.cache import principal_cache, token_version_cache, role_cache, type_cache
 from app.core.config import get_settings
 from app.core.seeder import seed_initial_data
 from app.core.session import get_session
 from app.db_models import User, Role, Type, Category, Transaction, Goal
 from app.db_models.base import Base
+from app.schemas import AuthContext
 from app.services import UserService, RoleService, TypeService, CategoryService, TransactionService, GoalService
 
 settings = get_settings()
@@ -29,11 +32,29 @@ test_engine = create_async_engine(
 test_async_session = async_sessionmaker(bind=test_engine, expire_on_commit=False, class_=AsyncSession)
 
 
+@event.listens_for(test_engine.sync_engine, "connect")
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    # sqlite only enforces foreign keys when asked to, and writes rely on them like they do on PostgreSQL
+    if test_engine.dialect.name == "sqlite":
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+
 @pytest.fixture
 def anyio_backend():
     return "asyncio"
 
 
+@pytest.fixture(autouse=True)
+def clear_caches() -> None:
+    """Fixture that keeps process-wide caches from leaking between tests."""
+    principal_cache.clear()
+    token_version_cache.clear()
+    role_cache.clear()
+    type_cache.clear()
+
+
 @pytest.fixture
 def mock_session() -> AsyncMock:
     mock_session = AsyncMock(spec=AsyncSession)
@@ -47,6 +68,9 @@ async def session_fixture() -> AsyncGenerator[AsyncSession, None]:
 
     async with test_async_session() as session:
         await seed_initial_data(session)
+        # mirror the app lifespan, so integration tests read reference data from memory
+        await RoleService(session=session).load_reference_cache()
+        await TypeService(session=session).load_reference_cache()
         yield session
         await session.rollback()
 
@@ -126,10 +150,20 @@ def mock_types() -> list[Type]:
 
 
 @pytest.fixture
-def mock_category_service(
-    mock_session: AsyncMock, mock_user_service: UserService, mock_type_service: TypeService
-) -> CategoryService:
-    return CategoryService(session=mock_session, user_service=mock_user_service, type_service=mock_type_service)
+def mock_auth_contexts(mock_users: list[User]) -> list[AuthContext]:
+    """Fixture that returns non-admin authorization contexts matching mock_users."""
+    return [AuthContext(id=user.id, email=user.email, role_id=user.role_id, is_admin=False) for user in mock_users]
+
+
+@pytest.fixture
+def mock_admin_auth_contexts(mock_users: list[User]) -> list[AuthContext]:
+    """Fixture that returns admin authorization contexts matching mock_users."""
+    return [AuthContext(id=user.id, email=user.email, role_id=user.role_id, is_admin=True) for user in mock_users]
+
+
+@pytest.fixture
+def mock_category_service(mock_session: AsyncMock, mock_type_service: TypeService) -> CategoryService:
+    return CategoryService(session=mock_session, type_service=mock_type_service)
 
 
 @pytest.fixture
@@ -145,13 +179,11 @@ def mock_transaction_service(
     mock_session: AsyncMock,
     mock_category_service: CategoryService,
     mock_type_service: TypeService,
-    mock_user_service: UserService,
 ) -> TransactionService:
     return TransactionService(
         session=mock_session,
         category_service=mock_category_service,
         type_service=mock_type_service,
-        user_service=mock_user_service,
     )
 
 
@@ -172,13 +204,11 @@ def mock_goal_service(
     mock_session: AsyncMock,
     mock_category_service: CategoryService,
     mock_type_service: TypeService,
-    mock_user_service: UserService,
 ) -> GoalService:
     return GoalService(
         session=mock_session,
         category_service=mock_category_service,
         type_service=mock_type_service,
-        user_service=mock_user_service,
     )
 
 
@@ -0,0 +1,75 @@
+import logging
+from logging.handlers import QueueHandler
+from pathlib import Path
+
+import pytest
+
+from app.common.enums import LogLevel
+from app.core.config import get_settings
+from app.core.logger import APP_LOGGER_NAME, configure_logging, get_logger, shutdown_logging
+
+
+settings = get_settings()
+
+
+@pytest.fixture
+def log_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setattr(settings, "log_dir", str(tmp_path))
+    yield tmp_path
+    shutdown_logging()
+
+
+@pytest.mark.unit
+class TestLogger:
+    @pytest.mark.anyio
+    async def test_get_logger__no_handlers(self):
+        logger = get_logger("app.some.module")
+
+        assert logger.name == "app.some.module"
+        assert logger.handlers == []
+
+    @pytest.mark.anyio
+    async def test_configure_logging__writes_from_listener(self, log_dir: Path):
+        configure_logging()
+        logger = get_logger("app.some.module")
+
+        logger.info("fetched %s transactions", 3)
+        shutdown_logging()
+
+        output = (log_dir / settings.log_filename).read_text()
+        assert "app.some.module - INFO - fetched 3 transactions" in output
+
+    @pytest.mark.anyio
+    async def test_configure_logging__once(self, log_dir: Path):
+        listener = configure_logging()
+
+        assert configure_logging() is listener
+        handlers = logging.getLogger(APP_LOGGER_NAME).handlers
+        assert len(handlers) == 1
+        assert isinstance(handlers[0], QueueHandler)
+
+    @pytest.mark.anyio
+    async def test_shutdown_logging__removes_queue_handler(self, log_dir: Path):
+        configure_logging()
+
+        shutdown_logging()
+
+        assert logging.getLogger(APP_LOGGER_NAME).handlers == []
+        # a stopped pipeline can be set up again
+        assert configure_logging() is not None
+
+    @pytest.mark.anyio
+    async def test_configure_logging__disabled_level_not_formatted(
+        self, log_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        class Unformattable:
+            def __str__(self):
+                raise AssertionError("message was formatted")
+
+        monkeypatch.setattr(settings, "log_level", LogLevel.WARNING)
+        configure_logging()
+
+        get_logger("app.some.module").info("value %s", Unformattable())
+        shutdown_logging()
+
+        assert (log_dir / settings.log_filename).read_text() == ""
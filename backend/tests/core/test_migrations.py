@@ -0,0 +1,80 @@
+import io
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+
+
+SCRIPT_LOCATION = Path(__file__).parents[2] / "alembic"
+
+
+def render_migration(revisions: str, downgrade: bool = False) -> str:
+    # offline mode renders the PostgreSQL statements of the migration without a database
+    output = io.StringIO()
+    config = Config(output_buffer=output)
+    config.set_main_option("script_location", str(SCRIPT_LOCATION))
+    if downgrade:
+        command.downgrade(config, revisions, sql=True)
+    else:
+        command.upgrade(config, revisions, sql=True)
+    return output.getvalue()
+
+
+@pytest.mark.unit
+class TestMigrations:
+    @pytest.mark.anyio
+    async def test_partition_migration__upgrade(self):
+        sql = render_migration("d41c7a9e3b52:e6a2f4c8b913")
+
+        # the partition key is part of the primary key, the ids keep coming from the existing sequence
+        assert "PRIMARY KEY (id, date)" in sql
+        assert "PARTITION BY RANGE (date)" in sql
+        assert "nextval('transaction_id_seq')" in sql
+        assert "CREATE TABLE transaction_default PARTITION OF transaction DEFAULT" in sql
+        assert sql.index("SELECT create_transaction_partitions(") < sql.index("INSERT INTO transaction (")
+        assert "DROP TABLE transaction_unpartitioned" in sql
+        assert "ALTER SEQUENCE transaction_id_seq OWNED BY transaction.id" in sql
+
+    @pytest.mark.anyio
+    async def test_partition_migration__downgrade(self):
+        sql = render_migration("e6a2f4c8b913:d41c7a9e3b52", downgrade=True)
+
+        assert "PRIMARY KEY (id)" in sql
+        assert "PARTITION BY" not in sql
+        assert "INSERT INTO transaction (id, user_id, type_id, category_id, date, value, comment)" in sql
+        assert "DROP TABLE transaction_partitioned" in sql
+        assert "DROP FUNCTION create_transaction_partitions(date, date)" in sql
+
+    @pytest.mark.anyio
+    async def test_category_constraints_migration__upgrade(self):
+        sql = render_migration("f3b8d1c5a729:a7c4e2d9f186")
+
+        # rows referencing a category of another type stop the upgrade, they are not changed by it
+        assert "UPDATE transaction" not in sql
+        assert "UPDATE goal" not in sql
+        assert "RAISE EXCEPTION 'transaction rows with ids % reference a category of another type'" in sql
+        assert sql.index("RAISE EXCEPTION 'goal rows") < sql.index("ADD CONSTRAINT fk_goal_category_id_type_id")
+        assert (
+            "FOREIGN KEY(category_id, type_id) REFERENCES category (id, type_id) DEFERRABLE INITIALLY DEFERRED" in sql
+        )
+
+    @pytest.mark.anyio
+    async def test_minor_units_migration__upgrade(self):
+        sql = render_migration("a7c4e2d9f186:b5e9d3a1c864")
+
+        assert "ALTER TABLE transaction ALTER COLUMN value TYPE BIGINT USING round(value * 100)::bigint" in sql
+        # rollup totals are summed again from the rounded values, not rounded themselves
+        assert "round(total" not in sql
+        rebuild = sql.index("DELETE FROM transaction_monthly_rollup")
+        assert sql.index("ALTER TABLE transaction ALTER COLUMN value") < rebuild
+        assert rebuild < sql.index("INSERT INTO transaction_monthly_rollup")
+        assert "sum(value), count(*) FROM transaction GROUP BY" in sql
+
+    @pytest.mark.anyio
+    async def test_minor_units_migration__downgrade(self):
+        sql = render_migration("b5e9d3a1c864:a7c4e2d9f186", downgrade=True)
+
+        assert (
+            "ALTER TABLE transaction_monthly_rollup ALTER COLUMN total TYPE NUMERIC USING total::numeric / 100" in sql
+        )
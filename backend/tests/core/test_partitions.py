@@ -0,0 +1,72 @@
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.partitions import create_transaction_partitions
+
+
+settings = get_settings()
+
+
+@pytest.fixture
+def mock_session() -> AsyncMock:
+    session = AsyncMock(spec=AsyncSession)
+    session.get_bind = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+    session.execute.return_value = MagicMock()
+    return session
+
+
+def get_month_range(mock_session: AsyncMock) -> tuple[date, date]:
+    statement = mock_session.execute.call_args.args[0]
+    compiled = statement.compile(dialect=postgresql.dialect())
+    assert "create_transaction_partitions(" in str(compiled)
+    from_month, to_month = compiled.params.values()
+    return from_month, to_month
+
+
+@pytest.mark.unit
+class TestPartitions:
+    @pytest.mark.anyio
+    async def test_create_transaction_partitions__sqlite_no_op(self, mock_session: AsyncMock):
+        mock_session.get_bind.return_value.dialect.name = "sqlite"
+
+        await create_transaction_partitions(session=mock_session, today=date(2025, 5, 17))
+
+        mock_session.execute.assert_not_awaited()
+        mock_session.commit.assert_not_awaited()
+
+    @pytest.mark.anyio
+    async def test_create_transaction_partitions__month_range(
+        self, mock_session: AsyncMock, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(settings, "transaction_partition_months_ahead", 3)
+
+        await create_transaction_partitions(session=mock_session, today=date(2025, 5, 17))
+
+        assert get_month_range(mock_session) == (date(2025, 5, 1), date(2025, 8, 1))
+        mock_session.commit.assert_awaited_once()
+
+    @pytest.mark.anyio
+    async def test_create_transaction_partitions__year_rollover(
+        self, mock_session: AsyncMock, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(settings, "transaction_partition_months_ahead", 3)
+
+        await create_transaction_partitions(session=mock_session, today=date(2025, 11, 30))
+
+        assert get_month_range(mock_session) == (date(2025, 11, 1), date(2026, 2, 1))
+
+    @pytest.mark.anyio
+    async def test_create_transaction_partitions__no_months_ahead(
+        self, mock_session: AsyncMock, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(settings, "transaction_partition_months_ahead", 0)
+
+        await create_transaction_partitions(session=mock_session, today=date(2025, 12, 31))
+
+        assert get_month_range(mock_session) == (date(2025, 12, 1), date(2025, 12, 1))
@@ -1,6 +1,10 @@
+from datetime import date
+
 import pytest
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db_models import Goal
+from app.db_models import Category, Goal
 
 
 @pytest.mark.unit
@@ -25,3 +29,43 @@ class TestGoalDbModel:
         assert str(goal.start_date) == "2026-01-01"
         assert str(goal.end_date) == "2026-12-31"
         assert goal.target_value == 1000
+
+
+@pytest.mark.integration
+class TestGoalDbModelConstraints:
+    @pytest.mark.anyio
+    async def test_goal_model__end_date_before_start_date(self, session_fixture: AsyncSession):
+        session_fixture.add(
+            Goal(
+                user_id=1,
+                type_id=1,
+                name="test goal",
+                start_date=date(2026, 12, 31),
+                end_date=date(2026, 1, 1),
+                target_value=1000,
+            )
+        )
+
+        with pytest.raises(IntegrityError):
+            await session_fixture.commit()
+
+    @pytest.mark.anyio
+    async def test_goal_model__category_of_another_type(self, session_fixture: AsyncSession):
+        session_fixture.add(Category(user_id=1, type_id=1, name="salary"))
+        await session_fixture.commit()
+        session_fixture.add(
+            Goal(
+                user_id=1,
+                type_id=2,
+                category_id=1,
+                name="test goal",
+                start_date=date(2026, 1, 1),
+                end_date=date(2026, 12, 31),
+                target_value=1000,
+            )
+        )
+
+        # deferred, so the violation is only reported by the commit
+        await session_fixture.flush()
+        with pytest.raises(IntegrityError):
+            await session_fixture.commit()
@@ -1,8 +1,13 @@
 from datetime import date
+from typing import Any, Awaitable, Callable
 
 import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db_models import Transaction
+from app.schemas import AuthContext, TransactionFilters
+from app.services import CategoryService, TransactionService, TypeService
 
 
 @pytest.mark.unit
@@ -25,3 +30,61 @@ class TestTransactionDbModel:
         assert transaction.date == date(year=2025, month=9, day=1)
         assert transaction.value == 10.5
         assert transaction.comment == "Test comment"
+
+
+async def explain_query_plan(session: AsyncSession, run: Callable[[], Awaitable[Any]]) -> str:
+    # capture the statement the service sends to the driver, then ask sqlite how it would run it
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        await run()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = statements[-1]
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return "\n".join(row[-1] for row in result.all())
+
+
+@pytest.fixture()
+def transaction_service(session_fixture: AsyncSession) -> TransactionService:
+    type_service = TypeService(session=session_fixture)
+    category_service = CategoryService(session=session_fixture, type_service=type_service)
+    return TransactionService(session=session_fixture, category_service=category_service, type_service=type_service)
+
+
+@pytest.mark.integration
+class TestTransactionDbModelIndexes:
+    @pytest.mark.anyio
+    async def test_list_query__uses_user_date_index(
+        self, session_fixture: AsyncSession, transaction_service: TransactionService
+    ):
+        filters = TransactionFilters(date_gt=date(2025, 1, 1), date_lt=date(2025, 12, 31))
+        auth_context = AuthContext(id=1, email="user@example.com", role_id=2, is_admin=False)
+
+        plan = await explain_query_plan(
+            session_fixture, lambda: transaction_service.get_page_with_filters(filters=filters, gotten_by=auth_context)
+        )
+
+        assert "USING INDEX ix_transaction_user_id_date_id" in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.anyio
+    async def test_total_query__uses_covering_index(
+        self, session_fixture: AsyncSession, transaction_service: TransactionService
+    ):
+        # no whole month in the range, so the total is summed from transactions rather than the monthly rollup
+        filters = TransactionFilters(type_id=[1], category_id=[1], date_gt=date(2025, 1, 15), date_lt=date(2025, 2, 10))
+        auth_context = AuthContext(id=1, email="user@example.com", role_id=2, is_admin=False)
+
+        plan = await explain_query_plan(
+            session_fixture, lambda: transaction_service.get_total_with_filters(filters=filters, gotten_by=auth_context)
+        )
+
+        assert "USING INDEX ix_transaction_user_id_type_id_category_id_date" in plan
@@ -0,0 +1,27 @@
+from datetime import date
+
+import pytest
+
+from app.db_models import TransactionMonthlyRollup
+
+
+@pytest.mark.unit
+class TestTransactionMonthlyRollupDbModel:
+    @pytest.mark.anyio
+    async def test_transaction_monthly_rollup_model__all_ok(self):
+        rollup = TransactionMonthlyRollup(
+            user_id=1,
+            type_id=2,
+            category_id=None,
+            month=date(year=2025, month=9, day=1),
+            total=10.5,
+            count=2,
+        )
+
+        assert hasattr(rollup, "id")
+        assert rollup.user_id == 1
+        assert rollup.type_id == 2
+        assert rollup.category_id is None
+        assert rollup.month == date(year=2025, month=9, day=1)
+        assert rollup.total == 10.5
+        assert rollup.count == 2
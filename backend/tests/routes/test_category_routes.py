@@ -74,7 +74,7 @@ class TestUserRoutes:
         response = await client_fixture.get("/categories", headers={"Authorization": f"Bearer {admin_token}"})
 
         assert response.status_code == 200
-        categories = response.json()
+        categories = response.json()["items"]
         assert isinstance(categories, list)
         assert len(categories) == 2
 
@@ -97,7 +97,7 @@ class TestUserRoutes:
         response = await client_fixture.get("/categories", headers={"Authorization": f"Bearer {user_token}"})
 
         assert response.status_code == 200
-        categories = response.json()
+        categories = response.json()["items"]
         assert isinstance(categories, list)
         assert len(categories) == 1
 
@@ -118,7 +118,7 @@ class TestUserRoutes:
         response = await client_fixture.get("/categories?type_id=2", headers={"Authorization": f"Bearer {admin_token}"})
 
         assert response.status_code == 200
-        categories = response.json()
+        categories = response.json()["items"]
         assert isinstance(categories, list)
         assert len(categories) == 1
 
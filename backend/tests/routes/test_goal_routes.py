@@ -93,7 +93,7 @@ class TestGoalRoutes:
 
         response = await client_fixture.get("/goals", headers={"Authorization": f"Bearer {admin_token}"})
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert isinstance(data, list)
         assert len(data) == 2
 
@@ -128,7 +128,7 @@ class TestGoalRoutes:
 
         response = await client_fixture.get("/goals", headers={"Authorization": f"Bearer {user_token}"})
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert isinstance(data, list)
         assert len(data) == 1
 
@@ -161,7 +161,7 @@ class TestGoalRoutes:
 
         response = await client_fixture.get("/goals?type_id=2", headers={"Authorization": f"Bearer {admin_token}"})
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert len(data) == 1
         assert data[0]["type_id"] == 2
 
@@ -170,6 +170,84 @@ class TestGoalRoutes:
         response = await client_fixture.get("/goals")
         assert response.status_code == 401
 
+    @pytest.mark.anyio
+    async def test_get_goals_progress__user(
+        self, client_fixture: AsyncClient, admin_token: str, user_token: str
+    ) -> None:
+        await client_fixture.post(
+            "/categories", headers={"Authorization": f"Bearer {user_token}"}, json={"type_id": 1, "name": "salary"}
+        )
+        for category_id, target_value in ((None, 100.0), (1, 50.0)):
+            await client_fixture.post(
+                "/goals",
+                headers={"Authorization": f"Bearer {user_token}"},
+                json={
+                    "type_id": 1,
+                    "category_id": category_id,
+                    "name": "user goal",
+                    "start_date": "2025-01-01",
+                    "end_date": "2025-01-31",
+                    "target_value": target_value,
+                },
+            )
+        for token, category_id, date, value in (
+            (user_token, None, "2025-01-01", 10.0),
+            (user_token, 1, "2025-01-31", 60.0),
+            (user_token, None, "2025-02-01", 1000.0),  # outside of the goal dates
+            (admin_token, None, "2025-01-15", 1000.0),  # of another user
+        ):
+            await client_fixture.post(
+                "/transactions",
+                headers={"Authorization": f"Bearer {token}"},
+                json={"type_id": 1, "category_id": category_id, "date": date, "value": value, "comment": None},
+            )
+
+        response = await client_fixture.get("/goals/progress", headers={"Authorization": f"Bearer {user_token}"})
+
+        assert response.status_code == 200
+        goals = response.json()["items"]
+        assert [(goal["id"], goal["current_value"], goal["percentage"], goal["remaining"]) for goal in goals] == [
+            (1, "70.00", 70.0, "30.00"),
+            (2, "60.00", 120.0, "0.00"),
+        ]
+
+    @pytest.mark.anyio
+    async def test_get_goals_progress__pagination(self, client_fixture: AsyncClient, admin_token: str) -> None:
+        for name in ("first goal", "second goal"):
+            await client_fixture.post(
+                "/goals",
+                headers={"Authorization": f"Bearer {admin_token}"},
+                json={
+                    "type_id": 2,
+                    "category_id": None,
+                    "name": name,
+                    "start_date": "2025-01-01",
+                    "end_date": "2025-12-31",
+                    "target_value": 100.0,
+                },
+            )
+
+        response = await client_fixture.get(
+            "/goals/progress?limit=1", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert [goal["name"] for goal in page["items"]] == ["first goal"]
+        assert page["items"][0]["current_value"] == "0.00"
+
+        response = await client_fixture.get(
+            f"/goals/progress?limit=1&cursor={page['next_cursor']}", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == 200
+        page = response.json()
+        assert [goal["name"] for goal in page["items"]] == ["second goal"]
+        assert page["next_cursor"] is None
+
+    @pytest.mark.anyio
+    async def test_get_goals_progress__not_logged(self, client_fixture: AsyncClient) -> None:
+        response = await client_fixture.get("/goals/progress")
+        assert response.status_code == 401
+
     @pytest.mark.anyio
     async def test_create_goal__all_ok(self, client_fixture: AsyncClient, user_token: str) -> None:
         response = await client_fixture.post(
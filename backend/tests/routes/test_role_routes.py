@@ -1,7 +1,10 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
+from app.db_models import User
 
 
 settings = get_settings()
@@ -30,6 +33,22 @@ class TestRoleRoutes:
 
         assert response.status_code == 403
 
+    @pytest.mark.anyio
+    async def test_get_role__demoted_through_other_process(
+        self, client_fixture: AsyncClient, session_fixture: AsyncSession, admin_token: str
+    ) -> None:
+        # a change this process did not make leaves its token version cache empty, the admin claims still look fresh
+        await session_fixture.execute(
+            update(User)
+            .where(User.email == settings.initial_admin_email)
+            .values(role_id=2, token_version=User.token_version + 1)
+        )
+        await session_fixture.commit()
+
+        response = await client_fixture.get("/roles/1", headers={"Authorization": f"Bearer {admin_token}"})
+
+        assert response.status_code == 403
+
     @pytest.mark.anyio
     async def test_get_role__not_logged(self, client_fixture: AsyncClient) -> None:
         response = await client_fixture.get("/roles/1")
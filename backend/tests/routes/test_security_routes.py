@@ -1,3 +1,4 @@
+import jwt
 import pytest
 from httpx import AsyncClient
 
@@ -20,6 +21,19 @@ class TestSecurityRoutes:
         assert "refresh_token" in token_data
         assert token_data["token_type"] == "bearer"
 
+    @pytest.mark.anyio
+    async def test_login__access_token_claims(self, client_fixture: AsyncClient) -> None:
+        payload = {"username": settings.initial_admin_email, "password": settings.initial_admin_password}
+        response = await client_fixture.post("/token", data=payload)
+
+        assert response.status_code == 200
+        claims = jwt.decode(response.json()["access_token"], settings.secret_key, algorithms=[settings.algorithm])
+        assert claims["sub"] == settings.initial_admin_email
+        assert claims["uid"] == 1
+        assert claims["rid"] == 1
+        assert claims["role"] == "admin"
+        assert claims["ver"] == 0
+
     @pytest.mark.anyio
     async def test_login__invalid_password(self, client_fixture: AsyncClient) -> None:
         payload = {"username": settings.initial_admin_email, "password": "wrongpassword"}
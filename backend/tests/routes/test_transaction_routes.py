@@ -1,5 +1,17 @@
+import csv
+import io
+import json
+
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db_models import TransactionMonthlyRollup, User
+
+
+settings = get_settings()
 
 
 @pytest.mark.integration
@@ -74,7 +86,7 @@ class TestTransactionRoutes:
 
         response = await client_fixture.get("/transactions", headers={"Authorization": f"Bearer {admin_token}"})
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert isinstance(data, list)
         assert len(data) == 2
 
@@ -95,7 +107,7 @@ class TestTransactionRoutes:
 
         response = await client_fixture.get("/transactions", headers={"Authorization": f"Bearer {user_token}"})
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert isinstance(data, list)
         assert len(data) == 1
 
@@ -122,7 +134,7 @@ class TestTransactionRoutes:
             "/transactions?type_id=2", headers={"Authorization": f"Bearer {admin_token}"}
         )
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert len(data) == 1
         assert data[0]["type_id"] == 2
 
@@ -151,9 +163,199 @@ class TestTransactionRoutes:
             r"/transactions?comment=%", headers={"Authorization": f"Bearer {admin_token}"}
         )
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert len(data) == 1
 
+    @pytest.mark.anyio
+    async def test_get_transactions__pagination(self, client_fixture: AsyncClient, admin_token: str) -> None:
+        for date, value in (("2025-01-02", 10), ("2025-01-01", 20), ("2025-01-02", 30)):
+            await client_fixture.post(
+                "/transactions",
+                headers={"Authorization": f"Bearer {admin_token}"},
+                json={"type_id": 1, "category_id": None, "date": date, "value": value, "comment": None},
+            )
+
+        response = await client_fixture.get("/transactions?limit=2", headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == 200
+        first_page = response.json()
+        assert [transaction["value"] for transaction in first_page["items"]] == [20, 10]
+        assert first_page["next_cursor"] is not None
+
+        response = await client_fixture.get(
+            "/transactions",
+            params={"limit": 2, "cursor": first_page["next_cursor"]},
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+        assert response.status_code == 200
+        second_page = response.json()
+        assert [transaction["value"] for transaction in second_page["items"]] == [30]
+        assert second_page["next_cursor"] is None
+
+    @pytest.mark.anyio
+    async def test_get_transactions__invalid_cursor(self, client_fixture: AsyncClient, admin_token: str) -> None:
+        response = await client_fixture.get(
+            "/transactions?cursor=notacursor", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.anyio
+    async def test_get_transactions__limit_out_of_range(self, client_fixture: AsyncClient, admin_token: str) -> None:
+        response = await client_fixture.get("/transactions?limit=0", headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == 422
+
+    @pytest.mark.anyio
+    async def test_get_transactions__search_modes(self, client_fixture: AsyncClient, admin_token: str) -> None:
+        for date, comment in (
+            ("2025-01-01", "rent and rent again"),
+            ("2025-01-02", "parent gift"),
+            ("2025-01-03", "monthly rent"),
+            ("2025-01-04", "groceries"),
+        ):
+            await client_fixture.post(
+                "/transactions",
+                headers={"Authorization": f"Bearer {admin_token}"},
+                json={"type_id": 2, "category_id": None, "date": date, "value": 10, "comment": comment},
+            )
+
+        response = await client_fixture.get(
+            "/transactions?comment=rent", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == 200
+        assert [t["comment"] for t in response.json()["items"]] == [
+            "rent and rent again",
+            "parent gift",
+            "monthly rent",
+        ]
+
+        response = await client_fixture.get(
+            "/transactions?comment=rent&comment=groceries&search_mode=ranked&limit=2",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+        assert response.status_code == 200
+        assert response.json()["next_cursor"] is None
+        assert len(response.json()["items"]) == 2
+
+        response = await client_fixture.get(
+            "/transactions?comment=rent&search_mode=unknown", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.anyio
+    async def test_get_transactions_aggregate__by_type(
+        self, client_fixture: AsyncClient, admin_token: str, user_token: str
+    ) -> None:
+        for token, type_id, value in (
+            (admin_token, 1, 10),
+            (admin_token, 1, 30),
+            (admin_token, 2, 5),
+            (user_token, 1, 99),
+        ):
+            await client_fixture.post(
+                "/transactions",
+                headers={"Authorization": f"Bearer {token}"},
+                json={"type_id": type_id, "category_id": None, "date": "2025-01-05", "value": value, "comment": None},
+            )
+
+        response = await client_fixture.get(
+            "/transactions/aggregate?group_by=type_id&metrics=sum,count,max&user_id=1",
+            headers={"Authorization": f"Bearer {admin_token}"},
+        )
+        assert response.status_code == 200
+        assert response.json() == [
+            {"type_id": 1, "sum": "40.00", "count": 2, "max": 30.0},
+            {"type_id": 2, "sum": "5.00", "count": 1, "max": 5.0},
+        ]
+
+    @pytest.mark.anyio
+    async def test_get_transactions_aggregate__by_month_user(
+        self, client_fixture: AsyncClient, admin_token: str, user_token: str
+    ) -> None:
+        for token, date, value in (
+            (user_token, "2025-01-05", 10),
+            (user_token, "2025-01-20", 20),
+            (user_token, "2025-02-01", 5),
+            (admin_token, "2025-01-05", 100),
+        ):
+            await client_fixture.post(
+                "/transactions",
+                headers={"Authorization": f"Bearer {token}"},
+                json={"type_id": 1, "category_id": None, "date": date, "value": value, "comment": None},
+            )
+
+        response = await client_fixture.get(
+            "/transactions/aggregate?group_by=month", headers={"Authorization": f"Bearer {user_token}"}
+        )
+        assert response.status_code == 200
+        assert response.json() == [{"period": "2025-01-01", "sum": "30.00"}, {"period": "2025-02-01", "sum": "5.00"}]
+
+    @pytest.mark.anyio
+    async def test_get_transactions_aggregate__no_group_by(self, client_fixture: AsyncClient, admin_token: str) -> None:
+        response = await client_fixture.get(
+            "/transactions/aggregate?metrics=count", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == 200
+        assert response.json() == [{"count": 0}]
+
+    @pytest.mark.anyio
+    async def test_get_transactions_aggregate__invalid_group_by(
+        self, client_fixture: AsyncClient, admin_token: str
+    ) -> None:
+        response = await client_fixture.get(
+            "/transactions/aggregate?group_by=month,day", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.anyio
+    async def test_export_transactions__ndjson(
+        self, client_fixture: AsyncClient, admin_token: str, user_token: str
+    ) -> None:
+        await client_fixture.post(
+            "/transactions",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            json={"type_id": 1, "category_id": None, "date": "2025-01-02", "value": 50, "comment": "admin transaction"},
+        )
+        await client_fixture.post(
+            "/transactions",
+            headers={"Authorization": f"Bearer {user_token}"},
+            json={"type_id": 2, "category_id": None, "date": "2025-01-03", "value": 75, "comment": "user transaction"},
+        )
+
+        response = await client_fixture.get(
+            "/transactions/export/ndjson", headers={"Authorization": f"Bearer {user_token}"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = response.text.splitlines()
+        assert len(lines) == 1
+        transaction = json.loads(lines[0])
+        assert transaction["value"] == 75
+        assert transaction["comment"] == "user transaction"
+
+    @pytest.mark.anyio
+    async def test_export_transactions__csv_with_filters(self, client_fixture: AsyncClient, admin_token: str) -> None:
+        for type_id, value in ((1, 10), (2, 20), (2, 30)):
+            await client_fixture.post(
+                "/transactions",
+                headers={"Authorization": f"Bearer {admin_token}"},
+                json={"type_id": type_id, "category_id": None, "date": "2025-01-05", "value": value, "comment": None},
+            )
+
+        response = await client_fixture.get(
+            "/transactions/export/csv?type_id=2", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["value"] for row in rows] == ["20.0", "30.0"]
+        assert all(row["type_id"] == "2" for row in rows)
+
+    @pytest.mark.anyio
+    async def test_export_transactions__invalid_format(self, client_fixture: AsyncClient, admin_token: str) -> None:
+        response = await client_fixture.get(
+            "/transactions/export/xml", headers={"Authorization": f"Bearer {admin_token}"}
+        )
+        assert response.status_code == 422
+
     @pytest.mark.anyio
     async def test_get_transactions__not_logged(self, client_fixture: AsyncClient) -> None:
         response = await client_fixture.get("/transactions")
@@ -177,7 +379,7 @@ class TestTransactionRoutes:
         response = await client_fixture.get("/transactions/total", headers={"Authorization": f"Bearer {admin_token}"})
         assert response.status_code == 200
         data = response.json()
-        assert data["total"] == 125.0
+        assert data["total"] == "125.00"
 
     @pytest.mark.anyio
     async def test_get_transactions_total__no_filters_user(
@@ -197,7 +399,136 @@ class TestTransactionRoutes:
         response = await client_fixture.get("/transactions/total", headers={"Authorization": f"Bearer {user_token}"})
         assert response.status_code == 200
         data = response.json()
-        assert data["total"] == 75.0
+        assert data["total"] == "75.00"
+
+    @pytest.mark.anyio
+    async def test_get_transactions_total__rollup_with_partial_months(
+        self, client_fixture: AsyncClient, session_fixture: AsyncSession, user_token: str
+    ) -> None:
+        headers = {"Authorization": f"Bearer {user_token}"}
+        for date, value in (
+            ("2025-01-04", 1),
+            ("2025-01-05", 2),
+            ("2025-02-01", 4),
+            ("2025-02-28", 8),
+            ("2025-03-10", 16),
+            ("2025-03-11", 32),
+        ):
+            await client_fixture.post(
+                "/transactions",
+                headers=headers,
+                json={"type_id": 1, "category_id": None, "date": date, "value": value, "comment": None},
+            )
+        # moved from february to march, then deleted from march
+        await client_fixture.put(
+            "/transactions/3", headers=headers, json={"type_id": 1, "date": "2025-03-01", "value": 64}
+        )
+        await client_fixture.delete("/transactions/6", headers=headers)
+
+        query = await session_fixture.execute(
+            select(
+                TransactionMonthlyRollup.month, TransactionMonthlyRollup.total, TransactionMonthlyRollup.count
+            ).order_by(TransactionMonthlyRollup.month)
+        )
+        assert [(str(month), float(total), count) for month, total, count in query.all()] == [
+            ("2025-01-01", 3.0, 2),
+            ("2025-02-01", 8.0, 1),
+            ("2025-03-01", 80.0, 2),
+        ]
+
+        response = await client_fixture.get(
+            "/transactions/total?date_gt=2025-01-05&date_lt=2025-03-10&type_id=1", headers=headers
+        )
+        assert response.status_code == 200
+        assert response.json()["total"] == "90.00"
+
+        response = await client_fixture.get("/transactions/total?date_gt=2025-02-01", headers=headers)
+        assert response.json()["total"] == "88.00"
+
+        response = await client_fixture.get("/transactions/total?date_lt=2025-03-10&value_gt=10", headers=headers)
+        assert response.json()["total"] == "80.00"
+
+    @pytest.mark.anyio
+    async def test_get_transactions_total__exact_cents(self, client_fixture: AsyncClient, user_token: str) -> None:
+        headers = {"Authorization": f"Bearer {user_token}"}
+        for date, value in (("2025-01-04", 0.1), ("2025-01-05", 0.2), ("2025-02-01", 0.7)):
+            await client_fixture.post(
+                "/transactions",
+                headers=headers,
+                json={"type_id": 1, "category_id": None, "date": date, "value": value, "comment": None},
+            )
+
+        # summed as integer minor units, from the rollup and from transactions alike, without float error
+        response = await client_fixture.get("/transactions/total", headers=headers)
+        assert response.json()["total"] == "1.00"
+        response = await client_fixture.get("/transactions/total?date_lt=2025-01-31", headers=headers)
+        assert response.json()["total"] == "0.30"
+
+    @pytest.mark.anyio
+    async def test_get_transactions_total__rollup_after_category_delete(
+        self, client_fixture: AsyncClient, session_fixture: AsyncSession, user_token: str
+    ) -> None:
+        headers = {"Authorization": f"Bearer {user_token}"}
+        await client_fixture.post("/categories", headers=headers, json={"type_id": 1, "name": "salary"})
+        for category_id, value in ((1, 10), (None, 5)):
+            await client_fixture.post(
+                "/transactions",
+                headers=headers,
+                json={"type_id": 1, "category_id": category_id, "date": "2025-01-15", "value": value, "comment": None},
+            )
+
+        response = await client_fixture.delete("/categories/1", headers=headers)
+        assert response.status_code == 200
+
+        query = await session_fixture.execute(
+            select(TransactionMonthlyRollup.category_id, TransactionMonthlyRollup.total, TransactionMonthlyRollup.count)
+        )
+        assert [(category_id, float(total), count) for category_id, total, count in query.all()] == [(None, 15.0, 2)]
+
+    @pytest.mark.anyio
+    async def test_get_transactions_total__rollup_after_category_delete_many_months(
+        self, client_fixture: AsyncClient, session_fixture: AsyncSession, user_token: str
+    ) -> None:
+        headers = {"Authorization": f"Bearer {user_token}"}
+        await client_fixture.post("/categories", headers=headers, json={"type_id": 1, "name": "salary"})
+        for category_id, day, value in ((1, "2025-01-15", 10), (1, "2025-02-15", 20), (None, "2025-02-20", 5)):
+            await client_fixture.post(
+                "/transactions",
+                headers=headers,
+                json={"type_id": 1, "category_id": category_id, "date": day, "value": value, "comment": None},
+            )
+        statements = []
+
+        def record_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = session_fixture.get_bind()
+        event.listen(engine, "before_cursor_execute", record_statement)
+        try:
+            response = await client_fixture.delete("/categories/1", headers=headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", record_statement)
+
+        assert response.status_code == 200
+        # every month of the category is moved by the database in one statement
+        upserts = [
+            statement for statement in statements if statement.startswith("INSERT INTO transaction_monthly_rollup")
+        ]
+        assert len(upserts) == 1
+        query = await session_fixture.execute(
+            select(
+                TransactionMonthlyRollup.category_id,
+                TransactionMonthlyRollup.month,
+                TransactionMonthlyRollup.total,
+                TransactionMonthlyRollup.count,
+            ).order_by(TransactionMonthlyRollup.month)
+        )
+        assert [
+            (category_id, month.isoformat(), float(total), count) for category_id, month, total, count in query
+        ] == [
+            (None, "2025-01-01", 10.0, 1),
+            (None, "2025-02-01", 25.0, 2),
+        ]
 
     @pytest.mark.anyio
     async def test_get_transactions_total__with_filters(self, client_fixture: AsyncClient, admin_token: str) -> None:
@@ -234,7 +565,7 @@ class TestTransactionRoutes:
         )
         assert response.status_code == 200
         data = response.json()
-        assert data["total"] == 50.0
+        assert data["total"] == "50.00"
 
     @pytest.mark.anyio
     async def test_get_transactions_total__no_match_returns_zero(
@@ -262,7 +593,7 @@ class TestTransactionRoutes:
         )
         assert response.status_code == 200
         data = response.json()
-        assert data["total"] == 0.0
+        assert data["total"] == "0.00"
 
     @pytest.mark.anyio
     async def test_get_transactions_total__not_logged(self, client_fixture: AsyncClient) -> None:
@@ -316,6 +647,45 @@ class TestTransactionRoutes:
         )
         assert response.status_code == 409
 
+    @pytest.mark.anyio
+    async def test_create_transaction__category_of_other_user_admin(
+        self, client_fixture: AsyncClient, user_token: str, admin_token: str
+    ) -> None:
+        await client_fixture.post(
+            "/categories",
+            headers={"Authorization": f"Bearer {user_token}"},
+            json={"type_id": 1, "name": "test category"},
+        )
+
+        # admins may reference the categories of every user
+        response = await client_fixture.post(
+            "/transactions",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            json={"type_id": 1, "category_id": 1, "date": "2025-01-11", "value": 15, "comment": None},
+        )
+        assert response.status_code == 201
+        assert response.json()["category_id"] == 1
+
+    @pytest.mark.anyio
+    async def test_create_transaction__category_of_other_user(
+        self, client_fixture: AsyncClient, user_token: str, admin_token: str
+    ) -> None:
+        await client_fixture.post(
+            "/categories",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            json={"type_id": 1, "name": "test category"},
+        )
+
+        response = await client_fixture.post(
+            "/transactions",
+            headers={"Authorization": f"Bearer {user_token}"},
+            json={"type_id": 1, "category_id": 1, "date": "2025-01-11", "value": 15, "comment": None},
+        )
+        assert response.status_code == 403
+
+        response = await client_fixture.get("/transactions", headers={"Authorization": f"Bearer {user_token}"})
+        assert response.json()["items"] == []
+
     @pytest.mark.anyio
     async def test_create_transaction__not_logged(self, client_fixture: AsyncClient) -> None:
         response = await client_fixture.post(
@@ -324,6 +694,520 @@ class TestTransactionRoutes:
         )
         assert response.status_code == 401
 
+    @pytest.mark.anyio
+    async def test_create_transactions_bulk__all_ok(
+        self, client_fixture: AsyncClient, session_fixture: AsyncSession, user_token: str
+    ) -> None:
+        headers = {"Authorization": f"Bearer {user_token}"}
+        await client_fixture.post("/categories", headers=headers, json={"type_id": 1, "name": "salary"})
+        items = [
+            {"type_id": 1, "category_id": 1, "date": "2025-01-10", "value": 10, "comment": "first"},
+            {"type_id": 1, "category_id": 1, "date": "2025-01-20", "value": 20, "comment": "second"},
+            {"type_id": 2, "category_id": None, "date": "2025-02-05", "value": 5, "comment": None},
+        ]
+
+        response = await client_fixture.post("/transactions/bulk", headers=headers, json={"items": items})
+        assert response.status_code == 201
+        body = response.json()
+        assert body["errors"] == []
+        assert [transaction["comment"] for transaction in body["items"]] == ["first", "second", None]
+        assert all(transaction["user_id"] == 2 for transaction in body["items"])
+        assert len({transaction["id"] for transaction in body["items"]}) == 3
+
+        # one rollup row per user, type, category and month
+        query = await session_fixture.execute(
+            select(
+                TransactionMonthlyRollup.category_id, TransactionMonthlyRollup.total, TransactionMonthlyRollup.count
+            ).order_by(TransactionMonthlyRollup.month)
+        )
+        assert [(category_id, float(total), count) for category_id, total, count in query.all()] == [
+            (1, 30.0, 2),
+            (None, 5.0, 1),
+        ]
+
+    @pytest.mark.anyio
+    async def test_create_transactions_bulk__atomic_invalid_item(
+        self, client_fixture: AsyncClient, user_token: str
+    ) -> None:
+        headers = {"Authorization": f"Bearer {user_token}"}
+        items = [
+            {"type_id": 1, "category_id": None, "date": "2025-01-10", "value": 10, "comment": None},
+            {"type_id": 100, "category_id": None, "date": "2025-01-11", "value": 20, "comment": None},
+        ]
+
+        response = await client_fixture.post("/transactions/bulk", headers=headers, json={"items": items})
+        assert response.status_code == 422
+        assert response.json()["detail"] == [{"index": 1, "detail": "type with id 100 not found"}]
+
+        response = await client_fixture.get("/transactions", headers=headers)
+        assert response.json()["items"] == []
+
+    @pytest.mark.anyio
+    async def test_create_transactions_bulk__not_atomic_reports_invalid_items(
+        self, client_fixture: AsyncClient, admin_token: str, user_token: str
+    ) -> None:
+        # categories of another user and of another type are rejected like in a single create
+        await client_fixture.post(
+            "/categories", headers={"Authorization": f"Bearer {admin_token}"}, json={"type_id": 1, "name": "admin"}
+        )
+        headers = {"Authorization": f"Bearer {user_token}"}
+        await client_fixture.post("/categories", headers=headers, json={"type_id": 2, "name": "groceries"})
+        items = [
+            {"type_id": 1, "category_id": 1, "date": "2025-01-10", "value": 10, "comment": None},
+            {"type_id": 1, "category_id": 2, "date": "2025-01-11", "value": 20, "comment": None},
+            {"type_id": 2, "category_id": 2, "date": "2025-01-12", "value": 30, "comment": None},
+            {"type_id": 2, "category_id": 100, "date": "2025-01-13", "value": 40, "comment": None},
+        ]
+
+        response = await client_fixture.post(
+            "/transactions/bulk", headers=headers, json={"items": items, "atomic": False}
+        )
+        assert response.status_code == 201
+        body = response.json()
+        assert [transaction["value"] for transaction in body["items"]] == [30]
+        assert body["errors"] == [
+            {"index": 0, "detail": "action forbidden: users can only view their own categories"},
+            {"index": 1, "detail": "entity not associated: category with id 2 is not of type with id 1"},
+            {"index": 3, "detail": "category with id 100 not found"},
+        ]
+
+    @pytest.mark.anyio
+    async def test_create_transactions_bulk__empty(self, client_fixture: AsyncClient, user_token: str) -> None:
+        response = await client_fixture.post(
+            "/transactions/bulk", headers={"Authorization": f"Bearer {user_token}"}, json={"items": []}
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.anyio
+    async def test_create_transactions_bulk__not_logged(self, client_fixture: AsyncClient) -> None:
+        response = await client_fixture.post(
+            "/transactions/bulk",
+            json={"items": [{"type_id": 1, "category_id": None, "date": "2025-01-12", "value": 5}]},
+        )
+        assert response.status_code == 401
+
+    @pytest.mark.anyio
+    async def test_upsert_transactions_bulk__resync_updates(
+        self, client_fixture: AsyncClient, session_fixture: AsyncSession, user_token: str
+    ) -> None:
+        headers = {"Authorization": f"Bearer {user_token}"}
+        items = [
+            {"type_id": 2, "date": "2025-01-10", "value": 10, "comment": "coffee", "external_id": "bank-1"},
+            {"type_id": 2, "date": "2025-01-20", "value": 20, "comment": "fuel", "external_id": "bank-2"},
+        ]
+        response = await client_fixture.put("/transactions/bulk", headers=headers, json={"items": items})
+        assert response.status_code == 200
+        first_ids = [transaction["id"] for transaction in response.json()["items"]]
+
+        # the same window again, one amount corrected by the bank and one new transaction
+        items[1]["value"] = 25
+        items.append({"type_id": 2, "date": "2025-02-01", "value": 5, "comment": None, "external_id": "bank-3"})
+        response = await client_fixture.put("/transactions/bulk", headers=headers, json={"items": items})
+        assert response.status_code == 200
+        transactions = response.json()["items"]
+        assert [transaction["id"] for transaction in transactions[:2]] == first_ids
+        assert [transaction["value"] for transaction in transactions] == [10, 25, 5]
+        assert [transaction["external_id"] for transaction in transactions] == ["bank-1", "bank-2", "bank-3"]
+
+        response = await client_fixture.get("/transactions?external_id=bank-2", headers=headers)
+        assert [transaction["value"] for transaction in response.json()["items"]] == [25]
+
+        query = await session_fixture.execute(
+            select(TransactionMonthlyRollup.total, TransactionMonthlyRollup.count).order_by(
+                TransactionMonthlyRollup.month
+            )
+        )
+        assert [(float(total), count) for total, count in query.all()] == [(35.0, 2), (5.0, 1)]
+
+    @pytest.mark.anyio
+    async def test_upsert_transactions_bulk__single_statement(
+        self, client_fixture: AsyncClient, session_fixture: AsyncSession, user_token: str
+    ) -> None:
+        headers = {"Authorization": f"Bearer {user_token}"}
+        items = [
+            {"type_id": 2, "date": f"2025-01-{day:02}", "value": day, "comment": None, "external_id": f"bank-{day}"}
+            for day in (5, 1, 4, 2, 3)
+        ]
+        statements = []
+
+        def record_statement(conn, cursor, statement, parameters, context, executemany) -> None:
+            statements.append(statement)
+
+        engine = session_fixture.get_bind()
+        event.listen(engine, "before_cursor_execute", record_statement)
+        try:
+            response = await client_fixture.put("/transactions/bulk", headers=headers, json={"items": items})
+        finally:
+            event.remove(engine, "before_cursor_execute", record_statement)
+
+        assert response.status_code == 200
+        # all rows go out in one multi-row statement, returned in the order of the items
+        upserts = [statement for statement in statements if statement.startswith('INSERT INTO "transaction"')]
+        assert len(upserts) == 1
+        assert [transaction["external_id"] for transaction in response.json()["items"]] == [
+            item["external_id"] for item in items
+        ]
+
+    @pytest.mark.anyio
+    async def test_upsert_transactions_bulk__date_changed(
+        self, client_fixture: AsyncClient, session_fixture: AsyncSession, user_token: str
+    ) -> None:
+        headers = {"Authorization": f"Bearer {user_token}"}
+        item = {"type_id": 2, "date": "2025-01-31", "value": 10, "comment": None, "external_id": "bank-1"}
+        await client_fixture.put("/transactions/bulk", headers=headers, json={"items": [item]})
+
+        # a pending transaction posted on a later day replaces the stored one
+        response = await client_fixture.put(
+            "/transactions/bulk", headers=headers, json={"items": [{**item, "date": "2025-02-01"}]}
+        )
+        assert response.status_code == 200
+
+        response = await client_fixture.get("/transactions", headers=headers)
+        assert [transaction["date"] for transaction in response.json()["items"]] == ["2025-02-01"]
+        query = await session_fixture.execute(
+            select(TransactionMonthlyRollup.month, TransactionMonthlyRollup.count).order_by(
+                TransactionMonthlyRollup.month
+            )
+        )
+        assert [(month.isoformat(), count) for month, count in query.all()] == [("2025-01-01", 0), ("2025-02-01", 1)]
+
+    @pytest.mark.anyio
+    async def test_upsert_transactions_bulk__repeated_external_id(
+        self, client_fixture: AsyncClient, user_token: str
+    ) -> None:
+        item = {"type_id": 2, "date": "2025-01-10", "value": 10, "comment": None, "external_id": "bank-1"}
+
+        response = await client_fixture.put(
+            "/transactions/bulk", headers={"Authorization": f"Bearer {user_token}"}, json={"items": [item, item]}
+        )
+        assert response.status_code == 422
+        assert response.json()["detail"] == [{"index": 1, "detail": "external id bank-1 is repeated"}]
+
+    @pytest.mark.anyio
+    async def test_upsert_transactions_bulk__missing_external_id(
+        self, client_fixture: AsyncClient, user_token: str
+    ) -> None:
+        response = await client_fixture.put(
+            "/transactions/bulk",
+            headers={"Authorization": f"Bearer {user_token}"},
+            json={"items": [{"type_id": 2, "date": "2025-01-10", "value": 10}]},
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.anyio
+    async def test_import_transactions__csv(
+        self, client_fixture: AsyncClient, session_fixture: AsyncSession, user_token: str
+    ) -> None:
+        headers = {"Authorization": f"Bearer {user_token}", "Content-Type": "text/csv"}
+        content = (
+            "type_id,category_id,date,value,comment\n"
+            "1,,2025-01-10,10,first\n"
+            "1,,2025-01-20,20,\n"
+            '2,,2025-02-05,5,"groceries, weekly"\n'
+        )
+
+        response = await client_fixture.post("/transactions/import/csv", headers=headers, content=content)
+        assert response.status_code == 201
+        assert response.json() == {"created": 3, "invalid": 0, "errors": []}
+
+        response = await client_fixture.get("/transactions", headers=headers)
+        transactions = response.json()["items"]
+        assert [transaction["comment"] for transaction in transactions] == ["first", None, "groceries, weekly"]
+        assert all(transaction["user_id"] == 2 for transaction in transactions)
+
+        query = await session_fixture.execute(
+            select(
+                TransactionMonthlyRollup.type_id, TransactionMonthlyRollup.total, TransactionMonthlyRollup.count
+            ).order_by(TransactionMonthlyRollup.month)
+        )
+        assert [(type_id, float(total), count) for type_id, total, count in query.all()] == [(1, 30.0, 2), (2, 5.0, 1)]
+
+    @pytest.mark.anyio
+    async def test_import_transactions__csv_not_atomic_reports_invalid_records(
+        self, client_fixture: AsyncClient, user_token: str
+    ) -> None:
+        headers = {"Authorization": f"Bearer {user_token}", "Content-Type": "text/csv"}
+        content = (
+            "type_id,category_id,date,value,comment\n"
+            "1,,2025-01-10,10,valid\n"
+            "1,,2025-01-11,abc,bad value\n"
+            "100,,2025-01-12,10,bad type\n"
+            "1,,2025-01-13,10,<script>\n"
+        )
+
+        response = await client_fixture.post("/transactions/import/csv?atomic=false", headers=headers, content=content)
+        assert response.status_code == 201
+        body = response.json()
+        assert body["created"] == 1
+        assert body["invalid"] == 3
+        assert [error["index"] for error in body["errors"]] == [1, 2, 3]
+        assert body["errors"][0]["detail"].startswith("value: ")
+        assert body["errors"][1]["detail"] == "type with id 100 not found"
+
+    @pytest.mark.anyio
+    async def test_import_transactions__csv_atomic_invalid_record(
+        self, client_fixture: AsyncClient, user_token: str
+    ) -> None:
+        headers = {"Authorization": f"Bearer {user_token}", "Content-Type": "text/csv"}
+        content = "type_id,category_id,date,value,comment\n1,,2025-01-10,10,valid\n1,,not a date,10,invalid\n"
+
+        response = await client_fixture.post("/transactions/import/csv", headers=headers, content=content)
+        assert response.status_code == 422
+        assert [error["index"] for error in response.json()["detail"]] == [1]
+
+        response = await client_fixture.get("/transactions", headers=headers)
+        assert response.json()["items"] == []
+
+        # the connection is still usable for a later import
+        response = await client_fixture.post(
+            "/transactions/import/csv", headers=headers, content="type_id,date,value\n1,2025-01-10,10\n"
+        )
+        assert response.json()["created"] == 1
+
+    @pytest.mark.anyio
+    async def test_import_transactions__record_too_large(
+        self, client_fixture: AsyncClient, user_token: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(settings, "max_import_record_size", 100)
+        headers = {"Authorization": f"Bearer {user_token}", "Content-Type": "text/csv"}
+        content = (
+            'type_id,date,value,comment\n1,2025-01-10,10,valid\n1,2025-01-11,10,"unmatched\n'
+            + "1,2025-01-12,10,\n" * 10
+        )
+
+        response = await client_fixture.post("/transactions/import/csv", headers=headers, content=content)
+        assert response.status_code == 413
+        assert response.json()["detail"] == "imported record is longer than 100 characters"
+
+        response = await client_fixture.get("/transactions", headers=headers)
+        assert response.json()["items"] == []
+
+    @pytest.mark.anyio
+    async def test_import_transactions__ofx(self, client_fixture: AsyncClient, user_token: str) -> None:
+        headers = {"Authorization": f"Bearer {user_token}", "Content-Type": "application/x-ofx"}
+        content = (
+            "OFXHEADER:100\n\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>\n"
+            "<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250115<TRNAMT>-12.50<NAME>phone</STMTTRN>\n"
+            "<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250116120000<TRNAMT>100.00<MEMO>salary</STMTTRN>\n"
+            "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n"
+        )
+
+        response = await client_fixture.post("/transactions/import/ofx", headers=headers, content=content)
+        assert response.status_code == 201
+        assert response.json()["created"] == 2
+
+        response = await client_fixture.get("/transactions", headers=headers)
+        transactions = response.json()["items"]
+        types = (await client_fixture.get("/types", headers=headers)).json()
+        type_names = {type["id"]: type["name"] for type in types}
+        assert [(type_names[t["type_id"]], t["value"], t["comment"]) for t in transactions] == [
+            ("expense", 12.5, "phone"),
+            ("income", 100.0, "salary"),
+        ]
+
+    @pytest.mark.anyio
+    async def test_import_transactions__invalid_format(self, client_fixture: AsyncClient, user_token: str) -> None:
+        response = await client_fixture.post(
+            "/transactions/import/qif", headers={"Authorization": f"Bearer {user_token}"}, content=""
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.anyio
+    async def test_import_transactions__not_logged(self, client_fixture: AsyncClient) -> None:
+        response = await client_fixture.post("/transactions/import/csv", content="type_id,date,value\n")
+        assert response.status_code == 401
+
+    @pytest.mark.anyio
+    async def test_update_transactions__recategorize_with_filters(
+        self, client_fixture: AsyncClient, session_fixture: AsyncSession, admin_token: str, user_token: str
+    ) -> None:
+        admin_headers = {"Authorization": f"Bearer {admin_token}"}
+        headers = {"Authorization": f"Bearer {user_token}"}
+        await client_fixture.post("/categories", headers=headers, json={"type_id": 2, "name": "groceries"})
+        item = {"type_id": 2, "category_id": None, "value": 10, "comment": None}
+        await client_fixture.post("/transactions", headers=admin_headers, json={**item, "date": "2025-01-05"})
+        for day in ("2025-01-10", "2025-01-20", "2025-03-01"):
+            await client_fixture.post("/transactions", headers=headers, json={**item, "date": day})
+
+        response = await client_fixture.patch(
+            "/transactions",
+            headers=headers,
+            json={"filters": {"date_lt": "2025-01-31"}, "changes": {"category_id": 1, "comment": "weekly shop"}},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"count": 2}
+
+        response = await client_fixture.get("/transactions", headers=admin_headers)
+        assert [(t["user_id"], t["category_id"], t["comment"]) for t in response.json()["items"]] == [
+            (1, None, None),
+            (2, 1, "weekly shop"),
+            (2, 1, "weekly shop"),
+            (2, None, None),
+        ]
+        query = await session_fixture.execute(
+            select(
+                TransactionMonthlyRollup.user_id,
+                TransactionMonthlyRollup.category_id,
+                TransactionMonthlyRollup.month,
+                TransactionMonthlyRollup.count,
+            )
+            .where(TransactionMonthlyRollup.count != 0)
+            .order_by(TransactionMonthlyRollup.user_id, TransactionMonthlyRollup.month)
+        )
+        assert [(user_id, category_id, month.isoformat(), count) for user_id, category_id, month, count in query] == [
+            (1, None, "2025-01-01", 1),
+            (2, 1, "2025-01-01", 2),
+            (2, None, "2025-03-01", 1),
+        ]
+
+    @pytest.mark.anyio
+    async def test_update_transactions__category_of_other_type(
+        self, client_fixture: AsyncClient, user_token: str
+    ) -> None:
+        headers = {"Authorization": f"Bearer {user_token}"}
+        await client_fixture.post("/categories", headers=headers, json={"type_id": 1, "name": "salary"})
+        await client_fixture.post(
+            "/transactions", headers=headers, json={"type_id": 2, "date": "2025-01-10", "value": 10}
+        )
+
+        response = await client_fixture.patch(
+            "/transactions", headers=headers, json={"filters": {"all": True}, "changes": {"category_id": 1}}
+        )
+        assert response.status_code == 409
+
+        # the type is changed together with the category
+        response = await client_fixture.patch(
+            "/transactions",
+            headers=headers,
+            json={"filters": {"all": True}, "changes": {"type_id": 1, "category_id": 1}},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"count": 1}
+
+    @pytest.mark.anyio
+    async def test_update_transactions__category_of_other_user(
+        self, client_fixture: AsyncClient, admin_token: str, user_token: str
+    ) -> None:
+        await client_fixture.post(
+            "/categories", headers={"Authorization": f"Bearer {admin_token}"}, json={"type_id": 2, "name": "admin"}
+        )
+
+        response = await client_fixture.patch(
+            "/transactions",
+            headers={"Authorization": f"Bearer {user_token}"},
+            json={"filters": {"all": True}, "changes": {"category_id": 1}},
+        )
+        assert response.status_code == 403
+
+    @pytest.mark.anyio
+    async def test_update_transactions__no_changes(self, client_fixture: AsyncClient, user_token: str) -> None:
+        response = await client_fixture.patch(
+            "/transactions",
+            headers={"Authorization": f"Bearer {user_token}"},
+            json={"filters": {"all": True}, "changes": {}},
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.anyio
+    async def test_update_transactions__no_filters(self, client_fixture: AsyncClient, user_token: str) -> None:
+        headers = {"Authorization": f"Bearer {user_token}"}
+        await client_fixture.post(
+            "/transactions", headers=headers, json={"type_id": 2, "date": "2025-01-10", "value": 10}
+        )
+
+        # pagination params and the search mode do not filter anything
+        for filters in (None, {}, {"limit": 10}, {"search_mode": "ranked"}, {"category_id": []}, {"all": False}):
+            body = (
+                {"changes": {"comment": "a"}} if filters is None else {"filters": filters, "changes": {"comment": "a"}}
+            )
+            response = await client_fixture.patch("/transactions", headers=headers, json=body)
+            assert response.status_code == 422
+
+        response = await client_fixture.get("/transactions", headers=headers)
+        assert [t["comment"] for t in response.json()["items"]] == [None]
+
+        response = await client_fixture.patch(
+            "/transactions", headers=headers, json={"filters": {"all": True}, "changes": {"comment": "a"}}
+        )
+        assert response.status_code == 200
+        assert response.json() == {"count": 1}
+
+    @pytest.mark.anyio
+    async def test_update_transactions__not_logged(self, client_fixture: AsyncClient) -> None:
+        response = await client_fixture.patch("/transactions", json={"changes": {"comment": "a"}})
+        assert response.status_code == 401
+
+    @pytest.mark.anyio
+    async def test_delete_transactions__with_filters(
+        self, client_fixture: AsyncClient, session_fixture: AsyncSession, admin_token: str, user_token: str
+    ) -> None:
+        admin_headers = {"Authorization": f"Bearer {admin_token}"}
+        headers = {"Authorization": f"Bearer {user_token}"}
+        item = {"type_id": 2, "category_id": None, "date": "2025-01-10", "comment": None}
+        await client_fixture.post("/transactions", headers=admin_headers, json={**item, "value": 1})
+        for value in (10, 20, 30):
+            await client_fixture.post("/transactions", headers=headers, json={**item, "value": value})
+
+        response = await client_fixture.request("DELETE", "/transactions", headers=headers, json={"value_lt": 20})
+        assert response.status_code == 200
+        assert response.json() == {"count": 2}
+
+        response = await client_fixture.get("/transactions", headers=admin_headers)
+        assert [(t["user_id"], t["value"]) for t in response.json()["items"]] == [(1, 1), (2, 30)]
+        response = await client_fixture.get("/transactions/total", headers=headers)
+        assert response.json()["total"] == "30.00"
+
+    @pytest.mark.anyio
+    async def test_delete_transactions__no_filters(
+        self, client_fixture: AsyncClient, admin_token: str, user_token: str
+    ) -> None:
+        admin_headers = {"Authorization": f"Bearer {admin_token}"}
+        headers = {"Authorization": f"Bearer {user_token}"}
+        item = {"type_id": 2, "date": "2025-01-10", "value": 10}
+        await client_fixture.post("/transactions", headers=admin_headers, json=item)
+        await client_fixture.post("/transactions", headers=headers, json=item)
+
+        for body in ({}, {"limit": 10, "cursor": None}, {"all": False}):
+            response = await client_fixture.request("DELETE", "/transactions", headers=headers, json=body)
+            assert response.status_code == 422
+
+        response = await client_fixture.get("/transactions", headers=admin_headers)
+        assert len(response.json()["items"]) == 2
+
+        # every transaction the user can see, not those of other users
+        response = await client_fixture.request("DELETE", "/transactions", headers=headers, json={"all": True})
+        assert response.status_code == 200
+        assert response.json() == {"count": 1}
+        response = await client_fixture.get("/transactions", headers=admin_headers)
+        assert [t["user_id"] for t in response.json()["items"]] == [1]
+
+    @pytest.mark.anyio
+    async def test_delete_transactions__demoted_admin(
+        self, client_fixture: AsyncClient, session_fixture: AsyncSession, admin_token: str, user_token: str
+    ) -> None:
+        item = {"type_id": 2, "date": "2025-01-10", "value": 10}
+        await client_fixture.post("/transactions", headers={"Authorization": f"Bearer {user_token}"}, json=item)
+        # demoted through another process, whose change this process's token version cache never saw
+        await session_fixture.execute(
+            update(User)
+            .where(User.email == settings.initial_admin_email)
+            .values(role_id=2, token_version=User.token_version + 1)
+        )
+        await session_fixture.commit()
+
+        response = await client_fixture.request(
+            "DELETE", "/transactions", headers={"Authorization": f"Bearer {admin_token}"}, json={"all": True}
+        )
+
+        # only the former admin's own transactions, of which there are none
+        assert response.status_code == 200
+        assert response.json() == {"count": 0}
+
+    @pytest.mark.anyio
+    async def test_delete_transactions__not_logged(self, client_fixture: AsyncClient) -> None:
+        response = await client_fixture.request("DELETE", "/transactions", json={})
+        assert response.status_code == 401
+
     @pytest.mark.anyio
     async def test_update_transaction__same_user_ok(self, client_fixture: AsyncClient, user_token: str) -> None:
         await client_fixture.post(
@@ -58,7 +58,7 @@ class TestUserRoutes:
         response = await client_fixture.get("/users", headers={"Authorization": f"Bearer {admin_token}"})
 
         assert response.status_code == 200
-        users = response.json()
+        users = response.json()["items"]
         assert isinstance(users, list)
         assert len(users) > 0
 
@@ -69,7 +69,7 @@ class TestUserRoutes:
         )
 
         assert response.status_code == 200
-        users = response.json()
+        users = response.json()["items"]
         assert isinstance(users, list)
         assert len(users) == 1
 
@@ -279,6 +279,15 @@ class TestUserRoutes:
         assert user["role_id"] == 2
         assert user["email"] == "test@email.com"
 
+    @pytest.mark.anyio
+    async def test_delete_user__token_no_longer_valid(self, client_fixture: AsyncClient, user_token: str) -> None:
+        response = await client_fixture.delete("/users/2", headers={"Authorization": f"Bearer {user_token}"})
+        assert response.status_code == 200
+
+        response = await client_fixture.get("/users/me", headers={"Authorization": f"Bearer {user_token}"})
+
+        assert response.status_code == 401
+
     @pytest.mark.anyio
     async def test_delete_user__all_ok_different_user_admin(
         self, client_fixture: AsyncClient, user_token: str, admin_token: str
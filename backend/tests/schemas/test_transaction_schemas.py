@@ -1,9 +1,19 @@
 from datetime import date
+from decimal import Decimal
 
 import pytest
 from pydantic import ValidationError
 
-from app.schemas import TransactionCreate, TransactionUpdate, TransactionOut, TransactionTotalOut, TransactionFilters
+from app.common.enums import AggregateGroupBy, AggregateMetric
+from app.schemas import (
+    TransactionCreate,
+    TransactionUpdate,
+    TransactionOut,
+    TransactionTotalOut,
+    TransactionFilters,
+    TransactionAggregateFilters,
+    TransactionPatch,
+)
 
 
 @pytest.mark.unit
@@ -51,6 +61,21 @@ class TestTransactionSchemas:
 
         assert "validation error for" in str(e.value)
 
+    @pytest.mark.anyio
+    async def test_TransactionCreate__value_is_exact(self):
+        transaction = TransactionCreate(type_id=1, date=date.today(), value="0.10")
+
+        assert transaction.value == Decimal("0.10")
+        # amounts are returned as JSON numbers
+        assert '"value":0.1' in transaction.model_dump_json()
+
+    @pytest.mark.anyio
+    async def test_TransactionCreate__value_too_many_decimal_places(self):
+        with pytest.raises(ValidationError) as e:
+            TransactionCreate(type_id=1, date=date.today(), value=10.005)
+
+        assert "Decimal input should have no more than 2 decimal places" in str(e.value)
+
     @pytest.mark.anyio
     async def test_TransactionCreate__comment_too_long(self):
         data = {"type_id": 1, "category_id": 2, "date": date.today(), "value": 100.5, "comment": "A" * 256}
@@ -184,13 +209,21 @@ class TestTransactionSchemas:
 
         assert total_out.total == 1500.75
 
+    @pytest.mark.anyio
+    async def test_TransactionTotalOut__json_keeps_every_digit(self):
+        # past the 15 digits a float holds, the sum would be rounded as a JSON number
+        total_out = TransactionTotalOut(total=Decimal("12345678901234567.89"))
+
+        assert total_out.model_dump_json() == '{"total":"12345678901234567.89"}'
+        assert TransactionTotalOut(total=Decimal(0)).model_dump_json() == '{"total":"0.00"}'
+
     @pytest.mark.anyio
     async def test_TransactionTotalOut__invalid_type(self):
         data = {"total": "should be float"}
         with pytest.raises(ValidationError) as e:
             TransactionTotalOut(**data)
 
-        assert "Input should be a valid number" in str(e.value)
+        assert "Input should be a valid decimal" in str(e.value)
 
     @pytest.mark.anyio
     async def test_TransactionTotalOut__missing_field(self):
@@ -262,3 +295,63 @@ class TestTransactionSchemas:
             TransactionFilters(**data)
 
         assert "Input should be a valid list" in str(e.value)
+
+    @pytest.mark.anyio
+    async def test_TransactionAggregateFilters__defaults(self):
+        filters = TransactionAggregateFilters()
+
+        assert filters.group_by == []
+        assert filters.metrics == [AggregateMetric.sum]
+
+    @pytest.mark.anyio
+    async def test_TransactionAggregateFilters__comma_separated(self):
+        filters = TransactionAggregateFilters(group_by=["type_id,month"], metrics="sum, count")
+
+        assert filters.group_by == [AggregateGroupBy.type_id, AggregateGroupBy.month]
+        assert filters.metrics == [AggregateMetric.sum, AggregateMetric.count]
+
+    @pytest.mark.anyio
+    async def test_TransactionAggregateFilters__multiple_periods(self):
+        with pytest.raises(ValidationError) as e:
+            TransactionAggregateFilters(group_by=["month", "week"])
+
+        assert "at most one of month, week, day" in str(e.value)
+
+    @pytest.mark.anyio
+    async def test_TransactionAggregateFilters__duplicates(self):
+        with pytest.raises(ValidationError) as e:
+            TransactionAggregateFilters(group_by=["type_id", "type_id"])
+
+        assert "duplicates" in str(e.value)
+
+    @pytest.mark.anyio
+    async def test_TransactionAggregateFilters__invalid_metric(self):
+        with pytest.raises(ValidationError):
+            TransactionAggregateFilters(metrics=["median"])
+
+    @pytest.mark.anyio
+    async def test_TransactionPatch__only_set_fields(self):
+        patch = TransactionPatch(category_id=None)
+
+        assert patch.model_fields_set == {"category_id"}
+
+    @pytest.mark.anyio
+    async def test_TransactionPatch__no_changes(self):
+        with pytest.raises(ValidationError) as e:
+            TransactionPatch()
+
+        assert "at least one field must be changed" in str(e.value)
+
+    @pytest.mark.anyio
+    async def test_TransactionPatch__type_without_category(self):
+        with pytest.raises(ValidationError) as e:
+            TransactionPatch(type_id=2)
+
+        assert "together with category_id" in str(e.value)
+
+    @pytest.mark.anyio
+    async def test_TransactionPatch__invalid_comment(self):
+        with pytest.raises(ValidationError) as e:
+            TransactionPatch(comment="<script>")
+
+        assert "comment contains invalid characters" in str(e.value)
@@ -5,8 +5,8 @@ import pytest
 from app.common.enums import EntityType
 from app.common.exceptions import EntityNotFoundException, ActionForbiddenException
 from app.core.config import get_settings
-from app.db_models import Category, Type, User
-from app.schemas import CategoryFilters, CategoryCreate, CategoryUpdate
+from app.db_models import Category, Type
+from app.schemas import CategoryFilters, CategoryCreate, CategoryUpdate, AuthContext
 from app.services import CategoryService
 
 
@@ -21,18 +21,18 @@ class TestCategoryServices:
         mock_session: AsyncMock,
         mock_category_service: CategoryService,
         mock_categories: list[Category],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalar_one_or_none.return_value = mock_categories[0]
-        mock_category_service.user_service.is_admin = AsyncMock(return_value=False)
 
-        category = await mock_category_service.get_by_id(entity_id=mock_categories[0].id, gotten_by=mock_users[0])
+        category = await mock_category_service.get_by_id(
+            entity_id=mock_categories[0].id, gotten_by=mock_auth_contexts[0]
+        )
 
         mock_session.execute.assert_called_once()
         mock_query.scalar_one_or_none.assert_called_once()
-        mock_category_service.user_service.is_admin.assert_not_called()
         assert category == mock_categories[0]
 
     @pytest.mark.anyio
@@ -41,32 +41,33 @@ class TestCategoryServices:
         mock_session: AsyncMock,
         mock_category_service: CategoryService,
         mock_categories: list[Category],
-        mock_users: list[User],
+        mock_admin_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalar_one_or_none.return_value = mock_categories[0]
-        mock_category_service.user_service.is_admin = AsyncMock(return_value=True)
 
-        category = await mock_category_service.get_by_id(entity_id=mock_categories[0].id, gotten_by=mock_users[1])
+        category = await mock_category_service.get_by_id(
+            entity_id=mock_categories[0].id, gotten_by=mock_admin_auth_contexts[1]
+        )
 
         mock_session.execute.assert_called_once()
         mock_query.scalar_one_or_none.assert_called_once()
-        mock_category_service.user_service.is_admin.assert_called_once()
         assert category == mock_categories[0]
 
     @pytest.mark.anyio
     async def test_get_by_id__id_does_not_exist(
-        self, mock_session: AsyncMock, mock_category_service: CategoryService, mock_users: list[User]
+        self, mock_session: AsyncMock, mock_category_service: CategoryService, mock_auth_contexts: list[AuthContext]
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalar_one_or_none.return_value = None
+        mock_query.scalar.return_value = False
 
         with pytest.raises(EntityNotFoundException):
-            await mock_category_service.get_by_id(entity_id=3, gotten_by=mock_users[0])
+            await mock_category_service.get_by_id(entity_id=3, gotten_by=mock_auth_contexts[0])
 
-        mock_session.execute.assert_called_once()
+        assert mock_session.execute.call_count == 2
         mock_query.scalar_one_or_none.assert_called_once()
 
     @pytest.mark.anyio
@@ -75,19 +76,18 @@ class TestCategoryServices:
         mock_session: AsyncMock,
         mock_category_service: CategoryService,
         mock_categories: list[Category],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
-        mock_query.scalar_one_or_none.return_value = mock_categories[0]
-        mock_category_service.user_service.is_admin = AsyncMock(return_value=False)
+        mock_query.scalar_one_or_none.return_value = None
+        mock_query.scalar.return_value = True
 
         with pytest.raises(ActionForbiddenException):
-            await mock_category_service.get_by_id(entity_id=mock_categories[0].id, gotten_by=mock_users[1])
+            await mock_category_service.get_by_id(entity_id=mock_categories[0].id, gotten_by=mock_auth_contexts[1])
 
-        mock_session.execute.assert_called_once()
+        assert mock_session.execute.call_count == 2
         mock_query.scalar_one_or_none.assert_called_once()
-        mock_category_service.user_service.is_admin.assert_called_once()
 
     @pytest.mark.anyio
     async def test_get_all_with_filters__no_filters_admin(
@@ -95,16 +95,14 @@ class TestCategoryServices:
         mock_session: AsyncMock,
         mock_category_service: CategoryService,
         mock_categories: list[Category],
-        mock_users: list[User],
+        mock_admin_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalars.return_value.all.return_value = mock_categories
-        mock_category_service.user_service.is_admin = AsyncMock(return_value=True)
 
-        categories = await mock_category_service.get_all_with_filters(gotten_by=mock_users[0])
+        categories = await mock_category_service.get_all_with_filters(gotten_by=mock_admin_auth_contexts[0])
 
-        mock_category_service.user_service.is_admin.assert_called_once()
         mock_session.execute.assert_called_once()
         mock_query.scalars.return_value.all.assert_called_once()
         assert categories == mock_categories
@@ -115,18 +113,16 @@ class TestCategoryServices:
         mock_session: AsyncMock,
         mock_category_service: CategoryService,
         mock_categories: list[Category],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalars.return_value.all.return_value = [mock_categories[1]]
-        mock_category_service.user_service.is_admin = AsyncMock(return_value=False)
 
         categories = await mock_category_service.get_all_with_filters(
-            filters=CategoryFilters(name=["groceries"]), gotten_by=mock_users[1]
+            filters=CategoryFilters(name=["groceries"]), gotten_by=mock_auth_contexts[1]
         )
 
-        mock_category_service.user_service.is_admin.assert_called_once()
         mock_session.execute.assert_called_once()
         mock_query.scalars.return_value.all.assert_called_once()
         assert categories == [mock_categories[1]]
@@ -199,18 +195,16 @@ class TestCategoryServices:
         self,
         mock_category_service: CategoryService,
         mock_categories: list[Category],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
         mock_types: list[Type],
     ) -> None:
         mock_category_service.get_by_id = AsyncMock(return_value=mock_categories[1])
-        mock_category_service.user_service.is_admin = AsyncMock(return_value=False)
 
         category = await mock_category_service._validate_update(
-            entity_id=1, update_schema=CategoryUpdate(name="test category"), updated_by=mock_users[0]
+            entity_id=1, update_schema=CategoryUpdate(name="test category"), updated_by=mock_auth_contexts[0]
         )
 
         mock_category_service.get_by_id.assert_called_once()
-        mock_category_service.user_service.is_admin.assert_not_called()
         assert category == mock_categories[1]
 
     @pytest.mark.anyio
@@ -218,55 +212,56 @@ class TestCategoryServices:
         self,
         mock_category_service: CategoryService,
         mock_categories: list[Category],
-        mock_users: list[User],
+        mock_admin_auth_contexts: list[AuthContext],
         mock_types: list[Type],
     ) -> None:
         mock_category_service.get_by_id = AsyncMock(return_value=mock_categories[1])
-        mock_category_service.user_service.is_admin = AsyncMock(return_value=True)
 
         category = await mock_category_service._validate_update(
-            entity_id=1, update_schema=CategoryUpdate(name="test category"), updated_by=mock_users[1]
+            entity_id=1, update_schema=CategoryUpdate(name="test category"), updated_by=mock_admin_auth_contexts[1]
         )
 
         mock_category_service.get_by_id.assert_called_once()
-        mock_category_service.user_service.is_admin.assert_called_once()
         assert category == mock_categories[1]
 
     @pytest.mark.anyio
     async def test_validate_update__category_does_not_exist(
-        self, mock_category_service: CategoryService, mock_users: list[User], mock_types: list[Type]
+        self,
+        mock_category_service: CategoryService,
+        mock_admin_auth_contexts: list[AuthContext],
+        mock_types: list[Type],
     ) -> None:
         mock_category_service.get_by_id = AsyncMock(
             side_effect=EntityNotFoundException(entity_id=100, entity_type=EntityType.category)
         )
-        mock_category_service.user_service.is_admin = AsyncMock(return_value=True)
 
         with pytest.raises(EntityNotFoundException):
             await mock_category_service._validate_update(
-                entity_id=100, update_schema=CategoryUpdate(name="test category"), updated_by=mock_users[1]
+                entity_id=100,
+                update_schema=CategoryUpdate(name="test category"),
+                updated_by=mock_admin_auth_contexts[1],
             )
 
         mock_category_service.get_by_id.assert_called_once()
-        mock_category_service.user_service.is_admin.assert_not_called()
 
     @pytest.mark.anyio
     async def test_validate_update__different_user(
         self,
         mock_category_service: CategoryService,
         mock_categories: list[Category],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
         mock_types: list[Type],
     ) -> None:
-        mock_category_service.get_by_id = AsyncMock(return_value=mock_categories[1])
-        mock_category_service.user_service.is_admin = AsyncMock(return_value=False)
+        mock_category_service.get_by_id = AsyncMock(
+            side_effect=ActionForbiddenException(detail="users can only update their own categories")
+        )
 
         with pytest.raises(ActionForbiddenException):
             await mock_category_service._validate_update(
-                entity_id=1, update_schema=CategoryUpdate(name="test category"), updated_by=mock_users[1]
+                entity_id=1, update_schema=CategoryUpdate(name="test category"), updated_by=mock_auth_contexts[1]
             )
 
         mock_category_service.get_by_id.assert_called_once()
-        mock_category_service.user_service.is_admin.assert_called_once()
 
     @pytest.mark.anyio
     async def test_update__all_ok(
@@ -274,7 +269,7 @@ class TestCategoryServices:
         mock_session: AsyncMock,
         mock_category_service: CategoryService,
         mock_categories: list[Category],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
         mock_category_service._validate_update = AsyncMock(return_value=mock_categories[1])
         mock_category_service._get_create_or_update_valid_fields = MagicMock(
@@ -283,7 +278,7 @@ class TestCategoryServices:
 
         category_update = CategoryUpdate(name="test category")
         category = await mock_category_service.update(
-            entity_id=mock_categories[1].id, update_schema=category_update, updated_by=mock_users[0]
+            entity_id=mock_categories[1].id, update_schema=category_update, updated_by=mock_auth_contexts[0]
         )
 
         mock_category_service._validate_update.assert_called_once()
@@ -296,67 +291,72 @@ class TestCategoryServices:
 
     @pytest.mark.anyio
     async def test_validate_delete__all_ok_same_user(
-        self, mock_category_service: CategoryService, mock_categories: list[Category], mock_users: list[User]
+        self,
+        mock_category_service: CategoryService,
+        mock_categories: list[Category],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
         mock_category_service.get_by_id = AsyncMock(return_value=mock_categories[1])
-        mock_category_service.user_service.is_admin = AsyncMock(return_value=False)
 
-        category = await mock_category_service._validate_delete(entity_id=1, deleted_by=mock_users[0])
+        category = await mock_category_service._validate_delete(entity_id=1, deleted_by=mock_auth_contexts[0])
 
         mock_category_service.get_by_id.assert_called_once()
-        mock_category_service.user_service.is_admin.assert_not_called()
         assert category == mock_categories[1]
 
     @pytest.mark.anyio
     async def test_validate_delete__all_ok_admin(
-        self, mock_category_service: CategoryService, mock_categories: list[Category], mock_users: list[User]
+        self,
+        mock_category_service: CategoryService,
+        mock_categories: list[Category],
+        mock_admin_auth_contexts: list[AuthContext],
     ) -> None:
         mock_category_service.get_by_id = AsyncMock(return_value=mock_categories[1])
-        mock_category_service.user_service.is_admin = AsyncMock(return_value=True)
 
-        category = await mock_category_service._validate_delete(entity_id=1, deleted_by=mock_users[1])
+        category = await mock_category_service._validate_delete(entity_id=1, deleted_by=mock_admin_auth_contexts[1])
 
         mock_category_service.get_by_id.assert_called_once()
-        mock_category_service.user_service.is_admin.assert_called_once()
         assert category == mock_categories[1]
 
     @pytest.mark.anyio
     async def test_validate_delete__id_not_found(
-        self, mock_category_service: CategoryService, mock_users: list[User]
+        self, mock_category_service: CategoryService, mock_admin_auth_contexts: list[AuthContext]
     ) -> None:
         mock_category_service.get_by_id = AsyncMock(
             side_effect=EntityNotFoundException(entity_id=100, entity_type=EntityType.category)
         )
-        mock_category_service.user_service.is_admin = AsyncMock(return_value=True)
 
         with pytest.raises(EntityNotFoundException):
-            await mock_category_service._validate_delete(entity_id=100, deleted_by=mock_users[0])
+            await mock_category_service._validate_delete(entity_id=100, deleted_by=mock_admin_auth_contexts[0])
 
         mock_category_service.get_by_id.assert_called_once()
-        mock_category_service.user_service.is_admin.assert_not_called()
 
     @pytest.mark.anyio
     async def test_validate_delete__different_user(
-        self, mock_category_service: CategoryService, mock_categories: list[Category], mock_users: list[User]
+        self,
+        mock_category_service: CategoryService,
+        mock_categories: list[Category],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
-        mock_category_service.get_by_id = AsyncMock(return_value=mock_categories[1])
-        mock_category_service.user_service.is_admin = AsyncMock(return_value=False)
+        mock_category_service.get_by_id = AsyncMock(
+            side_effect=ActionForbiddenException(detail="users can only delete their own categories")
+        )
 
         with pytest.raises(ActionForbiddenException):
-            await mock_category_service._validate_delete(entity_id=1, deleted_by=mock_users[1])
+            await mock_category_service._validate_delete(entity_id=1, deleted_by=mock_auth_contexts[1])
 
         mock_category_service.get_by_id.assert_called_once()
-        mock_category_service.user_service.is_admin.assert_called_once()
 
     @pytest.mark.anyio
     async def test_delete__all_ok(
         self, mock_session: AsyncMock, mock_category_service: CategoryService, mock_categories: list[Category]
     ) -> None:
         mock_category_service._validate_delete = AsyncMock(return_value=mock_categories[1])
+        mock_category_service.rollup_service.uncategorize = AsyncMock()
 
         category = await mock_category_service.delete(entity_id=mock_categories[1].id)
 
         mock_category_service._validate_delete.assert_called_once()
+        mock_category_service.rollup_service.uncategorize.assert_called_once_with(category_id=mock_categories[1].id)
         mock_session.delete.assert_called_once()
         mock_session.commit.assert_called_once()
         assert category == mock_categories[1]
@@ -1,6 +1,7 @@
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.exc import IntegrityError
 
 from app.common.exceptions import (
     EntityNotFoundException,
@@ -8,7 +9,7 @@ from app.common.exceptions import (
     EntityNotAssociatedException,
 )
 from app.db_models import Goal, Type, Category, User
-from app.schemas import GoalCreate, GoalUpdate, GoalFilters
+from app.schemas import GoalCreate, GoalUpdate, GoalFilters, AuthContext
 from app.services import GoalService
 
 
@@ -20,18 +21,17 @@ class TestGoalService:
         mock_session: AsyncMock,
         mock_goal_service: GoalService,
         mock_goals: list[Goal],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalar_one_or_none.return_value = mock_goals[0]
-        mock_goal_service.user_service.is_admin = AsyncMock(return_value=False)
 
-        goal = await mock_goal_service.get_by_id(entity_id=mock_goals[0].id, gotten_by=mock_users[0])
+        goal = await mock_goal_service.get_by_id(entity_id=mock_goals[0].id, gotten_by=mock_auth_contexts[0])
 
         mock_session.execute.assert_called_once()
         mock_query.scalar_one_or_none.assert_called_once()
-        mock_goal_service.user_service.is_admin.assert_not_called()
+        assert "goal.user_id = :" in str(mock_session.execute.call_args.args[0])
         assert goal == mock_goals[0]
 
     @pytest.mark.anyio
@@ -40,32 +40,32 @@ class TestGoalService:
         mock_session: AsyncMock,
         mock_goal_service: GoalService,
         mock_goals: list[Goal],
-        mock_users: list[User],
+        mock_admin_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalar_one_or_none.return_value = mock_goals[0]
-        mock_goal_service.user_service.is_admin = AsyncMock(return_value=True)
 
-        goal = await mock_goal_service.get_by_id(entity_id=mock_goals[0].id, gotten_by=mock_users[1])
+        goal = await mock_goal_service.get_by_id(entity_id=mock_goals[0].id, gotten_by=mock_admin_auth_contexts[1])
 
         mock_session.execute.assert_called_once()
         mock_query.scalar_one_or_none.assert_called_once()
-        mock_goal_service.user_service.is_admin.assert_called_once()
+        assert "goal.user_id = :" not in str(mock_session.execute.call_args.args[0])
         assert goal == mock_goals[0]
 
     @pytest.mark.anyio
     async def test_get_by_id__id_does_not_exist(
-        self, mock_session: AsyncMock, mock_goal_service: GoalService, mock_users: list[User]
+        self, mock_session: AsyncMock, mock_goal_service: GoalService, mock_auth_contexts: list[AuthContext]
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalar_one_or_none.return_value = None
+        mock_query.scalar.return_value = False
 
         with pytest.raises(EntityNotFoundException):
-            await mock_goal_service.get_by_id(entity_id=999, gotten_by=mock_users[0])
+            await mock_goal_service.get_by_id(entity_id=999, gotten_by=mock_auth_contexts[0])
 
-        mock_session.execute.assert_called_once()
+        assert mock_session.execute.call_count == 2
         mock_query.scalar_one_or_none.assert_called_once()
 
     @pytest.mark.anyio
@@ -74,19 +74,18 @@ class TestGoalService:
         mock_session: AsyncMock,
         mock_goal_service: GoalService,
         mock_goals: list[Goal],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
-        mock_query.scalar_one_or_none.return_value = mock_goals[0]
-        mock_goal_service.user_service.is_admin = AsyncMock(return_value=False)
+        mock_query.scalar_one_or_none.return_value = None
+        mock_query.scalar.return_value = True
 
         with pytest.raises(ActionForbiddenException):
-            await mock_goal_service.get_by_id(entity_id=mock_goals[0].id, gotten_by=mock_users[1])
+            await mock_goal_service.get_by_id(entity_id=mock_goals[0].id, gotten_by=mock_auth_contexts[1])
 
-        mock_session.execute.assert_called_once()
+        assert mock_session.execute.call_count == 2
         mock_query.scalar_one_or_none.assert_called_once()
-        mock_goal_service.user_service.is_admin.assert_called_once()
 
     @pytest.mark.anyio
     async def test_get_all_with_filters__admin(
@@ -94,16 +93,14 @@ class TestGoalService:
         mock_session: AsyncMock,
         mock_goal_service: GoalService,
         mock_goals: list[Goal],
-        mock_users: list[User],
+        mock_admin_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalars.return_value.all.return_value = mock_goals
-        mock_goal_service.user_service.is_admin = AsyncMock(return_value=True)
 
-        goals = await mock_goal_service.get_all_with_filters(gotten_by=mock_users[1])
+        goals = await mock_goal_service.get_all_with_filters(gotten_by=mock_admin_auth_contexts[1])
 
-        mock_goal_service.user_service.is_admin.assert_called_once()
         mock_session.execute.assert_called_once()
         assert goals == mock_goals
 
@@ -114,99 +111,115 @@ class TestGoalService:
         mock_goal_service: GoalService,
         mock_goals: list[Goal],
         mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalars.return_value.all.return_value = [mock_goals[0]]
-        mock_goal_service.user_service.is_admin = AsyncMock(return_value=False)
 
         filters = GoalFilters(type_id=[1])
-        goals = await mock_goal_service.get_all_with_filters(filters=filters, gotten_by=mock_users[0])
+        goals = await mock_goal_service.get_all_with_filters(filters=filters, gotten_by=mock_auth_contexts[0])
 
         assert filters.user_id == [mock_users[0].id]
-        mock_goal_service.user_service.is_admin.assert_called_once()
         mock_session.execute.assert_called_once()
         assert goals == [mock_goals[0]]
 
     @pytest.mark.anyio
-    async def test_validate_create__all_ok(
-        self, mock_goal_service: GoalService, mock_types: list[Type], mock_users: list[User]
+    async def test_get_progress_with_filters__non_admin(
+        self,
+        mock_session: AsyncMock,
+        mock_goal_service: GoalService,
+        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
-        create_schema = GoalCreate(
-            type_id=1,
-            category_id=None,
-            name="test goal",
-            start_date="2024-01-01",
-            end_date="2024-12-31",
-            target_value=100.0,
-        )
-        mock_goal_service.type_service.get_by_id = AsyncMock(return_value=mock_types[0])
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.mappings.return_value.all.return_value = [
+            {"id": 1, "target_value": 200.0, "current_value": 50.0},
+            {"id": 2, "target_value": 0.0, "current_value": 10.0},
+        ]
 
-        await mock_goal_service._validate_create(create_schema=create_schema, created_by=mock_users[0])
+        filters = GoalFilters()
+        goals = await mock_goal_service.get_progress_with_filters(filters=filters, gotten_by=mock_auth_contexts[0])
 
-        mock_goal_service.type_service.get_by_id.assert_called_once()
+        assert filters.user_id == [mock_users[0].id]
+        mock_session.execute.assert_called_once()
+        statement = str(mock_session.execute.call_args.args[0])
+        assert "LEFT OUTER JOIN" in statement
+        assert "GROUP BY goal.id" in statement
+        assert goals == [
+            {"id": 1, "target_value": 200.0, "current_value": 50.0, "percentage": 25.0, "remaining": 150.0},
+            {"id": 2, "target_value": 0.0, "current_value": 10.0, "percentage": None, "remaining": 0.0},
+        ]
 
     @pytest.mark.anyio
-    async def test_validate_create__category_not_associated(
+    async def test_create__rejected_by_constraint(
         self,
+        mock_session: AsyncMock,
         mock_goal_service: GoalService,
         mock_types: list[Type],
         mock_categories: list[Category],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
-        create_schema = create_schema = GoalCreate(
-            type_id=1,
-            category_id=2,
-            name="test goal",
-            start_date="2024-01-01",
-            end_date="2024-12-31",
-            target_value=100.0,
-        )
-        mock_goal_service.type_service.get_by_id = AsyncMock(return_value=mock_types[0])
+        mock_session.commit.side_effect = IntegrityError("INSERT", {}, Exception("FOREIGN KEY constraint failed"))
+        mock_goal_service.type_service.get_by_id = AsyncMock(return_value=mock_types[1])
         mock_goal_service.category_service.get_by_id = AsyncMock(return_value=mock_categories[1])  # mismatched type
 
+        # the references are only looked up once the insert is rejected, to raise the matching error
         with pytest.raises(EntityNotAssociatedException):
-            await mock_goal_service._validate_create(create_schema=create_schema, created_by=mock_users[0])
+            await mock_goal_service.create(
+                create_schema=GoalCreate(
+                    type_id=1,
+                    category_id=2,
+                    name="test goal",
+                    start_date="2024-01-01",
+                    end_date="2024-12-31",
+                    target_value=100.0,
+                ),
+                created_by=mock_auth_contexts[0],
+                user_id=mock_auth_contexts[0].id,
+            )
+
+        mock_session.rollback.assert_called_once()
 
     @pytest.mark.anyio
-    async def test_validate_update__all_ok_admin(
+    async def test_explain_integrity_error__category_of_another_user_admin(
         self,
         mock_goal_service: GoalService,
-        mock_goals: list[Goal],
         mock_types: list[Type],
-        mock_users: list[User],
+        mock_categories: list[Category],
+        mock_admin_auth_contexts: list[AuthContext],
     ) -> None:
-        mock_goal_service.get_by_id = AsyncMock(return_value=mock_goals[0])
-        mock_goal_service.user_service.is_admin = AsyncMock(return_value=True)
-        mock_goal_service.type_service.get_by_id = AsyncMock(return_value=mock_types[0])
-
-        goal = await mock_goal_service._validate_update(
-            entity_id=1,
-            update_schema=GoalUpdate(
-                type_id=1,
-                category_id=None,
-                name="test goal",
-                start_date="2024-01-01",
-                end_date="2024-12-31",
-                target_value=100.0,
-            ),
-            updated_by=mock_users[1],
-        )
+        mock_goal_service.type_service.get_by_id = AsyncMock(return_value=mock_types[1])
+        mock_goal_service.category_service.get_by_id = AsyncMock(return_value=mock_categories[1])
 
-        assert goal == mock_goals[0]
+        # admins may reference categories of any user, only the type of the category is wrong
+        with pytest.raises(EntityNotAssociatedException):
+            await mock_goal_service._explain_integrity_error(
+                schema=GoalCreate(
+                    type_id=1,
+                    category_id=2,
+                    name="test goal",
+                    start_date="2024-01-01",
+                    end_date="2024-12-31",
+                    target_value=100.0,
+                ),
+                created_by=mock_admin_auth_contexts[1],
+            )
 
     @pytest.mark.anyio
-    async def test_validate_update__different_user_forbidden(
+    async def test_update__category_of_another_user(
         self,
+        mock_session: AsyncMock,
         mock_goal_service: GoalService,
-        mock_goals: list[Goal],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
-        mock_goal_service.get_by_id = AsyncMock(return_value=mock_goals[0])
-        mock_goal_service.user_service.is_admin = AsyncMock(return_value=False)
+        mock_goal_service.category_service.get_by_id = AsyncMock(
+            side_effect=ActionForbiddenException(detail="users can only view their own categories")
+        )
 
-        with pytest.raises(ActionForbiddenException):
-            await mock_goal_service._validate_update(
+        with pytest.raises(ActionForbiddenException, match="users can only view their own categories"):
+            await mock_goal_service.update(
                 entity_id=1,
                 update_schema=GoalUpdate(
                     type_id=1,
@@ -216,29 +229,10 @@ class TestGoalService:
                     end_date="2024-12-31",
                     target_value=100.0,
                 ),
-                updated_by=mock_users[1],
+                updated_by=mock_auth_contexts[1],
             )
 
-    @pytest.mark.anyio
-    async def test_validate_delete__all_ok_admin(
-        self, mock_goal_service: GoalService, mock_goals: list[Goal], mock_users: list[User]
-    ) -> None:
-        mock_goal_service.get_by_id = AsyncMock(return_value=mock_goals[0])
-        mock_goal_service.user_service.is_admin = AsyncMock(return_value=True)
-
-        goal = await mock_goal_service._validate_delete(entity_id=1, deleted_by=mock_users[1])
-
-        assert goal == mock_goals[0]
-
-    @pytest.mark.anyio
-    async def test_validate_delete__different_user_forbidden(
-        self, mock_goal_service: GoalService, mock_goals: list[Goal], mock_users: list[User]
-    ) -> None:
-        mock_goal_service.get_by_id = AsyncMock(return_value=mock_goals[0])
-        mock_goal_service.user_service.is_admin = AsyncMock(return_value=False)
-
-        with pytest.raises(ActionForbiddenException):
-            await mock_goal_service._validate_delete(entity_id=1, deleted_by=mock_users[1])
+        mock_session.execute.assert_not_called()
 
     @pytest.mark.anyio
     async def test_create__all_ok(self, mock_session: AsyncMock, mock_goal_service: GoalService) -> None:
@@ -280,10 +274,12 @@ class TestGoalService:
         mock_session: AsyncMock,
         mock_goal_service: GoalService,
         mock_goals: list[Goal],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
-        mock_goal_service._validate_update = AsyncMock(return_value=mock_goals[0])
-        mock_goal_service._get_create_or_update_valid_fields = MagicMock(return_value={"target_value": 200.0})
+        mock_goals[0].target_value = 200.0
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.scalar_one_or_none.return_value = mock_goals[0]
 
         update_schema = GoalUpdate(
             type_id=1,
@@ -292,27 +288,73 @@ class TestGoalService:
             end_date="2024-12-31",
             target_value=200.0,
         )
-        goal = await mock_goal_service.update(entity_id=1, update_schema=update_schema, updated_by=mock_users[0])
+        goal = await mock_goal_service.update(
+            entity_id=1, update_schema=update_schema, updated_by=mock_auth_contexts[0]
+        )
 
-        mock_goal_service._validate_update.assert_called_once()
-        mock_goal_service._get_create_or_update_valid_fields.assert_called_once()
-        mock_session.add.assert_called_once()
+        # a single UPDATE returning the goal, without loading or refreshing it
+        mock_session.execute.assert_called_once()
+        mock_session.refresh.assert_not_called()
         mock_session.commit.assert_called_once()
-        mock_session.refresh.assert_called_once()
         assert goal.target_value == 200.0
 
+    @pytest.mark.anyio
+    async def test_update__different_user_forbidden(
+        self,
+        mock_session: AsyncMock,
+        mock_goal_service: GoalService,
+        mock_auth_contexts: list[AuthContext],
+    ) -> None:
+        mock_goal_service.exists = AsyncMock(return_value=True)
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.scalar_one_or_none.return_value = None
+
+        with pytest.raises(ActionForbiddenException, match="users can only update their own goals"):
+            await mock_goal_service.update(
+                entity_id=2,
+                update_schema=GoalUpdate(
+                    type_id=1,
+                    name="test goal",
+                    start_date="2024-01-01",
+                    end_date="2024-12-31",
+                    target_value=100.0,
+                ),
+                updated_by=mock_auth_contexts[0],
+            )
+
+        mock_session.commit.assert_not_called()
+
     @pytest.mark.anyio
     async def test_delete__all_ok(
         self,
         mock_session: AsyncMock,
         mock_goal_service: GoalService,
         mock_goals: list[Goal],
+        mock_admin_auth_contexts: list[AuthContext],
     ) -> None:
-        mock_goal_service._validate_delete = AsyncMock(return_value=mock_goals[0])
+        previous = mock_goal_service._get_column_values(mock_goals[0])
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.mappings.return_value.one_or_none.return_value = previous
 
-        goal = await mock_goal_service.delete(entity_id=mock_goals[0].id)
+        goal = await mock_goal_service.delete(entity_id=mock_goals[0].id, deleted_by=mock_admin_auth_contexts[1])
 
-        mock_goal_service._validate_delete.assert_called_once()
-        mock_session.delete.assert_called_once()
+        mock_session.execute.assert_called_once()
+        mock_session.delete.assert_not_called()
         mock_session.commit.assert_called_once()
-        assert goal == mock_goals[0]
+        assert mock_goal_service._get_column_values(goal) == previous
+
+    @pytest.mark.anyio
+    async def test_delete__different_user_forbidden(
+        self, mock_session: AsyncMock, mock_goal_service: GoalService, mock_auth_contexts: list[AuthContext]
+    ) -> None:
+        mock_goal_service.exists = AsyncMock(return_value=True)
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.mappings.return_value.one_or_none.return_value = None
+
+        with pytest.raises(ActionForbiddenException, match="users can only delete their own goals"):
+            await mock_goal_service.delete(entity_id=2, deleted_by=mock_auth_contexts[0])
+
+        mock_session.commit.assert_not_called()
@@ -71,6 +71,98 @@ class TestRoleServices:
         mock_query.scalars.return_value.all.assert_called_once()
         assert roles == [mock_roles[1]]
 
+    @pytest.mark.anyio
+    async def test_load_reference_cache(
+        self, mock_session: AsyncMock, mock_role_service: RoleService, mock_roles: list[Role]
+    ) -> None:
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.scalars.return_value.all.return_value = mock_roles
+
+        await mock_role_service.load_reference_cache()
+
+        mock_session.execute.assert_called_once()
+        assert mock_role_service.reference_cache.is_loaded
+        cached = mock_role_service.reference_cache.get(mock_roles[1].id)
+        assert cached is not mock_roles[1]
+        assert cached.id == mock_roles[1].id
+        assert cached.name == mock_roles[1].name
+
+    @pytest.mark.anyio
+    async def test_get_by_id__from_reference_cache(
+        self, mock_session: AsyncMock, mock_role_service: RoleService, mock_roles: list[Role]
+    ) -> None:
+        mock_role_service.reference_cache.load({role.id: role for role in mock_roles})
+
+        role = await mock_role_service.get_by_id(entity_id=mock_roles[1].id)
+
+        mock_session.execute.assert_not_called()
+        assert role == mock_roles[1]
+
+    @pytest.mark.anyio
+    async def test_get_by_id__from_reference_cache_id_does_not_exist(
+        self, mock_session: AsyncMock, mock_role_service: RoleService, mock_roles: list[Role]
+    ) -> None:
+        mock_role_service.reference_cache.load({role.id: role for role in mock_roles})
+
+        with pytest.raises(EntityNotFoundException):
+            await mock_role_service.get_by_id(entity_id=100)
+
+        mock_session.execute.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_get_by_id__bypass_reference_cache(
+        self, mock_session: AsyncMock, mock_role_service: RoleService, mock_roles: list[Role]
+    ) -> None:
+        mock_role_service.reference_cache.load({role.id: role for role in mock_roles})
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.scalar_one_or_none.return_value = mock_roles[1]
+
+        role = await mock_role_service.get_by_id(entity_id=mock_roles[1].id, from_cache=False)
+
+        mock_session.execute.assert_called_once()
+        assert role == mock_roles[1]
+
+    @pytest.mark.anyio
+    async def test_get_all_with_filters__from_reference_cache(
+        self, mock_session: AsyncMock, mock_role_service: RoleService, mock_roles: list[Role]
+    ) -> None:
+        mock_role_service.reference_cache.load({role.id: role for role in mock_roles})
+
+        all_roles = await mock_role_service.get_all_with_filters()
+        filtered_roles = await mock_role_service.get_all_with_filters(filters=RoleFilters(name=["admin"]))
+
+        mock_session.execute.assert_not_called()
+        assert all_roles == mock_roles
+        assert filtered_roles == [role for role in mock_roles if role.name == RoleName.admin]
+
+    @pytest.mark.anyio
+    async def test_get_by_name__from_reference_cache(
+        self, mock_session: AsyncMock, mock_role_service: RoleService, mock_roles: list[Role]
+    ) -> None:
+        mock_role_service.reference_cache.load({role.id: role for role in mock_roles})
+
+        role = await mock_role_service.get_by_name(role_name=RoleName.admin)
+
+        mock_session.execute.assert_not_called()
+        assert role.name == RoleName.admin
+
+    @pytest.mark.anyio
+    async def test_update__reloads_reference_cache(
+        self, mock_session: AsyncMock, mock_role_service: RoleService, mock_roles: list[Role]
+    ) -> None:
+        mock_role_service.reference_cache.load({})
+        mock_role_service._validate_update = AsyncMock(return_value=mock_roles[1])
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.scalars.return_value.all.return_value = mock_roles
+
+        await mock_role_service.update(entity_id=mock_roles[1].id, update_schema=RoleUpdate(name=RoleName.admin))
+
+        mock_session.execute.assert_called_once()
+        assert mock_role_service.reference_cache.get(mock_roles[1].id).name == mock_roles[1].name
+
     @pytest.mark.anyio
     async def test_get_create_or_update_valid_fields__RoleCreate(self, mock_role_service: RoleService) -> None:
         role_create = RoleCreate(name=RoleName.user)
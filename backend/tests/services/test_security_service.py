@@ -6,14 +6,19 @@ from jwt.exceptions import InvalidTokenError
 from unittest.mock import AsyncMock, patch
 
 from app.common.enums import RoleName
+from app.core.cache import principal_cache, evict_principal
 from app.db_models import User, Role
-from app.services import UserService, RoleService
+from app.schemas import TokenData, AuthContext
+from app.services import UserService
 from app.services.security import (
     authenticate_user,
+    get_access_token_data,
     create_access_token,
     create_refresh_token,
     verify_refresh_token,
     get_token_from_header_or_cookie,
+    get_token_data,
+    has_fresh_claims,
     get_current_user,
     get_current_admin,
 )
@@ -25,7 +30,7 @@ class TestSecurityServices:
     async def test_authenticate_user__success(self, mock_user_service: UserService, mock_users: list[User]) -> None:
         mock_user_service.get_by_email = AsyncMock(return_value=mock_users[0])
 
-        with patch("app.services.security.verify_password", return_value=True):
+        with patch("app.services.security.verify_password_async", return_value=True):
             user = await authenticate_user(
                 email=mock_users[0].email, password="password", user_service=mock_user_service
             )
@@ -48,7 +53,7 @@ class TestSecurityServices:
     ) -> None:
         mock_user_service.get_by_email = AsyncMock(return_value=mock_users[0])
 
-        with patch("app.services.security.verify_password", return_value=False):
+        with patch("app.services.security.verify_password_async", return_value=False):
             user = await authenticate_user(
                 email=mock_users[0].email, password="wrongpass", user_service=mock_user_service
             )
@@ -166,70 +171,213 @@ class TestSecurityServices:
         assert e.value.status_code == 401
 
     @pytest.mark.anyio
-    async def test_get_current_user__success(self, mock_user_service: UserService, mock_users: list[User]) -> None:
-        token_data = {"sub": mock_users[0].email}
-        mock_user_service.get_by_email = AsyncMock(return_value=mock_users[0])
+    async def test_get_access_token_data(
+        self, mock_user_service: UserService, mock_users: list[User], mock_roles: list[Role]
+    ) -> None:
+        mock_users[0].token_version = 3
+        mock_user_service.role_service.get_by_id = AsyncMock(return_value=mock_roles[0])
 
-        with patch("app.services.security.jwt.decode", return_value=token_data):
-            user = await get_current_user("token", mock_user_service)
+        data = await get_access_token_data(user=mock_users[0], user_service=mock_user_service)
 
-        mock_user_service.get_by_email.assert_awaited_once_with(email=mock_users[0].email)
-        assert user == mock_users[0]
+        mock_user_service.role_service.get_by_id.assert_awaited_once_with(entity_id=mock_users[0].role_id)
+        assert data == {
+            "sub": mock_users[0].email,
+            "uid": mock_users[0].id,
+            "rid": mock_roles[0].id,
+            "role": mock_roles[0].name.value,
+            "ver": 3,
+        }
+
+    @pytest.mark.anyio
+    async def test_get_token_data__all_claims(self) -> None:
+        payload = {"sub": "test1@email.com", "uid": 1, "rid": 0, "role": "admin", "ver": 2}
+
+        with patch("app.services.security.jwt.decode", return_value=payload):
+            token_data = await get_token_data("token")
+
+        assert token_data == TokenData(username="test1@email.com", user_id=1, role_id=0, role=RoleName.admin, version=2)
 
     @pytest.mark.anyio
-    async def test_get_current_user__invalid_token(self, mock_user_service: UserService) -> None:
+    async def test_get_token_data__subject_only(self) -> None:
+        with patch("app.services.security.jwt.decode", return_value={"sub": "test1@email.com"}):
+            token_data = await get_token_data("token")
+
+        assert token_data == TokenData(username="test1@email.com")
+
+    @pytest.mark.anyio
+    async def test_get_token_data__invalid_token(self) -> None:
         with patch("app.services.security.jwt.decode", side_effect=InvalidTokenError):
             with pytest.raises(HTTPException) as e:
-                await get_current_user("badtoken", mock_user_service)
+                await get_token_data("badtoken")
         assert e.value.status_code == 401
 
     @pytest.mark.anyio
-    async def test_get_current_user__no_username(self, mock_user_service: UserService) -> None:
+    async def test_get_token_data__no_username(self) -> None:
         with patch("app.services.security.jwt.decode", return_value={}):
             with pytest.raises(HTTPException) as e:
-                await get_current_user("token", mock_user_service)
+                await get_token_data("token")
         assert e.value.status_code == 401
 
     @pytest.mark.anyio
-    async def test_get_current_user__user_not_found(
+    async def test_get_token_data__invalid_claims(self) -> None:
+        with patch("app.services.security.jwt.decode", return_value={"sub": "test1@email.com", "role": "unknown"}):
+            with pytest.raises(HTTPException) as e:
+                await get_token_data("token")
+        assert e.value.status_code == 401
+
+    @pytest.mark.anyio
+    async def test_has_fresh_claims__all_claims(self) -> None:
+        token_data = TokenData(username="test1@email.com", user_id=1, role_id=0, role=RoleName.admin, version=2)
+
+        assert has_fresh_claims(token_data) is True
+
+    @pytest.mark.anyio
+    async def test_has_fresh_claims__missing_claims(self) -> None:
+        token_data = TokenData(username="test1@email.com")
+
+        assert has_fresh_claims(token_data) is False
+
+    @pytest.mark.anyio
+    async def test_has_fresh_claims__stale_version(self) -> None:
+        token_data = TokenData(username="test1@email.com", user_id=1, role_id=0, role=RoleName.admin, version=2)
+        evict_principal(user_id=1, min_token_version=3)
+
+        assert has_fresh_claims(token_data) is False
+
+    @pytest.mark.anyio
+    async def test_get_current_user__from_claims(self, mock_user_service: UserService) -> None:
+        token_data = TokenData(username="test1@email.com", user_id=1, role_id=1, role=RoleName.user, version=2)
+        mock_user_service.get_by_email = AsyncMock()
+
+        auth_context = await get_current_user(token_data, mock_user_service)
+
+        mock_user_service.get_by_email.assert_not_called()
+        assert auth_context == AuthContext(id=1, email="test1@email.com", role_id=1, is_admin=False)
+
+    @pytest.mark.anyio
+    async def test_get_current_user__admin_claims_checked(
         self, mock_user_service: UserService, mock_users: list[User]
     ) -> None:
+        token_data = TokenData(username=mock_users[0].email, user_id=1, role_id=0, role=RoleName.admin, version=2)
+        mock_users[0].token_version = 2
+        mock_user_service.get_by_email = AsyncMock(return_value=mock_users[0])
+        mock_user_service.role_service.get_by_id = AsyncMock()
+
+        auth_context = await get_current_user(token_data, mock_user_service)
+
+        mock_user_service.get_by_email.assert_awaited_once_with(email=mock_users[0].email)
+        mock_user_service.role_service.get_by_id.assert_not_called()
+        assert auth_context == AuthContext(id=1, email=mock_users[0].email, role_id=0, is_admin=True)
+
+    @pytest.mark.anyio
+    async def test_get_current_user__admin_cache_miss_falls_back_to_db(
+        self, mock_user_service: UserService, mock_users: list[User], mock_roles: list[Role]
+    ) -> None:
+        # demoted through another process, this one has no cached version and the admin claims look fresh
+        token_data = TokenData(username=mock_users[0].email, user_id=1, role_id=0, role=RoleName.admin, version=2)
+        assert has_fresh_claims(token_data) is True
+        mock_users[0].token_version = 3
+        mock_user_service.get_by_email = AsyncMock(return_value=mock_users[0])
+        mock_user_service.role_service.get_by_id = AsyncMock(return_value=mock_roles[1])
+
+        auth_context = await get_current_user(token_data, mock_user_service)
+
+        mock_user_service.role_service.get_by_id.assert_awaited_once_with(entity_id=mock_users[0].role_id)
+        assert auth_context.is_admin is False
+        # the version read from the database is cached, so the claims are stale from now on
+        assert has_fresh_claims(token_data) is False
+
+    @pytest.mark.anyio
+    async def test_get_current_user__admin_cached_principal_checked(
+        self, mock_user_service: UserService, mock_users: list[User], mock_roles: list[Role]
+    ) -> None:
+        token_data = TokenData(username=mock_users[0].email)
+        principal_cache.set(mock_users[0].email, AuthContext(id=1, email=mock_users[0].email, role_id=0, is_admin=True))
+        mock_users[0].token_version = 1
+        mock_user_service.get_by_email = AsyncMock(return_value=mock_users[0])
+        mock_user_service.role_service.get_by_id = AsyncMock(return_value=mock_roles[1])
+
+        auth_context = await get_current_user(token_data, mock_user_service)
+
+        assert auth_context.is_admin is False
+        assert principal_cache.get(mock_users[0].email) == auth_context
+
+    @pytest.mark.anyio
+    async def test_get_current_user__admin_not_found(self, mock_user_service: UserService) -> None:
+        token_data = TokenData(username="test1@email.com", user_id=1, role_id=0, role=RoleName.admin, version=2)
         mock_user_service.get_by_email = AsyncMock(return_value=None)
 
-        with patch("app.services.security.jwt.decode", return_value={"sub": mock_users[0].email}):
-            with pytest.raises(HTTPException) as e:
-                await get_current_user("token", mock_user_service)
+        with pytest.raises(HTTPException) as e:
+            await get_current_user(token_data, mock_user_service)
         assert e.value.status_code == 401
 
     @pytest.mark.anyio
-    async def test_get_current_admin__success(
-        self,
-        mock_user_service: UserService,
-        mock_users: list[User],
-        mock_role_service: RoleService,
-        mock_roles: list[Role],
+    async def test_get_current_user__stale_claims(
+        self, mock_user_service: UserService, mock_users: list[User], mock_roles: list[Role]
     ) -> None:
-        admin_role = next(role for role in mock_roles if role.name.value == RoleName.admin.value)
-        mock_user_service.role_service = mock_role_service
-        mock_role_service.get_by_id = AsyncMock(return_value=admin_role)
+        token_data = TokenData(
+            username=mock_users[0].email, user_id=mock_users[0].id, role_id=0, role=RoleName.admin, version=2
+        )
+        evict_principal(user_id=mock_users[0].id, min_token_version=3)
+        mock_user_service.get_by_email = AsyncMock(return_value=mock_users[0])
+        mock_user_service.role_service.get_by_id = AsyncMock(return_value=mock_roles[1])
 
-        user = await get_current_admin(mock_users[0], mock_user_service)
+        auth_context = await get_current_user(token_data, mock_user_service)
 
-        mock_role_service.get_by_id.assert_awaited_once_with(entity_id=mock_users[0].role_id)
-        assert user == mock_users[0]
+        mock_user_service.get_by_email.assert_awaited_once_with(email=mock_users[0].email)
+        assert auth_context.id == mock_users[0].id
+        assert auth_context.is_admin is False
 
     @pytest.mark.anyio
-    async def test_get_current_admin__not_admin(
-        self,
-        mock_user_service: UserService,
-        mock_users: list[User],
-        mock_role_service: RoleService,
-        mock_roles: list[Role],
+    async def test_get_current_user__success(
+        self, mock_user_service: UserService, mock_users: list[User], mock_roles: list[Role]
     ) -> None:
-        non_admin_role = next(role for role in mock_roles if role.name.value != RoleName.admin.value)
-        mock_user_service.role_service = mock_role_service
-        mock_role_service.get_by_id = AsyncMock(return_value=non_admin_role)
+        token_data = TokenData(username=mock_users[0].email)
+        mock_user_service.get_by_email = AsyncMock(return_value=mock_users[0])
+        mock_user_service.role_service.get_by_id = AsyncMock(return_value=mock_roles[0])
+
+        auth_context = await get_current_user(token_data, mock_user_service)
+
+        mock_user_service.get_by_email.assert_awaited_once_with(email=mock_users[0].email)
+        mock_user_service.role_service.get_by_id.assert_awaited_once_with(entity_id=mock_users[0].role_id)
+        assert auth_context == AuthContext(
+            id=mock_users[0].id, email=mock_users[0].email, role_id=mock_users[0].role_id, is_admin=True
+        )
+        assert principal_cache.get(mock_users[0].email) == auth_context
 
+    @pytest.mark.anyio
+    async def test_get_current_user__cached(
+        self, mock_user_service: UserService, mock_auth_contexts: list[AuthContext]
+    ) -> None:
+        token_data = TokenData(username=mock_auth_contexts[0].email)
+        principal_cache.set(mock_auth_contexts[0].email, mock_auth_contexts[0])
+        mock_user_service.get_by_email = AsyncMock()
+
+        auth_context = await get_current_user(token_data, mock_user_service)
+
+        mock_user_service.get_by_email.assert_not_called()
+        assert auth_context == mock_auth_contexts[0]
+
+    @pytest.mark.anyio
+    async def test_get_current_user__user_not_found(
+        self, mock_user_service: UserService, mock_users: list[User]
+    ) -> None:
+        token_data = TokenData(username=mock_users[0].email)
+        mock_user_service.get_by_email = AsyncMock(return_value=None)
+
+        with pytest.raises(HTTPException) as e:
+            await get_current_user(token_data, mock_user_service)
+        assert e.value.status_code == 401
+        assert principal_cache.get(mock_users[0].email) is None
+
+    @pytest.mark.anyio
+    async def test_get_current_admin__success(self, mock_admin_auth_contexts: list[AuthContext]) -> None:
+        auth_context = await get_current_admin(mock_admin_auth_contexts[0])
+
+        assert auth_context == mock_admin_auth_contexts[0]
+
+    @pytest.mark.anyio
+    async def test_get_current_admin__not_admin(self, mock_auth_contexts: list[AuthContext]) -> None:
         with pytest.raises(HTTPException) as e:
-            await get_current_admin(mock_users[0], mock_user_service)
+            await get_current_admin(mock_auth_contexts[0])
         assert e.value.status_code == 403
@@ -1,15 +1,27 @@
+from datetime import date
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
 
 from app.common.exceptions import (
     EntityNotFoundException,
     ActionForbiddenException,
     EntityNotAssociatedException,
+    BulkValidationException,
 )
 from app.db_models import Transaction, Type, Category, User
-from app.schemas import TransactionCreate, TransactionUpdate, TransactionFilters
+from app.schemas import (
+    TransactionCreate,
+    TransactionUpdate,
+    TransactionPatch,
+    TransactionFilters,
+    TransactionOut,
+    AuthContext,
+)
 from app.services import TransactionService
+from app.utils.pagination_utils import decode_cursor, encode_cursor
 
 
 @pytest.mark.unit
@@ -20,20 +32,18 @@ class TestTransactionService:
         mock_session: AsyncMock,
         mock_transaction_service: TransactionService,
         mock_transactions: list[Transaction],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalar_one_or_none.return_value = mock_transactions[0]
-        mock_transaction_service.user_service.is_admin = AsyncMock(return_value=False)
 
         transaction = await mock_transaction_service.get_by_id(
-            entity_id=mock_transactions[0].id, gotten_by=mock_users[0]
+            entity_id=mock_transactions[0].id, gotten_by=mock_auth_contexts[0]
         )
 
         mock_session.execute.assert_called_once()
         mock_query.scalar_one_or_none.assert_called_once()
-        mock_transaction_service.user_service.is_admin.assert_not_called()
         assert transaction == mock_transactions[0]
 
     @pytest.mark.anyio
@@ -42,34 +52,36 @@ class TestTransactionService:
         mock_session: AsyncMock,
         mock_transaction_service: TransactionService,
         mock_transactions: list[Transaction],
-        mock_users: list[User],
+        mock_admin_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalar_one_or_none.return_value = mock_transactions[0]
-        mock_transaction_service.user_service.is_admin = AsyncMock(return_value=True)
 
         transaction = await mock_transaction_service.get_by_id(
-            entity_id=mock_transactions[0].id, gotten_by=mock_users[1]
+            entity_id=mock_transactions[0].id, gotten_by=mock_admin_auth_contexts[1]
         )
 
         mock_session.execute.assert_called_once()
         mock_query.scalar_one_or_none.assert_called_once()
-        mock_transaction_service.user_service.is_admin.assert_called_once()
         assert transaction == mock_transactions[0]
 
     @pytest.mark.anyio
     async def test_get_by_id__id_does_not_exist(
-        self, mock_session: AsyncMock, mock_transaction_service: TransactionService, mock_users: list[User]
+        self,
+        mock_session: AsyncMock,
+        mock_transaction_service: TransactionService,
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalar_one_or_none.return_value = None
+        mock_query.scalar.return_value = False
 
         with pytest.raises(EntityNotFoundException):
-            await mock_transaction_service.get_by_id(entity_id=999, gotten_by=mock_users[0])
+            await mock_transaction_service.get_by_id(entity_id=999, gotten_by=mock_auth_contexts[0])
 
-        mock_session.execute.assert_called_once()
+        assert mock_session.execute.call_count == 2
         mock_query.scalar_one_or_none.assert_called_once()
 
     @pytest.mark.anyio
@@ -78,19 +90,36 @@ class TestTransactionService:
         mock_session: AsyncMock,
         mock_transaction_service: TransactionService,
         mock_transactions: list[Transaction],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
-        mock_query.scalar_one_or_none.return_value = mock_transactions[0]
-        mock_transaction_service.user_service.is_admin = AsyncMock(return_value=False)
+        mock_query.scalar_one_or_none.return_value = None
+        mock_query.scalar.return_value = True
 
         with pytest.raises(ActionForbiddenException):
-            await mock_transaction_service.get_by_id(entity_id=mock_transactions[0].id, gotten_by=mock_users[1])
+            await mock_transaction_service.get_by_id(entity_id=mock_transactions[0].id, gotten_by=mock_auth_contexts[1])
 
-        mock_session.execute.assert_called_once()
+        assert mock_session.execute.call_count == 2
         mock_query.scalar_one_or_none.assert_called_once()
-        mock_transaction_service.user_service.is_admin.assert_called_once()
+
+    @pytest.mark.anyio
+    async def test_get_by_id__as_rows(
+        self,
+        mock_session: AsyncMock,
+        mock_transaction_service: TransactionService,
+        mock_auth_contexts: list[AuthContext],
+    ) -> None:
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.one_or_none.return_value = (1, None, date(2025, 1, 1), 10, None, 1, 1, None)
+
+        row = await mock_transaction_service.get_by_id(entity_id=1, gotten_by=mock_auth_contexts[0], as_rows=True)
+
+        statement = mock_session.execute.call_args.args[0]
+        assert [column.name for column in statement.selected_columns] == list(TransactionOut.model_fields)
+        mock_query.scalar_one_or_none.assert_not_called()
+        assert row == mock_query.one_or_none.return_value
 
     @pytest.mark.anyio
     async def test_get_all_with_filters__admin(
@@ -98,16 +127,14 @@ class TestTransactionService:
         mock_session: AsyncMock,
         mock_transaction_service: TransactionService,
         mock_transactions: list[Transaction],
-        mock_users: list[User],
+        mock_admin_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalars.return_value.all.return_value = mock_transactions
-        mock_transaction_service.user_service.is_admin = AsyncMock(return_value=True)
 
-        transactions = await mock_transaction_service.get_all_with_filters(gotten_by=mock_users[1])
+        transactions = await mock_transaction_service.get_all_with_filters(gotten_by=mock_admin_auth_contexts[1])
 
-        mock_transaction_service.user_service.is_admin.assert_called_once()
         mock_session.execute.assert_called_once()
         assert transactions == mock_transactions
 
@@ -118,36 +145,150 @@ class TestTransactionService:
         mock_transaction_service: TransactionService,
         mock_transactions: list[Transaction],
         mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalars.return_value.all.return_value = [mock_transactions[0]]
-        mock_transaction_service.user_service.is_admin = AsyncMock(return_value=False)
 
         filters = TransactionFilters(type_id=[1])
-        transactions = await mock_transaction_service.get_all_with_filters(filters=filters, gotten_by=mock_users[0])
+        transactions = await mock_transaction_service.get_all_with_filters(
+            filters=filters, gotten_by=mock_auth_contexts[0]
+        )
 
         assert filters.user_id == [mock_users[0].id]
-        mock_transaction_service.user_service.is_admin.assert_called_once()
         mock_session.execute.assert_called_once()
         assert transactions == [mock_transactions[0]]
 
+    @pytest.mark.anyio
+    async def test_get_all_with_filters__as_rows(
+        self,
+        mock_session: AsyncMock,
+        mock_transaction_service: TransactionService,
+        mock_admin_auth_contexts: list[AuthContext],
+    ) -> None:
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.all.return_value = [(1, None, date(2025, 1, 1), 10, None, 1, 1, None)]
+
+        rows = await mock_transaction_service.get_all_with_filters(gotten_by=mock_admin_auth_contexts[1], as_rows=True)
+
+        statement = mock_session.execute.call_args.args[0]
+        # only the output columns, in the order of the output schema
+        assert [column.name for column in statement.selected_columns] == list(TransactionOut.model_fields)
+        mock_query.scalars.assert_not_called()
+        assert rows == mock_query.all.return_value
+
+    @pytest.mark.anyio
+    async def test_update_with_filters__locks_matched_rows(
+        self,
+        mock_session: AsyncMock,
+        mock_transaction_service: TransactionService,
+        mock_admin_auth_contexts: list[AuthContext],
+    ) -> None:
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_session.get_bind.return_value.dialect.name = "postgresql"
+        previous = {"id": 7, "user_id": 2, "type_id": 2, "category_id": 1, "date": date(2025, 1, 1), "value": 10}
+        mock_query.mappings.return_value.all.return_value = [previous]
+
+        count = await mock_transaction_service.update_with_filters(
+            filters=TransactionFilters(category_id=[1]),
+            patch_schema=TransactionPatch(category_id=None),
+            updated_by=mock_admin_auth_contexts[1],
+        )
+
+        select_statement, update_statement = (call.args[0] for call in mock_session.execute.call_args_list[:2])
+        assert select_statement._for_update_arg is not None
+        # only the locked rows are updated, not whatever matches the filters by then
+        assert "transaction.id = ANY" in str(update_statement.compile(dialect=postgresql.dialect()))
+        assert "category_id IN" not in str(update_statement.compile(dialect=postgresql.dialect()))
+        assert count == 1
+
+    @pytest.mark.anyio
+    async def test_delete_with_filters__rollup_from_deleted_rows(
+        self,
+        mock_session: AsyncMock,
+        mock_transaction_service: TransactionService,
+        mock_auth_contexts: list[AuthContext],
+    ) -> None:
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_session.get_bind.return_value.dialect.name = "postgresql"
+        deleted = {"user_id": 1, "type_id": 2, "category_id": None, "date": date(2025, 1, 1), "value": 10}
+        mock_query.mappings.return_value.all.return_value = [deleted]
+        mock_transaction_service.rollup_service.add_many = AsyncMock()
+
+        count = await mock_transaction_service.delete_with_filters(
+            filters=TransactionFilters(value_lt=20), deleted_by=mock_auth_contexts[0]
+        )
+
+        # the DELETE is the first statement, the rollup is reduced by what it returned
+        delete_statement = mock_session.execute.call_args_list[0].args[0]
+        assert str(delete_statement.compile(dialect=postgresql.dialect())).startswith("DELETE FROM transaction")
+        mock_transaction_service.rollup_service.add_many.assert_awaited_once_with([deleted], sign=-1)
+        assert count == 1
+
+    @pytest.mark.anyio
+    async def test_get_page_with_filters__has_next_page(
+        self,
+        mock_session: AsyncMock,
+        mock_transaction_service: TransactionService,
+        mock_transactions: list[Transaction],
+        mock_admin_auth_contexts: list[AuthContext],
+    ) -> None:
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.scalars.return_value.all.return_value = mock_transactions[:2]
+
+        transactions, next_cursor = await mock_transaction_service.get_page_with_filters(
+            filters=TransactionFilters(limit=1), gotten_by=mock_admin_auth_contexts[0]
+        )
+
+        mock_session.execute.assert_called_once()
+        statement = mock_session.execute.call_args.args[0]
+        assert statement._limit == 2
+        assert transactions == mock_transactions[:1]
+        assert decode_cursor(next_cursor, python_types=[date, int]) == [
+            mock_transactions[0].date,
+            mock_transactions[0].id,
+        ]
+
+    @pytest.mark.anyio
+    async def test_get_page_with_filters__last_page(
+        self,
+        mock_session: AsyncMock,
+        mock_transaction_service: TransactionService,
+        mock_transactions: list[Transaction],
+        mock_admin_auth_contexts: list[AuthContext],
+    ) -> None:
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.scalars.return_value.all.return_value = mock_transactions[:1]
+
+        transactions, next_cursor = await mock_transaction_service.get_page_with_filters(
+            filters=TransactionFilters(limit=1, cursor=encode_cursor([date(2024, 1, 1), 1])),
+            gotten_by=mock_admin_auth_contexts[0],
+        )
+
+        mock_session.execute.assert_called_once()
+        assert transactions == mock_transactions[:1]
+        assert next_cursor is None
+
     @pytest.mark.anyio
     async def test_get_total_with_filters__admin(
         self,
         mock_session: AsyncMock,
         mock_transaction_service: TransactionService,
         mock_transactions: list[Transaction],
-        mock_users: list[User],
+        mock_admin_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalar.return_value = 1500.0
-        mock_transaction_service.user_service.is_admin = AsyncMock(return_value=True)
 
-        total = await mock_transaction_service.get_total_with_filters(gotten_by=mock_users[1])
+        total = await mock_transaction_service.get_total_with_filters(gotten_by=mock_admin_auth_contexts[1])
 
-        mock_transaction_service.user_service.is_admin.assert_called_once()
         mock_session.execute.assert_called_once()
         assert total == 1500.0
 
@@ -158,106 +299,122 @@ class TestTransactionService:
         mock_transaction_service: TransactionService,
         mock_transactions: list[Transaction],
         mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
         mock_query = MagicMock()
         mock_session.execute.return_value = mock_query
         mock_query.scalar.return_value = 500.0
-        mock_transaction_service.user_service.is_admin = AsyncMock(return_value=False)
 
         filters = TransactionFilters(type_id=[1])
-        total = await mock_transaction_service.get_total_with_filters(filters=filters, gotten_by=mock_users[0])
+        total = await mock_transaction_service.get_total_with_filters(filters=filters, gotten_by=mock_auth_contexts[0])
 
         assert filters.user_id == [mock_users[0].id]
-        mock_transaction_service.user_service.is_admin.assert_called_once()
         mock_session.execute.assert_called_once()
         assert total == 500.0
 
     @pytest.mark.anyio
-    async def test_validate_create__all_ok(
-        self, mock_transaction_service: TransactionService, mock_types: list[Type], mock_users: list[User]
+    @pytest.mark.parametrize(
+        "filters, uses_rollup, uses_transactions",
+        [
+            (TransactionFilters(type_id=[1]), True, False),
+            (TransactionFilters(date_gt=date(2025, 1, 1), date_lt=date(2025, 3, 31)), True, False),
+            (TransactionFilters(date_gt=date(2025, 1, 15), date_lt=date(2025, 3, 31)), True, True),
+            (TransactionFilters(date_gt=date(2025, 1, 15), date_lt=date(2025, 2, 10)), False, True),
+            (TransactionFilters(value_gt=10), False, True),
+            (TransactionFilters(comment=["rent"]), False, True),
+        ],
+    )
+    async def test_get_total_statement__rollup(
+        self,
+        mock_transaction_service: TransactionService,
+        filters: TransactionFilters,
+        uses_rollup: bool,
+        uses_transactions: bool,
     ) -> None:
-        create_schema = TransactionCreate(type_id=1, category_id=None, date="2024-01-01", value=100.0)
-        mock_transaction_service.type_service.get_by_id = AsyncMock(return_value=mock_types[0])
-
-        await mock_transaction_service._validate_create(create_schema=create_schema, created_by=mock_users[0])
+        statement = str(mock_transaction_service._get_total_statement(filters=filters))
 
-        mock_transaction_service.type_service.get_by_id.assert_called_once()
+        assert ("sum(transaction_monthly_rollup.total)" in statement) == uses_rollup
+        assert ("sum(transaction.value)" in statement) == uses_transactions
 
     @pytest.mark.anyio
-    async def test_validate_create__category_not_associated(
+    async def test_create__rejected_by_constraint(
         self,
+        mock_session: AsyncMock,
         mock_transaction_service: TransactionService,
         mock_types: list[Type],
         mock_categories: list[Category],
-        mock_users: list[User],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
-        create_schema = TransactionCreate(type_id=1, category_id=2, date="2024-01-01", value=100.0)
-        mock_transaction_service.type_service.get_by_id = AsyncMock(return_value=mock_types[0])
-        mock_transaction_service.category_service.get_by_id = AsyncMock(
-            return_value=mock_categories[1]
-        )  # mismatched type
+        mock_transaction_service.rollup_service.add_changes = AsyncMock()
+        mock_session.commit.side_effect = IntegrityError("INSERT", {}, Exception("FOREIGN KEY constraint failed"))
+        mock_transaction_service.category_service.get_by_id = AsyncMock(return_value=mock_categories[1])
+        mock_transaction_service.type_service.get_by_ids = AsyncMock(return_value={1: mock_types[1]})
+        mock_transaction_service.category_service.get_by_ids = AsyncMock(return_value={2: mock_categories[1]})
 
+        # the references are only looked up once the insert is rejected, to raise the matching error
         with pytest.raises(EntityNotAssociatedException):
-            await mock_transaction_service._validate_create(create_schema=create_schema, created_by=mock_users[0])
+            await mock_transaction_service.create(
+                create_schema=TransactionCreate(type_id=1, category_id=2, date="2024-01-01", value=100.0),
+                created_by=mock_auth_contexts[0],
+                user_id=mock_auth_contexts[0].id,
+            )
+
+        mock_session.rollback.assert_called_once()
+        mock_transaction_service.category_service.get_by_ids.assert_called_once_with(entity_ids=[2])
 
     @pytest.mark.anyio
-    async def test_validate_update__all_ok_admin(
+    async def test_explain_integrity_error__category_of_another_user_admin(
         self,
         mock_transaction_service: TransactionService,
-        mock_transactions: list[Transaction],
         mock_types: list[Type],
-        mock_users: list[User],
+        mock_categories: list[Category],
+        mock_admin_auth_contexts: list[AuthContext],
     ) -> None:
-        mock_transaction_service.get_by_id = AsyncMock(return_value=mock_transactions[0])
-        mock_transaction_service.user_service.is_admin = AsyncMock(return_value=True)
-        mock_transaction_service.type_service.get_by_id = AsyncMock(return_value=mock_types[0])
-
-        transaction = await mock_transaction_service._validate_update(
-            entity_id=1,
-            update_schema=TransactionUpdate(type_id=1, date="2024-01-01", value=50.0),
-            updated_by=mock_users[1],
-        )
+        mock_transaction_service.type_service.get_by_ids = AsyncMock(return_value={1: mock_types[1]})
+        mock_transaction_service.category_service.get_by_ids = AsyncMock(return_value={2: mock_categories[1]})
 
-        assert transaction == mock_transactions[0]
+        # admins may reference categories of any user, only the type of the category is wrong
+        with pytest.raises(EntityNotAssociatedException):
+            await mock_transaction_service._explain_integrity_error(
+                schema=TransactionCreate(type_id=1, category_id=2, date="2024-01-01", value=100.0),
+                created_by=mock_admin_auth_contexts[1],
+            )
 
     @pytest.mark.anyio
-    async def test_validate_update__different_user_forbidden(
+    async def test_validate_create__category_of_another_user(
         self,
         mock_transaction_service: TransactionService,
-        mock_transactions: list[Transaction],
-        mock_users: list[User],
-        mock_types: list[Type],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
-        mock_transaction_service.get_by_id = AsyncMock(return_value=mock_transactions[0])
-        mock_transaction_service.user_service.is_admin = AsyncMock(return_value=False)
+        mock_transaction_service.category_service.get_by_id = AsyncMock(
+            side_effect=ActionForbiddenException(detail="users can only view their own categories")
+        )
 
         with pytest.raises(ActionForbiddenException):
-            await mock_transaction_service._validate_update(
-                entity_id=1,
-                update_schema=TransactionUpdate(type_id=1, date="2024-01-01", value=50.0),
-                updated_by=mock_users[1],
+            await mock_transaction_service._validate_create(
+                create_schema=TransactionCreate(type_id=1, category_id=1, date="2024-01-01", value=100.0),
+                created_by=mock_auth_contexts[1],
             )
 
-    @pytest.mark.anyio
-    async def test_validate_delete__all_ok_admin(
-        self, mock_transaction_service: TransactionService, mock_transactions: list[Transaction], mock_users: list[User]
-    ) -> None:
-        mock_transaction_service.get_by_id = AsyncMock(return_value=mock_transactions[0])
-        mock_transaction_service.user_service.is_admin = AsyncMock(return_value=True)
-
-        transaction = await mock_transaction_service._validate_delete(entity_id=1, deleted_by=mock_users[1])
-
-        assert transaction == mock_transactions[0]
+        mock_transaction_service.category_service.get_by_id.assert_called_once_with(
+            entity_id=1, gotten_by=mock_auth_contexts[1]
+        )
 
     @pytest.mark.anyio
-    async def test_validate_delete__different_user_forbidden(
-        self, mock_transaction_service: TransactionService, mock_transactions: list[Transaction], mock_users: list[User]
+    async def test_validate_create__admin(
+        self,
+        mock_transaction_service: TransactionService,
+        mock_admin_auth_contexts: list[AuthContext],
     ) -> None:
-        mock_transaction_service.get_by_id = AsyncMock(return_value=mock_transactions[0])
-        mock_transaction_service.user_service.is_admin = AsyncMock(return_value=False)
+        mock_transaction_service.category_service.get_by_id = AsyncMock()
 
-        with pytest.raises(ActionForbiddenException):
-            await mock_transaction_service._validate_delete(entity_id=1, deleted_by=mock_users[1])
+        # the category is left to the database constraints for admins
+        await mock_transaction_service._validate_create(
+            create_schema=TransactionCreate(type_id=1, category_id=1, date="2024-01-01", value=100.0),
+            created_by=mock_admin_auth_contexts[1],
+        )
+
+        mock_transaction_service.category_service.get_by_id.assert_not_called()
 
     @pytest.mark.anyio
     async def test_create__all_ok(self, mock_session: AsyncMock, mock_transaction_service: TransactionService) -> None:
@@ -265,12 +422,16 @@ class TestTransactionService:
         mock_transaction_service._get_create_or_update_valid_fields = MagicMock(
             return_value={"type_id": 1, "date": "2024-01-01", "value": 200.0, "user_id": 1}
         )
+        mock_transaction_service.rollup_service.add_changes = AsyncMock()
 
         create_schema = TransactionCreate(type_id=1, date="2024-01-01", value=200.0)
         transaction = await mock_transaction_service.create(create_schema=create_schema)
 
         mock_transaction_service._validate_create.assert_called_once()
         mock_transaction_service._get_create_or_update_valid_fields.assert_called_once()
+        rollup_kwargs = mock_transaction_service.rollup_service.add_changes.call_args.kwargs
+        assert rollup_kwargs["previous"] == []
+        assert [(row["type_id"], row["value"]) for row in rollup_kwargs["current"]] == [(1, 200.0)]
         mock_session.add.assert_called_once()
         mock_session.commit.assert_called_once()
         assert isinstance(transaction, Transaction)
@@ -278,28 +439,137 @@ class TestTransactionService:
         assert transaction.value == 200.0
         assert transaction.user_id == 1
 
+    @pytest.mark.anyio
+    async def test_validate_create_bulk__prefetches_references(
+        self,
+        mock_transaction_service: TransactionService,
+        mock_types: list[Type],
+        mock_categories: list[Category],
+        mock_auth_contexts: list[AuthContext],
+    ) -> None:
+        mock_transaction_service.type_service.get_by_ids = AsyncMock(return_value={1: mock_types[1]})
+        mock_transaction_service.category_service.get_by_ids = AsyncMock(return_value={1: mock_categories[0]})
+        create_schemas = [
+            TransactionCreate(type_id=1, category_id=1, date="2024-01-01", value=1.0),
+            TransactionCreate(type_id=1, category_id=1, date="2024-01-02", value=2.0),
+            TransactionCreate(type_id=3, category_id=None, date="2024-01-03", value=3.0),
+        ]
+
+        errors = await mock_transaction_service._validate_create_bulk(
+            create_schemas=create_schemas, created_by=mock_auth_contexts[0]
+        )
+
+        assert errors == [{"index": 2, "detail": "type with id 3 not found"}]
+        mock_transaction_service.type_service.get_by_ids.assert_called_once()
+        mock_transaction_service.category_service.get_by_ids.assert_called_once()
+
+    @pytest.mark.anyio
+    async def test_create_bulk__atomic_invalid(
+        self,
+        mock_session: AsyncMock,
+        mock_transaction_service: TransactionService,
+        mock_auth_contexts: list[AuthContext],
+    ) -> None:
+        mock_transaction_service._validate_create_bulk = AsyncMock(
+            return_value=[{"index": 0, "detail": "type with id 3 not found"}]
+        )
+
+        with pytest.raises(BulkValidationException):
+            await mock_transaction_service.create_bulk(
+                create_schemas=[TransactionCreate(type_id=3, date="2024-01-01", value=1.0)],
+                created_by=mock_auth_contexts[0],
+            )
+
+        mock_session.execute.assert_not_called()
+        mock_session.commit.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_create_bulk__not_atomic_creates_valid_items(
+        self,
+        mock_session: AsyncMock,
+        mock_transaction_service: TransactionService,
+        mock_transactions: list[Transaction],
+        mock_auth_contexts: list[AuthContext],
+    ) -> None:
+        errors = [{"index": 1, "detail": "type with id 3 not found"}]
+        mock_transaction_service._validate_create_bulk = AsyncMock(return_value=errors)
+        mock_transaction_service.rollup_service.add_many = AsyncMock()
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.scalars.return_value.all.return_value = [mock_transactions[0]]
+
+        transactions, returned_errors = await mock_transaction_service.create_bulk(
+            create_schemas=[
+                TransactionCreate(type_id=1, date="2024-01-01", value=1.0),
+                TransactionCreate(type_id=3, date="2024-01-02", value=2.0),
+            ],
+            created_by=mock_auth_contexts[0],
+            atomic=False,
+        )
+
+        assert transactions == [mock_transactions[0]]
+        assert returned_errors == errors
+        # only the valid item is inserted and rolled up, in one statement and one commit
+        mock_session.execute.assert_called_once()
+        assert [row["value"] for row in mock_session.execute.call_args.args[1]] == [1.0]
+        mock_transaction_service.rollup_service.add_many.assert_called_once()
+        mock_session.commit.assert_called_once()
+
     @pytest.mark.anyio
     async def test_update__all_ok(
         self,
         mock_session: AsyncMock,
         mock_transaction_service: TransactionService,
         mock_transactions: list[Transaction],
-        mock_users: list[User],
+        mock_categories: list[Category],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
-        mock_transaction_service._validate_update = AsyncMock(return_value=mock_transactions[0])
-        mock_transaction_service._get_create_or_update_valid_fields = MagicMock(return_value={"value": 300.0})
+        mock_transaction_service.rollup_service.add_changes = AsyncMock()
+        mock_transaction_service.category_service.get_by_id = AsyncMock(return_value=mock_categories[0])
+        previous = mock_transaction_service._get_column_values(mock_transactions[0])
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.mappings.return_value.one_or_none.return_value = previous
+        mock_query.scalar_one_or_none.return_value = Transaction(**{**previous, "value": 300.0})
 
-        update_schema = TransactionUpdate(type_id=1, date="2024-01-01", value=300.0)
+        update_schema = TransactionUpdate(type_id=1, category_id=1, date="2025-09-01", value=300.0)
         transaction = await mock_transaction_service.update(
-            entity_id=1, update_schema=update_schema, updated_by=mock_users[0]
+            entity_id=1, update_schema=update_schema, updated_by=mock_auth_contexts[0]
         )
 
-        mock_transaction_service._validate_update.assert_called_once()
-        mock_transaction_service._get_create_or_update_valid_fields.assert_called_once()
-        mock_session.add.assert_called_once()
+        # the category is checked, the previous values are read, then the UPDATE returns the transaction
+        mock_transaction_service.category_service.get_by_id.assert_called_once()
+        assert mock_session.execute.call_count == 2
+        mock_session.add.assert_not_called()
+        mock_session.refresh.assert_not_called()
         mock_session.commit.assert_called_once()
-        mock_session.refresh.assert_called_once()
         assert transaction.value == 300.0
+        # the previous value is moved out of the rollup and the updated one added
+        rollup_kwargs = mock_transaction_service.rollup_service.add_changes.call_args.kwargs
+        assert [row["value"] for row in rollup_kwargs["previous"]] == [mock_transactions[0].value]
+        assert [row["value"] for row in rollup_kwargs["current"]] == [300.0]
+
+    @pytest.mark.anyio
+    async def test_update__different_user_forbidden(
+        self,
+        mock_session: AsyncMock,
+        mock_transaction_service: TransactionService,
+        mock_auth_contexts: list[AuthContext],
+    ) -> None:
+        mock_transaction_service.exists = AsyncMock(return_value=True)
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.mappings.return_value.one_or_none.return_value = None
+
+        with pytest.raises(ActionForbiddenException, match="users can only update their own transactions"):
+            await mock_transaction_service.update(
+                entity_id=2,
+                update_schema=TransactionUpdate(type_id=1, date="2024-01-01", value=50.0),
+                updated_by=mock_auth_contexts[0],
+            )
+
+        mock_transaction_service.exists.assert_called_once_with(entity_id=2)
+        mock_session.commit.assert_not_called()
 
     @pytest.mark.anyio
     async def test_delete__all_ok(
@@ -307,12 +577,39 @@ class TestTransactionService:
         mock_session: AsyncMock,
         mock_transaction_service: TransactionService,
         mock_transactions: list[Transaction],
+        mock_auth_contexts: list[AuthContext],
     ) -> None:
-        mock_transaction_service._validate_delete = AsyncMock(return_value=mock_transactions[0])
+        mock_transaction_service.rollup_service.add_changes = AsyncMock()
+        previous = mock_transaction_service._get_column_values(mock_transactions[0])
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.mappings.return_value.one_or_none.return_value = previous
 
-        transaction = await mock_transaction_service.delete(entity_id=mock_transactions[0].id)
+        transaction = await mock_transaction_service.delete(
+            entity_id=mock_transactions[0].id, deleted_by=mock_auth_contexts[0]
+        )
 
-        mock_transaction_service._validate_delete.assert_called_once()
-        mock_session.delete.assert_called_once()
+        # a single DELETE returning the row, whose value is then moved out of the rollup
+        mock_session.execute.assert_called_once()
+        mock_session.delete.assert_not_called()
+        mock_transaction_service.rollup_service.add_changes.assert_called_once_with(previous=[previous], current=[])
         mock_session.commit.assert_called_once()
-        assert transaction == mock_transactions[0]
+        assert isinstance(transaction, Transaction)
+        assert mock_transaction_service._get_column_values(transaction) == previous
+
+    @pytest.mark.anyio
+    async def test_delete__id_does_not_exist(
+        self,
+        mock_session: AsyncMock,
+        mock_transaction_service: TransactionService,
+        mock_auth_contexts: list[AuthContext],
+    ) -> None:
+        mock_transaction_service.exists = AsyncMock(return_value=False)
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.mappings.return_value.one_or_none.return_value = None
+
+        with pytest.raises(EntityNotFoundException):
+            await mock_transaction_service.delete(entity_id=999, deleted_by=mock_auth_contexts[0])
+
+        mock_session.commit.assert_not_called()
@@ -71,6 +71,109 @@ class TestTypeServices:
         mock_query.scalars.return_value.all.assert_called_once()
         assert types == [mock_types[1]]
 
+    @pytest.mark.anyio
+    async def test_load_reference_cache(
+        self, mock_session: AsyncMock, mock_type_service: TypeService, mock_types: list[Type]
+    ) -> None:
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.scalars.return_value.all.return_value = mock_types
+
+        await mock_type_service.load_reference_cache()
+
+        mock_session.execute.assert_called_once()
+        assert mock_type_service.reference_cache.is_loaded
+        cached = mock_type_service.reference_cache.get(mock_types[1].id)
+        assert cached is not mock_types[1]
+        assert cached.id == mock_types[1].id
+        assert cached.name == mock_types[1].name
+
+    @pytest.mark.anyio
+    async def test_get_by_id__from_reference_cache(
+        self, mock_session: AsyncMock, mock_type_service: TypeService, mock_types: list[Type]
+    ) -> None:
+        mock_type_service.reference_cache.load({type.id: type for type in mock_types})
+
+        type = await mock_type_service.get_by_id(entity_id=mock_types[1].id)
+
+        mock_session.execute.assert_not_called()
+        assert type == mock_types[1]
+
+    @pytest.mark.anyio
+    async def test_get_by_id__from_reference_cache_id_does_not_exist(
+        self, mock_session: AsyncMock, mock_type_service: TypeService, mock_types: list[Type]
+    ) -> None:
+        mock_type_service.reference_cache.load({type.id: type for type in mock_types})
+
+        with pytest.raises(EntityNotFoundException):
+            await mock_type_service.get_by_id(entity_id=100)
+
+        mock_session.execute.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_get_by_ids__from_reference_cache(
+        self, mock_session: AsyncMock, mock_type_service: TypeService, mock_types: list[Type]
+    ) -> None:
+        mock_type_service.reference_cache.load({type.id: type for type in mock_types})
+
+        types = await mock_type_service.get_by_ids(entity_ids=[mock_types[1].id, mock_types[1].id, 100])
+
+        mock_session.execute.assert_not_called()
+        assert types == {mock_types[1].id: mock_types[1]}
+
+    @pytest.mark.anyio
+    async def test_get_by_id__bypass_reference_cache(
+        self, mock_session: AsyncMock, mock_type_service: TypeService, mock_types: list[Type]
+    ) -> None:
+        mock_type_service.reference_cache.load({type.id: type for type in mock_types})
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.scalar_one_or_none.return_value = mock_types[1]
+
+        type = await mock_type_service.get_by_id(entity_id=mock_types[1].id, from_cache=False)
+
+        mock_session.execute.assert_called_once()
+        assert type == mock_types[1]
+
+    @pytest.mark.anyio
+    async def test_get_all_with_filters__from_reference_cache(
+        self, mock_session: AsyncMock, mock_type_service: TypeService, mock_types: list[Type]
+    ) -> None:
+        mock_type_service.reference_cache.load({type.id: type for type in mock_types})
+
+        all_types = await mock_type_service.get_all_with_filters()
+        filtered_types = await mock_type_service.get_all_with_filters(filters=TypeFilters(name=["expense"]))
+
+        mock_session.execute.assert_not_called()
+        assert all_types == mock_types
+        assert filtered_types == [type for type in mock_types if type.name == TypeName.expense]
+
+    @pytest.mark.anyio
+    async def test_get_by_name__from_reference_cache(
+        self, mock_session: AsyncMock, mock_type_service: TypeService, mock_types: list[Type]
+    ) -> None:
+        mock_type_service.reference_cache.load({type.id: type for type in mock_types})
+
+        type = await mock_type_service.get_by_name(type_name=TypeName.expense)
+
+        mock_session.execute.assert_not_called()
+        assert type.name == TypeName.expense
+
+    @pytest.mark.anyio
+    async def test_update__reloads_reference_cache(
+        self, mock_session: AsyncMock, mock_type_service: TypeService, mock_types: list[Type]
+    ) -> None:
+        mock_type_service.reference_cache.load({})
+        mock_type_service._validate_update = AsyncMock(return_value=mock_types[1])
+        mock_query = MagicMock()
+        mock_session.execute.return_value = mock_query
+        mock_query.scalars.return_value.all.return_value = mock_types
+
+        await mock_type_service.update(entity_id=mock_types[1].id, update_schema=TypeUpdate(name=TypeName.expense))
+
+        mock_session.execute.assert_called_once()
+        assert mock_type_service.reference_cache.get(mock_types[1].id).name == mock_types[1].name
+
     @pytest.mark.anyio
     async def test_get_create_or_update_valid_fields__TypeCreate(self, mock_type_service: TypeService) -> None:
         type_create = TypeCreate(name=TypeName.expense)
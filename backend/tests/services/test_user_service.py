@@ -1,11 +1,13 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy.exc import IntegrityError
 
-from app.common.enums import EntityType, RoleName
+from app.common.enums import EntityType
 from app.common.exceptions import EntityNotFoundException, UserEmailAlreadyExistsException, ActionForbiddenException
+from app.core.cache import principal_cache
 from app.db_models import User, Role
-from app.schemas import UserFilters, UserCreate, UserUpdate
+from app.schemas import UserFilters, UserCreate, UserUpdate, AuthContext
 from app.services import UserService
 
 
@@ -67,43 +69,6 @@ class TestUserServices:
         mock_query.scalar_one_or_none.assert_called_once()
         assert user is None
 
-    @pytest.mark.anyio
-    async def test_is_admin__role_matches(self, mock_user_service: UserService, mock_users: list[User]):
-        admin_role = Role(id=1, name=RoleName.admin)
-        mock_user_service.get_by_id = AsyncMock(return_value=mock_users[0])
-        mock_user_service.role_service.get_by_name = AsyncMock(return_value=admin_role)
-
-        result = await mock_user_service.is_admin(user_id=1)
-
-        mock_user_service.get_by_id.assert_called_once()
-        mock_user_service.role_service.get_by_name.assert_called_once()
-        assert result is True
-
-    @pytest.mark.anyio
-    async def test_is_admin__role_does_not_match(self, mock_user_service: UserService, mock_users: list[User]):
-        admin_role = Role(id=1, name=RoleName.admin)
-        mock_user_service.get_by_id = AsyncMock(return_value=mock_users[1])
-        mock_user_service.role_service.get_by_name = AsyncMock(return_value=admin_role)
-
-        result = await mock_user_service.is_admin(user_id=1)
-
-        mock_user_service.get_by_id.assert_called_once()
-        mock_user_service.role_service.get_by_name.assert_called_once()
-        assert result is False
-
-    @pytest.mark.anyio
-    async def test_is_admin__user_not_found(self, mock_user_service: UserService, mock_users: list[User]):
-        mock_user_service.get_by_id = AsyncMock(
-            side_effect=EntityNotFoundException(entity_id=100, entity_type=EntityType.user)
-        )
-        mock_user_service.role_service.get_by_name = AsyncMock()
-
-        with pytest.raises(EntityNotFoundException):
-            await mock_user_service.is_admin(user_id=100)
-
-        mock_user_service.get_by_id.assert_called_once()
-        mock_user_service.role_service.get_by_name.assert_not_called()
-
     @pytest.mark.anyio
     async def test_get_all_with_filters__no_filters(
         self, mock_session: AsyncMock, mock_user_service: UserService, mock_users: list[User]
@@ -133,21 +98,23 @@ class TestUserServices:
         assert roles == [mock_users[1]]
 
     @pytest.mark.anyio
-    async def test_validate_create__all_ok(self, mock_user_service: UserService) -> None:
+    async def test_explain_integrity_error__other_constraint(self, mock_user_service: UserService) -> None:
         mock_user_service.get_by_email = AsyncMock(return_value=None)
         user_create = UserCreate(email="test@test.pl", password="testpassword")
 
-        await mock_user_service._validate_create(create_schema=user_create)
+        await mock_user_service._explain_integrity_error(schema=user_create)
 
         mock_user_service.get_by_email.assert_called_once()
 
     @pytest.mark.anyio
-    async def test_validate_create__email_exists(self, mock_user_service: UserService, mock_users: list[User]) -> None:
+    async def test_explain_integrity_error__email_exists(
+        self, mock_user_service: UserService, mock_users: list[User]
+    ) -> None:
         mock_user_service.get_by_email = AsyncMock(return_value=mock_users[0])
         user_create = UserCreate(email=mock_users[0].email, password="testpassword")
 
         with pytest.raises(UserEmailAlreadyExistsException):
-            await mock_user_service._validate_create(create_schema=user_create)
+            await mock_user_service._explain_integrity_error(schema=user_create)
 
         mock_user_service.get_by_email.assert_called_once()
 
@@ -194,72 +161,66 @@ class TestUserServices:
         assert user.password_hash == "testhash"
 
     @pytest.mark.anyio
-    async def test_create__email_exists(self, mock_session: AsyncMock, mock_user_service: UserService) -> None:
-        mock_user_service._validate_create = AsyncMock(
-            side_effect=UserEmailAlreadyExistsException(email="test@test.pl")
-        )
-        mock_user_service._get_create_or_update_valid_fields = MagicMock(
-            return_value={"role_id": 2, "email": "test@test.pl", "password_hash": "testhash"}
-        )
+    async def test_create__email_exists(
+        self, mock_session: AsyncMock, mock_user_service: UserService, mock_users: list[User]
+    ) -> None:
+        mock_session.commit.side_effect = IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed"))
+        mock_user_service.get_by_email = AsyncMock(return_value=mock_users[0])
 
         user_create = UserCreate(email="test@test.pl", password="testpassword")
         with pytest.raises(UserEmailAlreadyExistsException):
-            await mock_user_service.create(create_schema=user_create)
+            await mock_user_service.create(create_schema=user_create, password_hash="testhash", role_id=2)
 
-        mock_user_service._validate_create.assert_called_once()
-        mock_user_service._get_create_or_update_valid_fields.assert_not_called()
-        mock_session.add.assert_not_called()
-        mock_session.commit.assert_not_called()
+        # a single insert, the email is only looked up once the unique constraint rejected it
+        mock_session.add.assert_called_once()
+        mock_session.rollback.assert_called_once()
+        mock_user_service.get_by_email.assert_called_once_with(email="test@test.pl")
 
     @pytest.mark.anyio
-    async def test_validate_update__all_ok_admin(self, mock_user_service: UserService, mock_users: list[User]) -> None:
+    async def test_validate_update__all_ok_admin(
+        self, mock_user_service: UserService, mock_users: list[User], mock_admin_auth_contexts: list[AuthContext]
+    ) -> None:
         mock_user_service.get_by_id = AsyncMock(return_value=mock_users[2])
-        mock_user_service.is_admin = AsyncMock(return_value=True)
         mock_user_service.role_service.get_by_id = AsyncMock(return_value=Role(id=1, name="test admin"))
         mock_user_service.get_by_email = AsyncMock(return_value=None)
 
         user_update = UserUpdate(
             role_id=1, email="test@test.pl", old_password="oldpassword", new_password="newpassword"
         )
-        with patch("app.services.user.verify_password", return_value=True):
+        with patch("app.services.user.verify_password_async", return_value=True):
             user = await mock_user_service._validate_update(
-                entity_id=1, update_schema=user_update, updated_by=mock_users[0]
+                entity_id=1, update_schema=user_update, updated_by=mock_admin_auth_contexts[0]
             )
 
         mock_user_service.get_by_id.assert_called_once()
-        assert (
-            mock_user_service.is_admin.call_count == 2
-        )  # first when checking if can update at all, second when checking if can update roles
         mock_user_service.role_service.get_by_id.assert_called_once()
         mock_user_service.get_by_email.assert_called_once()
         assert user == mock_users[2]
 
     @pytest.mark.anyio
     async def test_validate_update__all_ok_same_user(
-        self, mock_user_service: UserService, mock_users: list[User]
+        self, mock_user_service: UserService, mock_users: list[User], mock_auth_contexts: list[AuthContext]
     ) -> None:
         mock_user_service.get_by_id = AsyncMock(return_value=mock_users[2])
-        mock_user_service.is_admin = AsyncMock(return_value=False)
         mock_user_service.role_service.get_by_id = AsyncMock(return_value=Role(id=2, name="test role"))
         mock_user_service.get_by_email = AsyncMock(return_value=None)
 
         user_update = UserUpdate(
             role_id=2, email="test@test.pl", old_password="oldpassword", new_password="newpassword"
         )
-        with patch("app.services.user.verify_password", return_value=True):
+        with patch("app.services.user.verify_password_async", return_value=True):
             user = await mock_user_service._validate_update(
-                entity_id=1, update_schema=user_update, updated_by=mock_users[2]
+                entity_id=1, update_schema=user_update, updated_by=mock_auth_contexts[2]
             )
 
         mock_user_service.get_by_id.assert_called_once()
-        mock_user_service.is_admin.assert_called_once()  # skipped at first because first condition of or is true already
         mock_user_service.role_service.get_by_id.assert_called_once()
         mock_user_service.get_by_email.assert_called_once()
         assert user == mock_users[2]
 
     @pytest.mark.anyio
     async def test_validate_update__user_id_does_not_exist(
-        self, mock_user_service: UserService, mock_users: list[User]
+        self, mock_user_service: UserService, mock_auth_contexts: list[AuthContext]
     ) -> None:
         mock_user_service.get_by_id = AsyncMock(
             side_effect=EntityNotFoundException(entity_id=100, entity_type=EntityType.user)
@@ -271,7 +232,9 @@ class TestUserServices:
             role_id=1, email="test@test.pl", old_password="oldpassword", new_password="newpassword"
         )
         with pytest.raises(EntityNotFoundException):
-            await mock_user_service._validate_update(entity_id=100, update_schema=user_update, updated_by=mock_users[0])
+            await mock_user_service._validate_update(
+                entity_id=100, update_schema=user_update, updated_by=mock_auth_contexts[0]
+            )
 
         mock_user_service.get_by_id.assert_called_once()
         mock_user_service.role_service.get_by_id.assert_not_called()
@@ -279,10 +242,9 @@ class TestUserServices:
 
     @pytest.mark.anyio
     async def test_validate_update__different_user(
-        self, mock_user_service: UserService, mock_users: list[User]
+        self, mock_user_service: UserService, mock_users: list[User], mock_auth_contexts: list[AuthContext]
     ) -> None:
         mock_user_service.get_by_id = AsyncMock(return_value=mock_users[2])
-        mock_user_service.is_admin = AsyncMock(return_value=False)
         mock_user_service.role_service.get_by_id = AsyncMock(return_value=Role(id=2, name="test role"))
         mock_user_service.get_by_email = AsyncMock(return_value=None)
 
@@ -290,19 +252,19 @@ class TestUserServices:
             role_id=2, email="test@test.pl", old_password="oldpassword", new_password="newpassword"
         )
         with pytest.raises(ActionForbiddenException):
-            await mock_user_service._validate_update(entity_id=1, update_schema=user_update, updated_by=mock_users[1])
+            await mock_user_service._validate_update(
+                entity_id=1, update_schema=user_update, updated_by=mock_auth_contexts[1]
+            )
 
         mock_user_service.get_by_id.assert_called_once()
-        mock_user_service.is_admin.assert_called_once()
         mock_user_service.role_service.get_by_id.assert_not_called()
         mock_user_service.get_by_email.assert_not_called()
 
     @pytest.mark.anyio
     async def test_validate_update__role_id_does_not_exist(
-        self, mock_user_service: UserService, mock_users: list[User]
+        self, mock_user_service: UserService, mock_users: list[User], mock_admin_auth_contexts: list[AuthContext]
     ) -> None:
         mock_user_service.get_by_id = AsyncMock(return_value=mock_users[0])
-        mock_user_service.is_admin = AsyncMock(return_value=True)
         mock_user_service.role_service.get_by_id = AsyncMock(
             side_effect=EntityNotFoundException(entity_id=100, entity_type=EntityType.role)
         )
@@ -312,19 +274,19 @@ class TestUserServices:
             role_id=100, email="test@test.pl", old_password="oldpassword", new_password="newpassword"
         )
         with pytest.raises(EntityNotFoundException):
-            await mock_user_service._validate_update(entity_id=1, update_schema=user_update, updated_by=mock_users[0])
+            await mock_user_service._validate_update(
+                entity_id=1, update_schema=user_update, updated_by=mock_admin_auth_contexts[0]
+            )
 
         mock_user_service.get_by_id.assert_called_once()
-        mock_user_service.is_admin.assert_not_called()  # skipped because first condition of or is true already
         mock_user_service.role_service.get_by_id.assert_called_once()
         mock_user_service.get_by_email.assert_not_called()
 
     @pytest.mark.anyio
     async def test_validate_update__cannot_update_roles(
-        self, mock_user_service: UserService, mock_users: list[User]
+        self, mock_user_service: UserService, mock_users: list[User], mock_auth_contexts: list[AuthContext]
     ) -> None:
         mock_user_service.get_by_id = AsyncMock(return_value=mock_users[2])
-        mock_user_service.is_admin = AsyncMock(return_value=False)
         mock_user_service.role_service.get_by_id = AsyncMock(return_value=Role(id=2, name="test role"))
         mock_user_service.get_by_email = AsyncMock(return_value=None)
 
@@ -332,19 +294,19 @@ class TestUserServices:
             role_id=1, email="test@test.pl", old_password="oldpassword", new_password="newpassword"
         )
         with pytest.raises(ActionForbiddenException):
-            await mock_user_service._validate_update(entity_id=1, update_schema=user_update, updated_by=mock_users[2])
+            await mock_user_service._validate_update(
+                entity_id=1, update_schema=user_update, updated_by=mock_auth_contexts[2]
+            )
 
         mock_user_service.get_by_id.assert_called_once()
-        mock_user_service.is_admin.assert_called_once()
         mock_user_service.role_service.get_by_id.assert_called_once()
         mock_user_service.get_by_email.assert_not_called()
 
     @pytest.mark.anyio
     async def test_validate_update__cannot_update_role_protected_user(
-        self, mock_user_service: UserService, mock_users: list[User]
+        self, mock_user_service: UserService, mock_users: list[User], mock_admin_auth_contexts: list[AuthContext]
     ) -> None:
         mock_user_service.get_by_id = AsyncMock(return_value=mock_users[1])
-        mock_user_service.is_admin = AsyncMock(return_value=True)
         mock_user_service.role_service.get_by_id = AsyncMock(return_value=Role(id=2, name="test role"))
         mock_user_service.get_by_email = AsyncMock(return_value=None)
 
@@ -352,19 +314,19 @@ class TestUserServices:
             role_id=1, email="test@test.pl", old_password="oldpassword", new_password="newpassword"
         )
         with pytest.raises(ActionForbiddenException):
-            await mock_user_service._validate_update(entity_id=1, update_schema=user_update, updated_by=mock_users[0])
+            await mock_user_service._validate_update(
+                entity_id=1, update_schema=user_update, updated_by=mock_admin_auth_contexts[0]
+            )
 
         mock_user_service.get_by_id.assert_called_once()
-        mock_user_service.is_admin.assert_called_once()
         mock_user_service.role_service.get_by_id.assert_called_once()
         mock_user_service.get_by_email.assert_not_called()
 
     @pytest.mark.anyio
     async def test_validate_update__email_exists_different_user(
-        self, mock_user_service: UserService, mock_users: list[User]
+        self, mock_user_service: UserService, mock_users: list[User], mock_admin_auth_contexts: list[AuthContext]
     ) -> None:
         mock_user_service.get_by_id = AsyncMock(return_value=mock_users[0])
-        mock_user_service.is_admin = AsyncMock(return_value=True)
         mock_user_service.role_service.get_by_id = AsyncMock(return_value=Role(id=2, name="test role"))
         mock_user_service.get_by_email = AsyncMock(return_value=mock_users[1])
 
@@ -372,52 +334,50 @@ class TestUserServices:
             role_id=2, email="test@test.pl", old_password="oldpassword", new_password="newpassword"
         )
         with pytest.raises(UserEmailAlreadyExistsException):
-            await mock_user_service._validate_update(entity_id=1, update_schema=user_update, updated_by=mock_users[0])
+            await mock_user_service._validate_update(
+                entity_id=1, update_schema=user_update, updated_by=mock_admin_auth_contexts[0]
+            )
 
         mock_user_service.get_by_id.assert_called_once()
-        mock_user_service.is_admin.assert_called_once()
         mock_user_service.role_service.get_by_id.assert_called_once()
         mock_user_service.get_by_email.assert_called_once()
 
     @pytest.mark.anyio
     async def test_validate_update__email_exists_same_user(
-        self, mock_user_service: UserService, mock_users: list[User]
+        self, mock_user_service: UserService, mock_users: list[User], mock_auth_contexts: list[AuthContext]
     ) -> None:
         mock_user_service.get_by_id = AsyncMock(return_value=mock_users[0])
-        mock_user_service.is_admin = AsyncMock(return_value=False)
         mock_user_service.role_service.get_by_id = AsyncMock(return_value=Role(id=1, name="test admin"))
         mock_user_service.get_by_email = AsyncMock(return_value=mock_users[0])
 
         user_update = UserUpdate(
             role_id=1, email="test@test.pl", old_password="oldpassword", new_password="newpassword"
         )
-        with patch("app.services.user.verify_password", return_value=True):
+        with patch("app.services.user.verify_password_async", return_value=True):
             user = await mock_user_service._validate_update(
-                entity_id=1, update_schema=user_update, updated_by=mock_users[0]
+                entity_id=1, update_schema=user_update, updated_by=mock_auth_contexts[0]
             )
 
         mock_user_service.get_by_id.assert_called_once()
-        mock_user_service.is_admin.assert_called_once()
         mock_user_service.role_service.get_by_id.assert_called_once()
         mock_user_service.get_by_email.assert_called_once()
         assert user == mock_users[0]
 
     @pytest.mark.anyio
     async def test_validate_update__old_password_does_not_match(
-        self, mock_user_service: UserService, mock_users: list[User]
+        self, mock_user_service: UserService, mock_users: list[User], mock_auth_contexts: list[AuthContext]
     ) -> None:
         mock_user_service.get_by_id = AsyncMock(return_value=mock_users[0])
-        mock_user_service.is_admin = AsyncMock(return_value=False)
         mock_user_service.role_service.get_by_id = AsyncMock(return_value=Role(id=1, name="test admin"))
         mock_user_service.get_by_email = AsyncMock(return_value=None)
 
         user_update = UserUpdate(
             role_id=1, email="test@test.pl", old_password="oldpassword", new_password="newpassword"
         )
-        with patch("app.services.user.verify_password", return_value=False):
+        with patch("app.services.user.verify_password_async", return_value=False):
             with pytest.raises(ActionForbiddenException):
                 await mock_user_service._validate_update(
-                    entity_id=1, update_schema=user_update, updated_by=mock_users[0]
+                    entity_id=1, update_schema=user_update, updated_by=mock_auth_contexts[0]
                 )
 
     @pytest.mark.anyio
@@ -444,6 +404,21 @@ class TestUserServices:
         assert user.email == user_update.email
         assert user.password_hash == "testhash"
 
+    @pytest.mark.anyio
+    async def test_update__evicts_cached_principal(
+        self, mock_user_service: UserService, mock_users: list[User]
+    ) -> None:
+        principal_cache.set(mock_users[0].email, mock_users[0])
+        principal_cache.set(mock_users[1].email, mock_users[1])
+        mock_user_service._validate_update = AsyncMock(return_value=mock_users[0])
+        mock_user_service._get_create_or_update_valid_fields = MagicMock(return_value={"email": "new@test.pl"})
+
+        user_update = UserUpdate(role_id=1, email="new@test.pl", old_password="oldpassword", new_password="newpassword")
+        await mock_user_service.update(entity_id=mock_users[0].id, update_schema=user_update)
+
+        assert principal_cache.get("test1@email.com") is None
+        assert principal_cache.get(mock_users[1].email) == mock_users[1]
+
     @pytest.mark.anyio
     async def test_update__entity_id_does_not_exist(
         self, mock_session: AsyncMock, mock_user_service: UserService, mock_users: list[User]
@@ -515,46 +490,46 @@ class TestUserServices:
 
     @pytest.mark.anyio
     async def test_vaidate_delete__all_ok_same_user(
-        self, mock_user_service: UserService, mock_users: list[User]
+        self, mock_user_service: UserService, mock_users: list[User], mock_auth_contexts: list[AuthContext]
     ) -> None:
         mock_user_service.get_by_id = AsyncMock(return_value=mock_users[2])
-        mock_user_service.is_admin = AsyncMock(return_value=False)
 
-        user = await mock_user_service._validate_delete(entity_id=1, deleted_by=mock_users[2])
+        user = await mock_user_service._validate_delete(entity_id=1, deleted_by=mock_auth_contexts[2])
 
         mock_user_service.get_by_id.assert_called_once()
-        mock_user_service.is_admin.assert_not_called()  # skipped because first condition of or is true already
         assert user == mock_users[2]
 
     @pytest.mark.anyio
-    async def test_vaidate_delete__all_ok_admin(self, mock_user_service: UserService, mock_users: list[User]) -> None:
+    async def test_vaidate_delete__all_ok_admin(
+        self, mock_user_service: UserService, mock_users: list[User], mock_admin_auth_contexts: list[AuthContext]
+    ) -> None:
         mock_user_service.get_by_id = AsyncMock(return_value=mock_users[2])
-        mock_user_service.is_admin = AsyncMock(return_value=True)
 
-        user = await mock_user_service._validate_delete(entity_id=1, deleted_by=mock_users[0])
+        user = await mock_user_service._validate_delete(entity_id=1, deleted_by=mock_admin_auth_contexts[0])
 
         mock_user_service.get_by_id.assert_called_once()
-        mock_user_service.is_admin.assert_called_once()
         assert user == mock_users[2]
 
     @pytest.mark.anyio
-    async def test_vaidate_delete__different_user(self, mock_user_service: UserService, mock_users: list[User]) -> None:
+    async def test_vaidate_delete__different_user(
+        self, mock_user_service: UserService, mock_users: list[User], mock_auth_contexts: list[AuthContext]
+    ) -> None:
         mock_user_service.get_by_id = AsyncMock(return_value=mock_users[2])
-        mock_user_service.is_admin = AsyncMock(return_value=False)
 
         with pytest.raises(ActionForbiddenException):
-            await mock_user_service._validate_delete(entity_id=1, deleted_by=mock_users[1])
+            await mock_user_service._validate_delete(entity_id=1, deleted_by=mock_auth_contexts[1])
 
         mock_user_service.get_by_id.assert_called_once()
-        mock_user_service.is_admin.assert_called_once()
 
     @pytest.mark.anyio
-    async def test_vaidate_delete__protected_user(self, mock_user_service: UserService, mock_users: list[User]) -> None:
+    async def test_vaidate_delete__protected_user(
+        self, mock_user_service: UserService, mock_users: list[User], mock_auth_contexts: list[AuthContext]
+    ) -> None:
         mock_user_service.get_by_id = AsyncMock(return_value=mock_users[1])
         mock_user_service.role_service.get_by_name = AsyncMock(return_value=Role(id=1, name="test admin"))
 
         with pytest.raises(ActionForbiddenException):
-            await mock_user_service._validate_delete(entity_id=2, deleted_by=mock_users[1])
+            await mock_user_service._validate_delete(entity_id=2, deleted_by=mock_auth_contexts[1])
 
         mock_user_service.get_by_id.assert_called_once()
 
@@ -571,6 +546,17 @@ class TestUserServices:
         mock_session.commit.assert_called_once()
         assert role == mock_users[0]
 
+    @pytest.mark.anyio
+    async def test_delete__evicts_cached_principal(
+        self, mock_user_service: UserService, mock_users: list[User]
+    ) -> None:
+        principal_cache.set(mock_users[0].email, mock_users[0])
+        mock_user_service._validate_delete = AsyncMock(return_value=mock_users[0])
+
+        await mock_user_service.delete(entity_id=mock_users[0].id)
+
+        assert principal_cache.get(mock_users[0].email) is None
+
     @pytest.mark.anyio
     async def test_delete__protected_user(
         self, mock_session: AsyncMock, mock_user_service: UserService, mock_users: list[Role]
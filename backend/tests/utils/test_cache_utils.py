@@ -0,0 +1,149 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.utils.cache_utils import ReferenceCache, TTLCache
+
+
+@pytest.mark.unit
+class TestCacheUtils:
+    @pytest.mark.anyio
+    async def test_get__missing_key(self):
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+
+        assert cache.get("missing") is None
+
+    @pytest.mark.anyio
+    async def test_set__then_get(self):
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+
+        cache.set("key", "value")
+
+        assert cache.get("key") == "value"
+        assert len(cache) == 1
+
+    @pytest.mark.anyio
+    async def test_get__expired_entry(self):
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+
+        with patch("app.utils.cache_utils.time.monotonic", return_value=1000.0):
+            cache.set("key", "value")
+        with patch("app.utils.cache_utils.time.monotonic", return_value=1060.0):
+            value = cache.get("key")
+
+        assert value is None
+        assert len(cache) == 0
+
+    @pytest.mark.anyio
+    async def test_set__evicts_least_recently_used(self):
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+
+        cache.set("first", 1)
+        cache.set("second", 2)
+        cache.get("first")
+        cache.set("third", 3)
+
+        assert cache.get("first") == 1
+        assert cache.get("second") is None
+        assert cache.get("third") == 3
+
+    @pytest.mark.anyio
+    async def test_set__zero_max_size_disables_cache(self):
+        cache = TTLCache(max_size=0, ttl_seconds=60)
+
+        cache.set("key", "value")
+
+        assert cache.get("key") is None
+
+    @pytest.mark.anyio
+    async def test_pop(self):
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+        cache.set("key", "value")
+
+        cache.pop("key")
+        cache.pop("missing")
+
+        assert cache.get("key") is None
+
+    @pytest.mark.anyio
+    async def test_pop_where(self):
+        cache = TTLCache(max_size=3, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 1)
+
+        cache.pop_where(lambda _, value: value == 1)
+
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert cache.get("c") is None
+
+    @pytest.mark.anyio
+    async def test_clear(self):
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        cache.clear()
+
+        assert len(cache) == 0
+
+
+@pytest.mark.unit
+class TestReferenceCache:
+    @pytest.mark.anyio
+    async def test_not_loaded(self):
+        cache = ReferenceCache()
+
+        assert not cache.is_loaded
+        assert cache.get(1) is None
+        assert cache.find(lambda _: True) is None
+        assert cache.values() == []
+
+    @pytest.mark.anyio
+    async def test_load__then_get(self):
+        cache = ReferenceCache()
+
+        cache.load({1: "a", 2: "b"})
+
+        assert cache.is_loaded
+        assert cache.get(1) == "a"
+        assert cache.get(3) is None
+        assert cache.values() == ["a", "b"]
+
+    @pytest.mark.anyio
+    async def test_load__empty_snapshot_is_loaded(self):
+        cache = ReferenceCache()
+
+        cache.load({})
+
+        assert cache.is_loaded
+        assert cache.values() == []
+
+    @pytest.mark.anyio
+    async def test_load__replaces_snapshot(self):
+        cache = ReferenceCache()
+        cache.load({1: "a", 2: "b"})
+
+        cache.load({3: "c"})
+
+        assert cache.get(1) is None
+        assert cache.values() == ["c"]
+
+    @pytest.mark.anyio
+    async def test_find(self):
+        cache = ReferenceCache()
+        cache.load({1: "a", 2: "b"})
+
+        assert cache.find(lambda value: value == "b") == "b"
+        assert cache.find(lambda value: value == "c") is None
+
+    @pytest.mark.anyio
+    async def test_clear(self):
+        cache = ReferenceCache()
+        cache.load({1: "a"})
+
+        cache.clear()
+
+        assert not cache.is_loaded
+        assert cache.get(1) is None
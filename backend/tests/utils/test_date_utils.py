@@ -0,0 +1,40 @@
+from datetime import date
+
+import pytest
+
+from app.utils.date_utils import get_month_start, get_next_month_start, get_whole_months
+
+
+@pytest.mark.unit
+class TestDateUtils:
+    @pytest.mark.anyio
+    async def test_get_month_start(self):
+        assert get_month_start(date(2025, 2, 17)) == date(2025, 2, 1)
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize(
+        "day, expected",
+        [
+            (date(2025, 1, 31), date(2025, 2, 1)),
+            (date(2025, 2, 1), date(2025, 3, 1)),
+            (date(2025, 12, 5), date(2026, 1, 1)),
+        ],
+    )
+    async def test_get_next_month_start(self, day: date, expected: date):
+        assert get_next_month_start(day) == expected
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize(
+        "start, end, expected",
+        [
+            (date(2025, 1, 1), date(2025, 3, 31), (date(2025, 1, 1), date(2025, 4, 1))),
+            (date(2025, 1, 15), date(2025, 3, 10), (date(2025, 2, 1), date(2025, 3, 1))),
+            (date(2025, 1, 15), date(2025, 2, 27), None),
+            (date(2025, 1, 2), date(2025, 1, 31), None),
+            (None, date(2025, 3, 10), (None, date(2025, 3, 1))),
+            (date(2025, 1, 15), None, (date(2025, 2, 1), None)),
+            (None, None, (None, None)),
+        ],
+    )
+    async def test_get_whole_months(self, start: date | None, end: date | None, expected):
+        assert get_whole_months(start, end) == expected
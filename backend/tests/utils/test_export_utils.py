@@ -0,0 +1,85 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.common.enums import ExportFormat
+from app.db_models import Transaction
+from app.schemas import TransactionOut
+from app.utils.export_utils import serialize_chunks
+
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.fixture
+def transactions() -> list[Transaction]:
+    return [
+        Transaction(id=1, user_id=1, type_id=1, category_id=None, date=date(2025, 1, 1), value=10.5, comment="a"),
+        Transaction(id=2, user_id=1, type_id=2, category_id=1, date=date(2025, 1, 2), value=20, comment=None),
+    ]
+
+
+@pytest.mark.unit
+class TestExportUtils:
+    @pytest.mark.anyio
+    async def test_serialize_chunks__ndjson(self, transactions: list[Transaction]):
+        output = [
+            chunk
+            async for chunk in serialize_chunks(
+                _chunks(transactions[:1], transactions[1:]), schema=TransactionOut, export_format=ExportFormat.ndjson
+            )
+        ]
+
+        assert len(output) == 2
+        assert output[0] == (
+            '{"type_id":1,"category_id":null,"date":"2025-01-01","value":10.5,"comment":"a","id":1,"user_id":1,'
+            '"external_id":null}\n'
+        )
+
+    @pytest.mark.anyio
+    async def test_serialize_chunks__ndjson_rows(self):
+        rows = [
+            {
+                "type_id": 1,
+                "category_id": None,
+                "date": date(2025, 1, 1),
+                "value": Decimal("10.50"),
+                "comment": "a",
+                "id": 1,
+                "user_id": 1,
+                "external_id": None,
+            },
+        ]
+
+        output = [
+            chunk
+            async for chunk in serialize_chunks(_chunks(rows), schema=TransactionOut, export_format=ExportFormat.ndjson)
+        ]
+
+        assert output == [
+            '{"type_id":1,"category_id":null,"date":"2025-01-01","value":10.5,"comment":"a","id":1,"user_id":1,'
+            '"external_id":null}\n'
+        ]
+
+    @pytest.mark.anyio
+    async def test_serialize_chunks__csv(self, transactions: list[Transaction]):
+        output = [
+            chunk
+            async for chunk in serialize_chunks(
+                _chunks(transactions), schema=TransactionOut, export_format=ExportFormat.csv
+            )
+        ]
+
+        assert output[0] == "type_id,category_id,date,value,comment,id,user_id,external_id\r\n"
+        assert output[1] == "1,,2025-01-01,10.5,a,1,1,\r\n2,1,2025-01-02,20.0,,2,1,\r\n"
+
+    @pytest.mark.anyio
+    async def test_serialize_chunks__csv_no_rows(self):
+        output = [
+            chunk async for chunk in serialize_chunks(_chunks(), schema=TransactionOut, export_format=ExportFormat.csv)
+        ]
+
+        assert output == ["type_id,category_id,date,value,comment,id,user_id,external_id\r\n"]
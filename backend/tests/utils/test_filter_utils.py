@@ -0,0 +1,81 @@
+from typing import ClassVar
+
+import pytest
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.common.enums import FilterOperator
+from app.db_models import Transaction
+from app.schemas import TransactionFilters
+from app.utils.filter_utils import FILTER_CONDITIONS, compile_filter_plan, get_active_filters
+
+
+class InvalidFilters(BaseModel):
+    missing: list[int] | None = None
+    value_gt: float | None = None
+
+    list_filters: ClassVar[list[str]] = ["missing"]
+    gt_filters: ClassVar[list[str]] = ["value_gt"]
+    lt_filters: ClassVar[list[str]] = []
+    kw_filters: ClassVar[list[str]] = []
+
+
+@pytest.mark.unit
+class TestFilterUtils:
+    @pytest.mark.anyio
+    async def test_compile_filter_plan__transaction(self):
+        plan = compile_filter_plan(Transaction, TransactionFilters)
+
+        assert [(entry.filter_name, entry.column.key, entry.operator) for entry in plan] == [
+            ("user_id", "user_id", FilterOperator.in_),
+            ("type_id", "type_id", FilterOperator.in_),
+            ("category_id", "category_id", FilterOperator.in_),
+            ("external_id", "external_id", FilterOperator.in_),
+            ("date_gt", "date", FilterOperator.gte),
+            ("value_gt", "value", FilterOperator.gte),
+            ("date_lt", "date", FilterOperator.lte),
+            ("value_lt", "value", FilterOperator.lte),
+            ("comment", "comment", FilterOperator.ilike),
+        ]
+
+    @pytest.mark.anyio
+    async def test_compile_filter_plan__cached(self):
+        assert compile_filter_plan(Transaction, TransactionFilters) is compile_filter_plan(
+            Transaction, TransactionFilters
+        )
+
+    @pytest.mark.anyio
+    async def test_compile_filter_plan__invalid_filter_ignored(self):
+        plan = compile_filter_plan(Transaction, InvalidFilters)
+
+        assert [entry.filter_name for entry in plan] == ["value_gt"]
+
+    @pytest.mark.anyio
+    async def test_get_active_filters__skips_unset_and_empty(self):
+        filters = TransactionFilters(type_id=[], value_gt=0, comment=["rent"])
+
+        active_filters = get_active_filters(Transaction, filters)
+
+        assert [(entry.filter_name, value) for entry, value in active_filters] == [
+            ("value_gt", 0),
+            ("comment", ["rent"]),
+        ]
+
+    @pytest.mark.anyio
+    async def test_filter_conditions__ilike_escaped(self):
+        condition = FILTER_CONDITIONS[FilterOperator.ilike](Transaction.comment, ["50%", "a_b"])
+
+        compiled = select(Transaction.id).where(condition).compile()
+
+        assert " OR " in str(compiled)
+        assert set(compiled.params.values()) == {"%50\\%%", "%a\\_b%"}
+
+    @pytest.mark.anyio
+    async def test_filter_conditions__match(self):
+        condition = FILTER_CONDITIONS[FilterOperator.match](Transaction.comment, ["rent", "fuel"])
+
+        compiled = select(Transaction.id).where(condition).compile(dialect=postgresql.dialect())
+
+        assert str(compiled).count("@@ plainto_tsquery") == 2
+        assert set(compiled.params.values()) == {"rent", "fuel"}
@@ -0,0 +1,110 @@
+import pytest
+
+from app.common.enums import TypeName
+from app.common.exceptions import ImportRecordTooLargeException
+from app.utils.import_utils import decode_chunks, iter_batches, iter_csv_records, iter_lines, iter_ofx_records
+
+
+async def _chunks(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def _split(data: bytes, size: int) -> list[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+OFX = (
+    b"OFXHEADER:100\nDATA:OFXSGML\n\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>\n"
+    b"<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250115120000[-5:EST]<TRNAMT>-12.50<NAME>phone<MEMO>phone bill</STMTTRN>\n"
+    b"<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250116<TRNAMT>100.00<NAME>salary</STMTTRN>\n"
+    b"</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n"
+)
+
+
+@pytest.mark.unit
+class TestImportUtils:
+    @pytest.mark.anyio
+    async def test_decode_chunks__character_split_between_chunks(self):
+        data = "﻿café".encode()
+
+        texts = [text async for text in decode_chunks(_chunks(*_split(data, 1)))]
+
+        assert "".join(texts) == "café"
+
+    @pytest.mark.anyio
+    async def test_iter_lines__lines_split_between_chunks(self):
+        lines = [line async for line in iter_lines(_chunks("a,b\nc", ",d\n", "e"), max_size=100)]
+
+        assert lines == ["a,b\n", "c,d\n", "e"]
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+    async def test_iter_csv_records(self, chunk_size: int):
+        data = (
+            b"id,type_id,category_id,date,value,comment\r\n"
+            b'1,1,,2025-01-01,10,"multi\r\nline, quoted"\r\n'
+            b"\r\n"
+            b"2,2,3,2025-01-02,5.5,\r\n"
+        )
+
+        records = [
+            record async for record in iter_csv_records(decode_chunks(_chunks(*_split(data, chunk_size))), max_size=100)
+        ]
+
+        assert records == [
+            {
+                "type_id": "1",
+                "category_id": None,
+                "date": "2025-01-01",
+                "value": "10",
+                "comment": "multi\r\nline, quoted",
+            },
+            {"type_id": "2", "category_id": "3", "date": "2025-01-02", "value": "5.5", "comment": None},
+        ]
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize("chunk_size", [1, 5, 1000])
+    async def test_iter_ofx_records(self, chunk_size: int):
+        type_ids = {TypeName.income: 1, TypeName.expense: 2}
+
+        records = [
+            record
+            async for record in iter_ofx_records(
+                decode_chunks(_chunks(*_split(OFX, chunk_size))), type_ids=type_ids, max_size=100
+            )
+        ]
+
+        assert records == [
+            {"type_id": 2, "category_id": None, "date": "2025-01-15", "value": "12.50", "comment": "phone bill"},
+            {"type_id": 1, "category_id": None, "date": "2025-01-16", "value": "100.00", "comment": "salary"},
+        ]
+
+    @pytest.mark.anyio
+    async def test_iter_lines__line_too_large(self):
+        with pytest.raises(ImportRecordTooLargeException):
+            async for _ in iter_lines(_chunks(*["a" * 10] * 20), max_size=100):
+                pass
+
+    @pytest.mark.anyio
+    async def test_iter_csv_records__unmatched_quote(self):
+        chunks = ["type_id,date,value,comment\n", '1,2025-01-01,10,"unmatched\n', *["a,b\n"] * 50]
+
+        # the quoted value would otherwise continue to the end of the file
+        with pytest.raises(ImportRecordTooLargeException, match="longer than 100 characters"):
+            async for _ in iter_csv_records(_chunks(*chunks), max_size=100):
+                pass
+
+    @pytest.mark.anyio
+    async def test_iter_ofx_records__no_tag(self):
+        type_ids = {TypeName.income: 1, TypeName.expense: 2}
+
+        with pytest.raises(ImportRecordTooLargeException):
+            async for _ in iter_ofx_records(_chunks(*["a" * 10] * 20), type_ids=type_ids, max_size=100):
+                pass
+
+    @pytest.mark.anyio
+    async def test_iter_batches(self):
+        batches = [batch async for batch in iter_batches(_chunks(*range(5)), batch_size=2)]
+
+        assert batches == [[0, 1], [2, 3], [4]]
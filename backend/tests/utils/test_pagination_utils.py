@@ -0,0 +1,39 @@
+from datetime import date
+
+import pytest
+
+from app.common.exceptions import InvalidCursorException
+from app.utils.pagination_utils import encode_cursor, decode_cursor
+
+
+@pytest.mark.unit
+class TestPaginationUtils:
+    @pytest.mark.anyio
+    async def test_encode_cursor__then_decode(self):
+        cursor = encode_cursor([date(2025, 1, 2), 5])
+
+        assert decode_cursor(cursor, python_types=[date, int]) == [date(2025, 1, 2), 5]
+
+    @pytest.mark.anyio
+    async def test_decode_cursor__not_base64(self):
+        with pytest.raises(InvalidCursorException):
+            decode_cursor("not a cursor!", python_types=[int])
+
+    @pytest.mark.anyio
+    async def test_decode_cursor__not_json(self):
+        with pytest.raises(InvalidCursorException):
+            decode_cursor("bm90anNvbg==", python_types=[int])
+
+    @pytest.mark.anyio
+    async def test_decode_cursor__wrong_number_of_values(self):
+        cursor = encode_cursor([1, 2])
+
+        with pytest.raises(InvalidCursorException):
+            decode_cursor(cursor, python_types=[int])
+
+    @pytest.mark.anyio
+    async def test_decode_cursor__wrong_value_type(self):
+        cursor = encode_cursor(["not a date", 1])
+
+        with pytest.raises(InvalidCursorException):
+            decode_cursor(cursor, python_types=[date, int])
@@ -1,8 +1,17 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
 import pytest
 
+from app.common.enums import ExecutorType
 from app.utils.password_utils import (
     verify_password,
     get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    get_password_executor,
+    shutdown_password_executor,
 )
 
 
@@ -36,3 +45,45 @@ class TestPasswordUtils:
         assert isinstance(hashed, str)
         assert hashed != password
         assert hashed.startswith("$2b$")
+
+    @pytest.mark.anyio
+    async def test_verify_password_async(self):
+        password = "secret123"
+        hashed = await get_password_hash_async(password)
+
+        assert await verify_password_async(password, hashed) is True
+        assert await verify_password_async("wrong123", hashed) is False
+
+    @pytest.mark.anyio
+    async def test_get_password_hash_async__does_not_block_event_loop(self):
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        ticker = asyncio.create_task(tick())
+        await get_password_hash_async("secret123")
+        ticker.cancel()
+
+        assert ticks > 1
+
+    @pytest.mark.anyio
+    async def test_get_password_executor__configured_type(self):
+        shutdown_password_executor()
+        try:
+            for executor_type, executor_class in (
+                (ExecutorType.thread, ThreadPoolExecutor),
+                (ExecutorType.process, ProcessPoolExecutor),
+            ):
+                settings = MagicMock(password_hashing_executor=executor_type, password_hashing_max_workers=2)
+                with patch("app.utils.password_utils.get_settings", return_value=settings):
+                    executor = get_password_executor()
+
+                assert isinstance(executor, executor_class)
+                assert get_password_executor() is executor
+                shutdown_password_executor()
+        finally:
+            shutdown_password_executor()
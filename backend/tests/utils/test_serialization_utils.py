@@ -0,0 +1,87 @@
+import json
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db_models import Transaction
+from app.schemas import Page, TransactionOut
+from app.utils.serialization_utils import SerializedJSONResponse, get_record_adapter, to_json_bytes
+
+
+@pytest.mark.unit
+class TestSerializationUtils:
+    @pytest.mark.anyio
+    async def test_get_record_adapter__cached(self):
+        assert get_record_adapter(Page[TransactionOut]) is get_record_adapter(Page[TransactionOut])
+
+    @pytest.mark.anyio
+    async def test_to_json_bytes__dicts(self):
+        transaction = {
+            "id": 1,
+            "user_id": 1,
+            "type_id": 1,
+            "category_id": None,
+            "date": date(2025, 1, 1),
+            "value": Decimal("10.50"),
+            "comment": "a",
+            "external_id": None,
+            "rank": 0.5,
+        }
+
+        output = to_json_bytes({"items": [transaction], "next_cursor": "abc"}, annotation=Page[TransactionOut])
+
+        # keys that are not fields of the schema are left out
+        assert output == (
+            b'{"items":[{"id":1,"user_id":1,"type_id":1,"category_id":null,"date":"2025-01-01","value":10.5,'
+            b'"comment":"a","external_id":null}],"next_cursor":"abc"}'
+        )
+
+    @pytest.mark.anyio
+    async def test_to_json_bytes__entities(self):
+        transaction = Transaction(
+            id=1, user_id=1, type_id=1, category_id=None, date=date(2025, 1, 1), value=Decimal("10.50"), comment="a"
+        )
+
+        output = to_json_bytes(transaction, annotation=TransactionOut)
+
+        assert output == (
+            b'{"type_id":1,"category_id":null,"date":"2025-01-01","value":10.5,"comment":"a","id":1,"user_id":1,'
+            b'"external_id":null}'
+        )
+
+    @pytest.mark.anyio
+    async def test_to_json_bytes__rows(self):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Transaction.__table__.create)
+            await conn.execute(
+                insert(Transaction),
+                [{"user_id": 1, "type_id": 1, "date": date(2025, 1, 1), "value": Decimal("0.10"), "comment": "row"}],
+            )
+            rows = (await conn.execute(select(*Transaction.__table__.columns))).all()
+        await engine.dispose()
+
+        output = json.loads(to_json_bytes(rows, annotation=list[TransactionOut]))
+
+        assert output == [
+            {
+                "type_id": 1,
+                "category_id": None,
+                "date": "2025-01-01",
+                "value": 0.1,
+                "comment": "row",
+                "id": 1,
+                "user_id": 1,
+                "external_id": None,
+            }
+        ]
+
+    @pytest.mark.anyio
+    async def test_serialized_json_response(self):
+        response = SerializedJSONResponse([], annotation=list[TransactionOut], status_code=200)
+
+        assert response.body == b"[]"
+        assert response.headers["content-type"] == "application/json"
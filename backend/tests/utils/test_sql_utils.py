@@ -0,0 +1,129 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import Column, Date, Integer, MetaData, String, Table, func, insert, literal, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.utils.sql_utils import MinorUnits, date_trunc, in_values, text_match, text_rank
+
+
+@pytest.mark.unit
+class TestSqlUtils:
+    @pytest.mark.anyio
+    @pytest.mark.parametrize(
+        "precision, value, expected",
+        [
+            ("day", date(2025, 1, 5), date(2025, 1, 5)),
+            ("week", date(2025, 1, 1), date(2024, 12, 30)),
+            ("week", date(2025, 1, 5), date(2024, 12, 30)),
+            ("week", date(2025, 1, 6), date(2025, 1, 6)),
+            ("month", date(2025, 3, 15), date(2025, 3, 1)),
+        ],
+    )
+    async def test_date_trunc__sqlite(self, precision: str, value: date, expected: date):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.connect() as conn:
+            result = await conn.execute(select(date_trunc(precision, literal(value, Date()))))
+
+        assert result.scalar() == expected
+
+    @pytest.mark.anyio
+    async def test_date_trunc__postgresql(self):
+        statement = select(date_trunc("month", literal(date(2025, 3, 15), Date())))
+
+        assert "CAST(date_trunc('month', " in str(statement.compile(dialect=postgresql.dialect()))
+
+    @pytest.mark.anyio
+    async def test_date_trunc__precision_in_cache_key(self):
+        column = literal(date(2025, 3, 15), Date())
+
+        assert date_trunc("month", column)._generate_cache_key() != date_trunc("week", column)._generate_cache_key()
+
+    @pytest.mark.anyio
+    async def test_date_trunc__invalid_precision(self):
+        with pytest.raises(ValueError):
+            date_trunc("year", literal(date(2025, 3, 15), Date()))
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize(
+        "comment, query, expected",
+        [("Monthly Rent", "rent", True), ("groceries", "rent", False), (None, "rent", False)],
+    )
+    async def test_text_match__sqlite(self, comment: str | None, query: str, expected: bool):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        column = literal(comment, String())
+        async with engine.connect() as conn:
+            result = await conn.execute(select(text_match(column, query), text_rank(column, query)))
+
+        assert result.one() == (expected, float(expected))
+
+    @pytest.mark.anyio
+    async def test_text_match__postgresql(self):
+        statement = select(text_rank(literal("rent", String()), "rent")).where(
+            text_match(literal("rent", String()), "rent")
+        )
+
+        compiled = str(statement.compile(dialect=postgresql.dialect()))
+        assert "ts_rank(to_tsvector('simple', coalesce(" in compiled
+        assert "@@ plainto_tsquery('simple', " in compiled
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize(
+        "value, expected",
+        [(Decimal("12.34"), 1234), (Decimal("-0.5"), -50), (0.1, 10), (7, 700), (None, None)],
+    )
+    async def test_minor_units__bind(self, value: Decimal | float | int | None, expected: int | None):
+        assert MinorUnits(exponent=2).process_bind_param(value, postgresql.dialect()) == expected
+
+    @pytest.mark.anyio
+    async def test_minor_units__bind_too_many_decimal_places(self):
+        with pytest.raises(ValueError):
+            MinorUnits(exponent=2).process_bind_param(Decimal("1.005"), postgresql.dialect())
+
+    @pytest.mark.anyio
+    @pytest.mark.parametrize(
+        "value, expected",
+        # integers from the column, NUMERIC sums on PostgreSQL and float averages on SQLite
+        [(1234, Decimal("12.34")), (Decimal("1234"), Decimal("12.34")), (1234.5, Decimal("12.345")), (None, None)],
+    )
+    async def test_minor_units__result(self, value: int | Decimal | float | None, expected: Decimal | None):
+        assert MinorUnits(exponent=2).process_result_value(value, postgresql.dialect()) == expected
+
+    @pytest.mark.anyio
+    async def test_minor_units__exact_sum_sqlite(self):
+        table = Table("amounts", MetaData(), Column("value", MinorUnits(exponent=2)))
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(table.create)
+            await conn.execute(insert(table), [{"value": Decimal("0.1")}, {"value": Decimal("0.2")}])
+            stored = await conn.exec_driver_sql("SELECT sum(value) FROM amounts")
+            result = await conn.execute(select(func.sum(table.c.value)))
+
+        # summed as integers by the database, without the float error of 0.1 + 0.2
+        assert stored.scalar() == 30
+        assert result.scalar() == Decimal("0.30")
+
+    @pytest.mark.anyio
+    async def test_in_values__postgresql(self):
+        condition = in_values(Column("id", Integer), list(range(40000)), dialect_name="postgresql")
+
+        compiled = condition.compile(dialect=postgresql.dialect())
+
+        # a single array parameter, however many values
+        assert str(compiled) == "id = ANY (%(param_1)s::INTEGER[])"
+        assert compiled.params["param_1"] == list(range(40000))
+
+    @pytest.mark.anyio
+    async def test_in_values__sqlite(self):
+        table = Table("ids", MetaData(), Column("id", Integer))
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(table.metadata.create_all)
+            await conn.execute(table.insert(), [{"id": 1}, {"id": 2}, {"id": 3}])
+            query = await conn.execute(
+                select(table.c.id).where(in_values(table.c.id, [1, 3], dialect_name="sqlite")).order_by(table.c.id)
+            )
+            assert query.scalars().all() == [1, 3]
+        await engine.dispose()
@@ -1,4 +1,4 @@
-import client from "./client";
+import client, { getAllPages } from "./client";
 
 
 export function getCategory(id) {
@@ -6,7 +6,7 @@ export function getCategory(id) {
 }
 
 export function getCategories(params = {}) {
-  return client.get("/categories", { params });
+  return getAllPages("/categories", params);
 }
 
 export function createCategory(data) {
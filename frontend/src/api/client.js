@@ -50,4 +50,18 @@ client.interceptors.response.use(
   }
 );
 
+// list endpoints are cursor paginated, follow next_cursor until the last page and return all items as data,
+// only meant for small lists needed whole, such as the categories naming the rows and filling the selects
+export async function getAllPages(url, params = {}) {
+  const items = [];
+  let cursor = null;
+  let response;
+  do {
+    response = await client.get(url, { params: cursor ? { ...params, cursor } : params });
+    items.push(...response.data.items);
+    cursor = response.data.next_cursor;
+  } while (cursor);
+  return { ...response, data: items };
+}
+
 export default client;
\ No newline at end of file
@@ -5,10 +5,15 @@ export function getGoal(id) {
   return client.get(`/goals/${id}`);
 }
 
+// single pages, continued by passing their next_cursor as the cursor param
 export function getGoals(params = {}) {
   return client.get("/goals", { params });
 }
 
+export function getGoalsProgress(params = {}) {
+  return client.get("/goals/progress", { params });
+}
+
 export function createGoal(data) {
   return client.post("/goals", data);
 }
@@ -5,6 +5,7 @@ export function getTransaction(id) {
   return client.get(`/transactions/${id}`);
 }
 
+// a single page, continued by passing its next_cursor as the cursor param
 export function getTransactions(params = {}) {
   return client.get("/transactions", { params });
 }
@@ -13,6 +14,10 @@ export function getTransactionsTotal(params = {}) {
   return client.get("/transactions/total", { params });
 }
 
+export function getTransactionsAggregate(params = {}) {
+  return client.get("/transactions/aggregate", { params });
+}
+
 export function createTransaction(data) {
   return client.post("/transactions", data);
 }
@@ -9,6 +9,7 @@ export function getUser(id) {
   return client.get(`/users/${id}`);
 }
 
+// a single page, continued by passing its next_cursor as the cursor param
 export function getUsers(params = {}) {
   return client.get("/users/", { params });
 }
@@ -0,0 +1,36 @@
+import { useCallback, useEffect, useRef, useState } from "react";
+
+
+// lists are cursor paginated, the first page is loaded whenever the params change and later ones only on demand
+const useCursorPages = (getPage, params) => {
+  const [items, setItems] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [isLoading, setIsLoading] = useState(false);
+  // pages requested for params that have changed since are dropped
+  const requestRef = useRef(0);
+
+  const fetchPage = useCallback(async (cursor) => {
+    const request = ++requestRef.current;
+    setIsLoading(true);
+    try {
+      const res = await getPage(cursor ? { ...params, cursor } : params);
+      if (request !== requestRef.current) return;
+      setItems(prev => (cursor ? [...prev, ...res.data.items] : res.data.items));
+      setNextCursor(res.data.next_cursor);
+    } finally {
+      if (request === requestRef.current) setIsLoading(false);
+    }
+  }, [getPage, params]);
+
+  useEffect(() => {
+    fetchPage(null);
+  }, [fetchPage]);
+
+  const loadMore = () => {
+    if (nextCursor && !isLoading) fetchPage(nextCursor);
+  };
+
+  return { items, hasMore: nextCursor !== null, isLoading, loadMore };
+};
+
+export default useCursorPages;
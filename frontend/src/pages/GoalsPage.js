@@ -3,8 +3,7 @@ import { FiPlus } from "react-icons/fi";
 import { FiFilter } from "react-icons/fi";
 
 import { getCategories } from "../api/categories.api";
-import { getGoals, createGoal, updateGoal, deleteGoal } from "../api/goals.api";
-import { getTransactionsTotal } from "../api/transactions.api";
+import { getGoalsProgress, createGoal, updateGoal, deleteGoal } from "../api/goals.api";
 import { getTypes } from "../api/types.api";
 import Button from "../components/Button";
 import Navbar from "../components/Navbar";
@@ -12,10 +11,9 @@ import GoCard from "../features/goals/GoCard";
 import GoAddModal from "../features/goals/GoAddModal";
 import GoFilterModal from "../features/goals/GoFilterModal";
 import GoEditModal from "../features/goals/GoEditModal";
+import useCursorPages from "../hooks/useCursorPages";
 
 const GoalsPage = () => {
-  const [goals, setGoals] = useState([]);
-  const [goalTotals, setGoalTotals] = useState({});
   const [typeMap, setTypeMap] = useState(new Map());
   const [categoryMap, setCategoryMap] = useState(new Map());
   const [isFilterModalOpen, setIsFilterModalOpen] = useState(false);
@@ -39,34 +37,7 @@ const GoalsPage = () => {
     fetchTypesAndCategories();
   }, []);
   
-  useEffect(() => {
-    const fetchGoals = async () => {
-      const res = await getGoals(filters);
-      setGoals(res.data);
-    }
-    fetchGoals();
-  }, [filters]);
-
-  useEffect(() => {
-    const fetchTotals = async () => {
-      const totals = {};
-      await Promise.all(goals.map(async (goal) => {
-        try {
-          const res = await getTransactionsTotal({
-            type_id: goal.type_id,
-            category_id: goal.category_id,
-            date_gt: goal.start_date,
-            date_lt: goal.end_date
-          });
-          totals[goal.id] = res.data.total;
-        } catch {
-          totals[goal.id] = "error";
-        }
-      }));
-      setGoalTotals(totals);
-    };
-    if (goals.length > 0) fetchTotals();
-  }, [goals]);
+  const { items: goals, hasMore, isLoading, loadMore } = useCursorPages(getGoalsProgress, filters);
 
   const handleFilter = (form) => {
     const query = {};
@@ -120,7 +91,6 @@ const GoalsPage = () => {
 
   const mappedGoals = goals.map(goal => ({
     ...goal,
-    current_value: goalTotals[goal.id] ?? "",
     type: typeMap[goal.type_id] || goal.type_id,
     category: categoryMap[goal.category_id] || goal.category_id
   }));
@@ -167,6 +137,13 @@ const GoalsPage = () => {
           </div>
         </div>
         {goCards.length > 0 ? goCards : <p className="text-center">no goals found</p>}
+        {hasMore && (
+          <div className="text-center">
+            <Button variant="secondary" onClick={loadMore} disabled={isLoading}>
+              load more
+            </Button>
+          </div>
+        )}
       </div>
 
       <GoFilterModal
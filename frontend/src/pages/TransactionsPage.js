@@ -3,7 +3,7 @@ import { FiPlus } from "react-icons/fi";
 import { FiFilter } from "react-icons/fi";
 
 import { getCategories } from "../api/categories.api";
-import { getTransactions, getTransactionsTotal, createTransaction, updateTransaction, deleteTransaction } from "../api/transactions.api";
+import { getTransactions, getTransactionsAggregate, createTransaction, updateTransaction, deleteTransaction } from "../api/transactions.api";
 import { getTypes } from "../api/types.api";
 import Button from "../components/Button";
 import Navbar from "../components/Navbar";
@@ -12,10 +12,10 @@ import TrEditModal from "../features/transactions/TrEditModal";
 import TrFilterModal from "../features/transactions/TrFilterModal";
 import TrSummaryCard from "../features/transactions/TrSummaryCard";
 import TrTable from "../features/transactions/TrTable";
+import useCursorPages from "../hooks/useCursorPages";
 
 
 const TransactionsPage = () => {
-  const [transactions, setTransactions] = useState([]);
   const [typeMap, setTypeMap] = useState(new Map());
   const [categoryMap, setCategoryMap] = useState(new Map());
   const [incomeTotal, setIncomeTotal] = useState(0);
@@ -41,13 +41,7 @@ const TransactionsPage = () => {
     fetchTypesAndCategories();
   }, []);
 
-  useEffect(() => {
-    const fetchTransactions = async () => { 
-      const res = await getTransactions(filters);
-      setTransactions(res.data);
-    };
-    fetchTransactions();
-  }, [filters]);
+  const { items: transactions, hasMore, isLoading, loadMore } = useCursorPages(getTransactions, filters);
 
   useEffect(() => {
     const fetchTotals = async () => {
@@ -57,22 +51,13 @@ const TransactionsPage = () => {
       const expenseTypeId = Object.keys(typeMap).find(id => typeMap[id] === "expense");
 
       try {
-        if (filters.type_id === incomeTypeId) {
-          const incomeRes = await getTransactionsTotal(filters);
-          setIncomeTotal(incomeRes.data.total);
-          setExpensesTotal(0);
-          return;
-        } else if (filters.type_id ===  expenseTypeId) {
-          const expenseRes = await getTransactionsTotal(filters);
-          setExpensesTotal(expenseRes.data.total);
-          setIncomeTotal(0);
-          return;
-        } else {
-          const incomeRes = await getTransactionsTotal({ type_id: incomeTypeId, ...filters });
-          setIncomeTotal(incomeRes.data.total);
-          const expenseRes = await getTransactionsTotal({ type_id: expenseTypeId, ...filters });
-          setExpensesTotal(expenseRes.data.total);
-        }
+        // one grouped query returns the totals of all types
+        const res = await getTransactionsAggregate({ ...filters, group_by: "type_id", metrics: "sum" });
+        const totals = {};
+        // sums are decimal strings, so that large ones keep every digit
+        res.data.forEach(group => { totals[group.type_id] = Number(group.sum); });
+        setIncomeTotal(totals[incomeTypeId] || 0);
+        setExpensesTotal(totals[expenseTypeId] || 0);
       } catch (error) {
         console.error("Failed to fetch totals:", error);
       }
@@ -188,6 +173,13 @@ const TransactionsPage = () => {
               setIsEditModalOpen(true);
             }}>
             </TrTable>
+            {hasMore && (
+              <div className="text-center">
+                <Button variant="secondary" onClick={loadMore} disabled={isLoading}>
+                  load more
+                </Button>
+              </div>
+            )}
           </div>
         </div>
       